@@ -159,6 +159,13 @@ class DefaultValues:
     
     # Pagination
     USERS_PER_PAGE = 20
+    LOGS_PER_PAGE = 50
+    ARCHIVED_LOGS_LIMIT = 500
+    NOTIFICATIONS_PER_PAGE = 20
+    EVENTS_PER_PAGE = 20  # Vue d'ensemble des événements (administration)
+    EXPORT_BATCH_SIZE = 500  # Lignes lues par lot (curseur serveur sous PostgreSQL)
+    DELETE_BATCH_SIZE = 500  # Lignes supprimées par transaction (suppression d'événement)
+    PATCH_MAX_CHANGES = 2000  # Changements par patch JSON de participants
     
     # Groupes par défaut pour les événements
     DEFAULT_GROUPS_CONFIG = {
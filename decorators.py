@@ -3,14 +3,20 @@ Décorateurs personnalisés pour GN Manager.
 
 Ce module fournit des décorateurs réutilisables pour:
 - Vérification des permissions (admin, organisateur)
-- Gestion des accès aux événements
+- Gestion des accès aux événements (événement et participation chargés une
+  fois, relus par les vues dans g.current_event / g.current_membership)
+- Routage des vues en lecture vers le moteur read-only
+- Prise anticipée du verrou d'écriture (BEGIN IMMEDIATE)
 """
 
 from functools import wraps
 from flask import flash, redirect, url_for
 from flask_login import current_user
-from models import Participant, Event
+from models import db
 from constants import ParticipantType
+from utils.db_routing import read_only_session
+from utils.db_transaction import begin_write
+from utils.request_context import get_current_event, get_current_membership
 
 
 def admin_required(f):
@@ -51,7 +57,8 @@ def organizer_required(f):
     IMPORTANT: La route doit avoir un paramètre 'event_id' en premier argument.
     
     Redirige vers la page de détail de l'événement avec un message d'erreur
-    si l'utilisateur n'est pas organisateur.
+    si l'utilisateur n'est pas organisateur. Sinon, l'événement et la
+    participation sont disponibles dans g.current_event et g.current_membership.
     """
     @wraps(f)
     def decorated_function(event_id, *args, **kwargs):
@@ -59,13 +66,10 @@ def organizer_required(f):
             flash('Vous devez être connecté pour accéder à cette page.', 'warning')
             return redirect(url_for('auth.login'))
         
-        event = Event.query.get_or_404(event_id)
-        participant = Participant.query.filter_by(
-            event_id=event.id, 
-            user_id=current_user.id
-        ).first()
+        event = get_current_event(event_id)
+        participant = get_current_membership(event_id)
         
-        if not participant or participant.type.lower() != ParticipantType.ORGANISATEUR.value.lower():
+        if not participant or participant.type != ParticipantType.ORGANISATEUR.value:
             flash('Accès réservé aux organisateurs de cet événement.', 'danger')
             return redirect(url_for('event.detail', event_id=event.id))
         
@@ -85,7 +89,8 @@ def participant_required(f):
     IMPORTANT: La route doit avoir un paramètre 'event_id' en premier argument.
     
     Redirige vers la page de détail de l'événement avec un message d'erreur
-    si l'utilisateur ne participe pas à l'événement.
+    si l'utilisateur ne participe pas à l'événement. Sinon, l'événement et la
+    participation sont disponibles dans g.current_event et g.current_membership.
     """
     @wraps(f)
     def decorated_function(event_id, *args, **kwargs):
@@ -93,11 +98,8 @@ def participant_required(f):
             flash('Vous devez être connecté pour accéder à cette page.', 'warning')
             return redirect(url_for('auth.login'))
         
-        event = Event.query.get_or_404(event_id)
-        participant = Participant.query.filter_by(
-            event_id=event.id, 
-            user_id=current_user.id
-        ).first()
+        event = get_current_event(event_id)
+        participant = get_current_membership(event_id)
         
         if not participant:
             flash('Vous devez participer à cet événement pour accéder à cette page.', 'danger')
@@ -132,3 +134,43 @@ def creator_required(f):
         
         return f(*args, **kwargs)
     return decorated_function
+
+
+def read_only_db(f):
+    """
+    Décorateur qui fait lire la vue sur le moteur en lecture seule.
+
+    Utilisation:
+        @read_only_db
+        def my_listing_route():
+            ...
+
+    À placer sous les décorateurs de permission : la vérification d'accès
+    reste sur le moteur principal. Une écriture éventuelle bascule la
+    session sur le moteur principal pour le reste de la requête.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        with read_only_session(db.session):
+            return f(*args, **kwargs)
+    return decorated_function
+
+
+def write_transaction(f):
+    """
+    Décorateur qui prend le verrou d'écriture avant d'exécuter la vue.
+
+    Utilisation:
+        @write_transaction
+        def my_update_route():
+            ...
+
+    À placer sous les décorateurs de permission : les requêtes refusées ne
+    prennent pas le verrou. Sous SQLite, BEGIN IMMEDIATE avec reprises
+    (utils/db_transaction.py) ; un verrou non obtenu donne une réponse 503.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        begin_write()
+        return f(*args, **kwargs)
+    return decorated_function
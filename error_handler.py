@@ -7,6 +7,8 @@ import logging
 import traceback
 from flask import request, jsonify
 from werkzeug.exceptions import HTTPException
+from exceptions import DatabaseBusyError
+from models import db
 
 
 def init_error_handlers(app):
@@ -81,6 +83,30 @@ def init_error_handlers(app):
         from flask import render_template
         return render_template('errors/500.html'), 500
     
+    @app.errorhandler(DatabaseBusyError)
+    def database_busy_error(error):
+        """Gère les verrous d'écriture non obtenus (503, le client réessaie)."""
+        db.session.rollback()
+        app.logger.warning(
+            f'503 Database Busy: {request.method} {request.url}',
+            extra={
+                'user_id': getattr(request, 'user_id', None),
+                'ip_address': request.remote_addr
+            }
+        )
+        
+        if request.path.startswith('/api/') or request.accept_mimetypes.accept_json:
+            response = jsonify({
+                'error': 'Service Unavailable',
+                'message': 'The database is busy, please retry'
+            })
+        else:
+            from flask import render_template
+            response = app.make_response(render_template('errors/500.html'))
+        response.status_code = 503
+        response.headers['Retry-After'] = '1'
+        return response
+    
     @app.errorhandler(Exception)
     def handle_exception(error):
         """Gère toutes les exceptions non interceptées."""
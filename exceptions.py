@@ -25,6 +25,16 @@ class DatabaseError(AppError):
     pass
 
 
+class DatabaseBusyError(DatabaseError):
+    """
+    Exception levée quand le verrou d'écriture n'a pas pu être obtenu.
+    
+    Levée après épuisement des tentatives (voir utils/db_transaction.py) ;
+    renvoyée au client en 503 pour qu'il réessaie.
+    """
+    pass
+
+
 class PermissionError(AppError):
     """
     Exception levée pour les erreurs d'autorisation/permissions.
@@ -3,7 +3,7 @@ import argparse
 import json
 import sys
 import logging
-from datetime import datetime
+from datetime import datetime, date
 import os
 import csv
 from dotenv import load_dotenv
@@ -43,9 +43,12 @@ def fix_sequences_logic(db, app):
         'account_validation_token',
         'event_link',
         'event_notification',
+        'event_notification_read',
         'gforms_category',
         'gforms_field_mapping',
-        'gforms_submission'
+        'gforms_submission',
+        'gforms_answer',
+        'activity_log_rollup'
     ]
     
     try:
@@ -87,7 +90,7 @@ def fix_sequences_logic(db, app):
 class DateTimeEncoder(json.JSONEncoder):
     """Client JSONEncoder pour gérer les objets datetime."""
     def default(self, obj):
-        if isinstance(obj, datetime):
+        if isinstance(obj, (datetime, date)):
             return obj.isoformat()
         return super().default(obj)
 
@@ -102,6 +105,9 @@ def serialize_model(instance):
     data = {}
     for column in instance.__table__.columns:
         value = getattr(instance, column.name)
+        # Colonnes JSON : export sous forme de texte, comme en base
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value)
         data[column.name] = value
     return data
 
@@ -133,6 +139,10 @@ def update_instance_from_dict(instance, data, model):
                     if isinstance(value, str):
                         value = datetime.fromisoformat(value)
                         
+                elif python_type is date:
+                    if isinstance(value, str):
+                        value = date.fromisoformat(value)
+                        
                 elif python_type is int:
                     if isinstance(value, str):
                         value = int(value)
@@ -152,7 +162,9 @@ def update_instance_from_dict(instance, data, model):
 def export_model_to_csv(model, dir_path, filename):
     """Exporte un modèle vers un fichier CSV."""
     import os
-    items = model.query.all()
+    from constants import DefaultValues
+    # Lecture par lots (curseur serveur sous PostgreSQL)
+    items = model.query.yield_per(DefaultValues.EXPORT_BATCH_SIZE)
     file_path = os.path.join(dir_path, filename)
     
     with open(file_path, 'w', newline='', encoding='utf-8') as f:
@@ -164,8 +176,10 @@ def export_model_to_csv(model, dir_path, filename):
             row = []
             for col in columns:
                 val = getattr(item, col)
-                if isinstance(val, datetime):
+                if isinstance(val, (datetime, date)):
                     val = val.isoformat()
+                elif isinstance(val, (dict, list)):
+                    val = json.dumps(val)
                 row.append(val)
             writer.writerow(row)
             
@@ -221,27 +235,35 @@ def export_data(args):
     from models import (User, Event, Participant, Role, EventLink,
                         PasswordResetToken, AccountValidationToken,
                         ActivityLog, CastingProposal, CastingAssignment, FormResponse,
-                        EventNotification, GFormsCategory, GFormsFieldMapping, GFormsSubmission)
+                        EventNotification, GFormsCategory, GFormsFieldMapping, GFormsSubmission,
+                        ActivityLogRollup, EventNotificationRead)
+    from constants import DefaultValues
+
+    def serialize_all(model):
+        # Lecture par lots (curseur serveur sous PostgreSQL)
+        return [serialize_model(i) for i in model.query.yield_per(DefaultValues.EXPORT_BATCH_SIZE)]
     
     app = create_app()
     with app.app_context():
         data = {
             'timestamp': datetime.now().isoformat(),
-            'users': [serialize_model(i) for i in User.query.all()],
-            'events': [serialize_model(i) for i in Event.query.all()],
-            'event_links': [serialize_model(i) for i in EventLink.query.all()],
-            'roles': [serialize_model(i) for i in Role.query.all()],
-            'participants': [serialize_model(i) for i in Participant.query.all()],
-            'password_reset_tokens': [serialize_model(i) for i in PasswordResetToken.query.all()],
-            'account_validation_tokens': [serialize_model(i) for i in AccountValidationToken.query.all()],
-            'activity_logs': [serialize_model(i) for i in ActivityLog.query.all()],
-            'casting_proposals': [serialize_model(i) for i in CastingProposal.query.all()],
-            'casting_assignments': [serialize_model(i) for i in CastingAssignment.query.all()],
-            'form_responses': [serialize_model(i) for i in FormResponse.query.all()],
-            'event_notifications': [serialize_model(i) for i in EventNotification.query.all()],
-            'gforms_categories': [serialize_model(i) for i in GFormsCategory.query.all()],
-            'gforms_field_mappings': [serialize_model(i) for i in GFormsFieldMapping.query.all()],
-            'gforms_submissions': [serialize_model(i) for i in GFormsSubmission.query.all()]
+            'users': serialize_all(User),
+            'events': serialize_all(Event),
+            'event_links': serialize_all(EventLink),
+            'roles': serialize_all(Role),
+            'participants': serialize_all(Participant),
+            'password_reset_tokens': serialize_all(PasswordResetToken),
+            'account_validation_tokens': serialize_all(AccountValidationToken),
+            'activity_logs': serialize_all(ActivityLog),
+            'activity_log_rollups': serialize_all(ActivityLogRollup),
+            'casting_proposals': serialize_all(CastingProposal),
+            'casting_assignments': serialize_all(CastingAssignment),
+            'form_responses': serialize_all(FormResponse),
+            'event_notifications': serialize_all(EventNotification),
+            'event_notification_reads': serialize_all(EventNotificationRead),
+            'gforms_categories': serialize_all(GFormsCategory),
+            'gforms_field_mappings': serialize_all(GFormsFieldMapping),
+            'gforms_submissions': serialize_all(GFormsSubmission)
         }
         
     with open(file_path, 'w', encoding='utf-8') as f:
@@ -268,7 +290,8 @@ def import_data(args):
     from models import (db, User, Event, Participant, Role, EventLink,
                         PasswordResetToken, AccountValidationToken,
                         ActivityLog, CastingProposal, CastingAssignment, FormResponse,
-                        EventNotification, GFormsCategory, GFormsFieldMapping, GFormsSubmission)
+                        EventNotification, GFormsCategory, GFormsFieldMapping, GFormsSubmission,
+                        ActivityLogRollup, EventNotificationRead)
     
     app = create_app()
     with app.app_context():
@@ -286,10 +309,12 @@ def import_data(args):
             ('password_reset_tokens', PasswordResetToken),
             ('account_validation_tokens', AccountValidationToken),
             ('activity_logs', ActivityLog),
+            ('activity_log_rollups', ActivityLogRollup),
             ('casting_proposals', CastingProposal),
             ('casting_assignments', CastingAssignment),
             ('form_responses', FormResponse),
             ('event_notifications', EventNotification),
+            ('event_notification_reads', EventNotificationRead),
             ('gforms_categories', GFormsCategory),
             ('gforms_field_mappings', GFormsFieldMapping),
             ('gforms_submissions', GFormsSubmission)
@@ -329,6 +354,7 @@ def import_data(args):
         db.session.commit()
         
         fix_sequences_logic(db, app)
+        rebuild_derived_data(db)
         
     logger.info("Import JSON terminé avec succès.")
 
@@ -343,7 +369,8 @@ def export_data_csv(args):
     from models import (User, Event, Participant, Role, EventLink,
                         PasswordResetToken, AccountValidationToken,
                         ActivityLog, CastingProposal, CastingAssignment, FormResponse,
-                        EventNotification, GFormsCategory, GFormsFieldMapping, GFormsSubmission)
+                        EventNotification, GFormsCategory, GFormsFieldMapping, GFormsSubmission,
+                        ActivityLogRollup, EventNotificationRead)
     
     app = create_app()
     with app.app_context():
@@ -355,6 +382,7 @@ def export_data_csv(args):
         export_model_to_csv(PasswordResetToken, dir_path, 'tokens_reset.csv')
         export_model_to_csv(AccountValidationToken, dir_path, 'tokens_validation.csv')
         export_model_to_csv(ActivityLog, dir_path, 'activity_logs.csv')
+        export_model_to_csv(ActivityLogRollup, dir_path, 'activity_log_rollups.csv')
         export_model_to_csv(CastingProposal, dir_path, 'casting_proposals.csv')
         export_model_to_csv(CastingAssignment, dir_path, 'casting_assignments.csv')
         export_model_to_csv(FormResponse, dir_path, 'form_responses.csv')
@@ -362,6 +390,7 @@ def export_data_csv(args):
         export_model_to_csv(GFormsFieldMapping, dir_path, 'gforms_field_mappings.csv')
         export_model_to_csv(GFormsSubmission, dir_path, 'gforms_submissions.csv')
         export_model_to_csv(EventNotification, dir_path, 'event_notifications.csv')
+        export_model_to_csv(EventNotificationRead, dir_path, 'event_notification_reads.csv')
         
     logger.info("Export CSV terminé.")
 
@@ -380,7 +409,8 @@ def import_data_csv(args):
     from models import (db, User, Event, Participant, Role, EventLink,
                         PasswordResetToken, AccountValidationToken,
                         ActivityLog, CastingProposal, CastingAssignment, FormResponse,
-                        GFormsCategory, GFormsFieldMapping, GFormsSubmission)
+                        GFormsCategory, GFormsFieldMapping, GFormsSubmission,
+                        ActivityLogRollup, EventNotificationRead)
     
     app = create_app()
     with app.app_context():
@@ -418,6 +448,7 @@ def import_data_csv(args):
         import_model_from_csv(PasswordResetToken, dir_path, 'tokens_reset.csv', db)
         import_model_from_csv(AccountValidationToken, dir_path, 'tokens_validation.csv', db)
         import_model_from_csv(ActivityLog, dir_path, 'activity_logs.csv', db)
+        import_model_from_csv(ActivityLogRollup, dir_path, 'activity_log_rollups.csv', db)
         import_model_from_csv(CastingProposal, dir_path, 'casting_proposals.csv', db)
         import_model_from_csv(CastingAssignment, dir_path, 'casting_assignments.csv', db)
         import_model_from_csv(FormResponse, dir_path, 'form_responses.csv', db)
@@ -425,12 +456,100 @@ def import_data_csv(args):
         import_model_from_csv(GFormsFieldMapping, dir_path, 'gforms_field_mappings.csv', db)
         import_model_from_csv(GFormsSubmission, dir_path, 'gforms_submissions.csv', db)
         import_model_from_csv(EventNotification, dir_path, 'event_notifications.csv', db)
+        import_model_from_csv(EventNotificationRead, dir_path, 'event_notification_reads.csv', db)
         
         fix_sequences_logic(db, app)
+        rebuild_derived_data(db)
 
     logger.info("Import CSV terminé.")
 
 
+def rebuild_derived_data(db, event_ids=None):
+    """
+    Reconstruit les données dérivées : compteurs de participants, réponses
+    GForms normalisées et, sans filtre d'événement, l'index de recherche.
+    """
+    from services.participant_counter_service import recount_event_counters
+    from services.gforms_answer_service import rebuild_gforms_answers
+    from services.search_service import rebuild_search_index
+    try:
+        rows = recount_event_counters(event_ids)
+        answers = rebuild_gforms_answers(event_ids)
+        documents = rebuild_search_index() if event_ids is None else None
+        db.session.commit()
+        logger.info(f"  - Compteurs de participants reconstruits ({rows} lignes).")
+        logger.info(f"  - Réponses GForms normalisées reconstruites ({answers} écrites).")
+        if documents is not None:
+            logger.info(f"  - Index de recherche reconstruit ({documents} documents).")
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Erreur lors de la reconstruction des données dérivées: {e}")
+        sys.exit(1)
+
+
+def recount(args):
+    """Recalcule les données dérivées (compteurs, réponses GForms, index de recherche) après dérive."""
+    from app import create_app
+    from models import db
+    
+    app = create_app()
+    with app.app_context():
+        event_ids = [args.event_id] if args.event_id else None
+        rebuild_derived_data(db, event_ids)
+    logger.info("Recomptage terminé.")
+
+
+def archive_logs(args):
+    """Archive les logs d'activité anciens dans des fichiers mensuels compressés."""
+    from app import create_app
+    from models import db
+    from services.activity_log_archive_service import archive_activity_logs
+    
+    app = create_app()
+    with app.app_context():
+        days = args.days if args.days is not None else app.config['ACTIVITY_LOG_RETENTION_DAYS']
+        archive_dir = args.dir or app.config['ACTIVITY_LOG_ARCHIVE_DIR']
+        logger.info(f"Archivage des logs de plus de {days} jours vers {archive_dir}...")
+        try:
+            result = archive_activity_logs(archive_dir, days)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Erreur lors de l'archivage des logs: {e}")
+            sys.exit(1)
+        
+        # SQLite : ramener le WAL à zéro après les suppressions
+        if 'sqlite' in app.config['SQLALCHEMY_DATABASE_URI']:
+            from sqlalchemy import text
+            db.session.execute(text('PRAGMA wal_checkpoint(TRUNCATE)'))
+        
+        months = ', '.join(result['months']) or 'aucun'
+        logger.info(f"  - {result['archived']} logs archivés (mois : {months}).")
+    logger.info("Archivage terminé.")
+
+
+def delete_event(args):
+    """Supprime un événement et toutes ses données par lots (reprend une suppression interrompue)."""
+    from app import create_app
+    from models import db
+    from services.event_deletion_service import delete_event_data
+    
+    app = create_app()
+    with app.app_context():
+        logger.info(f"Suppression de l'événement {args.id} par lots de {args.batch_size}...")
+        try:
+            stats = delete_event_data(
+                args.id, batch_size=args.batch_size,
+                progress=lambda step, total: logger.info(f"  - {step} : {total} lignes")
+            )
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Erreur lors de la suppression de l'événement: {e}")
+            sys.exit(1)
+        if not stats['event']:
+            logger.warning(f"  - Événement {args.id} introuvable (données restantes nettoyées).")
+    logger.info("Suppression terminée.")
+
+
 def disconnect_circular_dependencies(db):
     """Rompt les liens circulaires pour permettre la suppression propre."""
     from models import Role, Participant
@@ -452,22 +571,27 @@ def clean_database(db):
     from models import (User, Event, Participant, Role, EventLink,
                         PasswordResetToken, AccountValidationToken,
                         ActivityLog, CastingProposal, CastingAssignment, FormResponse,
-                        EventNotification, GFormsCategory, GFormsFieldMapping, GFormsSubmission)
+                        EventNotification, GFormsCategory, GFormsFieldMapping, GFormsSubmission,
+                        EventParticipantCount, GFormsAnswer, ActivityLogRollup, EventNotificationRead)
                         
     logger.info("Nettoyage complet de la base...")
     try:
         disconnect_circular_dependencies(db)
         
+        db.session.query(EventNotificationRead).delete()
         db.session.query(EventNotification).delete()
+        db.session.query(GFormsAnswer).delete()
         db.session.query(GFormsSubmission).delete()
         db.session.query(GFormsFieldMapping).delete()
         db.session.query(GFormsCategory).delete()
         db.session.query(CastingAssignment).delete()
         db.session.query(CastingProposal).delete()
         db.session.query(ActivityLog).delete()
+        db.session.query(ActivityLogRollup).delete()
         db.session.query(AccountValidationToken).delete()
         db.session.query(PasswordResetToken).delete()
         db.session.query(FormResponse).delete() 
+        db.session.query(EventParticipantCount).delete()
         db.session.query(Participant).delete()
         db.session.query(Role).delete()
         db.session.query(EventLink).delete()
@@ -530,20 +654,25 @@ def reset_db(args):
             from models import (CastingAssignment, CastingProposal, ActivityLog, 
                               AccountValidationToken, PasswordResetToken, Participant, 
                               Role, Event, EventLink, FormResponse, EventNotification,
-                              GFormsCategory, GFormsFieldMapping, GFormsSubmission)
+                              GFormsCategory, GFormsFieldMapping, GFormsSubmission,
+                              EventParticipantCount, GFormsAnswer, ActivityLogRollup, EventNotificationRead)
                               
             disconnect_circular_dependencies(db)
 
+            db.session.query(EventNotificationRead).delete()
             db.session.query(EventNotification).delete()
+            db.session.query(GFormsAnswer).delete()
             db.session.query(GFormsSubmission).delete()
             db.session.query(GFormsFieldMapping).delete()
             db.session.query(GFormsCategory).delete()
             db.session.query(CastingAssignment).delete()
             db.session.query(CastingProposal).delete()
             db.session.query(ActivityLog).delete()
+            db.session.query(ActivityLogRollup).delete()
             db.session.query(AccountValidationToken).delete()
             db.session.query(PasswordResetToken).delete()
             db.session.query(FormResponse).delete()
+            db.session.query(EventParticipantCount).delete()
             db.session.query(Participant).delete()
             db.session.query(Role).delete()
             db.session.query(EventLink).delete()
@@ -580,6 +709,23 @@ def main():
     rst.add_argument('--keep-email', required=True, help='Email admin à garder')
     rst.set_defaults(func=reset_db)
     
+    # Recount
+    rcn = subparsers.add_parser('recount', help='Recalculer les compteurs de participants, les réponses GForms et l\'index de recherche')
+    rcn.add_argument('--event-id', type=int, help='Limiter à un événement')
+    rcn.set_defaults(func=recount)
+    
+    # Archive logs
+    arc = subparsers.add_parser('archive-logs', help="Archiver les logs d'activité anciens (JSONL.gz mensuels)")
+    arc.add_argument('--days', type=int, help='Durée de rétention en jours (défaut : ACTIVITY_LOG_RETENTION_DAYS)')
+    arc.add_argument('--dir', help="Dossier d'archives (défaut : ACTIVITY_LOG_ARCHIVE_DIR)")
+    arc.set_defaults(func=archive_logs)
+    
+    # Delete event
+    dle = subparsers.add_parser('delete-event', help='Supprimer un événement et ses données par lots')
+    dle.add_argument('--id', type=int, required=True, help="ID de l'événement")
+    dle.add_argument('--batch-size', type=int, default=500, help='Lignes supprimées par transaction (défaut : 500)')
+    dle.set_defaults(func=delete_event)
+    
     args = parser.parse_args()
     
     if args.command == 'export':
@@ -0,0 +1,52 @@
+"""Backfill activity_log.created_at and make it NOT NULL
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3b4c5d6e7f8'
+down_revision = 'f2a3b4c5d6e7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Helper to check existence
+    conn = op.get_bind()
+    from sqlalchemy.engine.reflection import Inspector
+    inspector = Inspector.from_engine(conn)
+    if 'activity_log' not in inspector.get_table_names():
+        return
+
+    columns = {c['name']: c for c in inspector.get_columns('activity_log')}
+    if not columns['created_at']['nullable']:
+        return
+
+    # Une ligne sans date reprend celle de la ligne précédente (ordre des ID),
+    # à défaut la plus ancienne du journal, à défaut maintenant : elle garde
+    # sa place dans la pagination par curseur (created_at, id)
+    op.execute("""
+        UPDATE activity_log
+        SET created_at = COALESCE(
+            (SELECT MAX(previous.created_at) FROM activity_log AS previous
+             WHERE previous.id < activity_log.id AND previous.created_at IS NOT NULL),
+            (SELECT MIN(dated.created_at) FROM activity_log AS dated
+             WHERE dated.created_at IS NOT NULL),
+            CURRENT_TIMESTAMP
+        )
+        WHERE created_at IS NULL
+    """)
+
+    with op.batch_alter_table('activity_log', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('activity_log', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=True)
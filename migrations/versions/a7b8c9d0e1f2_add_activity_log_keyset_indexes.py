@@ -0,0 +1,50 @@
+"""Add activity_log keyset pagination indexes
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7b8c9d0e1f2'
+down_revision = 'f6a7b8c9d0e1'
+branch_labels = None
+depends_on = None
+
+
+# (nom de l'index, colonnes)
+INDEXES = [
+    ('idx_activity_log_action_created', ['action_type', 'created_at', 'id']),
+    ('idx_activity_log_event_created', ['event_id', 'created_at', 'id']),
+    ('idx_activity_log_user_created', ['user_id', 'created_at', 'id']),
+]
+
+
+def upgrade():
+    # Helper to check existence
+    conn = op.get_bind()
+    from sqlalchemy.engine.reflection import Inspector
+    inspector = Inspector.from_engine(conn)
+    if 'activity_log' not in inspector.get_table_names():
+        return
+
+    existing = [i['name'] for i in inspector.get_indexes('activity_log')]
+    for name, columns in INDEXES:
+        if name not in existing:
+            op.create_index(name, 'activity_log', columns, unique=False)
+
+    # Index partiel des logs non consultés ("marquer comme vu")
+    if 'idx_activity_log_unviewed' not in existing:
+        op.create_index('idx_activity_log_unviewed', 'activity_log', ['id'], unique=False,
+                        sqlite_where=sa.text('is_viewed = 0'),
+                        postgresql_where=sa.text('NOT is_viewed'))
+
+
+def downgrade():
+    op.drop_index('idx_activity_log_unviewed', table_name='activity_log')
+    for name, columns in reversed(INDEXES):
+        op.drop_index(name, table_name='activity_log')
@@ -0,0 +1,59 @@
+"""Add event_participant_count materialized counters
+
+Revision ID: b2c3d4e5f6a7
+Revises: aa0e1450a788
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2c3d4e5f6a7'
+down_revision = 'aa0e1450a788'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Helper to check existence
+    conn = op.get_bind()
+    from sqlalchemy.engine.reflection import Inspector
+    inspector = Inspector.from_engine(conn)
+    tables = inspector.get_table_names()
+
+    # 1. Create event_participant_count table
+    if 'event_participant_count' not in tables:
+        op.create_table('event_participant_count',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('event_id', sa.Integer(), nullable=False),
+            sa.Column('type', sa.String(length=50), nullable=False),
+            sa.Column('registration_status', sa.String(length=50), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['event_id'], ['event.id'], ),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('event_id', 'type', 'registration_status', name='uq_event_participant_count')
+        )
+
+    # 2. Backfill depuis les participants existants (types legacy normalisés)
+    op.execute("DELETE FROM event_participant_count")
+    op.execute("""
+        INSERT INTO event_participant_count (event_id, type, registration_status, count)
+        SELECT event_id, canonical_type, COALESCE(registration_status, ''), COUNT(*)
+        FROM (
+            SELECT event_id, registration_status,
+                   CASE lower(type)
+                       WHEN 'organisateur' THEN 'Organisateur'
+                       WHEN 'pj' THEN 'PJ'
+                       WHEN 'pnj' THEN 'PNJ'
+                       ELSE COALESCE(type, '')
+                   END AS canonical_type
+            FROM participant
+        ) AS p
+        GROUP BY event_id, canonical_type, COALESCE(registration_status, '')
+    """)
+
+
+def downgrade():
+    op.drop_table('event_participant_count')
@@ -0,0 +1,34 @@
+"""Add is_deleting flag to Event
+
+Revision ID: b4c5d6e7f8a9
+Revises: a3b4c5d6e7f8
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4c5d6e7f8a9'
+down_revision = 'a3b4c5d6e7f8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Helper to check existing columns
+    conn = op.get_bind()
+    from sqlalchemy.engine.reflection import Inspector
+    inspector = Inspector.from_engine(conn)
+    columns = [c['name'] for c in inspector.get_columns('event')]
+
+    if 'is_deleting' not in columns:
+        with op.batch_alter_table('event', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('is_deleting', sa.Boolean(), nullable=False,
+                                          server_default=sa.false()))
+
+
+def downgrade():
+    with op.batch_alter_table('event', schema=None) as batch_op:
+        batch_op.drop_column('is_deleting')
@@ -0,0 +1,38 @@
+"""Add activity_log_rollup table
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8c9d0e1f2a3'
+down_revision = 'a7b8c9d0e1f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Helper to check existence
+    conn = op.get_bind()
+    from sqlalchemy.engine.reflection import Inspector
+    inspector = Inspector.from_engine(conn)
+    tables = inspector.get_table_names()
+
+    if 'activity_log_rollup' not in tables:
+        op.create_table('activity_log_rollup',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('day', sa.Date(), nullable=False),
+            sa.Column('action_type', sa.String(length=50), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('day', 'action_type', name='uq_activity_log_rollup_day_type')
+        )
+
+
+def downgrade():
+    op.drop_table('activity_log_rollup')
@@ -0,0 +1,67 @@
+"""Canonicalize participant type/status and add composite index
+
+Revision ID: c3d4e5f6a7b8
+Revises: b2c3d4e5f6a7
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3d4e5f6a7b8'
+down_revision = 'b2c3d4e5f6a7'
+branch_labels = None
+depends_on = None
+
+
+CANONICAL_TYPES = ('Organisateur', 'PJ', 'PNJ')
+CANONICAL_STATUSES = ('À valider', 'En attente', 'Validé', 'Rejeté')
+
+
+def upgrade():
+    # Helper to check existence
+    conn = op.get_bind()
+    from sqlalchemy.engine.reflection import Inspector
+    inspector = Inspector.from_engine(conn)
+
+    # 1. Normaliser les valeurs legacy (casse) vers les valeurs canoniques.
+    # lower() de SQLite ne gère que l'ASCII : les statuts accentués sont
+    # donc comparés en Python.
+    participant = sa.table('participant',
+        sa.column('id', sa.Integer),
+        sa.column('type', sa.String),
+        sa.column('registration_status', sa.String)
+    )
+    types_by_lower = {v.lower(): v for v in CANONICAL_TYPES}
+    statuses_by_lower = {v.lower(): v for v in CANONICAL_STATUSES}
+
+    for column, mapping in (('type', types_by_lower), ('registration_status', statuses_by_lower)):
+        col = participant.c[column]
+        distinct_values = [row[0] for row in conn.execute(sa.select(col).distinct()) if row[0]]
+        for value in distinct_values:
+            canonical = mapping.get(value.lower())
+            if canonical and canonical != value:
+                conn.execute(participant.update().where(col == value).values({column: canonical}))
+
+    # 2. Index composite (event_id, type, registration_status)
+    indexes = [i['name'] for i in inspector.get_indexes('participant')]
+    if 'idx_participant_event_type_status' not in indexes:
+        op.create_index('idx_participant_event_type_status', 'participant',
+                        ['event_id', 'type', 'registration_status'], unique=False)
+
+    # 3. Les compteurs matérialisés suivent les valeurs canoniques
+    tables = inspector.get_table_names()
+    if 'event_participant_count' in tables:
+        op.execute("DELETE FROM event_participant_count")
+        op.execute("""
+            INSERT INTO event_participant_count (event_id, type, registration_status, count)
+            SELECT event_id, COALESCE(type, ''), COALESCE(registration_status, ''), COUNT(*)
+            FROM participant
+            GROUP BY event_id, COALESCE(type, ''), COALESCE(registration_status, '')
+        """)
+
+
+def downgrade():
+    op.drop_index('idx_participant_event_type_status', table_name='participant')
@@ -0,0 +1,61 @@
+"""Never reuse event_notification ids (SQLite AUTOINCREMENT)
+
+Revision ID: c5d6e7f8a9b0
+Revises: b4c5d6e7f8a9
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d6e7f8a9b0'
+down_revision = 'b4c5d6e7f8a9'
+branch_labels = None
+depends_on = None
+
+
+def _table_sql(conn):
+    return conn.execute(sa.text(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'event_notification'"
+    )).scalar() or ''
+
+
+def upgrade():
+    # Helper to check existence
+    conn = op.get_bind()
+    from sqlalchemy.engine.reflection import Inspector
+    inspector = Inspector.from_engine(conn)
+    # PostgreSQL : les séquences ne réattribuent jamais un ID
+    if conn.dialect.name != 'sqlite' or 'event_notification' not in inspector.get_table_names():
+        return
+    if 'AUTOINCREMENT' in _table_sql(conn).upper():
+        return
+
+    with op.batch_alter_table('event_notification', recreate='always',
+                              table_kwargs={'sqlite_autoincrement': True}) as batch_op:
+        pass
+
+    # Les curseurs de lecture peuvent pointer au-delà de la plus grande notification
+    # restante (dernières notifications supprimées) : la séquence repart après eux
+    if 'event_notification_read' in inspector.get_table_names():
+        op.execute("""
+            INSERT INTO sqlite_sequence (name, seq)
+            SELECT 'event_notification', 0
+            WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'event_notification')
+        """)
+        op.execute("""
+            UPDATE sqlite_sequence
+            SET seq = MAX(seq, COALESCE((SELECT MAX(last_read_id) FROM event_notification_read), 0))
+            WHERE name = 'event_notification'
+        """)
+
+
+def downgrade():
+    conn = op.get_bind()
+    if conn.dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table('event_notification', recreate='always',
+                              table_kwargs={'sqlite_autoincrement': False}) as batch_op:
+        pass
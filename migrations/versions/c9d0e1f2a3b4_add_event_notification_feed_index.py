@@ -0,0 +1,35 @@
+"""Add event_notification feed index
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9d0e1f2a3b4'
+down_revision = 'b8c9d0e1f2a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Helper to check existence
+    conn = op.get_bind()
+    from sqlalchemy.engine.reflection import Inspector
+    inspector = Inspector.from_engine(conn)
+    if 'event_notification' not in inspector.get_table_names():
+        return
+
+    existing = [i['name'] for i in inspector.get_indexes('event_notification')]
+    # Fil de notifications paginé par curseur sur l'ID
+    if 'idx_event_notification_event_id' not in existing:
+        op.create_index('idx_event_notification_event_id', 'event_notification',
+                        ['event_id', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('idx_event_notification_event_id', table_name='event_notification')
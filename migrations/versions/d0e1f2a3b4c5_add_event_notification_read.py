@@ -0,0 +1,91 @@
+"""Add per-user event_notification_read watermarks
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import json
+from datetime import datetime
+
+
+# revision identifiers, used by Alembic.
+revision = 'd0e1f2a3b4c5'
+down_revision = 'c9d0e1f2a3b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Helper to check existence
+    conn = op.get_bind()
+    from sqlalchemy.engine.reflection import Inspector
+    inspector = Inspector.from_engine(conn)
+    tables = inspector.get_table_names()
+
+    # 1. Create event_notification_read table
+    if 'event_notification_read' not in tables:
+        op.create_table('event_notification_read',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('event_id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('last_read_id', sa.Integer(), nullable=False),
+            sa.Column('read_ids', sa.Text(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['event_id'], ['event.id'], ),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('event_id', 'user_id', name='uq_event_notification_read_event_user')
+        )
+
+    if 'event_notification' not in tables:
+        return
+
+    # 2. L'index sur is_read ne sert plus : le drapeau global n'est plus écrit
+    existing = [i['name'] for i in inspector.get_indexes('event_notification')]
+    if 'idx_event_notification_event_read_created' in existing:
+        op.drop_index('idx_event_notification_event_read_created', table_name='event_notification')
+
+    # 3. Backfill : le drapeau global devient le curseur de chaque organisateur
+    notification = sa.table('event_notification',
+        sa.column('id', sa.Integer), sa.column('event_id', sa.Integer), sa.column('is_read', sa.Boolean))
+    participant = sa.table('participant',
+        sa.column('event_id', sa.Integer), sa.column('user_id', sa.Integer), sa.column('type', sa.String))
+    read_state = sa.table('event_notification_read',
+        sa.column('event_id', sa.Integer), sa.column('user_id', sa.Integer),
+        sa.column('last_read_id', sa.Integer), sa.column('read_ids', sa.Text),
+        sa.column('updated_at', sa.DateTime))
+
+    conn.execute(read_state.delete())
+    unread = sa.or_(notification.c.is_read.is_(None), notification.c.is_read == sa.false())
+    now = datetime.utcnow()
+    rows = []
+    for event_id, max_id in conn.execute(
+            sa.select(notification.c.event_id, sa.func.max(notification.c.id))
+            .group_by(notification.c.event_id)).fetchall():
+        first_unread = conn.execute(sa.select(sa.func.min(notification.c.id)).where(
+            notification.c.event_id == event_id, unread)).scalar()
+        if first_unread is None:
+            last_read_id, read_ids = max_id, []
+        else:
+            last_read_id = first_unread - 1
+            read_ids = [r[0] for r in conn.execute(sa.select(notification.c.id).where(
+                notification.c.event_id == event_id, notification.c.id > last_read_id,
+                notification.c.is_read == sa.true()).order_by(notification.c.id))]
+
+        organizers = conn.execute(sa.select(participant.c.user_id).where(
+            participant.c.event_id == event_id, participant.c.type == 'Organisateur')).fetchall()
+        for (user_id,) in organizers:
+            rows.append({'event_id': event_id, 'user_id': user_id, 'last_read_id': last_read_id,
+                         'read_ids': json.dumps(read_ids), 'updated_at': now})
+
+    if rows:
+        op.bulk_insert(read_state, rows)
+
+
+def downgrade():
+    op.drop_table('event_notification_read')
+    op.create_index('idx_event_notification_event_read_created', 'event_notification',
+                    ['event_id', 'is_read', 'created_at'], unique=False)
@@ -0,0 +1,48 @@
+"""Add indexes for hot queries
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4e5f6a7b8c9'
+down_revision = 'c3d4e5f6a7b8'
+branch_labels = None
+depends_on = None
+
+
+# (nom de l'index, table, colonnes)
+INDEXES = [
+    ('idx_event_date_start', 'event', ['date_start']),
+    ('idx_role_event_group_name', 'role', ['event_id', 'group', 'name']),
+    ('idx_activity_log_created_at', 'activity_log', ['created_at']),
+    ('idx_casting_proposal_event_position', 'casting_proposal', ['event_id', 'position']),
+    ('idx_form_response_event', 'form_response', ['event_id']),
+    ('idx_event_notification_event_read_created', 'event_notification', ['event_id', 'is_read', 'created_at']),
+    ('idx_gforms_submission_form_response', 'gforms_submission', ['form_response_id']),
+]
+
+
+def upgrade():
+    # Helper to check existence
+    conn = op.get_bind()
+    from sqlalchemy.engine.reflection import Inspector
+    inspector = Inspector.from_engine(conn)
+    tables = inspector.get_table_names()
+
+    for name, table, columns in INDEXES:
+        if table not in tables:
+            continue
+        existing = [i['name'] for i in inspector.get_indexes(table)]
+        if name not in existing:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,50 @@
+"""Add partial indexes on active users
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1f2a3b4c5d6'
+down_revision = 'd0e1f2a3b4c5'
+branch_labels = None
+depends_on = None
+
+
+# (nom de l'index, colonnes)
+INDEXES = [
+    ('idx_user_active', ['id']),
+    ('idx_user_active_name', ['nom', 'prenom', 'id']),
+]
+
+
+def upgrade():
+    # Helper to check existence
+    conn = op.get_bind()
+    from sqlalchemy.engine.reflection import Inspector
+    inspector = Inspector.from_engine(conn)
+    if 'user' not in inspector.get_table_names():
+        return
+
+    # Les comptes antérieurs aux colonnes peuvent avoir NULL : ils doivent
+    # correspondre au filtre des index partiels
+    user = sa.table('user', sa.column('is_banned', sa.Boolean), sa.column('is_deleted', sa.Boolean))
+    op.execute(user.update().where(user.c.is_banned.is_(None)).values(is_banned=False))
+    op.execute(user.update().where(user.c.is_deleted.is_(None)).values(is_deleted=False))
+
+    existing = [i['name'] for i in inspector.get_indexes('user')]
+    for name, columns in INDEXES:
+        if name not in existing:
+            op.create_index(name, 'user', columns, unique=False,
+                            sqlite_where=sa.text('is_deleted = 0 AND is_banned = 0'),
+                            postgresql_where=sa.text('NOT is_deleted AND NOT is_banned'))
+
+
+def downgrade():
+    for name, columns in reversed(INDEXES):
+        op.drop_index(name, table_name='user')
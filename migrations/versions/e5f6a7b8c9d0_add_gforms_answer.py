@@ -0,0 +1,92 @@
+"""Add normalized gforms_answer table
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import json
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5f6a7b8c9d0'
+down_revision = 'd4e5f6a7b8c9'
+branch_labels = None
+depends_on = None
+
+
+def _encode(value):
+    """Même encodage que services.gforms_answer_service.encode_answer_value."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return ', '.join('' if v is None else str(v) for v in value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def upgrade():
+    # Helper to check existence
+    conn = op.get_bind()
+    from sqlalchemy.engine.reflection import Inspector
+    inspector = Inspector.from_engine(conn)
+    tables = inspector.get_table_names()
+
+    # 1. Create gforms_answer table
+    if 'gforms_answer' not in tables:
+        op.create_table('gforms_answer',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('submission_id', sa.Integer(), nullable=False),
+            sa.Column('field_mapping_id', sa.Integer(), nullable=False),
+            sa.Column('value', sa.Text(), nullable=False),
+            sa.ForeignKeyConstraint(['submission_id'], ['gforms_submission.id'], ),
+            sa.ForeignKeyConstraint(['field_mapping_id'], ['gforms_field_mapping.id'], ),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('submission_id', 'field_mapping_id', name='uq_gforms_answer_submission_field')
+        )
+        op.create_index('idx_gforms_answer_field_value', 'gforms_answer', ['field_mapping_id', 'value'], unique=False)
+
+    # 2. Backfill depuis raw_data (mappings manquants créés sans catégorie)
+    submission = sa.table('gforms_submission',
+        sa.column('id', sa.Integer), sa.column('event_id', sa.Integer), sa.column('raw_data', sa.Text))
+    mapping = sa.table('gforms_field_mapping',
+        sa.column('id', sa.Integer), sa.column('event_id', sa.Integer), sa.column('field_name', sa.String))
+    answer = sa.table('gforms_answer',
+        sa.column('submission_id', sa.Integer), sa.column('field_mapping_id', sa.Integer), sa.column('value', sa.Text))
+
+    mappings = {(event_id, name): mid for mid, event_id, name in
+                conn.execute(sa.select(mapping.c.id, mapping.c.event_id, mapping.c.field_name))}
+    conn.execute(answer.delete())
+
+    rows = []
+    for sub_id, event_id, raw in conn.execute(
+            sa.select(submission.c.id, submission.c.event_id, submission.c.raw_data)).fetchall():
+        try:
+            data = json.loads(raw) if raw else {}
+        except ValueError:
+            continue
+        if not isinstance(data, dict):
+            continue
+        for field_name, raw_value in data.items():
+            value = _encode(raw_value)
+            if value is None:
+                continue
+            key = (event_id, field_name)
+            if key not in mappings:
+                conn.execute(mapping.insert().values(event_id=event_id, field_name=field_name))
+                mappings[key] = conn.execute(sa.select(mapping.c.id).where(
+                    mapping.c.event_id == event_id, mapping.c.field_name == field_name)).scalar()
+            rows.append({'submission_id': sub_id, 'field_mapping_id': mappings[key], 'value': value})
+            if len(rows) >= 1000:
+                conn.execute(answer.insert(), rows)
+                rows = []
+    if rows:
+        conn.execute(answer.insert(), rows)
+
+
+def downgrade():
+    op.drop_index('idx_gforms_answer_field_value', table_name='gforms_answer')
+    op.drop_table('gforms_answer')
@@ -0,0 +1,156 @@
+"""Deduplicate participants and GForms submissions, add unique indexes
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import json
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a3b4c5d6e7'
+down_revision = 'e1f2a3b4c5d6'
+branch_labels = None
+depends_on = None
+
+
+def _duplicate_groups(conn, table, key_columns, where=None):
+    """Groupes de lignes partageant la clé : [[id, ...] par ID croissant]."""
+    keys = [table.c[name] for name in key_columns]
+    duplicates = sa.select(*keys).group_by(*keys).having(sa.func.count() > 1)
+    if where is not None:
+        duplicates = duplicates.where(where)
+    groups = []
+    for key in conn.execute(duplicates).all():
+        ids = conn.execute(
+            sa.select(table.c.id)
+            .where(*(column == value for column, value in zip(keys, key)))
+            .order_by(table.c.id)
+        ).scalars().all()
+        groups.append(ids)
+    return groups
+
+
+def _dedupe_participants(conn):
+    """Garde la plus ancienne participation et y rattache les références des doublons."""
+    participant = sa.table('participant',
+        sa.column('id', sa.Integer),
+        sa.column('event_id', sa.Integer),
+        sa.column('user_id', sa.Integer),
+        sa.column('role_id', sa.Integer)
+    )
+    role = sa.table('role', sa.column('assigned_participant_id', sa.Integer))
+    assignment = sa.table('casting_assignment', sa.column('participant_id', sa.Integer))
+
+    event_ids = set()
+    for kept_id, *duplicate_ids in _duplicate_groups(conn, participant, ['event_id', 'user_id']):
+        kept = conn.execute(sa.select(participant.c.event_id, participant.c.role_id)
+                            .where(participant.c.id == kept_id)).one()
+        event_ids.add(kept.event_id)
+        if kept.role_id is None:
+            role_id = conn.execute(
+                sa.select(participant.c.role_id)
+                .where(participant.c.id.in_(duplicate_ids), participant.c.role_id.isnot(None))
+                .order_by(participant.c.id)
+            ).scalar()
+            if role_id is not None:
+                conn.execute(participant.update().where(participant.c.id == kept_id).values(role_id=role_id))
+        conn.execute(role.update().where(role.c.assigned_participant_id.in_(duplicate_ids))
+                     .values(assigned_participant_id=kept_id))
+        conn.execute(assignment.update().where(assignment.c.participant_id.in_(duplicate_ids))
+                     .values(participant_id=kept_id))
+        conn.execute(participant.delete().where(participant.c.id.in_(duplicate_ids)))
+
+    # Compteurs matérialisés des événements touchés (types déjà canoniques)
+    if event_ids:
+        ids = ', '.join(str(int(event_id)) for event_id in sorted(event_ids))
+        op.execute(f"DELETE FROM event_participant_count WHERE event_id IN ({ids})")
+        op.execute(f"""
+            INSERT INTO event_participant_count (event_id, type, registration_status, count)
+            SELECT event_id, COALESCE(type, ''), COALESCE(registration_status, ''), COUNT(*)
+            FROM participant
+            WHERE event_id IN ({ids})
+            GROUP BY event_id, COALESCE(type, ''), COALESCE(registration_status, '')
+        """)
+
+
+def _dedupe_submissions(conn, tables):
+    """
+    Fusionne les soumissions d'un même email dans la plus récente : réponses
+    des plus anciennes complétées par les plus récentes, réponses normalisées
+    déplacées quand la soumission gardée n'a pas le champ.
+    """
+    submission = sa.table('gforms_submission',
+        sa.column('id', sa.Integer),
+        sa.column('event_id', sa.Integer),
+        sa.column('email', sa.String),
+        sa.column('user_id', sa.Integer),
+        sa.column('form_response_id', sa.Integer),
+        sa.column('raw_data', sa.Text)
+    )
+    answer = sa.table('gforms_answer',
+        sa.column('submission_id', sa.Integer),
+        sa.column('field_mapping_id', sa.Integer)
+    )
+
+    for ids in _duplicate_groups(conn, submission, ['event_id', 'email'], where=submission.c.email != ''):
+        *older_ids, kept_id = ids
+        rows = conn.execute(sa.select(submission).where(submission.c.id.in_(ids))
+                            .order_by(submission.c.id)).all()
+        merged = {}
+        user_id = form_response_id = None
+        for row in rows:
+            try:
+                data = json.loads(row.raw_data) if row.raw_data else {}
+            except (TypeError, ValueError):
+                data = {}
+            if isinstance(data, dict):
+                merged.update({key: value for key, value in data.items() if value is not None})
+            user_id = row.user_id or user_id
+            form_response_id = row.form_response_id or form_response_id
+        conn.execute(submission.update().where(submission.c.id == kept_id).values(
+            raw_data=json.dumps(merged), user_id=user_id, form_response_id=form_response_id))
+
+        if 'gforms_answer' in tables:
+            # Du plus récent au plus ancien : le premier qui a le champ le donne
+            for older_id in reversed(older_ids):
+                present = sa.select(answer.c.field_mapping_id).where(answer.c.submission_id == kept_id)
+                conn.execute(answer.update().where(
+                    answer.c.submission_id == older_id,
+                    answer.c.field_mapping_id.notin_(present)
+                ).values(submission_id=kept_id))
+            conn.execute(answer.delete().where(answer.c.submission_id.in_(older_ids)))
+        conn.execute(submission.delete().where(submission.c.id.in_(older_ids)))
+
+
+def upgrade():
+    # Helper to check existence
+    conn = op.get_bind()
+    from sqlalchemy.engine.reflection import Inspector
+    inspector = Inspector.from_engine(conn)
+    tables = inspector.get_table_names()
+
+    # 1. Participant : une participation par (event_id, user_id)
+    if 'participant' in tables:
+        indexes = [i['name'] for i in inspector.get_indexes('participant')]
+        if 'uq_participant_event_user' not in indexes:
+            _dedupe_participants(conn)
+            op.create_index('uq_participant_event_user', 'participant', ['event_id', 'user_id'], unique=True)
+
+    # 2. GFormsSubmission : une soumission par (event_id, email) non vide
+    if 'gforms_submission' in tables:
+        indexes = [i['name'] for i in inspector.get_indexes('gforms_submission')]
+        if 'uq_gforms_submission_event_email' not in indexes:
+            _dedupe_submissions(conn, tables)
+            op.create_index('uq_gforms_submission_event_email', 'gforms_submission', ['event_id', 'email'],
+                            unique=True,
+                            sqlite_where=sa.text("email <> ''"),
+                            postgresql_where=sa.text("email <> ''"))
+
+
+def downgrade():
+    op.drop_index('uq_gforms_submission_event_email', table_name='gforms_submission')
+    op.drop_index('uq_participant_event_user', table_name='participant')
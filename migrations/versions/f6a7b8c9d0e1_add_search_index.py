@@ -0,0 +1,97 @@
+"""Add FTS5 search_index with sync triggers
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6a7b8c9d0e1'
+down_revision = 'e5f6a7b8c9d0'
+branch_labels = None
+depends_on = None
+
+
+USER_CONTENT = "trim(coalesce({t}.prenom, '') || ' ' || coalesce({t}.nom, '') || ' ' || {t}.email)"
+PARTICIPANT_CONTENT = "trim(coalesce({t}.global_comment, '') || ' ' || coalesce({t}.info_payement, ''))"
+
+INSERT_USER = (
+    "INSERT INTO search_index(rowid, content, kind, ref_id, event_id) "
+    "SELECT {t}.id * 4 + 1, " + USER_CONTENT + ", 'user', {t}.id, NULL"
+)
+INSERT_PARTICIPANT = (
+    "INSERT INTO search_index(rowid, content, kind, ref_id, event_id) "
+    "SELECT {t}.id * 4 + 2, " + PARTICIPANT_CONTENT + ", 'participant', {t}.id, {t}.event_id"
+)
+INSERT_ANSWER = (
+    "INSERT INTO search_index(rowid, content, kind, ref_id, event_id) "
+    "SELECT {t}.id * 4 + 3, {t}.value, 'answer', {t}.id, "
+    "(SELECT event_id FROM gforms_submission WHERE id = {t}.submission_id)"
+)
+
+TRIGGERS = {
+    'search_user_ai': 'AFTER INSERT ON "user" BEGIN ' + INSERT_USER.format(t='new') + "; END",
+    'search_user_au': 'AFTER UPDATE OF nom, prenom, email ON "user" BEGIN '
+                      "DELETE FROM search_index WHERE rowid = old.id * 4 + 1; "
+                      + INSERT_USER.format(t='new') + "; END",
+    'search_user_ad': 'AFTER DELETE ON "user" BEGIN '
+                      "DELETE FROM search_index WHERE rowid = old.id * 4 + 1; END",
+    'search_participant_ai': "AFTER INSERT ON participant BEGIN "
+                             + INSERT_PARTICIPANT.format(t='new') + " WHERE "
+                             + PARTICIPANT_CONTENT.format(t='new') + " <> ''; END",
+    'search_participant_au': "AFTER UPDATE OF global_comment, info_payement, event_id ON participant BEGIN "
+                             "DELETE FROM search_index WHERE rowid = old.id * 4 + 2; "
+                             + INSERT_PARTICIPANT.format(t='new') + " WHERE "
+                             + PARTICIPANT_CONTENT.format(t='new') + " <> ''; END",
+    'search_participant_ad': "AFTER DELETE ON participant BEGIN "
+                             "DELETE FROM search_index WHERE rowid = old.id * 4 + 2; END",
+    'search_answer_ai': "AFTER INSERT ON gforms_answer BEGIN " + INSERT_ANSWER.format(t='new') + "; END",
+    'search_answer_au': "AFTER UPDATE OF value ON gforms_answer BEGIN "
+                        "DELETE FROM search_index WHERE rowid = old.id * 4 + 3; "
+                        + INSERT_ANSWER.format(t='new') + "; END",
+    'search_answer_ad': "AFTER DELETE ON gforms_answer BEGIN "
+                        "DELETE FROM search_index WHERE rowid = old.id * 4 + 3; END",
+}
+
+
+def upgrade():
+    conn = op.get_bind()
+    # FTS5 : SQLite uniquement (les autres moteurs gardent la recherche LIKE)
+    if conn.dialect.name != 'sqlite':
+        return
+
+    from sqlalchemy.engine.reflection import Inspector
+    inspector = Inspector.from_engine(conn)
+    tables = inspector.get_table_names()
+
+    # 1. Table virtuelle
+    if 'search_index' not in tables:
+        op.execute(
+            "CREATE VIRTUAL TABLE search_index USING fts5("
+            "content, kind UNINDEXED, ref_id UNINDEXED, event_id UNINDEXED, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+
+    # 2. Triggers de synchronisation
+    for name, body in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+    # 3. Indexation des données existantes
+    op.execute("DELETE FROM search_index")
+    op.execute(INSERT_USER.format(t='u') + ' FROM "user" u')
+    op.execute(INSERT_PARTICIPANT.format(t='p') + " FROM participant p WHERE "
+               + PARTICIPANT_CONTENT.format(t='p') + " <> ''")
+    op.execute(INSERT_ANSWER.format(t='a') + " FROM gforms_answer a")
+
+
+def downgrade():
+    conn = op.get_bind()
+    if conn.dialect.name != 'sqlite':
+        return
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.execute("DROP TABLE IF EXISTS search_index")
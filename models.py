@@ -6,17 +6,244 @@ Ce module définit tous les modèles de la base de données:
 - Event: Événements GN
 - Role: Rôles disponibles pour un événement
 - Participant: Inscription d'un utilisateur à un événement
+- EventParticipantCount: Compteurs matérialisés des participants par événement
 - EventNotification: Notifications d'activité pour les événements
+- GFormsAnswer: Réponses normalisées des soumissions Google Forms
+- ActivityLogRollup: Comptages journaliers des logs d'activité archivés
 - PasswordResetToken: Tokens de réinitialisation de mot de passe
 - AccountValidationToken: Tokens de validation de compte
 """
 
+import json
+import logging
+
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
 from sqlalchemy.orm import validates
+from sqlalchemy.types import TypeDecorator, Text
+from sqlalchemy.ext.mutable import MutableDict, MutableList
 from datetime import datetime
+from constants import ParticipantType, RegistrationStatus
+from utils.db_routing import RoutingSession
+
+# Session routée : les vues @read_only_db lisent sur un moteur en lecture seule
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+logger = logging.getLogger(__name__)
+
+
+class JSONText(TypeDecorator):
+    """
+    Colonne JSON stockée en TEXT.
+
+    Le décodage a lieu une seule fois, au chargement de la ligne : les
+    appelants manipulent directement des dict/list. Les chaînes déjà
+    sérialisées sont écrites telles quelles (compatibilité avec l'existant).
+    """
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, str):
+            return value
+        return json.dumps(value)
+
+    def process_result_value(self, value, dialect):
+        if not value:
+            return None
+        try:
+            return json.loads(value)
+        except ValueError:
+            # Texte libre legacy : laissé à la coercition de la colonne
+            return value
+
+
+def _decode_json_string(key, value):
+    """Décode une valeur JSON passée sous forme de chaîne (affectation legacy)."""
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except ValueError:
+        return None
+
+
+def _track(value, root):
+    """Enveloppe les conteneurs imbriqués pour remonter leurs mutations à la racine."""
+    if isinstance(value, dict) and not isinstance(value, _NestedDict):
+        return _NestedDict(value, root)
+    if isinstance(value, list) and not isinstance(value, _NestedList):
+        return _NestedList(value, root)
+    return value
+
+
+class _NestedDict(dict):
+    """Dictionnaire imbriqué dans une colonne JSON (ex: listes de groupes)."""
+
+    def __init__(self, data, root):
+        super().__init__()
+        self._root = root
+        for k, v in data.items():
+            dict.__setitem__(self, k, _track(v, root))
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, _track(value, self._root))
+        self._root.changed()
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._root.changed()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
 
-db = SQLAlchemy()
+    def update(self, *args, **kwargs):
+        for k, v in dict(*args, **kwargs).items():
+            dict.__setitem__(self, k, _track(v, self._root))
+        self._root.changed()
+
+    def pop(self, *args):
+        result = dict.pop(self, *args)
+        self._root.changed()
+        return result
+
+    def popitem(self):
+        result = dict.popitem(self)
+        self._root.changed()
+        return result
+
+    def clear(self):
+        dict.clear(self)
+        self._root.changed()
+
+
+class _NestedList(list):
+    """Liste imbriquée dans une colonne JSON (ex: groupes d'un type)."""
+
+    def __init__(self, data, root):
+        super().__init__(_track(v, root) for v in data)
+        self._root = root
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = [_track(v, self._root) for v in value]
+        else:
+            value = _track(value, self._root)
+        list.__setitem__(self, index, value)
+        self._root.changed()
+
+    def __delitem__(self, index):
+        list.__delitem__(self, index)
+        self._root.changed()
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def append(self, value):
+        list.append(self, _track(value, self._root))
+        self._root.changed()
+
+    def extend(self, values):
+        list.extend(self, (_track(v, self._root) for v in values))
+        self._root.changed()
+
+    def insert(self, index, value):
+        list.insert(self, index, _track(value, self._root))
+        self._root.changed()
+
+    def pop(self, *args):
+        result = list.pop(self, *args)
+        self._root.changed()
+        return result
+
+    def remove(self, value):
+        list.remove(self, value)
+        self._root.changed()
+
+    def clear(self):
+        list.clear(self)
+        self._root.changed()
+
+    def sort(self, **kwargs):
+        list.sort(self, **kwargs)
+        self._root.changed()
+
+    def reverse(self):
+        list.reverse(self)
+        self._root.changed()
+
+
+class JSONDict(MutableDict):
+    """
+    Dictionnaire JSON suivi en place : toute mutation, y compris dans une
+    liste ou un dictionnaire imbriqué, marque la ligne comme modifiée.
+    """
+
+    @classmethod
+    def coerce(cls, key, value):
+        decoded = _decode_json_string(key, value)
+        if decoded is None and isinstance(value, str):
+            # Texte libre non JSON conservé sous forme de message
+            decoded = {'message': value}
+        elif decoded is not None and not isinstance(decoded, dict):
+            # JSON valide mais pas un objet (liste, scalaire) : enveloppé
+            decoded = {'value': decoded}
+        result = super().coerce(key, decoded)
+        if result is not None:
+            for k, v in result.items():
+                dict.__setitem__(result, k, _track(v, result))
+        return result
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, _track(value, self))
+
+    def setdefault(self, key, default=None):
+        return super().setdefault(key, _track(default, self))
+
+    def update(self, *args, **kwargs):
+        super().update({k: _track(v, self) for k, v in dict(*args, **kwargs).items()})
+
+
+class JSONList(MutableList):
+    """
+    Liste JSON suivie en place : toute mutation, y compris dans un élément
+    imbriqué (ex: une entrée de configuration PAF), marque la ligne comme modifiée.
+    """
+
+    @classmethod
+    def coerce(cls, key, value):
+        decoded = _decode_json_string(key, value)
+        if decoded is None and isinstance(value, str):
+            logger.warning(f"Valeur JSON invalide ignorée pour {key}")
+            decoded = []
+        result = super().coerce(key, decoded)
+        if result is not None:
+            for i, v in enumerate(result):
+                list.__setitem__(result, i, _track(v, result))
+        return result
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = [_track(v, self) for v in value]
+        else:
+            value = _track(value, self)
+        super().__setitem__(index, value)
+
+    def append(self, value):
+        super().append(_track(value, self))
+
+    def extend(self, values):
+        super().extend([_track(v, self) for v in values])
+
+    def insert(self, index, value):
+        super().insert(index, _track(value, self))
+
+
+JSONDictColumn = JSONDict.as_mutable(JSONText)
+JSONListColumn = JSONList.as_mutable(JSONText)
 
 
 class User(UserMixin, db.Model):
@@ -59,6 +286,15 @@ class User(UserMixin, db.Model):
     is_deleted = db.Column(db.Boolean, default=False)  # Suppression logique
     account_status = db.Column(db.String(20), default='active')  # active, deregistered
 
+    # Utilisateurs actifs (ni supprimés, ni bannis) : annuaire de l'administration (index partiels)
+    __table_args__ = (
+        db.Index('idx_user_active', 'id',
+                 sqlite_where=db.text('is_deleted = 0 AND is_banned = 0'),
+                 postgresql_where=db.text('NOT is_deleted AND NOT is_banned')),
+        db.Index('idx_user_active_name', 'nom', 'prenom', 'id',
+                 sqlite_where=db.text('is_deleted = 0 AND is_banned = 0'),
+                 postgresql_where=db.text('NOT is_deleted AND NOT is_banned')),
+    )
 
     @property
     def is_admin(self):
@@ -96,6 +332,7 @@ class Event(db.Model):
         google_form_url: URL du Google Form d'inscription
         external_link: Lien externe (legacy)
         statut: Statut manuel de l'événement
+        is_deleting: Suppression en cours (masqué, plus modifiable)
         groups_config: Configuration JSON des groupes (PJ/PNJ/Organisateur)
     """
     id = db.Column(db.Integer, primary_key=True)
@@ -123,20 +360,23 @@ class Event(db.Model):
     discord_webhook_url = db.Column(db.String(255), nullable=True)
     external_link = db.Column(db.String(255))
     statut = db.Column(db.String(50), default='En préparation')
+    # Posé avant la suppression par lots : l'événement disparaît des listes
+    # et n'accepte plus d'écritures jusqu'à la suppression de sa ligne
+    is_deleting = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
     # Statuts possibles: "En préparation", "Inscriptions ouvertes", "Inscriptions fermées",
     # "Casting en cours", "Casting terminé", "Rôles en cours de préparation",
     # "Rôles en cours d'envois", "Rôles envoyés, préparatifs de l'evènement",
     # "Évènement en cours", "Terminé", "Annulé", "Reporté"
     # "Évènement en cours", "Terminé", "Annulé", "Reporté"
-    groups_config = db.Column(db.Text, default='{"PJ": ["Peu importe"], "PNJ": ["Peu importe"], "Organisateur": ["Peu importe"]}')
+    groups_config = db.Column(JSONDictColumn, default=lambda: {"PJ": ["Peu importe"], "PNJ": ["Peu importe"], "Organisateur": ["Peu importe"]})
     
     # Configuration PAF (JSON)
     # Format: [{"name": "PJ Standard", "amount": 50}, {"name": "PJ Réduit", "amount": 30}]
-    paf_config = db.Column(db.Text, default='[]')
+    paf_config = db.Column(JSONListColumn, default=lambda: [])
     
     # Moyens de paiement autorisés (JSON)
     # Format: ["Helloasso", "PayPal", "Espèces"]
-    payment_methods = db.Column(db.Text, default='["Helloasso"]')
+    payment_methods = db.Column(JSONListColumn, default=lambda: ["Helloasso"])
     
     # Nombre maximum de participants
     max_pjs = db.Column(db.Integer, default=50)
@@ -145,6 +385,11 @@ class Event(db.Model):
     
     # Casting validation status
     is_casting_validated = db.Column(db.Boolean, default=False)
+    
+    # Database indexes for performance (filtres futur/passé du tableau de bord)
+    __table_args__ = (
+        db.Index('idx_event_date_start', 'date_start'),
+    )
 
     
     # Relations
@@ -211,7 +456,12 @@ class Role(db.Model):
     
     # Analyse des traits de caractère
     character_traits_status = db.Column(db.String(20), default=None)  # None, pending, success, error
-    character_traits_data = db.Column(db.Text, default=None)  # JSON: traits ou message d'erreur
+    character_traits_data = db.Column(JSONDictColumn, default=None)  # JSON: traits ou message d'erreur
+    
+    # Database indexes for performance (tri par groupe/nom du trombinoscope)
+    __table_args__ = (
+        db.Index('idx_role_event_group_name', 'event_id', 'group', 'name'),
+    )
     
     @validates('type')
     def validate_type(self, key, value):
@@ -294,18 +544,18 @@ class Participant(db.Model):
     
     @property
     def is_organizer(self):
-        """Vérifie si le participant est un organisateur (insensible à la casse)."""
-        return self.type and self.type.lower() == 'organisateur'
+        """Vérifie si le participant est un organisateur (type canonique)."""
+        return self.type == ParticipantType.ORGANISATEUR.value
         
     @property
     def is_pj(self):
-        """Vérifie si le participant est un PJ (insensible à la casse)."""
-        return self.type and self.type.lower() == 'pj'
+        """Vérifie si le participant est un PJ (type canonique)."""
+        return self.type == ParticipantType.PJ.value
         
     @property
     def is_pnj(self):
-        """Vérifie si le participant est un PNJ (insensible à la casse)."""
-        return self.type and self.type.lower() == 'pnj'
+        """Vérifie si le participant est un PNJ (type canonique)."""
+        return self.type == ParticipantType.PNJ.value
 
     @property
     def photo_status(self):
@@ -334,11 +584,26 @@ class Participant(db.Model):
                 return 'PNJ'
         return value
 
+    @validates('registration_status')
+    def validate_registration_status(self, key, value):
+        """Assure que le statut est normalisé (À valider, En attente, Validé, Rejeté)."""
+        if value:
+            v_lower = value.lower()
+            for status in RegistrationStatus:
+                if status.value.lower() == v_lower:
+                    return status.value
+        return value
+
     # Database indexes for foreign keys (improves query performance)
+    # Les valeurs de type et statut étant canoniques, les comptages par
+    # événement utilisent des prédicats d'égalité couverts par l'index composite.
     __table_args__ = (
         db.Index('idx_participant_event', 'event_id'),
         db.Index('idx_participant_user', 'user_id'),
         db.Index('idx_participant_status', 'registration_status'),
+        db.Index('idx_participant_event_type_status', 'event_id', 'type', 'registration_status'),
+        # Une participation par utilisateur et par événement (cible des INSERT ... ON CONFLICT)
+        db.Index('uq_participant_event_user', 'event_id', 'user_id', unique=True),
     )
     
     # Relations
@@ -350,6 +615,41 @@ class Participant(db.Model):
         return f'<Participant User:{self.user_id} Event:{self.event_id}>'
 
 
+class EventParticipantCount(db.Model):
+    """
+    Compteur matérialisé des participants d'un événement.
+    
+    Une ligne par combinaison (type, statut d'inscription). Les compteurs sont
+    maintenus dans la même transaction que les écritures sur Participant
+    (voir services/participant_counter_service.py) et peuvent être
+    reconstruits via `manage_db.py recount`.
+    
+    Attributes:
+        id: Identifiant unique
+        event_id: ID de l'événement
+        type: Type de participation (Organisateur/PJ/PNJ)
+        registration_status: Statut d'inscription
+        count: Nombre de participants correspondants
+    """
+    __tablename__ = 'event_participant_count'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('event.id'), nullable=False)
+    type = db.Column(db.String(50), nullable=False, default='')
+    registration_status = db.Column(db.String(50), nullable=False, default='')
+    count = db.Column(db.Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        db.UniqueConstraint('event_id', 'type', 'registration_status', name='uq_event_participant_count'),
+    )
+    
+    # Relations
+    event = db.relationship('Event', backref=db.backref('participant_counts', cascade='all, delete-orphan'))
+    
+    def __repr__(self):
+        return f'<EventParticipantCount Event:{self.event_id} {self.type}/{self.registration_status}={self.count}>'
+
+
 class PasswordResetToken(db.Model):
     """
     Token de réinitialisation de mot de passe.
@@ -412,9 +712,21 @@ class ActivityLog(db.Model):
     action_type = db.Column(db.String(50), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
     event_id = db.Column(db.Integer, db.ForeignKey('event.id'), nullable=True)
-    details = db.Column(db.Text)  # JSON
+    details = db.Column(JSONDictColumn)  # JSON
     is_viewed = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)  # Clé des curseurs (created_at, id)
+    
+    # Database indexes for performance
+    __table_args__ = (
+        db.Index('idx_activity_log_created_at', 'created_at'),
+        # Pagination par curseur (created_at, id) par filtre
+        db.Index('idx_activity_log_action_created', 'action_type', 'created_at', 'id'),
+        db.Index('idx_activity_log_event_created', 'event_id', 'created_at', 'id'),
+        db.Index('idx_activity_log_user_created', 'user_id', 'created_at', 'id'),
+        # Logs non consultés uniquement (index partiel)
+        db.Index('idx_activity_log_unviewed', 'id',
+                 sqlite_where=db.text('is_viewed = 0'), postgresql_where=db.text('NOT is_viewed')),
+    )
     
     # Relations
     user = db.relationship('User', backref='activity_logs')
@@ -424,6 +736,36 @@ class ActivityLog(db.Model):
         return f'<ActivityLog {self.action_type} by User:{self.user_id}>'
 
 
+class ActivityLogRollup(db.Model):
+    """
+    Nombre de logs d'activité par jour et par type d'action.
+    
+    Alimenté lors de l'archivage des logs anciens (voir
+    services/activity_log_archive_service.py) : les statistiques restent
+    disponibles dans la base alors que les lignes détaillées sont déplacées
+    dans des archives mensuelles compressées.
+    
+    Attributes:
+        id: Identifiant unique
+        day: Jour des logs agrégés
+        action_type: Type d'action
+        count: Nombre de logs archivés pour ce jour et ce type
+    """
+    __tablename__ = 'activity_log_rollup'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    action_type = db.Column(db.String(50), nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        db.UniqueConstraint('day', 'action_type', name='uq_activity_log_rollup_day_type'),
+    )
+    
+    def __repr__(self):
+        return f'<ActivityLogRollup {self.day} {self.action_type}: {self.count}>'
+
+
 class CastingProposal(db.Model):
     """
     Représente une colonne de proposition de casting pour un événement.
@@ -444,6 +786,11 @@ class CastingProposal(db.Model):
     position = db.Column(db.Integer, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Database indexes for performance
+    __table_args__ = (
+        db.Index('idx_casting_proposal_event_position', 'event_id', 'position'),
+    )
+    
     # Relations
     # Relations
     event = db.relationship('Event', backref=db.backref('casting_proposals', cascade='all, delete-orphan'))
@@ -511,6 +858,11 @@ class FormResponse(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Database indexes for performance
+    __table_args__ = (
+        db.Index('idx_form_response_event', 'event_id'),
+    )
+    
     def __repr__(self):
         return f'<FormResponse {self.response_id} from {self.respondent_email}>'
 
@@ -531,7 +883,8 @@ class EventNotification(db.Model):
         action_type: Type d'action (participant_join_request, participant_left, event_updated)
         description: Description détaillée de la notification
         created_at: Date de création de la notification
-        is_read: Indicateur de lecture (pour les organisateurs)
+        is_read: Ancien indicateur de lecture global, conservé pour les
+            imports ; la lecture est suivie par EventNotificationRead
     """
     id = db.Column(db.Integer, primary_key=True)
     event_id = db.Column(db.Integer, db.ForeignKey('event.id'), nullable=False)
@@ -541,6 +894,15 @@ class EventNotification(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     is_read = db.Column(db.Boolean, default=False)
     
+    # Database indexes for performance (fil paginé et compteur de non-lues par ID)
+    # AUTOINCREMENT sous SQLite : les curseurs de lecture (EventNotificationRead)
+    # supposent des IDs croissants ; sans lui, l'ID de la dernière notification
+    # supprimée serait réattribué et la nouvelle notification paraîtrait déjà lue
+    __table_args__ = (
+        db.Index('idx_event_notification_event_id', 'event_id', 'id'),
+        {'sqlite_autoincrement': True},
+    )
+    
     # Relations
     event = db.relationship('Event', backref=db.backref('notifications', cascade='all, delete-orphan'))
     user = db.relationship('User')
@@ -549,6 +911,42 @@ class EventNotification(db.Model):
         return f'<EventNotification {self.action_type} for Event {self.event_id}>'
 
 
+class EventNotificationRead(db.Model):
+    """
+    Curseur de lecture des notifications d'un événement, par utilisateur.
+
+    Une notification est lue si son ID est inférieur ou égal à last_read_id,
+    ou s'il figure dans read_ids (lectures individuelles au-delà du curseur).
+    "Tout marquer comme lu" se réduit ainsi à un upsert de cette ligne.
+
+    Attributes:
+        id: Identifiant unique
+        event_id: ID de l'événement
+        user_id: ID du lecteur (organisateur)
+        last_read_id: ID de la dernière notification lue en continu
+        read_ids: IDs lus individuellement au-delà de last_read_id
+        updated_at: Date de la dernière lecture
+    """
+    __tablename__ = 'event_notification_read'
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('event.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    last_read_id = db.Column(db.Integer, nullable=False, default=0)
+    read_ids = db.Column(JSONListColumn, default=lambda: [])
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint('event_id', 'user_id', name='uq_event_notification_read_event_user'),
+    )
+
+    # Relations
+    event = db.relationship('Event', backref=db.backref('notification_reads', cascade='all, delete-orphan'))
+
+    def __repr__(self):
+        return f'<EventNotificationRead Event {self.event_id} User {self.user_id} <= {self.last_read_id}>'
+
+
 class GFormsCategory(db.Model):
     """
     Catégorie pour organiser les champs de formulaire Google Forms.
@@ -640,13 +1038,17 @@ class GFormsSubmission(db.Model):
     timestamp = db.Column(db.DateTime, nullable=False)
     type_ajout = db.Column(db.String(20))  # créé, ajouté, mis à jour
     form_response_id = db.Column(db.Integer, db.ForeignKey('form_response.id'))
-    raw_data = db.Column(db.Text)  # JSON
+    raw_data = db.Column(JSONDictColumn)  # JSON
     
     # Database indexes for performance
     __table_args__ = (
         db.Index('idx_gforms_submission_event', 'event_id'),
         db.Index('idx_gforms_submission_email', 'email'),
         db.Index('idx_gforms_submission_timestamp', 'timestamp'),
+        db.Index('idx_gforms_submission_form_response', 'form_response_id'),
+        # Une soumission par email et par événement ; les réponses anonymes (email vide) restent distinctes
+        db.Index('uq_gforms_submission_event_email', 'event_id', 'email', unique=True,
+                 sqlite_where=db.text("email <> ''"), postgresql_where=db.text("email <> ''")),
     )
     
     # Relations
@@ -656,3 +1058,40 @@ class GFormsSubmission(db.Model):
     
     def __repr__(self):
         return f'<GFormsSubmission {self.email} - Event {self.event_id}>'
+
+
+class GFormsAnswer(db.Model):
+    """
+    Réponse normalisée d'une soumission Google Forms (une ligne par champ).
+
+    Miroir de GFormsSubmission.raw_data maintenu par le webhook et l'import
+    CSV (services/gforms_answer_service.py). Permet de lister les champs
+    présents et de filtrer les soumissions par valeur sans décoder le JSON.
+
+    Attributes:
+        id: Identifiant unique
+        submission_id: ID de la soumission
+        field_mapping_id: ID du champ (GFormsFieldMapping)
+        value: Valeur textuelle de la réponse (listes jointes par ", ")
+    """
+    __tablename__ = 'gforms_answer'
+
+    id = db.Column(db.Integer, primary_key=True)
+    submission_id = db.Column(db.Integer, db.ForeignKey('gforms_submission.id'), nullable=False)
+    field_mapping_id = db.Column(db.Integer, db.ForeignKey('gforms_field_mapping.id'), nullable=False)
+    value = db.Column(db.Text, nullable=False, default='')
+
+    # Database indexes for performance
+    # - (field_mapping_id, value) : "quelles soumissions ont la valeur X pour le champ Y"
+    #   et, par préfixe, "quels champs ont au moins une réponse"
+    __table_args__ = (
+        db.UniqueConstraint('submission_id', 'field_mapping_id', name='uq_gforms_answer_submission_field'),
+        db.Index('idx_gforms_answer_field_value', 'field_mapping_id', 'value'),
+    )
+
+    # Relations
+    submission = db.relationship('GFormsSubmission', backref=db.backref('answers', cascade='all, delete-orphan'))
+    field_mapping = db.relationship('GFormsFieldMapping', backref=db.backref('answers', cascade='all, delete-orphan'))
+
+    def __repr__(self):
+        return f'<GFormsAnswer submission:{self.submission_id} field:{self.field_mapping_id}>'
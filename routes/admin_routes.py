@@ -16,9 +16,17 @@ from werkzeug.security import generate_password_hash
 from werkzeug.utils import secure_filename
 from PIL import Image
 from datetime import datetime
-from decorators import admin_required
-from constants import UserRole, ActivityLogType, DefaultValues, RegistrationStatus
+from types import SimpleNamespace
+from decorators import admin_required, read_only_db
+from constants import UserRole, ActivityLogType, DefaultValues, RegistrationStatus, ParticipantType
 from exceptions import DatabaseError
+from services.participant_counter_service import recount_event_counters
+from services.search_service import search
+from services.event_overview_service import events_overview
+from services.user_directory_service import user_directory, user_participations
+from services.activity_log_archive_service import list_archive_months, read_archived_logs, get_monthly_rollups
+from utils.pagination import decode_cursor, keyset_page
+from sqlalchemy import false, func
 from sqlalchemy.orm import joinedload
 import json
 import os
@@ -28,6 +36,7 @@ admin_bp = Blueprint('admin', __name__)
 
 @admin_bp.route('/dashboard')
 @login_required
+@read_only_db
 def dashboard():
     """
     Dashboard principal avec liste des événements et admin panel.
@@ -37,10 +46,12 @@ def dashboard():
     - Profil utilisateur
     - Panel admin (si admin)
     """
+    # Admin Sub-Navigation : l'annuaire n'est lu que si le panneau est demandé
+    admin_view = request.args.get('admin_view')
     users_pagination = None
-    if current_user.is_admin:
+    if current_user.is_admin and admin_view:
         page = request.args.get('page', 1, type=int)
-        users_pagination = User.query.paginate(page=page, per_page=DefaultValues.USERS_PER_PAGE, error_out=False)
+        users_pagination = user_directory(page=page)
         
     # Logique de filtrage
     filter_type = request.args.get('filter', 'future')
@@ -60,7 +71,8 @@ def dashboard():
     
     # Filtrage de visibilité (sauf pour les admins qui voient tout/le filtre 'mine' qui implique déjà l'accès)
     # Pour 'future', 'past', et 'all', on doit exclure les événements privés où l'utilisateur n'est pas participant
-    base_query = Event.query
+    # Les événements en cours de suppression n'apparaissent plus
+    base_query = Event.query.filter(Event.is_deleting == false())
     if not current_user.is_admin and filter_type != 'mine':
         # On inclut les événements publics OU les événements privés où l'utilisateur est participant
         from sqlalchemy import or_
@@ -74,7 +86,7 @@ def dashboard():
     if filter_type == 'mine':
         # Événements auxquels je participe
         if my_event_ids:
-            events = Event.query.filter(Event.id.in_(my_event_ids)).order_by(Event.date_start).all()
+            events = base_query.filter(Event.id.in_(my_event_ids)).order_by(Event.date_start).all()
     elif filter_type == 'future':
         events = base_query.filter(Event.date_start >= now).order_by(Event.date_start).all()
     elif filter_type == 'past':
@@ -82,9 +94,6 @@ def dashboard():
     else:
         # 'all'
         events = base_query.order_by(Event.date_start).all()
-        
-    # Admin Sub-Navigation
-    admin_view = request.args.get('admin_view')
     
     return render_template('dashboard.html', 
                          user=current_user, 
@@ -111,28 +120,18 @@ def admin_page():
     search_query = request.args.get('q', '')
     
     users_pagination = None
+    events_pagination = None
     events = None
+    date_from = _parse_date_arg('date_from')
+    date_to = _parse_date_arg('date_to')
     
     if admin_view == 'events':
-        # Charger tous les événements avec participants eagerly loaded
-        events = Event.query.options(
-            joinedload(Event.participants).joinedload(Participant.user)
-        ).order_by(Event.date_start.desc()).all()
+        # Une page d'événements, avec compteurs et organisateurs agrégés
+        events_pagination, events = events_overview(page=page, date_from=date_from, date_to=date_to)
     else:
-        query = User.query
-        
-        if search_query:
-            from sqlalchemy import or_
-            term = f"%{search_query}%"
-            query = query.filter(
-                or_(
-                    User.email.ilike(term),
-                    User.nom.ilike(term),
-                    User.prenom.ilike(term)
-                )
-            )
-            
-        users_pagination = query.paginate(page=page, per_page=DefaultValues.USERS_PER_PAGE, error_out=False)
+        users_pagination = user_directory(page=page, search_query=search_query,
+                                          status=request.args.get('status', 'all'),
+                                          sort=request.args.get('sort', 'id'))
     
     breadcrumbs = [
         ('Dashboard', url_for('admin.dashboard')),
@@ -142,11 +141,23 @@ def admin_page():
     return render_template('admin.html', 
                          user=current_user,
                          users_pagination=users_pagination,
+                         events_pagination=events_pagination,
                          events=events,
+                         date_from=request.args.get('date_from', '') if date_from else '',
+                         date_to=request.args.get('date_to', '') if date_to else '',
                          admin_view=admin_view,
                          breadcrumbs=breadcrumbs)
 
 
+def _parse_date_arg(name):
+    """Date AAAA-MM-JJ passée en paramètre d'URL, None si absente ou invalide."""
+    value = request.args.get(name, '')
+    try:
+        return datetime.strptime(value, '%Y-%m-%d') if value else None
+    except ValueError:
+        return None
+
+
 @admin_bp.route('/profile', methods=['GET'])
 @login_required
 def profile_page():
@@ -286,25 +297,8 @@ def user_events(user_id):
     """
     user = User.query.get_or_404(user_id)
     
-    # Récupérer toutes les participations de l'utilisateur avec les événements liés
-    participations = Participant.query.filter_by(user_id=user_id)\
-        .options(joinedload(Participant.event))\
-        .options(joinedload(Participant.role))\
-        .order_by(Participant.event_id.desc())\
-        .all()
-    
-    # Grouper par événement (au cas où plusieurs rôles)
-    events_data = []
-    seen_events = set()
-    
-    for p in participations:
-        if p.event_id not in seen_events:
-            seen_events.add(p.event_id)
-            events_data.append({
-                'event': p.event,
-                'participation': p,
-                'role_name': p.role.name if p.role else None
-            })
+    # Une ligne par événement, colonnes affichées uniquement
+    events_data = user_participations(user_id)
     
     page = request.args.get('page', 1, type=int)
     
@@ -381,19 +375,17 @@ def admin_update_full_user(user_id):
     elif status_code == UserRole.SYSADMIN.value:
         user.role = UserRole.SYSADMIN.value
         user.is_banned = False
-        
-    db.session.commit()
     
-    # Journal de la mise à jour utilisateur
+    # Journal de la mise à jour utilisateur (même commit que la mise à jour)
     log = ActivityLog(
         user_id=current_user.id,
         action_type=ActivityLogType.USER_UPDATE.value,
-        details=json.dumps({
+        details={
             'target_user_id': user.id,
             'target_email': user.email,
             'updated_fields': 'Admin Full Update',
             'new_role': user.role
-        })
+        }
     )
     db.session.add(log)
     db.session.commit()
@@ -434,30 +426,35 @@ def admin_delete_user(user_id):
                 role.assigned_participant_id = None
         
         # Supprimer les tokens
-        from models import AccountValidationToken, PasswordResetToken, GFormsSubmission, EventNotification
+        from models import (AccountValidationToken, PasswordResetToken, GFormsSubmission, GFormsAnswer,
+                            EventNotification, EventNotificationRead)
         AccountValidationToken.query.filter_by(email=user.email).delete()
         PasswordResetToken.query.filter_by(email=user.email).delete()
         
-        # Supprimer les soumissions GForms
+        # Supprimer les soumissions GForms (et leurs réponses normalisées)
+        submission_ids = db.session.query(GFormsSubmission.id).filter_by(user_id=user.id)
+        GFormsAnswer.query.filter(GFormsAnswer.submission_id.in_(submission_ids)).delete(synchronize_session=False)
         GFormsSubmission.query.filter_by(user_id=user.id).delete()
         
-        # Supprimer les notifications liées
+        # Supprimer les notifications liées et les curseurs de lecture
         EventNotification.query.filter_by(user_id=user.id).delete()
+        EventNotificationRead.query.filter_by(user_id=user.id).delete()
         
         # Supprimer les logs d'activité générés par cet utilisateur
         ActivityLog.query.filter_by(user_id=user.id).delete()
         
-        # Supprimer les participations
+        # Supprimer les participations (suppression en masse : recompter les événements touchés)
         Participant.query.filter_by(user_id=user.id).delete()
+        recount_event_counters({p.event_id for p in participants})
         
         # Logger l'action (par l'admin courant)
         log = ActivityLog(
             user_id=current_user.id,
             action_type=ActivityLogType.USER_DELETION.value,
-            details=json.dumps({
+            details={
                 'target_email': user.email,
                 'name': f"{user.nom or ''} {user.prenom or ''}".strip()
-            })
+            }
         )
         db.session.add(log)
         
@@ -473,6 +470,34 @@ def admin_delete_user(user_id):
     return redirect(url_for('admin.admin_page', admin_view='users', page=page, _anchor='admin'))
 
 
+def _filtered_logs_query(args):
+    """
+    Construit la requête des logs selon les filtres de la requête HTTP.
+    
+    Filtres : action_type, event_id, user_id (index dédiés), up_to_id
+    (limite haute pour n'agir que sur les logs déjà affichés).
+    
+    Returns:
+        tuple: (requête ActivityLog, dict des filtres actifs)
+    """
+    filters = {
+        'action_type': args.get('action_type') or None,
+        'event_id': args.get('event_id', type=int),
+        'user_id': args.get('user_id', type=int),
+    }
+    query = ActivityLog.query
+    if filters['action_type']:
+        query = query.filter(ActivityLog.action_type == filters['action_type'])
+    if filters['event_id']:
+        query = query.filter(ActivityLog.event_id == filters['event_id'])
+    if filters['user_id']:
+        query = query.filter(ActivityLog.user_id == filters['user_id'])
+    up_to_id = args.get('up_to_id', type=int)
+    if up_to_id:
+        query = query.filter(ActivityLog.id <= up_to_id)
+    return query, {k: v for k, v in filters.items() if v}
+
+
 @admin_bp.route('/admin/logs')
 @login_required
 @admin_required
@@ -483,35 +508,82 @@ def admin_logs():
     Montre toutes les inscriptions, créations d'événements et
     demandes de participation. Les logs non consultés sont
     surlignés en jaune.
+    
+    Pagination par curseur sur (created_at, id) : seule la page affichée
+    est chargée (et ses détails JSON décodés).
     """
-    # Récupérer tous les logs, les plus récents en premier
-    logs = ActivityLog.query.order_by(ActivityLog.created_at.desc()).all()
+    query, filters = _filtered_logs_query(request.args)
+    cursor = decode_cursor(request.args.get('cursor'))
+    
+    logs, next_cursor = keyset_page(
+        query.options(joinedload(ActivityLog.user)),
+        ActivityLog.created_at, ActivityLog.id,
+        cursor=cursor, limit=DefaultValues.LOGS_PER_PAGE
+    )
     
-    # Enrichir avec les détails JSON
+    # Détails JSON (décodés au chargement par la colonne)
     for log in logs:
-        try:
-            log.details_dict = json.loads(log.details or '{}')
-        except json.JSONDecodeError:
-            log.details_dict = {}
+        log.details_dict = log.details or {}
     
-    return render_template('admin_logs.html', logs=logs)
+    # Limite haute des actions groupées (logs arrivés après l'affichage épargnés)
+    newest_id = db.session.query(func.max(ActivityLog.id)).scalar()
+    
+    return render_template('admin_logs.html', logs=logs, filters=filters,
+                           next_cursor=next_cursor, is_first_page=cursor is None,
+                           newest_id=newest_id,
+                           action_types=[t.value for t in ActivityLogType])
+
+
+@admin_bp.route('/admin/logs/archives')
+@login_required
+@admin_required
+def admin_log_archives():
+    """
+    Consulte les logs d'activité archivés (fichiers mensuels compressés).
+    
+    Sans mois sélectionné : liste des archives et totaux mensuels par type
+    (table activity_log_rollup). Avec ?month=AAAA-MM : logs du mois, lus à
+    la demande dans l'archive et filtrés comme le journal courant.
+    """
+    archive_dir = current_app.config['ACTIVITY_LOG_ARCHIVE_DIR']
+    months = list_archive_months(archive_dir)
+    month = request.args.get('month')
+    if month not in months:
+        month = None
+    
+    _, filters = _filtered_logs_query(request.args)
+    logs = []
+    if month:
+        for record in read_archived_logs(archive_dir, month, limit=DefaultValues.ARCHIVED_LOGS_LIMIT, **filters):
+            user = None
+            if record['user_email']:
+                user = SimpleNamespace(email=record['user_email'], nom=record['user_nom'],
+                                       prenom=record['user_prenom'])
+            logs.append(SimpleNamespace(created_at=record['created_at'], action_type=record['action_type'],
+                                        user=user, details_dict=record['details'] or {}, is_viewed=True))
+    
+    return render_template('admin_log_archives.html', months=months, month=month, logs=logs,
+                           filters=filters, rollups=get_monthly_rollups(),
+                           retention_days=current_app.config['ACTIVITY_LOG_RETENTION_DAYS'],
+                           limit=DefaultValues.ARCHIVED_LOGS_LIMIT,
+                           action_types=[t.value for t in ActivityLogType])
 
 
 @admin_bp.route('/admin/logs/delete-all', methods=['POST'])
 @login_required
 @admin_required
 def delete_all_logs():
-    """Supprime tous les logs d'activité."""
+    """Supprime les logs d'activité (tous, ou ceux des filtres actifs) en une requête."""
+    query, filters = _filtered_logs_query(request.form)
     try:
-        # Suppression de tous les enregistrements
-        num_deleted = db.session.query(ActivityLog).delete()
+        num_deleted = query.delete(synchronize_session=False)
         db.session.commit()
         flash(f"{num_deleted} logs ont été supprimés.", "success")
     except DatabaseError as e:
         db.session.rollback()
         flash(f"Erreur lors de la suppression des logs : {str(e)}", "danger")
     
-    return redirect(url_for('admin.admin_logs'))
+    return redirect(url_for('admin.admin_logs', **filters))
 
 
 @admin_bp.route('/admin/logs/mark-viewed', methods=['POST'])
@@ -519,14 +591,42 @@ def delete_all_logs():
 @admin_required
 def mark_logs_viewed():
     """
-    Marque tous les logs comme consultés.
+    Marque tous les logs comme consultés (ou ceux des filtres actifs).
     
-    Supprime le surlignage jaune des logs.
+    Supprime le surlignage jaune des logs. Une seule requête UPDATE,
+    limitée aux logs non vus via l'index partiel idx_activity_log_unviewed.
     """
-    ActivityLog.query.filter_by(is_viewed=False).update({'is_viewed': True})
+    query, _ = _filtered_logs_query(request.form)
+    updated = query.filter_by(is_viewed=False).update({'is_viewed': True}, synchronize_session=False)
     db.session.commit()
     
-    return jsonify({'success': True})
+    return jsonify({'success': True, 'updated': updated})
+
+
+@admin_bp.route('/api/search')
+@login_required
+def search_api():
+    """
+    API: Recherche plein texte dans les utilisateurs, commentaires de
+    participants et réponses Google Forms.
+    
+    Paramètres : q (saisie libre), event_id (optionnel), limit.
+    Les résultats sont limités aux événements organisés par l'utilisateur
+    (tous pour un administrateur).
+    
+    Returns:
+        JSON avec la liste des résultats classés par pertinence
+    """
+    text = request.args.get('q', '').strip()
+    event_id = request.args.get('event_id', type=int)
+    limit = request.args.get('limit', 20, type=int)
+    
+    try:
+        results = search(text, current_user, event_id=event_id, limit=limit)
+    except PermissionError:
+        return jsonify({'error': 'Accès refusé'}), 403
+    
+    return jsonify({'query': text, 'results': results})
 
 
 @admin_bp.route('/deregister', methods=['POST'])
@@ -562,10 +662,10 @@ def deregister():
         )
         
         # Si l'utilisateur est organisateur, vérifier s'il est le seul
-        if participant.type == 'Organisateur':
+        if participant.is_organizer:
             remaining_organizers = Participant.query.filter_by(
                 event_id=event.id,
-                type='Organisateur'
+                type=ParticipantType.ORGANISATEUR.value
             ).filter(Participant.user_id != current_user.id).count()
             
             # Si c'est le seul organisateur, annuler l'événement
@@ -580,12 +680,13 @@ def deregister():
     if delete_data:
         # Hard delete: supprimer complètement l'utilisateur
         # Supprimer les tokens associés
-        from models import AccountValidationToken, PasswordResetToken, EventNotification
+        from models import AccountValidationToken, PasswordResetToken, EventNotification, EventNotificationRead
         AccountValidationToken.query.filter_by(email=current_user.email).delete()
         PasswordResetToken.query.filter_by(email=current_user.email).delete()
         
-        # Supprimer les notifications créées par cet utilisateur
+        # Supprimer les notifications créées par cet utilisateur et ses curseurs de lecture
         EventNotification.query.filter_by(user_id=current_user.id).delete()
+        EventNotificationRead.query.filter_by(user_id=current_user.id).delete()
         
         # Supprimer l'utilisateur
         user_email = current_user.email
@@ -142,18 +142,18 @@ def register():
             # Sauvegarder en base uniquement si l'email a été envoyé
             db.session.add(new_user)
             db.session.add(token)
-            db.session.commit()
+            db.session.flush()
             
             # Logger l'inscription
             log = ActivityLog(
                 action_type=ActivityLogType.USER_REGISTRATION.value,
                 user_id=new_user.id,
-                details=json.dumps({
+                details={
                     'email': email,
                     'nom': nom,
                     'prenom': prenom,
                     'genre': request.form.get('genre')
-                })
+                }
             )
             db.session.add(log)
             db.session.commit()
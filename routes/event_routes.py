@@ -10,16 +10,19 @@ Ce module gère :
 - Inscription à un événement
 """
 
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app, session
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app, session, g
 from markupsafe import Markup
 from flask_login import login_required, current_user
 from models import db, Event, Participant, Role, CastingProposal, CastingAssignment, ActivityLog, User
 import json
 import logging
 from datetime import datetime
-from constants import ParticipantType, EventStatus, RegistrationStatus, ActivityLogType
-from decorators import organizer_required
+from constants import ParticipantType, EventStatus, RegistrationStatus, ActivityLogType, DefaultValues
+from decorators import organizer_required, read_only_db
 from exceptions import DatabaseError
+from services.participant_counter_service import count_active_by_type
+from services.registration_service import upsert_participant, canonical_value, RegistrationValueError
+from utils.request_context import get_current_event, get_current_membership
 from sqlalchemy.orm import joinedload
 import numpy as np
 from scipy.optimize import linear_sum_assignment
@@ -71,7 +74,7 @@ def create_event():
         new_event.webhook_secret = secrets.token_hex(16).upper()
         
         db.session.add(new_event)
-        db.session.commit()
+        db.session.flush()
         
         # Ajouter le créateur comme organisateur
         participant = Participant(
@@ -82,19 +85,18 @@ def create_event():
             registration_status=RegistrationStatus.VALIDATED.value
         )
         db.session.add(participant)
-        db.session.commit()
         
         # Logger la création de l'événement
         log = ActivityLog(
             action_type=ActivityLogType.EVENT_CREATION.value,
             user_id=current_user.id,
             event_id=new_event.id,
-            details=json.dumps({
+            details={
                 'event_name': name,
                 'location': location,
                 'date_start': date_start.strftime('%Y-%m-%d'),
                 'date_end': date_end.strftime('%Y-%m-%d')
-            })
+            }
         )
         db.session.add(log)
         db.session.commit()
@@ -107,6 +109,7 @@ def create_event():
 
 @event_bp.route('/event/<int:event_id>')
 @login_required
+@read_only_db
 def detail(event_id):
     """
     Affiche les détails d'un événement.
@@ -117,14 +120,10 @@ def detail(event_id):
     Returns:
         Template avec les informations de l'événement
     """
-    from sqlalchemy.orm import joinedload
-    
     # Eager load participants and users to avoid N+1 queries
-    event = Event.query\
-        .options(joinedload(Event.participants).joinedload(Participant.user))\
-        .get_or_404(event_id)
-    # Vérifier si l'utilisateur est participant
-    participant = Participant.query.filter_by(event_id=event.id, user_id=current_user.id).first()
+    event = get_current_event(event_id, joinedload(Event.participants).joinedload(Participant.user))
+    # Vérifier si l'utilisateur est participant (pris parmi les participants chargés)
+    participant = get_current_membership(event_id)
     
     # Contrôle d'accès pour les événements privés
     # 1. Si le participant est rejeté, accès bloqué directement
@@ -138,22 +137,13 @@ def detail(event_id):
             return render_template('event_access_code.html', event=event, breadcrumbs=[('GN Manager', url_for('admin.dashboard')), (event.name, '#')])
     
     is_organizer = participant and participant.is_organizer and participant.registration_status == RegistrationStatus.VALIDATED.value
-    groups_config = json.loads(event.groups_config or '{}')
-
-    # Calcul des compteurs de participants (hors rejetés)
-    from sqlalchemy import func
-    count_pjs = Participant.query.filter_by(event_id=event.id).filter(
-        func.lower(Participant.type) == ParticipantType.PJ.value.lower(),
-        Participant.registration_status != RegistrationStatus.REJECTED.value
-    ).count()
-    count_pnjs = Participant.query.filter_by(event_id=event.id).filter(
-        func.lower(Participant.type) == ParticipantType.PNJ.value.lower(),
-        Participant.registration_status != RegistrationStatus.REJECTED.value
-    ).count()
-    count_orgs = Participant.query.filter_by(event_id=event.id).filter(
-        func.lower(Participant.type) == ParticipantType.ORGANISATEUR.value.lower(),
-        Participant.registration_status != RegistrationStatus.REJECTED.value
-    ).count()
+    groups_config = event.groups_config or {}
+
+    # Compteurs de participants (hors rejetés), lus depuis les compteurs matérialisés
+    counts = count_active_by_type(event.id)
+    count_pjs = counts[ParticipantType.PJ.value]
+    count_pnjs = counts[ParticipantType.PNJ.value]
+    count_orgs = counts[ParticipantType.ORGANISATEUR.value]
     
     # Récupérer les rôles de l'événement avec eager loading des assignments pour la modale de suppression
     roles = Role.query.filter_by(event_id=event.id)\
@@ -173,20 +163,18 @@ def detail(event_id):
         ).first()
     
     # PAF Config
-    try:
-        paf_config = json.loads(event.paf_config or '[]')
-    except json.JSONDecodeError:
-        paf_config = []
+    paf_config = event.paf_config or []
     
     paf_map = {item['name']: item['amount'] for item in paf_config if 'name' in item and 'amount' in item}
     
     # Récupérer les notifications pour les organisateurs
-    notifications = []
+    # (dernière page seulement, les plus anciennes sont chargées à la demande)
+    notification_feed = None
     unread_count = 0
     if is_organizer:
-        from services.notification_service import get_event_notifications, count_unread_notifications
-        notifications = get_event_notifications(event_id)
-        unread_count = count_unread_notifications(event_id)
+        from services.notification_service import get_notification_feed
+        notification_feed = get_notification_feed(event_id, current_user.id)
+        unread_count = notification_feed['unread_count']
 
     breadcrumbs = [
         ('GN Manager', url_for('admin.dashboard')),
@@ -195,13 +183,13 @@ def detail(event_id):
 
     return render_template('event_detail.html', event=event, participant=participant, is_organizer=is_organizer, groups_config=groups_config, breadcrumbs=breadcrumbs,
                           count_pjs=count_pjs, count_pnjs=count_pnjs, count_orgs=count_orgs, roles=roles, assigned_role=assigned_role,
-                          paf_config=paf_config, paf_map=paf_map, notifications=notifications, unread_count=unread_count)
+                          paf_config=paf_config, paf_map=paf_map, notification_feed=notification_feed, unread_count=unread_count)
 
 @event_bp.route('/event/<int:event_id>/access', methods=['POST'])
 @login_required
 def verify_access_code(event_id):
     """Vérifie le code d'accès pour un événement privé."""
-    event = Event.query.get_or_404(event_id)
+    event = get_current_event(event_id)
     code = request.form.get('access_code')
     
     if event.access_code and code == event.access_code:
@@ -225,7 +213,7 @@ def update_general(event_id):
     Args:
         event_id: ID de l'événement à modifier
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
         
     # Capture old state for logging
     old_state = {
@@ -361,23 +349,21 @@ def update_general(event_id):
                     paf_config.append({'name': name.strip(), 'amount': float(amount) if amount else 0})
                 except ValueError:
                     pass
-        event.paf_config = json.dumps(paf_config)
+        event.paf_config = paf_config
         
         # Configuration des moyens de paiement
         payment_methods_raw = request.form.get('payment_methods', '').strip()
         if payment_methods_raw:
             # Parse comma-separated list
             methods = [m.strip() for m in payment_methods_raw.split(',') if m.strip()]
-            event.payment_methods = json.dumps(methods)
+            event.payment_methods = methods
         elif payment_methods_raw == '':
             # Si le champ est vide, garder au moins Helloasso
-            event.payment_methods = json.dumps(['Helloasso'])
+            event.payment_methods = ['Helloasso']
         
         # Checkbox handling: presence means True
         event.google_form_active = 'google_form_active' in request.form
         event.auto_invite_email = 'auto_invite_email' in request.form
-             
-        db.session.commit()
         
         # Journal et notification avec les détails spécifiques
         changes = []
@@ -404,13 +390,12 @@ def update_general(event_id):
             action_type=ActivityLogType.EVENT_UPDATE.value,
             user_id=current_user.id,
             event_id=event.id,
-            details=json.dumps({
+            details={
                 'updated_fields': ', '.join(changes) if changes else 'General Update',
                 'event_name': event.name
-            })
+            }
         )
         db.session.add(log)
-        db.session.commit()
         
         # Créer une notification pour les utilisateurs internes (organisateurs)
         if changes:
@@ -421,6 +406,8 @@ def update_general(event_id):
                 action_type='event_updated',
                 description=f"modifications apportées : {', '.join(changes)}"
             )
+        # Un seul commit : modifications, journal et notification
+        db.session.commit()
 
         flash('Informations générales mises à jour.', 'success')
     except (ValueError, TypeError) as e:
@@ -438,7 +425,7 @@ def regenerate_secret(event_id):
     
     Accès réservé aux organisateurs.
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
     import secrets
     new_secret = secrets.token_hex(16).upper()
@@ -449,10 +436,10 @@ def regenerate_secret(event_id):
         action_type=ActivityLogType.EVENT_UPDATE.value,
         user_id=current_user.id,
         event_id=event.id,
-        details=json.dumps({
+        details={
             'updated_fields': 'webhook_secret (regenerated)',
             'event_name': event.name
-        })
+        }
     )
     db.session.add(log)
     db.session.commit()
@@ -472,32 +459,25 @@ def update_status(event_id):
     
     Accès réservé aux organisateurs.
     """
-    # Import sqlalchemy for eager loading
-    from sqlalchemy.orm import joinedload
-    
-    # Eager load participants and their users to avoid N+1 queries
-    event = Event.query\
-        .options(joinedload(Event.participants).joinedload(Participant.user))\
-        .get_or_404(event_id)
+    event = g.current_event
         
     statut = request.form.get('statut')
     if statut:
         old_status = event.statut
         event.statut = statut
-        db.session.commit()
         
         # Journal du changement de statut
         log = ActivityLog(
             action_type=ActivityLogType.STATUS_CHANGE.value,
             user_id=current_user.id,
             event_id=event.id,
-            details=json.dumps({
+            details={
                 'old_status': old_status, 
                 'new_status': statut, 
                 'target': 'EVENT',
                 'event_name': event.name,
                 'changed_by': current_user.email
-            })
+            }
         )
         db.session.add(log)
         db.session.commit()
@@ -516,7 +496,7 @@ def update_groups(event_id):
     
     Accès réservé aux organisateurs.
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
         
     # Données attendues : groups_pj, groups_pnj, groups_org (chaînes séparées par des virgules)
     groups_pj = [g.strip() for g in request.form.get('groups_pj', '').split(',') if g.strip()]
@@ -529,15 +509,14 @@ def update_groups(event_id):
         "Organisateur": groups_org
     }
     
-    event.groups_config = json.dumps(config)
-    db.session.commit()
+    event.groups_config = config
     
     # Journal de la mise à jour des groupes
     log = ActivityLog(
         action_type=ActivityLogType.GROUPS_UPDATE.value,
         user_id=current_user.id,
         event_id=event.id,
-        details=json.dumps({'message': 'Groups configuration updated'})
+        details={'message': 'Groups configuration updated'}
     )
     db.session.add(log)
     db.session.commit()
@@ -555,7 +534,7 @@ def add_role(event_id):
     
     Accès réservé aux organisateurs.
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
     name = request.form.get('name')
     if not name:
@@ -574,7 +553,6 @@ def add_role(event_id):
     )
     
     db.session.add(new_role)
-    db.session.commit()
     
     # Notification
     from services.notification_service import create_notification
@@ -584,6 +562,7 @@ def add_role(event_id):
         action_type='role_created',
         description=f"Action : ajout du rôle '{name}'"
     )
+    db.session.commit()
     
     flash(f'Rôle "{name}" créé avec succès.', 'success')
     return redirect(url_for('event.detail', event_id=event.id) + '#list-roles')
@@ -598,7 +577,7 @@ def update_role(event_id, role_id):
     
     Accès réservé aux organisateurs.
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     role = Role.query.filter_by(id=role_id, event_id=event_id).first_or_404()
     
     name = request.form.get('name')
@@ -619,8 +598,6 @@ def update_role(event_id, role_id):
     role.pdf_url = request.form.get('pdf_url') or None
     role.comment = request.form.get('comment') or None
     
-    db.session.commit()
-    
     # Notification
     from services.notification_service import create_notification
     desc = f"Action : modification du rôle '{name}'"
@@ -633,6 +610,7 @@ def update_role(event_id, role_id):
         action_type='role_updated',
         description=desc
     )
+    db.session.commit()
     
     flash(f'Rôle "{name}" mis à jour.', 'success')
     return redirect(url_for('event.detail', event_id=event.id) + '#list-roles')
@@ -647,7 +625,7 @@ def delete_role(event_id, role_id):
     
     Accès réservé aux organisateurs.
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     role = Role.query.filter_by(id=role_id, event_id=event_id).first_or_404()
     
     # Unassign participants associated with this role
@@ -662,7 +640,6 @@ def delete_role(event_id, role_id):
     CastingAssignment.query.filter_by(role_id=role.id).delete()
     
     db.session.delete(role)
-    db.session.commit()
     
     # Notification
     from services.notification_service import create_notification
@@ -672,6 +649,7 @@ def delete_role(event_id, role_id):
         action_type='role_deleted',
         description=f"Action : suppression du rôle '{role.name}'"
     )
+    db.session.commit()
     
     flash(f'Rôle "{role.name}" supprimé.', 'success')
     return redirect(url_for('event.detail', event_id=event.id) + '#list-roles')
@@ -685,7 +663,10 @@ def trombinoscope_content(event_id):
     Renvoie le contenu HTML du trombinoscope pour l'onglet correspondant.
     Permet le rafraîchissement dynamique.
     """
-    event = Event.query.options(joinedload(Event.participants).joinedload(Participant.user)).get_or_404(event_id)
+    # L'événement est déjà en session (décorateur) : ses participants et leurs
+    # utilisateurs sont chargés en une requête plutôt qu'à la demande
+    event = Event.query.options(joinedload(Event.participants).joinedload(Participant.user))\
+        .populate_existing().get(event_id)
     
     # Récupération des rôles (similaire à 'detail')
     roles = Role.query.filter_by(event_id=event.id)\
@@ -701,6 +682,7 @@ def trombinoscope_content(event_id):
 @event_bp.route('/event/<int:event_id>/trombinoscope/export/odt', methods=['GET'])
 @login_required
 @organizer_required
+@read_only_db
 def export_trombinoscope_odt(event_id):
     """
     Exporte le trombinoscope au format ODT.
@@ -713,7 +695,7 @@ def export_trombinoscope_odt(event_id):
     """
     try:
         import re
-        event = Event.query.get_or_404(event_id)
+        event = g.current_event
         
         include_type = request.args.get('include_type') == 'on'
         include_player_name = request.args.get('include_player_name') == 'on'
@@ -749,6 +731,7 @@ def export_trombinoscope_odt(event_id):
 @event_bp.route('/event/<int:event_id>/trombinoscope/export/images', methods=['GET'])
 @login_required
 @organizer_required
+@read_only_db
 def export_trombinoscope_images(event_id):
     """
     Exporte les images du trombinoscope dans une archive ZIP.
@@ -763,7 +746,7 @@ def export_trombinoscope_images(event_id):
     """
     try:
         import re
-        event = Event.query.get_or_404(event_id)
+        event = g.current_event
         
         # Récupération des options
         # Pour la backward compatibility ou lien direct: on peut assumer True par défaut?
@@ -813,17 +796,18 @@ def join(event_id):
     
     Le statut initial est 'À valider' et nécessite validation par un organisateur.
     """
-    event = Event.query.get_or_404(event_id)
+    event = get_current_event(event_id)
     
     if event.statut in ['Annulé', 'Terminé']:
         flash('Impossible de rejoindre cet événement (Annulé ou Terminé).', 'danger')
         return redirect(url_for('event.detail', event_id=event.id))
         
-    if Participant.query.filter_by(event_id=event.id, user_id=current_user.id).first():
-        flash('Vous participez déjà à cet événement.', 'warning')
+    # Type canonique (PJ, PNJ, Organisateur) : l'INSERT Core ne passe pas par les validateurs
+    try:
+        registration_type = canonical_value(ParticipantType, request.form.get('type', ParticipantType.PJ.value))
+    except RegistrationValueError:
+        flash("Type d'inscription invalide.", 'danger')
         return redirect(url_for('event.detail', event_id=event.id))
-    
-    registration_type = request.form.get('type', ParticipantType.PJ.value)
     # Le champ 'group' n'est pas utilisé dans le constructeur Participant.
     # Le code est conservé tel quel, mais le champ n'est pas passé au constructeur.
     # Le champ 'group' est omis dans la création du Participant.
@@ -839,10 +823,9 @@ def join(event_id):
         share_discord = request.form.get('share_discord', 'on') == 'on'
         share_facebook = request.form.get('share_facebook', 'on') == 'on'
         
-        # Création et sauvegarde de la participation
-        participant = Participant(
-            event_id=event.id, 
-            user_id=current_user.id,
+        # Création de la participation (INSERT ... ON CONFLICT : un double envoi ne crée pas de doublon)
+        participant_id = upsert_participant(
+            event.id, current_user.id,
             type=registration_type,
             registration_status=status,
             comment=comment,
@@ -856,21 +839,23 @@ def join(event_id):
             share_discord=share_discord,
             share_facebook=share_facebook
         )
-        db.session.add(participant)
+        if not participant_id:
+            db.session.rollback()
+            flash('Vous participez déjà à cet événement.', 'warning')
+            return redirect(url_for('event.detail', event_id=event_id))
         
         # Log de l'activité
         log = ActivityLog(
             user_id=current_user.id,
             action_type=ActivityLogType.EVENT_PARTICIPATION.value,
             event_id=event.id,
-            details=json.dumps({
+            details={
                 'type': registration_type,
                 'status': status,
                 'comment': comment
-            })
+            }
         )
         db.session.add(log)
-        db.session.commit()
         
         # Créer une notification pour les organisateurs
         from services.notification_service import create_notification
@@ -880,6 +865,7 @@ def join(event_id):
             action_type='participant_join_request',
             description=f"{current_user.prenom} {current_user.nom} a demandé à participer en tant que {registration_type}"
         )
+        db.session.commit()
         
         # Notification Discord
         if event.discord_webhook_url:
@@ -913,12 +899,12 @@ def delete_event(event_id):
     
     Accessible aux admin, créateurs et organisateurs de l'événement.
     """
-    event = Event.query.get_or_404(event_id)
+    event = get_current_event(event_id)
     
     # Vérification des permissions
     is_organizer = False
-    participant = Participant.query.filter_by(event_id=event.id, user_id=current_user.id).first()
-    if participant and participant.type.lower() == ParticipantType.ORGANISATEUR.value.lower() and participant.registration_status == RegistrationStatus.VALIDATED.value:
+    participant = get_current_membership(event_id)
+    if participant and participant.is_organizer and participant.registration_status == RegistrationStatus.VALIDATED.value:
         is_organizer = True
         
     if not (current_user.is_admin or is_organizer):
@@ -928,40 +914,27 @@ def delete_event(event_id):
     try:
         event_name = event.name # Sauvegarde du nom pour le log
         
-        # 1. Supprimer les Rôles (Cascade manuelle si nécessaire, mais foreign key set to null or delete logic needed)
-        # Note: SQLAlchemy cascade might handle this depending on model def, but explicit is safer here to be sure
-        Role.query.filter_by(event_id=event.id).delete()
-        
-        # 2. Supprimer les Participants
-        Participant.query.filter_by(event_id=event.id).delete()
-        
-        # 3. Supprimer les Logs liés directement à l'événement ?
-        # Le User demande "toutes les données concernant cet événement". 
-        # Les anciens ActivityLogs référençant l'event_id vont avoir event_id=NULL si on ne les supprime pas et que la contrainte le fait.
-        # Mais pour l'historique système, on préfère souvent garder les traces même si l'objet est supprimé.
-        # Cependant, pour respecter "toutes les données", on va laisser l'activity log de suppression faire foi.
-        # On va mettre à NULL les event_id des logs existants pour éviter les incohérences ou erreurs FK, 
-        # ou les laisser tels quels si la BDD est configurée en CASCADE (ce qui n'est pas garanti par défaut en SQLite/SQLAlchemy sans config explicite).
-        # On va explicitement set NULL pour être propre.
-        ActivityLog.query.filter_by(event_id=event.id).update({'event_id': None})
-        
-        # 4. Supprimer l'événement
-        db.session.delete(event)
-        
-        # 5. Logger la suppression
+        # Événement masqué et fermé aux écritures, journal de la suppression,
+        # avant le traitement par lots
+        event.is_deleting = True
         log = ActivityLog(
             action_type=ActivityLogType.EVENT_DELETION.value,
             user_id=current_user.id,
-            details=json.dumps({
+            details={
                 'event_name': event_name,
                 'deleted_by_email': current_user.email
-            })
+            }
         )
         db.session.add(log)
-        
         db.session.commit()
         
-        flash(f"L'événement '{event_name}' et toutes ses données ont été supprimés.", "success")
+        # Suppression ensembliste par lots (rôles, participants, casting,
+        # notifications, GForms, liens, compteurs) puis dossier d'uploads
+        from services.event_deletion_service import start_event_deletion
+        if start_event_deletion(event.id) is None:
+            flash(f"La suppression de l'événement '{event_name}' et de toutes ses données est en cours.", "success")
+        else:
+            flash(f"L'événement '{event_name}' et toutes ses données ont été supprimés.", "success")
         return redirect(url_for('admin.dashboard'))
         
     except DatabaseError as e:
@@ -981,7 +954,7 @@ def casting_interface(event_id):
     """
     Interface de gestion du casting.
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
     breadcrumbs = [
         ('GN Manager', url_for('admin.dashboard')),
@@ -995,13 +968,14 @@ def casting_interface(event_id):
 @event_bp.route('/event/<int:event_id>/casting_data')
 @login_required
 @organizer_required
+@read_only_db
 def casting_data(event_id):
     """
     Retourne les données de casting au format JSON.
     
     Inclut les participants groupés par type, les propositions, les attributions et les scores.
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
     # Récupérer les participants validés, regroupés par type
     participants = Participant.query.filter_by(
@@ -1063,7 +1037,7 @@ def casting_data(event_id):
         'assignments': assignments,
         'scores': scores,
         'is_casting_validated': event.is_casting_validated or False,
-        'groups_config': json.loads(event.groups_config) if event.groups_config else {},
+        'groups_config': event.groups_config or {},
         'roles': [{'id': r.id, 'name': r.name, 'type': r.type, 'genre': (getattr(r, 'genre', None) or '').strip(), 'group': getattr(r, 'group', None)} for r in roles]
     })
 
@@ -1075,7 +1049,7 @@ def add_proposal(event_id):
     """
     Ajoute une nouvelle proposition de casting.
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
     data = request.get_json()
     name = data.get('name', '').strip()
@@ -1092,7 +1066,6 @@ def add_proposal(event_id):
         position=max_pos + 1
     )
     db.session.add(proposal)
-    db.session.commit()
     
     # Notification
     from services.notification_service import create_notification
@@ -1102,6 +1075,7 @@ def add_proposal(event_id):
         action_type='casting_proposal_added',
         description=f"Action : ajout d'une proposition '{name}'"
     )
+    db.session.commit()
     
     return jsonify({'id': proposal.id, 'name': proposal.name})
 
@@ -1113,7 +1087,7 @@ def casting_assign(event_id):
     """
     Attribue un participant à un rôle pour une proposition donnée.
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
     data = request.get_json()
     role_id = data.get('role_id')
@@ -1168,7 +1142,7 @@ def delete_proposal(event_id):
     """
     Supprime une proposition de casting et toutes ses attributions.
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
     data = request.get_json()
     proposal_id = data.get('proposal_id')
@@ -1194,7 +1168,7 @@ def toggle_casting_validation(event_id):
     
     Quand validé, les participants peuvent voir leur rôle assigné.
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
     data = request.get_json() or {}
     validated = data.get('validated')
@@ -1204,8 +1178,6 @@ def toggle_casting_validation(event_id):
     else:
         event.is_casting_validated = not event.is_casting_validated
     
-    db.session.commit()
-    
     # Notification
     from services.notification_service import create_notification
     status_text = "validé" if event.is_casting_validated else "non-validé"
@@ -1216,6 +1188,7 @@ def toggle_casting_validation(event_id):
         action_type='casting_validation',
         description=f"Action : modification de la validation du casting en '{status_text}'"
     )
+    db.session.commit()
     
     return jsonify({
         'success': True,
@@ -1230,7 +1203,7 @@ def update_casting_score(event_id):
     """
     Met à jour le score d'une attribution de casting.
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
     data = request.get_json()
     proposal_id = data.get('proposal_id')
@@ -1275,7 +1248,7 @@ def auto_assign_casting(event_id):
     Calcule et attribue automatiquement les rôles en utilisant l'algorithme Hongrois (Kuhn-Munkres).
     Cela garantit une solution mathématiquement optimale pour maximiser le score global.
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
     # Vérifier que le casting n'est pas validé
     if event.is_casting_validated:
@@ -1354,7 +1327,7 @@ def auto_assign_casting(event_id):
 @organizer_required
 def mark_notification_read(event_id, notif_id):
     """
-    Marque une notification comme lue.
+    Marque une notification comme lue pour l'organisateur connecté.
     
     Accès réservé aux organisateurs.
     """
@@ -1367,7 +1340,7 @@ def mark_notification_read(event_id, notif_id):
     if notification.event_id != event_id:
         return jsonify({'success': False, 'error': 'Notification not found'}), 403
     
-    success = mark_as_read(notif_id)
+    success = mark_as_read(notification, current_user.id)
     return jsonify({'success': success})
 
 
@@ -1376,14 +1349,48 @@ def mark_notification_read(event_id, notif_id):
 @organizer_required
 def mark_all_notifications_read(event_id):
     """
-    Marque toutes les notifications d'un événement comme lues.
+    Marque toutes les notifications d'un événement comme lues pour
+    l'organisateur connecté (avance son curseur de lecture).
+
+    Un 'up_to_id' optionnel (JSON) limite la mise à jour aux notifications
+    affichées, sans marquer celles arrivées depuis le chargement de la page.
     """
-    from models import EventNotification
-    notifications = EventNotification.query.filter_by(event_id=event_id, is_read=False).all()
-    for notif in notifications:
-        notif.is_read = True
-    db.session.commit()
-    return jsonify({'success': True, 'count': len(notifications)})
+    from services.notification_service import mark_all_as_read
+    data = request.get_json(silent=True) or {}
+    try:
+        up_to_id = int(data['up_to_id']) if data.get('up_to_id') is not None else None
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'up_to_id invalide'}), 400
+    last_read_id = mark_all_as_read(event_id, current_user.id, up_to_id=up_to_id)
+    return jsonify({'success': True, 'last_read_id': last_read_id})
+
+
+@event_bp.route('/event/<int:event_id>/notifications/feed')
+@login_required
+@organizer_required
+def notification_feed(event_id):
+    """
+    Fil de notifications paginé par curseur (JSON).
+
+    Paramètres : before_id (notifications plus anciennes), since_id
+    (nouvelles notifications), limit (plafonné à NOTIFICATIONS_PER_PAGE).
+    """
+    from services.notification_service import get_notification_feed, serialize_notification
+    before_id = request.args.get('before_id', type=int)
+    since_id = request.args.get('since_id', type=int)
+    if before_id is not None and since_id is not None:
+        return jsonify({'error': 'before_id et since_id sont exclusifs'}), 400
+    limit = request.args.get('limit', DefaultValues.NOTIFICATIONS_PER_PAGE, type=int)
+    limit = max(1, min(limit, DefaultValues.NOTIFICATIONS_PER_PAGE))
+
+    feed = get_notification_feed(event_id, current_user.id, before_id=before_id,
+                                 since_id=since_id, limit=limit)
+    return jsonify({
+        'items': [serialize_notification(n, n.id not in feed['unread_ids']) for n in feed['items']],
+        'unread_count': feed['unread_count'],
+        'has_more': feed['has_more'],
+        'next_before_id': feed['next_before_id'],
+    })
 
 
 @event_bp.route('/event/<int:event_id>/casting/reset_main', methods=['POST'])
@@ -1393,7 +1400,7 @@ def reset_main_casting(event_id):
     """
     Réinitialise toutes les attributions de la colonne principale (casting final).
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
     # Vérifier que le casting n'est pas validé
     if event.is_casting_validated:
@@ -12,22 +12,32 @@ import json
 import logging
 import csv
 from io import StringIO, TextIOWrapper
-from flask import Blueprint, render_template, request, jsonify, current_app, Response
+from flask import Blueprint, render_template, request, jsonify, current_app, Response, g
 from flask_login import login_required, current_user
 from datetime import datetime
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import SQLAlchemyError
 from werkzeug.security import generate_password_hash
 import secrets
 
-from models import db, Event, GFormsCategory, GFormsFieldMapping, GFormsSubmission, User, Participant, EventNotification
-from decorators import organizer_required
+from models import db, GFormsCategory, GFormsFieldMapping, GFormsSubmission, GFormsAnswer, User, Participant, EventNotification
+from decorators import organizer_required, read_only_db
+from utils.db_dialect import is_missing_table_error, insert_ignore, upsert_rows
+from utils.db_transaction import begin_write
+from exceptions import DatabaseBusyError
 from constants import RegistrationStatus, ParticipantType
 from services.email_service import send_new_account_invitation
+from services.participant_read_model import iter_participant_rows
+from services.registration_service import upsert_participant, upsert_submission
+from services.gforms_answer_service import (sync_submission_answers, get_answered_field_names,
+                                           get_event_answers, query_event_submissions)
 
 # Création du Blueprint
 gforms_bp = Blueprint('gforms', __name__)
 logger = logging.getLogger(__name__)
 
+# Taille de page maximale de l'API des soumissions
+MAX_SUBMISSIONS_PER_PAGE = 200
+
 
 @gforms_bp.route('/event/<int:event_id>/gforms')
 @login_required
@@ -37,7 +47,7 @@ def gforms_menu(event_id):
     Page principale du menu GForms.
     Affiche les 3 onglets : formulaires, catégories, settings.
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
     # Vérifier si le webhook secret est configuré
     if not event.webhook_secret:
@@ -58,27 +68,27 @@ def gforms_menu(event_id):
             position=0
         )
         db.session.add(default_category)
-        db.session.commit()
+        db.session.flush()
         logger.info(f"Created default 'Généralités' category for event {event_id}")
 
     # Vérifier et créer les mappings par défaut pour timestamp et type_ajout
     default_fields = ['timestamp', 'type_ajout']
-    mappings_changed = False
+    # Catégorie et mappings par défaut partent dans le même commit
+    mappings_changed = bool(db.session.new)
     
-    for field_name in default_fields:
-        mapping = GFormsFieldMapping.query.filter_by(
-            event_id=event_id,
-            field_name=field_name
-        ).first()
-        
-        if not mapping:
-            mapping = GFormsFieldMapping(
-                event_id=event_id,
-                field_name=field_name,
-                category_id=default_category.id
-            )
-            db.session.add(mapping)
-            mappings_changed = True
+    # Une seule instruction, les mappings existants sont ignorés (ON CONFLICT DO NOTHING)
+    missing = {field_name for field_name in default_fields} - {
+        field_name for (field_name,) in db.session.query(GFormsFieldMapping.field_name).filter(
+            GFormsFieldMapping.event_id == event_id,
+            GFormsFieldMapping.field_name.in_(default_fields)
+        )
+    }
+    if missing:
+        insert_ignore(GFormsFieldMapping, [
+            {'event_id': event_id, 'field_name': field_name, 'category_id': default_category.id}
+            for field_name in default_fields if field_name in missing
+        ], index_elements=['event_id', 'field_name'])
+        mappings_changed = True
             
     if mappings_changed:
         db.session.commit()
@@ -94,19 +104,41 @@ def gforms_menu(event_id):
 @gforms_bp.route('/event/<int:event_id>/gforms/submissions')
 @login_required
 @organizer_required
+@read_only_db
 def get_submissions(event_id):
     """
     API: Retourne la liste des soumissions avec pagination.
+    
+    Filtres, tri et recherche sont exécutés en SQL sur la table gforms_answer :
+    - q : texte libre (email et toutes les réponses)
+    - eq[<champ>]=valeur : égalité stricte sur un champ
+    - contains[<champ>]=texte : sous-chaîne sur un champ
+    - sort : timestamp, email, type_ajout ou nom de champ ; order : asc|desc
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
     # Pagination
     page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 50, type=int)
+    per_page = min(max(request.args.get('per_page', 50, type=int), 1), MAX_SUBMISSIONS_PER_PAGE)
+    
+    # Filtres
+    equals, contains = {}, {}
+    for key, value in request.args.items():
+        if key.startswith('eq[') and key.endswith(']'):
+            equals[key[3:-1]] = value
+        elif key.startswith('contains[') and key.endswith(']') and value:
+            contains[key[9:-1]] = value
+    search = request.args.get('q', '').strip() or None
+    sort = request.args.get('sort', 'timestamp')
+    order = 'asc' if request.args.get('order', 'desc').lower() == 'asc' else 'desc'
     
     try:
         # Récupérer les soumissions
-        submissions_query = GFormsSubmission.query.filter_by(event_id=event_id).order_by(GFormsSubmission.timestamp.desc())
+        try:
+            submissions_query = query_event_submissions(event_id, search=search, equals=equals,
+                                                        contains=contains, sort=sort, order=order)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         submissions_paginated = submissions_query.paginate(page=page, per_page=per_page, error_out=False)
         
         # Récupérer les mappings de champs pour connaître tous les champs disponibles
@@ -117,7 +149,7 @@ def get_submissions(event_id):
         submissions_data = []
         for sub in submissions_paginated.items:
             try:
-                raw_data = json.loads(sub.raw_data) if sub.raw_data else {}
+                raw_data = sub.raw_data or {}
                 
                 submissions_data.append({
                     'id': sub.id,
@@ -132,6 +164,7 @@ def get_submissions(event_id):
         
         return jsonify({
             'submissions': submissions_data,
+            'sort': {'field': sort, 'order': order},
             'pagination': {
                 'page': page,
                 'per_page': per_page,
@@ -141,8 +174,8 @@ def get_submissions(event_id):
                 'has_next': submissions_paginated.has_next
             }
         })
-    except OperationalError as e:
-        if 'no such table' in str(e).lower():
+    except SQLAlchemyError as e:
+        if is_missing_table_error(e):
             logger.warning(f"GFormsSubmission table not found: {e}")
             return jsonify({
                 'submissions': [],
@@ -165,7 +198,7 @@ def get_categories(event_id):
     """
     API: Retourne la liste des catégories.
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
     categories = GFormsCategory.query.filter_by(event_id=event_id).order_by(GFormsCategory.position).all()
     
@@ -187,7 +220,7 @@ def save_categories(event_id):
     API: Crée ou met à jour des catégories.
     Payload: { "categories": [{"id": 1, "name": "...", "color": "...", "position": 0}, ...] }
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
     data = request.get_json()
     categories_input = data.get('categories', [])
@@ -263,9 +296,6 @@ def save_categories(event_id):
         
         if removed_ids: actions.append(f"{len(removed_ids)} catégories supprimées")
         
-        db.session.commit()
-        logger.info(f"Saved {len(categories_input)} categories for event {event_id}")
-        
         if actions:
             from services.notification_service import create_notification
             create_notification(
@@ -275,6 +305,9 @@ def save_categories(event_id):
                 description=f"Configuration GForms : {', '.join(actions)}"
             )
         
+        db.session.commit()
+        logger.info(f"Saved {len(categories_input)} categories for event {event_id}")
+        
         return jsonify({'success': True, 'message': 'Catégories enregistrées'})
         
     except Exception as e:
@@ -290,24 +323,16 @@ def get_fields(event_id):
     """
     API: Retourne la liste des champs détectés avec leurs mappings.
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
     try:
-        # Récupérer tous les champs détectés à partir des soumissions
-        submissions = GFormsSubmission.query.filter_by(event_id=event_id).all()
-        detected_fields = set()
+        # Champs ayant au moins une réponse (table normalisée, sans décoder raw_data)
+        detected_fields = set(get_answered_field_names(event_id))
         
         # Champs système toujours présents
         detected_fields.add('timestamp')
         detected_fields.add('type_ajout')
         
-        for sub in submissions:
-            try:
-                raw_data = json.loads(sub.raw_data) if sub.raw_data else {}
-                detected_fields.update(raw_data.keys())
-            except:
-                continue
-        
         # Récupérer les mappings existants
         mappings = GFormsFieldMapping.query.filter_by(event_id=event_id).all()
         mapping_dict = {m.field_name: m for m in mappings}
@@ -336,8 +361,8 @@ def get_fields(event_id):
             })
         
         return jsonify({'fields': fields_data})
-    except OperationalError as e:
-        if 'no such table' in str(e).lower():
+    except SQLAlchemyError as e:
+        if is_missing_table_error(e):
             # Retourner au moins les champs par défaut
             return jsonify({'fields': [
                 {'field_name': 'timestamp', 'field_alias': 'Date', 'category_id': None, 'category': None},
@@ -358,42 +383,22 @@ def save_field_mappings(event_id):
     API: Sauvegarde les associations champ → catégorie.
     Payload: { "mappings": [{"field_name": "...", "category_id": 1, "field_alias": "..."}, ...] }
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
     data = request.get_json()
     mappings_input = data.get('mappings', [])
     
     try:
-        for mapping_data in mappings_input:
-            field_name = mapping_data.get('field_name')
-            category_id = mapping_data.get('category_id')
-            field_alias = mapping_data.get('field_alias')
-            
-            if not field_name:
-                continue
-            
-            # Vérifier si le mapping existe already
-            mapping = GFormsFieldMapping.query.filter_by(
-                event_id=event_id,
-                field_name=field_name
-            ).first()
-            
-            if mapping:
-                # Mettre à jour
-                mapping.category_id = category_id
-                mapping.field_alias = field_alias
-            else:
-                # Créer
-                mapping = GFormsFieldMapping(
-                    event_id=event_id,
-                    field_name=field_name,
-                    category_id=category_id,
-                    field_alias=field_alias
-                )
-                db.session.add(mapping)
-        
-        db.session.commit()
-        logger.info(f"Saved field mappings for event {event_id}")
+        # Une seule instruction : INSERT ... ON CONFLICT (event_id, field_name) DO UPDATE
+        upsert_rows(GFormsFieldMapping, [
+            {
+                'event_id': event_id,
+                'field_name': mapping_data.get('field_name'),
+                'category_id': mapping_data.get('category_id'),
+                'field_alias': mapping_data.get('field_alias'),
+            }
+            for mapping_data in mappings_input if mapping_data.get('field_name')
+        ], index_elements=['event_id', 'field_name'], update_columns=['category_id', 'field_alias'])
         
         from services.notification_service import create_notification
         create_notification(
@@ -403,6 +408,9 @@ def save_field_mappings(event_id):
             description=f"Configuration GForms : {len(mappings_input)} mappings mis à jour"
         )
         
+        db.session.commit()
+        logger.info(f"Saved field mappings for event {event_id}")
+        
         return jsonify({'success': True, 'message': 'Mappings enregistrés'})
         
     except Exception as e:
@@ -414,27 +422,33 @@ def save_field_mappings(event_id):
 @gforms_bp.route('/event/<int:event_id>/gforms/export')
 @login_required
 @organizer_required
+@read_only_db
 def export_gforms_data(event_id):
     """
     Export CSV fusionnant les données de Participant et les données GForms.
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
-    # 1. Récupérer toutes les soumissions GForms
-    submissions = GFormsSubmission.query.filter_by(event_id=event_id).all()
+    # 1. Récupérer toutes les soumissions GForms (réponses normalisées)
+    answers_by_submission = get_event_answers(event_id)
+    submissions = db.session.query(GFormsSubmission.id, GFormsSubmission.email)\
+        .filter_by(event_id=event_id).all()
     sub_map = {}
-    for s in submissions:
-        try:
-            sub_map[s.email.lower()] = json.loads(s.raw_data) if s.raw_data else {}
-        except:
-            sub_map[s.email.lower()] = {}
+    for sub_id, email in submissions:
+        sub_map[email.lower()] = answers_by_submission.get(sub_id, {})
             
     # 2. Récupérer tous les participants de l'événement
-    participants = Participant.query.filter_by(event_id=event_id).all()
+    participants = iter_participant_rows(event_id, [
+        User.email, User.nom, User.prenom, User.phone, User.discord, User.facebook,
+        Participant.type, Participant.registration_status, Participant.paf_status,
+        Participant.payment_amount, Participant.payment_method,
+        Participant.participant_phone, Participant.participant_discord, Participant.participant_facebook,
+        Participant.global_comment,
+    ])
     
     # 3. Collecter tous les champs dynamiques de GForms
     dynamic_fields = set()
-    for data in sub_map.values():
+    for data in answers_by_submission.values():
         dynamic_fields.update(data.keys())
     
     # Trier les champs pour la consistance
@@ -452,22 +466,22 @@ def export_gforms_data(event_id):
     processed_emails = set()
     
     for p in participants:
-        email_key = p.user.email.lower()
+        email_key = p.email.lower()
         processed_emails.add(email_key)
         form_data = sub_map.get(email_key, {})
         
         row = [
-            p.user.email,
-            p.user.nom,
-            p.user.prenom,
+            p.email,
+            p.nom,
+            p.prenom,
             p.type,
             p.registration_status,
             p.paf_status,
             p.payment_amount,
             p.payment_method,
-            p.participant_phone or p.user.phone or "",
-            p.participant_discord or p.user.discord or "",
-            p.participant_facebook or p.user.facebook or "",
+            p.participant_phone or p.phone or "",
+            p.participant_discord or p.discord or "",
+            p.participant_facebook or p.facebook or "",
             p.global_comment or ""
         ]
         
@@ -504,6 +518,7 @@ def export_gforms_data(event_id):
         action_type='gforms_export',
         description="Action : export des données GForms"
     )
+    db.session.commit()
     
     return Response(
         output.getvalue(),
@@ -523,7 +538,7 @@ def import_gforms_data(event_id):
     - Col 1 : Email
     - Col 2+ : Questions / Réponses
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
     if 'file' not in request.files:
         return jsonify({'success': False, 'error': 'Aucun fichier fourni'}), 400
@@ -554,6 +569,9 @@ def import_gforms_data(event_id):
             
         if len(headers) < 2:
             return jsonify({'success': False, 'error': 'Le fichier doit contenir au moins 2 colonnes (Timestamp, Email)'}), 400
+        
+        # Verrou d'écriture pris avant l'import (BEGIN IMMEDIATE, reprises)
+        begin_write()
             
         # Stats
         stats = {
@@ -566,6 +584,9 @@ def import_gforms_data(event_id):
         # Cache des utilisateurs/participants pour éviter trop de requêtes
         # (Optimisation simple : on ne charge pas tout, on fait au fil de l'eau mais on pourrait optimiser plus)
         
+        # Soumissions créées ou modifiées (réponses normalisées synchronisées en fin d'import)
+        touched_submissions = []
+        
         for row_idx, row in enumerate(csv_reader, start=2): # Start=2 car ligne 1 = header
             if not row:
                 continue
@@ -658,7 +679,7 @@ def import_gforms_data(event_id):
                     log = ActivityLog(
                         action_type=ActivityLogType.USER_REGISTRATION.value, # Type d'événement d'activité
                         user_id=current_user.id,
-                        details=json.dumps({'email': email, 'source': 'gforms_import', 'event_id': event.id})
+                        details={'email': email, 'source': 'gforms_import', 'event_id': event.id}
                     )
                     db.session.add(log)
                     
@@ -687,17 +708,13 @@ def import_gforms_data(event_id):
                 if nom_form: user.nom = nom_form
                 if prenom_form: user.prenom = prenom_form
                 
-                # 2. Gestion Participant
-                participant = Participant.query.filter_by(user_id=user.id, event_id=event.id).first()
-                if not participant:
-                    participant = Participant(
-                        user_id=user.id,
-                        event_id=event.id,
-                        type=ParticipantType.PJ.value,
-                        registration_status=RegistrationStatus.TO_VALIDATE.value
-                    )
-                    db.session.add(participant)
-                    
+                # 2. Gestion Participant (INSERT ... ON CONFLICT : une requête, pas de doublon)
+                participant_id = upsert_participant(
+                    event.id, user.id,
+                    type=ParticipantType.PJ.value,
+                    registration_status=RegistrationStatus.TO_VALIDATE.value
+                )
+                if participant_id:
                     # Notification
                     notif = EventNotification(
                         event_id=event.id,
@@ -710,30 +727,29 @@ def import_gforms_data(event_id):
                 else:
                     type_ajout = "mis à jour"
 
-                # 3. Gestion GFormsSubmission
-                submission = GFormsSubmission.query.filter_by(event_id=event.id, email=email).first()
-                if not submission:
-                    submission = GFormsSubmission(
-                        event_id=event.id,
-                        user_id=user.id,
-                        email=email,
-                        timestamp=datetime.utcnow(), # On met le temps d'import par defaut
-                        type_ajout=type_ajout,
-                        raw_data=json.dumps(answers)
-                    )
-                    db.session.add(submission)
+                # 3. Gestion GFormsSubmission (INSERT ... ON CONFLICT sur (event_id, email))
+                submission, created = upsert_submission(
+                    event.id, email,
+                    user_id=user.id,
+                    timestamp=datetime.utcnow(), # On met le temps d'import par defaut
+                    type_ajout=type_ajout,
+                    raw_data=answers
+                )
+                if created:
                     stats['imported'] += 1
+                    touched_submissions.append(submission)
                 else:
                     # Fusion des données
-                    current_data = json.loads(submission.raw_data) if submission.raw_data else {}
+                    current_data = dict(submission.raw_data or {})
                     # On écrase/ajoute les nouvelles valeurs non vides
                     for k, v in answers.items():
                         current_data[k] = v
                     
-                    submission.raw_data = json.dumps(current_data)
+                    submission.raw_data = current_data
                     submission.type_ajout = "mis à jour" # Force status update
                     submission.timestamp = datetime.utcnow() # Mettre à jour le timestamp
                     stats['updated'] += 1
+                    touched_submissions.append(submission)
                     
             except Exception as e:
                 db.session.rollback() # Rollback partiel si possible ? Non, session unique.
@@ -750,9 +766,6 @@ def import_gforms_data(event_id):
         # On récupère toutes les clés de toutes les réponses importées
         # (C'est déjà fait implicitement car on a stocké dans raw_data, mais il faut mettre à jour la table mappings)
         
-        # Recupération des champs existants
-        existing_mappings = {m.field_name for m in GFormsFieldMapping.query.filter_by(event_id=event_id).all()}
-        
         # On parcourt les headers (sauf 0 et 1)
         default_cat = GFormsCategory.query.filter(
             GFormsCategory.event_id == event_id,
@@ -764,16 +777,15 @@ def import_gforms_data(event_id):
              db.session.add(default_cat)
              db.session.flush()
              
-        for h in headers[2:]:
-            h = h.strip()
-            if h and h not in existing_mappings:
-                new_mapping = GFormsFieldMapping(
-                    event_id=event_id,
-                    field_name=h,
-                    category_id=default_cat.id
-                )
-                db.session.add(new_mapping)
-                existing_mappings.add(h)
+        # Une seule instruction, les champs déjà mappés sont ignorés (ON CONFLICT DO NOTHING)
+        field_names = dict.fromkeys(h.strip() for h in headers[2:] if h.strip())
+        insert_ignore(GFormsFieldMapping, [
+            {'event_id': event_id, 'field_name': h, 'category_id': default_cat.id}
+            for h in field_names
+        ], index_elements=['event_id', 'field_name'])
+        
+        # Réponses normalisées (miroir de raw_data)
+        sync_submission_answers(touched_submissions)
 
         # Notification récapitulative pour l'import
         if stats['imported'] > 0 or stats['updated'] > 0:
@@ -818,6 +830,8 @@ def import_gforms_data(event_id):
 
     except UnicodeDecodeError:
         return jsonify({'success': False, 'error': 'Encodage fichier invalide (utilisez UTF-8)'}), 400
+    except DatabaseBusyError:
+        raise  # 503 (error_handler)
     except Exception as e:
         db.session.rollback()
         logger.error(f"Erreur import GForms: {e}", exc_info=True)
@@ -833,7 +847,7 @@ def purge_gforms_data(event_id):
     Supprime : GFormsSubmission, GFormsFieldMapping, GFormsCategory, FormResponse.
     Ne touche pas aux utilisateurs ni aux participants.
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
 
     try:
         from models import FormResponse
@@ -845,13 +859,13 @@ def purge_gforms_data(event_id):
         nb_responses = FormResponse.query.filter_by(event_id=event_id).count()
 
         # Supprimer dans l'ordre (respecter les FK)
+        submission_ids = db.session.query(GFormsSubmission.id).filter_by(event_id=event_id)
+        GFormsAnswer.query.filter(GFormsAnswer.submission_id.in_(submission_ids)).delete(synchronize_session=False)
         GFormsSubmission.query.filter_by(event_id=event_id).delete()
         GFormsFieldMapping.query.filter_by(event_id=event_id).delete()
         GFormsCategory.query.filter_by(event_id=event_id).delete()
         FormResponse.query.filter_by(event_id=event_id).delete()
 
-        db.session.commit()
-
         total = nb_submissions + nb_mappings + nb_categories + nb_responses
         logger.info(f"Purged all GForms data for event {event_id}: "
                      f"{nb_submissions} submissions, {nb_mappings} mappings, "
@@ -867,6 +881,7 @@ def purge_gforms_data(event_id):
                         f"{nb_submissions} soumissions, {nb_categories} catégories, "
                         f"{nb_mappings} mappings, {nb_responses} réponses brutes"
         )
+        db.session.commit()
 
         return jsonify({
             'success': True,
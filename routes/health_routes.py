@@ -78,6 +78,35 @@ def metrics():
         if os.path.exists(db_path):
             db_size = os.path.getsize(db_path)
     
+    # Profil de connexion et PRAGMA effectifs (lus sur une connexion du pool)
+    database_info = {
+        'size_bytes': db_size,
+        'size_mb': round(db_size / (1024 * 1024), 2),
+        'profile': current_app.config.get('DB_PROFILE'),
+    }
+    if db_uri.startswith('sqlite'):
+        from utils.deploy_config_loader import read_sqlite_pragmas
+        options = current_app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+        database_info['pragmas'] = read_sqlite_pragmas(db.session.connection())
+        database_info['pool'] = {
+            'class': type(db.engine.pool).__name__,
+            'size': options.get('pool_size'),
+            'recycle': options.get('pool_recycle'),
+        }
+    elif db_uri.startswith('postgresql'):
+        pool = db.engine.pool
+        database_info['settings'] = current_app.config.get('POSTGRES_SETTINGS', {})
+        database_info['pool'] = {
+            'class': type(pool).__name__,
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'overflow': pool.overflow(),
+        }
+    
+    # Contention du verrou d'écriture par endpoint (attente, détention, reprises)
+    from utils.db_transaction import lock_metrics
+    database_info['write_locks'] = lock_metrics().snapshot()
+    
     # Compter les fichiers de logs
     log_dir = os.path.join(current_app.root_path, 'logs')
     log_files_count = 0
@@ -89,10 +118,7 @@ def metrics():
         'uptime_seconds': round(uptime, 2),
         'python_version': f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
         'flask_debug': current_app.debug,
-        'database': {
-            'size_bytes': db_size,
-            'size_mb': round(db_size / (1024 * 1024), 2)
-        },
+        'database': database_info,
         'logs': {
             'directory': log_dir,
             'file_count': log_files_count
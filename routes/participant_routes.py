@@ -7,12 +7,12 @@ Ce module gère :
 - API d'assignation de rôles
 """
 
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app, g
 from flask_login import login_required, current_user
-from models import db, Event, Participant, Role, ActivityLog
+from models import db, Participant, Role, ActivityLog, User, CastingAssignment
 from sqlalchemy.orm import joinedload
-from constants import ParticipantType, RegistrationStatus, PAFStatus, ActivityLogType
-from decorators import organizer_required
+from constants import ParticipantType, RegistrationStatus, PAFStatus, ActivityLogType, DefaultValues
+from decorators import organizer_required, read_only_db, write_transaction
 import json
 import csv
 import io
@@ -22,6 +22,15 @@ from googleapiclient.discovery import build
 import datetime
 from services.notification_service import create_notification, count_unread_notifications
 from utils.file_validation import validate_upload, generate_unique_filename, FileValidationError
+from utils.file_cleanup import schedule_file_removal
+from utils.db_transaction import begin_write
+from services.participant_counter_service import recount_event_counters
+from services.participant_read_model import list_participants, iter_participant_rows, ROLE_NAME
+from services.participant_status_service import (change_registration_status, StatusTransitionError,
+                                                 CapacityExceededError)
+from services.participant_patch_service import (apply_participant_patch, paf_due_map, compute_paf_status,
+                                                PatchValidationError)
+from utils.request_context import get_current_event, get_current_membership
 from werkzeug.utils import secure_filename
 import os
 import shutil
@@ -45,15 +54,12 @@ isateurs.
     Returns:
         Template de gestion des participants
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
         
-    # Optimisation N+1 avec joinedload
-    participants = Participant.query.filter_by(event_id=event.id)\
-        .options(joinedload(Participant.user), joinedload(Participant.role), joinedload(Participant.assigned_role_ref)).all()
+    # Modèle de lecture : colonnes affichées uniquement, sans objets ORM
+    participants = list_participants(event.id)
         
-    groups_config = json.loads(event.groups_config or '{}')
-    
-    groups_config = json.loads(event.groups_config or '{}')
+    groups_config = event.groups_config or {}
     
     breadcrumbs = [
         ('GN Manager', url_for('admin.dashboard')),
@@ -63,9 +69,9 @@ isateurs.
         
     
     
-    payment_methods = json.loads(event.payment_methods or '["Helloasso"]')
+    payment_methods = event.payment_methods or ['Helloasso']
     
-    unread_count = count_unread_notifications(event.id)
+    unread_count = count_unread_notifications(event.id, current_user.id)
     
     return render_template('manage_participants.html', event=event, participants=participants, groups_config=groups_config, payment_methods=payment_methods, breadcrumbs=breadcrumbs, is_organizer=True, unread_count=unread_count)
 
@@ -73,15 +79,23 @@ isateurs.
 @participant_bp.route('/event/<int:event_id>/participants/export')
 @login_required
 @organizer_required
+@read_only_db
 def export_participants(event_id):
     """
     Exporte tous les participants d'un événement en CSV avec toutes les données visibles.
     """
-    event = Event.query.get_or_404(event_id)
-    
-    # Récupérer tous les participants avec leurs users et rôles
-    participants = Participant.query.filter_by(event_id=event.id)\
-        .options(joinedload(Participant.user), joinedload(Participant.role)).all()
+    event = g.current_event
+    
+    # Colonnes exportées uniquement, lues par lots (curseur serveur sous PostgreSQL)
+    participants = iter_participant_rows(event.id, [
+        User.nom, User.prenom, User.email, User.age, User.genre,
+        Participant.type, Participant.group, Participant.registration_status,
+        Participant.participant_phone, Participant.participant_discord, Participant.participant_facebook,
+        Participant.share_phone, Participant.share_discord, Participant.share_facebook,
+        ROLE_NAME,
+        Participant.paf_status, Participant.paf_type, Participant.payment_amount, Participant.payment_method,
+        Participant.global_comment, Participant.info_payement,
+    ])
     
     # Créer le CSV en mémoire
     output = io.StringIO()
@@ -98,23 +112,22 @@ def export_participants(event_id):
     ]
     writer.writerow(headers)
     
+    # Montants dus par type PAF (configuration décodée une seule fois)
+    paf_amounts = {}
+    for config in event.paf_config or []:
+        paf_amounts.setdefault(config.get('name'), float(config.get('amount', 0)))
+    
     # Données
     for p in participants:
         # Calculer montant dû basé sur le type PAF
-        paf_config = json.loads(event.paf_config or '[]')
-        due_amount = 0.0
-        if p.paf_type:
-            for config in paf_config:
-                if config.get('name') == p.paf_type:
-                    due_amount = float(config.get('amount', 0))
-                    break
+        due_amount = paf_amounts.get(p.paf_type, 0.0) if p.paf_type else 0.0
         
         row = [
-            p.user.nom or '',
-            p.user.prenom or '',
-            p.user.email or '',
-            p.user.age or '',
-            p.user.genre or '',
+            p.nom or '',
+            p.prenom or '',
+            p.email or '',
+            p.age or '',
+            p.genre or '',
             p.type or '',
             p.group or '',
             p.registration_status or '',
@@ -123,7 +136,7 @@ def export_participants(event_id):
             p.participant_discord if p.share_discord else '',
             p.participant_facebook if p.share_facebook else '',
             # Rôle
-            p.role.name if p.role else '',
+            p.role_name or '',
             # PAF
             p.paf_status or '',
             p.paf_type or '',
@@ -162,6 +175,9 @@ def update_contact(event_id, participant_id):
         flash('Accès non autorisé', 'danger')
         return redirect(url_for('event.detail', event_id=event_id))
     
+    # Verrou d'écriture pris une fois la propriété vérifiée
+    begin_write()
+    
     # Récupérer le champ à modifier et la nouvelle valeur
     field = request.form.get('field')
     value = request.form.get('value', '').strip()
@@ -185,11 +201,12 @@ def update_contact(event_id, participant_id):
 @participant_bp.route('/event/<int:event_id>/participants/bulk_update', methods=['POST'])
 @login_required
 @organizer_required
+@write_transaction
 def bulk_update(event_id):
     """
     Mise à jour groupée des participants.
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
         
     p_ids = request.form.getlist('participant_ids')
     
@@ -199,6 +216,7 @@ def bulk_update(event_id):
         Participant.event_id == event.id
     ).all()
     participants_map = {str(p.id): p for p in participants}
+    updated_ids = []
     
     for p_id in p_ids:
         # Utiliser le dictionnaire au lieu de faire une requête SQL à chaque itération
@@ -215,20 +233,22 @@ def bulk_update(event_id):
             p.payment_amount = float(pay_amt) if pay_amt else 0.0
             p.payment_method = request.form.get(f'pay_method_{p_id}', p.payment_method)
             p.comment = request.form.get(f'comment_{p_id}', p.comment)
-            
-            # Journal de la mise à jour groupée pour ce participant
-            log = ActivityLog(
-                user_id=current_user.id,
-                action_type=ActivityLogType.PARTICIPANT_UPDATE.value,
-                event_id=event.id,
-                details=json.dumps({
-                    'participant_id': p.id,
-                    'update_type': 'bulk_update',
-                    'new_type': p.type,
-                    'new_group': p.group
-                })
-            )
-            db.session.add(log)
+            updated_ids.append(p.id)
+    
+    # Une seule ligne de journal pour toute la mise à jour groupée
+    if updated_ids:
+        log = ActivityLog(
+            user_id=current_user.id,
+            action_type=ActivityLogType.PARTICIPANT_UPDATE.value,
+            event_id=event.id,
+            details={
+                'event_name': event.name,
+                'update_type': 'bulk_update',
+                'participant_ids': updated_ids,
+                'updated_fields': f"mise à jour groupée de {len(updated_ids)} participant(s)"
+            }
+        )
+        db.session.add(log)
             
     db.session.commit()
     flash('Participants mis à jour avec succès.', 'success')
@@ -238,11 +258,12 @@ def bulk_update(event_id):
 @participant_bp.route('/event/<int:event_id>/participant/<int:p_id>/update', methods=['POST'])
 @login_required
 @organizer_required
+@write_transaction
 def update(event_id, p_id):
     """
     Met à jour un participant depuis la modal d'édition.
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
     p = Participant.query.get_or_404(p_id)
     if p.event_id != event_id:
@@ -316,14 +337,14 @@ def update(event_id, p_id):
         user_id=current_user.id,
         action_type=ActivityLogType.PARTICIPANT_UPDATE.value,
         event_id=event.id,
-        details=json.dumps({
+        details={
             'participant_id': p.id,
             'update_type': 'single_update',
             'new_type': p.type,
             'new_group': p.group,
             'paf_status': p.paf_status,
             'photo_locked': p.is_photo_locked
-        })
+        }
     )
     db.session.add(log)
     
@@ -335,11 +356,12 @@ def update(event_id, p_id):
 @participant_bp.route('/event/<int:event_id>/participant/<int:p_id>/update_paf', methods=['POST'])
 @login_required
 @organizer_required
+@write_transaction
 def update_paf(event_id, p_id):
     """
     Met à jour le type de PAF d'un participant.
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     p = Participant.query.get_or_404(p_id)
     
     if p.event_id != event_id:
@@ -352,11 +374,11 @@ def update_paf(event_id, p_id):
         user_id=current_user.id,
         action_type=ActivityLogType.PARTICIPANT_UPDATE.value,
         event_id=event.id,
-        details=json.dumps({
+        details={
             'participant_id': p.id,
             'update_type': 'paf_type_update',
             'new_paf_type': p.paf_type
-        })
+        }
     )
     db.session.add(log)
     db.session.commit()
@@ -368,13 +390,14 @@ def update_paf(event_id, p_id):
 @participant_bp.route('/event/<int:event_id>/participant/<int:p_id>/update_paf_inline', methods=['POST'])
 @login_required
 @organizer_required
+@write_transaction
 def update_paf_inline(event_id, p_id):
     """
     Met à jour les informations de PAF d'un participant via AJAX.
     """
     data = request.json
     p = Participant.query.get_or_404(p_id)
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
     if p.event_id != event_id:
         return jsonify({'success': False, 'error': 'Participant invalide'}), 400
@@ -415,25 +438,11 @@ def update_paf_inline(event_id, p_id):
             p.global_comment = new_comment
             changes.append("commentaire global mis à jour")
         
-    # Recalculer le statut PAF si nécessaire
-    # Si le statut est 'dispensé(e)' ou 'erreur', on le garde sauf si le montant change vers un montant positif
-    recalc_status = True
-    if p.paf_status in ['dispensé(e)', 'erreur'] and ('payment_amount' not in data or float(data.get('payment_amount', 0)) == 0):
-        recalc_status = False
-        
-    if recalc_status:
-        paf_config = json.loads(event.paf_config or '[]')
-        paf_map = {item['name']: float(item['amount']) for item in paf_config}
-        due = paf_map.get(p.paf_type, 0.0) if p.paf_type else 0.0
-        
-        if (p.payment_amount or 0) >= due:
-            p.paf_status = 'versée'
-        elif (p.payment_amount or 0) > 0:
-            p.paf_status = 'partielle'
-        else:
-            p.paf_status = 'non versée'
-            
-    db.session.commit()
+    # Recalculer le statut PAF ('dispensé(e)' et 'erreur' conservés sauf montant positif)
+    paf_map = paf_due_map(event)
+    due = paf_map.get(p.paf_type, 0.0) if p.paf_type else 0.0
+    p.paf_status = compute_paf_status(p.paf_status, due, p.payment_amount,
+                                      amount_changed='payment_amount' in data)
     
     # Journaliser les changements spécifiques le cas échéant
     if changes:
@@ -441,12 +450,12 @@ def update_paf_inline(event_id, p_id):
             user_id=current_user.id,
             action_type=ActivityLogType.PARTICIPANT_UPDATE.value,
             event_id=event.id,
-            details=json.dumps({
+            details={
                 'participant_id': p.id,
                 'update_type': 'paf_inline_update',
                 'changes': changes,
                 'participant_email': p.user.email
-            })
+            }
         )
         db.session.add(log)
         
@@ -459,12 +468,9 @@ def update_paf_inline(event_id, p_id):
             action_type='participant_updated',
             description=f"Mise à jour pour {p.user.prenom} {p.user.nom} : {', '.join(changes)}"
         )
-        db.session.commit()
+    # Un seul commit : modification, journal et notification
+    db.session.commit()
 
-    # Recalculer due pour le retour AJAX
-    paf_config = json.loads(event.paf_config or '[]')
-    paf_map = {item['name']: float(item['amount']) for item in paf_config}
-    due = paf_map.get(p.paf_type, 0.0) if p.paf_type else 0.0
     remaining = due - (p.payment_amount or 0)
     
     return jsonify({
@@ -483,9 +489,47 @@ def update_paf_inline(event_id, p_id):
     })
 
 
+@participant_bp.route('/event/<int:event_id>/participants/patch', methods=['PATCH'])
+@login_required
+@organizer_required
+@write_transaction
+def patch_participants(event_id):
+    """
+    Applique en une fois les modifications d'une session d'édition (AJAX).
+    
+    Payload JSON: { "changes": [{"participant_id": 1, "field": "payment_amount", "value": 20}, ...] }
+    Tout ou rien : un changement invalide fait refuser le patch (400).
+    """
+    event = g.current_event
+    data = request.get_json(silent=True) or {}
+    
+    try:
+        result = apply_participant_patch(event, data.get('changes'), current_user.id)
+    except PatchValidationError as e:
+        return jsonify({'success': False, 'error': str(e), 'errors': e.errors}), 400
+    
+    if result['updated']:
+        create_notification(
+            event_id=event.id,
+            user_id=current_user.id,
+            action_type='participant_updated',
+            description=f"Mise à jour groupée de {result['updated']} participant(s) : {', '.join(result['fields'])}"
+        )
+    # Un seul commit : modifications, journal et notification
+    db.session.commit()
+    
+    return jsonify({
+        'success': True,
+        'updated': result['updated'],
+        'changes': result['changes'],
+        'participants': {str(pid): values for pid, values in result['participants'].items()}
+    })
+
+
 @participant_bp.route('/event/<int:event_id>/participant/<int:p_id>/change-status', methods=['POST'])
 @login_required
 @organizer_required
+@write_transaction
 def change_status(event_id, p_id):
     """
     Change le statut d'inscription d'un participant.
@@ -495,7 +539,7 @@ def change_status(event_id, p_id):
     - 'reject': Passe le statut à 'Rejeté'
     - 'pending': Passe le statut à 'En attente'
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
     # Optimisation N+1: charger user avec joinedload car on accède à participant.user.email
     participant = Participant.query.options(joinedload(Participant.user)).get(p_id)
@@ -525,11 +569,11 @@ def change_status(event_id, p_id):
     log = ActivityLog(
         user_id=current_user.id,
         action_type=ActivityLogType.STATUS_CHANGE.value,
-        details=json.dumps({
+        details={
             'participant': participant.user.email,
             'name': f"{participant.user.prenom or ''} {participant.user.nom or ''}",
             'new_status': participant.registration_status
-        })
+        }
     )
     db.session.add(log)
     
@@ -548,6 +592,41 @@ def change_status(event_id, p_id):
 
 
 
+@participant_bp.route('/event/<int:event_id>/participants/bulk-status', methods=['POST'])
+@login_required
+@organizer_required
+@write_transaction
+def bulk_status(event_id):
+    """
+    Change le statut d'inscription de plusieurs participants (AJAX).
+    
+    Payload JSON: { "participant_ids": [1, 2, 3, ...], "action": "validate" | "reject" | "pending" }
+    Les limites max_pjs / max_pnjs / max_organizers sont vérifiées avant le
+    commit : si une limite est dépassée, aucun participant n'est modifié (409).
+    """
+    event = g.current_event
+    data = request.get_json(silent=True) or {}
+    
+    try:
+        result = change_registration_status(event, data.get('participant_ids'), data.get('action'),
+                                            current_user.id)
+    except CapacityExceededError as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e), 'over_limit': e.over_limit}), 409
+    except StatusTransitionError as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    # Un seul commit : statuts, compteurs, journal et notification
+    db.session.commit()
+    
+    return jsonify({
+        'success': True,
+        **result,
+        'message': f"{result['updated']} participant(s) mis à jour"
+    })
+
+
 @participant_bp.route('/api/casting/assign', methods=['POST'])
 @login_required
 def api_assign():
@@ -562,10 +641,13 @@ def api_assign():
     role_id = data.get('role_id')
     
     # Vérification de sécurité (organisateur)
-    event = Event.query.get_or_404(event_id)
-    me = Participant.query.filter_by(event_id=event.id, user_id=current_user.id).first()
+    event = get_current_event(event_id)
+    me = get_current_membership(event_id)
     if not me or not me.is_organizer:
         return jsonify({'error': 'Unauthorized'}), 403
+    
+    # Verrou d'écriture pris une fois les droits vérifiés
+    begin_write()
         
     participant = Participant.query.get_or_404(participant_id)
     role = Role.query.get_or_404(role_id)
@@ -579,11 +661,11 @@ def api_assign():
         user_id=current_user.id,
         action_type=ActivityLogType.PARTICIPANT_UPDATE.value,
         event_id=event.id,
-        details=json.dumps({
+        details={
             'action': 'role_assign',
             'role_name': role.name,
             'participant_id': participant.id
-        })
+        }
     )
     db.session.add(log)
     
@@ -603,11 +685,14 @@ def api_unassign():
     event_id = data.get('event_id')
     role_id = data.get('role_id')
     
-    event = Event.query.get_or_404(event_id)
-    me = Participant.query.filter_by(event_id=event.id, user_id=current_user.id).first()
+    event = get_current_event(event_id)
+    me = get_current_membership(event_id)
     if not me or not me.is_organizer:
         return jsonify({'error': 'Unauthorized'}), 403
 
+    # Verrou d'écriture pris une fois les droits vérifiés
+    begin_write()
+
     if role_id:
         role = Role.query.get(role_id)
         if role and role.assigned_participant_id:
@@ -621,11 +706,11 @@ def api_unassign():
                 user_id=current_user.id,
                 action_type=ActivityLogType.PARTICIPANT_UPDATE.value,
                 event_id=event.id,
-                details=json.dumps({
+                details={
                     'action': 'role_unassign',
                     'role_name': role.name,
                     'assigned_participant_id': p.id if p else None
-                })
+                }
             )
             db.session.add(log)
             
@@ -635,15 +720,25 @@ def api_unassign():
     return jsonify({'error': 'Invalid request'}), 400
 
 
+# Colonnes des exports CSV et Google Sheets
+_SHEET_EXPORT_COLUMNS = [
+    User.email, User.nom, User.prenom, User.age, User.genre,
+    Participant.type, Participant.group, Participant.registration_status,
+    Participant.paf_status, Participant.payment_amount, Participant.payment_method,
+    ROLE_NAME, Participant.comment,
+]
+
+
 @participant_bp.route('/event/<int:event_id>/export/csv', methods=['POST'])
 @login_required
 @organizer_required
+@read_only_db
 def export_csv(event_id):
     """
     Export des participants au format CSV.
     """
-    event = Event.query.get_or_404(event_id)
-    participants = Participant.query.filter_by(event_id=event.id).options(joinedload(Participant.user)).all()
+    event = g.current_event
+    participants = iter_participant_rows(event.id, _SHEET_EXPORT_COLUMNS)
     
     # Création du CSV en mémoire
     si = io.StringIO()
@@ -660,18 +755,18 @@ def export_csv(event_id):
     
     for p in participants:
         row = [
-            p.user.email,
-            p.user.nom or '',
-            p.user.prenom or '',
-            p.user.age or '',
-            p.user.genre or '',
+            p.email,
+            p.nom or '',
+            p.prenom or '',
+            p.age or '',
+            p.genre or '',
             p.type or '',
             p.group or '',
             p.registration_status or '',
             p.paf_status or '',
             p.payment_amount or 0,
             p.payment_method or '',
-            p.role.name if p.role else '',
+            p.role_name or '',
             p.comment or ''
         ]
         writer.writerow(row)
@@ -707,8 +802,8 @@ def export_google(event_id):
         
     try:
         # 2. Préparer les données
-        event = Event.query.get_or_404(event_id)
-        participants = Participant.query.filter_by(event_id=event.id).options(joinedload(Participant.user)).all()
+        event = g.current_event
+        participants = iter_participant_rows(event.id, _SHEET_EXPORT_COLUMNS)
         
         headers = [
             'Email', 'Nom', 'Prénom', 'Age', 'Genre', 
@@ -720,18 +815,18 @@ def export_google(event_id):
         rows = [headers]
         for p in participants:
             rows.append([
-                p.user.email,
-                p.user.nom or '',
-                p.user.prenom or '',
-                str(p.user.age or ''),
-                p.user.genre or '',
+                p.email,
+                p.nom or '',
+                p.prenom or '',
+                str(p.age or ''),
+                p.genre or '',
                 p.type or '',
                 p.group or '',
                 p.registration_status or '',
                 p.paf_status or '',
                 str(p.payment_amount or 0),
                 p.payment_method or '',
-                p.role.name if p.role else '',
+                p.role_name or '',
                 p.comment or ''
             ])
             
@@ -799,18 +894,21 @@ def leave(event_id):
     """
     Permet à un utilisateur de quitter un événement.
     """
-    event = Event.query.get_or_404(event_id)
-    participant = Participant.query.filter_by(event_id=event.id, user_id=current_user.id).first()
+    event = get_current_event(event_id)
+    participant = get_current_membership(event_id)
     
     if not participant:
         flash('Vous ne participez pas à cet événement.', 'warning')
         return redirect(url_for('event.detail', event_id=event_id))
     
+    # Verrou d'écriture pris une fois la participation vérifiée
+    begin_write()
+    
     # Gestion du cas "Organisateur unique"
     if participant.is_organizer:
         other_organizers = Participant.query.filter(
             Participant.event_id == event.id,
-            Participant.is_organizer == True,
+            Participant.type == ParticipantType.ORGANISATEUR.value,
             Participant.id != participant.id
         ).count()
         
@@ -855,12 +953,9 @@ def update_event_photo(event_id, participant_id):
     # Vérification des autorisations : soi-même ou un organisateur
     if participant.user_id != current_user.id:
         # Si ce n'est pas l'utilisateur lui-même, vérifier si c'est un organisateur de l'événement
-        is_organizer = Participant.query.filter_by(
-            event_id=event_id, 
-            user_id=current_user.id
-        ).filter(Participant.type == 'Organisateur').first()
+        membership = get_current_membership(event_id)
         
-        if not is_organizer:
+        if not membership or membership.type != ParticipantType.ORGANISATEUR.value:
             flash('Accès non autorisé', 'danger')
             return redirect(url_for('event.detail', event_id=event_id))
 
@@ -936,12 +1031,9 @@ def copy_profile_to_event_photo(event_id, participant_id):
     # Vérification des autorisations
     if participant.user_id != current_user.id:
          # Si ce n'est pas l'utilisateur lui-même, vérifier si c'est un organisateur de l'événement
-        is_organizer = Participant.query.filter_by(
-            event_id=event_id, 
-            user_id=current_user.id
-        ).filter(Participant.type == 'Organisateur').first()
+        membership = get_current_membership(event_id)
         
-        if not is_organizer:
+        if not membership or membership.type != ParticipantType.ORGANISATEUR.value:
             flash('Accès non autorisé', 'danger')
             return redirect(url_for('event.detail', event_id=event_id))
             
@@ -1017,6 +1109,7 @@ def copy_profile_to_event_photo(event_id, participant_id):
 @participant_bp.route('/event/<int:event_id>/participants/bulk-delete', methods=['POST'])
 @login_required
 @organizer_required
+@write_transaction
 def bulk_delete(event_id):
     """
     Suppression groupée de participants.
@@ -1024,7 +1117,7 @@ def bulk_delete(event_id):
     Payload JSON: { "participant_ids": [1, 2, 3, ...] }
     Ne supprime pas les organisateurs pour éviter les erreurs critiques.
     """
-    event = Event.query.get_or_404(event_id)
+    event = g.current_event
     
     data = request.get_json()
     if not data or 'participant_ids' not in data:
@@ -1035,38 +1128,51 @@ def bulk_delete(event_id):
         return jsonify({'success': False, 'error': 'Liste de participants vide'}), 400
     
     try:
-        # Récupérer les participants concernés (vérifier qu'ils appartiennent bien à cet événement)
-        participants = Participant.query.filter(
-            Participant.id.in_(participant_ids),
-            Participant.event_id == event_id
-        ).all()
-        
-        if not participants:
+        # Projection des participants concernés (appartenant bien à cet événement)
+        batch_size = DefaultValues.DELETE_BATCH_SIZE
+        rows = []
+        for start in range(0, len(participant_ids), batch_size):
+            rows += db.session.query(
+                Participant.id, Participant.type, Participant.custom_image, User.nom, User.prenom
+            ).join(User, Participant.user_id == User.id).filter(
+                Participant.id.in_(participant_ids[start:start + batch_size]),
+                Participant.event_id == event_id
+            ).all()
+        
+        if not rows:
             return jsonify({'success': False, 'error': 'Aucun participant trouvé'}), 404
         
+        deleted_ids = []
         deleted_names = []
         skipped_orga = []
+        photo_paths = []
         
-        for p in participants:
+        for p_id, p_type, custom_image, nom, prenom in rows:
             # Protection : ne pas supprimer les organisateurs
-            if p.type == ParticipantType.ORGANISATEUR.value:
-                skipped_orga.append(f"{p.user.nom} {p.user.prenom}")
+            if p_type == ParticipantType.ORGANISATEUR.value:
+                skipped_orga.append(f"{nom} {prenom}")
                 continue
             
-            deleted_names.append(f"{p.user.nom} {p.user.prenom}")
-            
-            # Supprimer la photo d'événement si elle existe
-            if p.custom_image:
-                photo_path = os.path.join(current_app.root_path, p.custom_image.lstrip('/'))
-                if os.path.exists(photo_path):
-                    try:
-                        os.remove(photo_path)
-                    except OSError:
-                        pass
-            
-            db.session.delete(p)
-        
-        db.session.commit()
+            deleted_ids.append(p_id)
+            deleted_names.append(f"{nom} {prenom}")
+            if custom_image:
+                photo_paths.append(os.path.join(current_app.root_path, custom_image.lstrip('/')))
+        
+        # Suppression ensembliste : références des rôles, casting, participants
+        for start in range(0, len(deleted_ids), batch_size):
+            chunk = deleted_ids[start:start + batch_size]
+            Role.query.filter(Role.assigned_participant_id.in_(chunk))\
+                .update({'assigned_participant_id': None}, synchronize_session=False)
+            CastingAssignment.query.filter(CastingAssignment.participant_id.in_(chunk))\
+                .delete(synchronize_session=False)
+            Participant.query.filter(Participant.id.in_(chunk))\
+                .delete(synchronize_session=False)
+        
+        if deleted_ids:
+            # Les suppressions en masse contournent les hooks des compteurs
+            recount_event_counters([event.id])
+            # Photos supprimées une fois le commit réussi
+            schedule_file_removal(photo_paths)
         
         # Notification
         if deleted_names:
@@ -1080,6 +1186,7 @@ def bulk_delete(event_id):
                 action_type='participant_bulk_delete',
                 description=description
             )
+        db.session.commit()
         
         result = {
             'success': True,
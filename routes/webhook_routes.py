@@ -1,9 +1,11 @@
 import os
 import json
 import logging
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, g
 from datetime import datetime
-from models import db, FormResponse, Event, User, Participant, Role, GFormsSubmission, GFormsCategory, GFormsFieldMapping, EventNotification
+from utils.db_dialect import upsert, insert_ignore
+from utils.db_transaction import begin_write
+from models import db, FormResponse, Event, User, Role, GFormsSubmission, GFormsCategory, GFormsFieldMapping, EventNotification
 from extensions import csrf
 from flask_login import login_required
 from decorators import organizer_required
@@ -11,6 +13,8 @@ from werkzeug.security import generate_password_hash
 import secrets
 from constants import RegistrationStatus, ParticipantType
 from services.email_service import send_new_account_invitation
+from services.gforms_answer_service import sync_submission_answers
+from services.registration_service import upsert_participant, upsert_submission
 
 # Création du Blueprint
 webhook_bp = Blueprint('webhook', __name__)
@@ -19,7 +23,8 @@ logger = logging.getLogger(__name__)
 def verify_token():
     """
     Vérifie le token d'authentification dans le header Authorization.
-    Retourne l'objet Event correspondant si valide, sinon None.
+    Retourne l'objet Event correspondant si valide (aussi placé dans
+    g.current_event), sinon None.
     """
     auth_header = request.headers.get('Authorization')
     if not auth_header:
@@ -36,6 +41,7 @@ def verify_token():
     event = Event.query.filter_by(webhook_secret=token).first()
     
     if event:
+        g.current_event = event
         return event
         
     # Fallback legacy (env var) si besoin, mais on passe au per-event.
@@ -59,6 +65,11 @@ def gform_webhook():
     event = verify_token()
     if not event:
         return jsonify({"error": "Unauthorized"}), 401
+    if event.is_deleting:
+        return jsonify({"error": "Event is being deleted"}), 410
+    
+    # Verrou d'écriture pris d'emblée (BEGIN IMMEDIATE, reprises) ; 503 si la base reste occupée
+    begin_write()
         
     try:
         data = request.get_json()
@@ -70,30 +81,22 @@ def gform_webhook():
             return jsonify({"error": "Missing responseId"}), 400
             
         # 2. Upsert Logic (FormResponse - Legacy)
-        form_response = FormResponse.query.filter_by(response_id=response_id).first()
-        
-        if form_response:
-            # Update
-            logger.info(f"Updating FormResponse {response_id}")
-            form_response.answers = json.dumps(data.get('answers', {}))
-            form_response.respondent_email = data.get('email')
-            form_response.form_id = data.get('formId') # Mettre à jour le form_id au cas où
-            form_response.updated_at = datetime.utcnow()
-            action = "updated"
-        else:
-            # Insert
-            logger.info(f"Creating new FormResponse {response_id}")
-            form_response = FormResponse(
-                response_id=response_id,
-                form_id=data.get('formId'),
-                event_id=event.id,
-                respondent_email=data.get('email'),
-                answers=json.dumps(data.get('answers', {})),
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
-            db.session.add(form_response)
-            action = "created"
+        # INSERT ... ON CONFLICT : deux envois simultanés de la même réponse
+        # ne lèvent pas d'IntegrityError
+        action = "updated" if db.session.query(FormResponse.id).filter_by(response_id=response_id).first() else "created"
+        logger.info(f"Upserting FormResponse {response_id} ({action})")
+        now = datetime.utcnow()
+        form_response_id = upsert(FormResponse, {
+            'response_id': response_id,
+            'form_id': data.get('formId'),
+            'event_id': event.id,
+            'respondent_email': data.get('email'),
+            'answers': json.dumps(data.get('answers', {})),
+            'created_at': now,
+            'updated_at': now,
+        }, index_elements=['response_id'],
+            update_columns=['form_id', 'respondent_email', 'answers', 'updated_at'])
+        form_response = db.session.get(FormResponse, form_response_id, populate_existing=True)
             
         db.session.flush() # Ensure ID is available
             
@@ -116,7 +119,6 @@ def gform_webhook():
             email = ""
             
         user = None
-        participant = None
         type_ajout = "anonyme"
         
         if email:
@@ -143,22 +145,18 @@ def gform_webhook():
                  logger.info(f"Found existing User ID: {user.id}") # DEBUG LOG
                  type_ajout = "ajouté" # Par défaut si user existe
             
-            # 2. Identifier ou Créer le Participant
-            participant = Participant.query.filter_by(user_id=user.id, event_id=event.id).first()
-            if not participant:
-                logger.info(f"Registering User {user.id} to Event {event.id}")
-                participant = Participant(
-                    user_id=user.id,
-                    event_id=event.id,
-                    type=ParticipantType.PJ.value, # Défaut
-                    registration_status=RegistrationStatus.TO_VALIDATE.value, # "À valider"
-                    role_communicated=False,
-                    role_received=False
-                )
-                db.session.add(participant)
-                db.session.flush()
+            # 2. Inscrire le Participant (INSERT ... ON CONFLICT : pas de doublon sur les envois simultanés)
+            participant_id = upsert_participant(
+                event.id, user.id,
+                type=ParticipantType.PJ.value, # Défaut
+                registration_status=RegistrationStatus.TO_VALIDATE.value, # "À valider"
+                role_communicated=False,
+                role_received=False
+            )
+            if participant_id:
+                logger.info(f"Registered User {user.id} to Event {event.id} (Participant ID: {participant_id})")
             else:
-                 logger.info(f"Found existing Participant ID: {participant.id}") # DEBUG LOG
+                 logger.info(f"Found existing Participant for User {user.id}") # DEBUG LOG
                  type_ajout = "mis à jour" # Si participant existe déjà
             
             # 3. Traitement de l'identité (Nom/Prénom)
@@ -222,26 +220,21 @@ def gform_webhook():
         
         # 1. Créer/Mettre à jour GFormsSubmission
         g_submission = GFormsSubmission.query.filter_by(form_response_id=form_response.id).first()
-        if not g_submission and email:
-            g_submission = GFormsSubmission.query.filter_by(event_id=event.id, email=email).first()
-            
+        created = False
         if not g_submission:
-             g_submission = GFormsSubmission(
-                event_id=event.id,
+            # INSERT ... ON CONFLICT (event_id, email) : retourne la soumission existante de l'email
+            g_submission, created = upsert_submission(
+                event.id, email,
                 user_id=user.id if user else None,
-                email=email,
                 timestamp=datetime.utcnow(),
                 type_ajout=type_ajout,
                 form_response_id=form_response.id,
-                raw_data=json.dumps(answers)
+                raw_data=answers
             )
-             db.session.add(g_submission)
-        else:
+            
+        if not created:
             # Merge logic: replace only if new data is not empty
-            try:
-                current_data = json.loads(g_submission.raw_data) if g_submission.raw_data else {}
-            except:
-                current_data = {}
+            current_data = dict(g_submission.raw_data or {})
             
             if isinstance(answers, dict):
                 for key, val in answers.items():
@@ -250,7 +243,7 @@ def gform_webhook():
                     if val is not None:
                         current_data[key] = val
                         
-            g_submission.raw_data = json.dumps(current_data)
+            g_submission.raw_data = current_data
             g_submission.type_ajout = type_ajout
             g_submission.timestamp = datetime.utcnow()
             g_submission.form_response_id = form_response.id # Lier à la dernière réponse
@@ -272,17 +265,14 @@ def gform_webhook():
                 db.session.add(default_cat)
                 db.session.flush()
             
-            existing_mappings = {m.field_name for m in GFormsFieldMapping.query.filter_by(event_id=event.id).all()}
-            
-            for field_name in answers.keys():
-                if field_name not in existing_mappings:
-                    new_mapping = GFormsFieldMapping(
-                        event_id=event.id,
-                        field_name=field_name,
-                        category_id=default_cat.id
-                    )
-                    db.session.add(new_mapping)
-                    existing_mappings.add(field_name) # Avoid duplicates in same transaction
+            # Mappings manquants (ON CONFLICT DO NOTHING sur (event_id, field_name))
+            insert_ignore(GFormsFieldMapping, [
+                {'event_id': event.id, 'field_name': field_name, 'category_id': default_cat.id}
+                for field_name in answers.keys()
+            ], index_elements=['event_id', 'field_name'])
+
+            # 3. Réponses normalisées (miroir de raw_data)
+            sync_submission_answers([g_submission])
 
         db.session.commit()
         logger.info("Transaction committed successfully")
@@ -424,18 +414,18 @@ def webhook_pdf2txt():
 
             if not success:
                 role.character_traits_status = 'error'
-                role.character_traits_data = json.dumps({
+                role.character_traits_data = {
                     'error': f"Échec du lancement de l'analyse des traits: {message}"
-                })
+                }
                 db.session.commit()
                 logger.error(f"❌ Échec du lancement de l'analyse character pour '{role.name}': {message}")
 
         elif etat == 'échec':
             erreur = data.get('erreur', 'Erreur inconnue')
             role.character_traits_status = 'error'
-            role.character_traits_data = json.dumps({
+            role.character_traits_data = {
                 'error': f"Échec de l'extraction PDF: {erreur}"
-            })
+            }
             db.session.commit()
             logger.error(f"❌ Extraction PDF échouée pour '{role.name}': {erreur}")
 
@@ -514,21 +504,21 @@ def webhook_character():
                 if resp.status_code == 200:
                     traits_data = resp.json()
                     role.character_traits_status = 'success'
-                    role.character_traits_data = json.dumps(traits_data)
+                    role.character_traits_data = traits_data
                     db.session.commit()
                     logger.info(f"✅ Traits sauvegardés pour '{role.name}': "
                                 f"{json.dumps(traits_data, ensure_ascii=False)[:500]}")
                 else:
                     error_msg = f"Erreur téléchargement traits: HTTP {resp.status_code}"
                     role.character_traits_status = 'error'
-                    role.character_traits_data = json.dumps({'error': error_msg})
+                    role.character_traits_data = {'error': error_msg}
                     db.session.commit()
                     logger.error(f"❌ {error_msg} pour '{role.name}'")
             except Exception as e_download:
                 role.character_traits_status = 'error'
-                role.character_traits_data = json.dumps({
+                role.character_traits_data = {
                     'error': f"Erreur téléchargement résultat: {str(e_download)}"
-                })
+                }
                 db.session.commit()
                 logger.error(f"❌ Erreur téléchargement traits pour '{role.name}': {e_download}",
                              exc_info=True)
@@ -536,7 +526,7 @@ def webhook_character():
         elif status == 'failed':
             error_msg = data.get('error', 'Erreur inconnue')
             role.character_traits_status = 'error'
-            role.character_traits_data = json.dumps({'error': error_msg})
+            role.character_traits_data = {'error': error_msg}
             db.session.commit()
             logger.error(f"❌ Analyse character échouée pour '{role.name}': {error_msg}")
 
@@ -592,7 +582,7 @@ def analyze_traits(event_id, role_id):
     else:
         # Rollback du statut en cas d'échec de l'appel API
         role.character_traits_status = 'error'
-        role.character_traits_data = json.dumps({'error': message})
+        role.character_traits_data = {'error': message}
         db.session.commit()
         logger.error(f"❌ Échec du lancement de l'analyse pour '{role.name}': {message}")
         return jsonify({"error": message}), 500
@@ -639,5 +629,5 @@ def traits_status(event_id, role_id):
 
     return jsonify({
         "status": role.character_traits_status or 'none',
-        "traits_data": role.character_traits_data
+        "traits_data": json.dumps(role.character_traits_data) if role.character_traits_data is not None else None
     }), 200
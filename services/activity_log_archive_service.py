@@ -0,0 +1,176 @@
+"""
+Service de rétention et d'archivage du journal d'activité.
+
+Les logs plus anciens que la durée de rétention sont déplacés, par lots,
+dans des fichiers mensuels compressés (activity_log-AAAA-MM.jsonl.gz, une
+ligne JSON par log) puis supprimés de la base. Les comptages par jour et
+par type sont conservés dans activity_log_rollup.
+
+Chaque lot est d'abord écrit et synchronisé sur disque, puis supprimé de
+la base dans une transaction : après une interruption, un lot peut être
+archivé deux fois, d'où le dédoublonnage par (id, created_at) à la lecture
+(l'ID seul ne suffit pas : SQLite réutilise les IDs des lignes supprimées).
+"""
+
+import gzip
+import json
+import os
+import re
+from collections import Counter
+from datetime import datetime, timedelta
+
+from models import db, ActivityLog, ActivityLogRollup, User
+
+ARCHIVE_FILENAME = 'activity_log-{month}.jsonl.gz'
+_ARCHIVE_RE = re.compile(r'^activity_log-(\d{4}-\d{2})\.jsonl\.gz$')
+
+
+def archive_path(archive_dir, month):
+    """Chemin de l'archive d'un mois ('AAAA-MM')."""
+    return os.path.join(archive_dir, ARCHIVE_FILENAME.format(month=month))
+
+
+def _serialize(log, email, nom, prenom):
+    """Ligne d'archive autonome (l'utilisateur peut être supprimé plus tard)."""
+    return {
+        'id': log.id,
+        'created_at': log.created_at.isoformat(),
+        'action_type': log.action_type,
+        'user_id': log.user_id,
+        'user_email': email,
+        'user_nom': nom,
+        'user_prenom': prenom,
+        'event_id': log.event_id,
+        'details': log.details,
+        'is_viewed': bool(log.is_viewed),
+    }
+
+
+def _add_rollups(counts):
+    """Ajoute des comptages {(jour, type): n} à activity_log_rollup. Ne commit pas."""
+    days = {day for day, _ in counts}
+    existing = {(r.day, r.action_type): r for r in
+                ActivityLogRollup.query.filter(ActivityLogRollup.day.in_(days)).all()}
+    for (day, action_type), count in counts.items():
+        rollup = existing.get((day, action_type))
+        if rollup is None:
+            db.session.add(ActivityLogRollup(day=day, action_type=action_type, count=count))
+        else:
+            rollup.count += count
+
+
+def archive_activity_logs(archive_dir, retention_days, now=None, batch_size=1000):
+    """
+    Archive les logs plus anciens que retention_days puis les supprime.
+
+    Commit après chaque lot.
+
+    Args:
+        archive_dir: Dossier des archives mensuelles (créé si besoin)
+        retention_days: Nombre de jours conservés dans la base
+        now: Date de référence (défaut : maintenant)
+        batch_size: Nombre de logs par lot
+
+    Returns:
+        dict: {'archived': nombre de logs, 'months': mois touchés}
+    """
+    cutoff = (now or datetime.utcnow()) - timedelta(days=retention_days)
+    os.makedirs(archive_dir, exist_ok=True)
+
+    archived = 0
+    months = set()
+    while True:
+        rows = db.session.query(ActivityLog, User.email, User.nom, User.prenom)\
+            .outerjoin(User, ActivityLog.user_id == User.id)\
+            .filter(ActivityLog.created_at < cutoff)\
+            .order_by(ActivityLog.created_at, ActivityLog.id)\
+            .limit(batch_size).all()
+        if not rows:
+            break
+
+        by_month = {}
+        counts = Counter()
+        for log, email, nom, prenom in rows:
+            by_month.setdefault(log.created_at.strftime('%Y-%m'), []).append(
+                _serialize(log, email, nom, prenom))
+            counts[(log.created_at.date(), log.action_type)] += 1
+
+        # 1. Écriture durable des archives (membres gzip ajoutés en fin de fichier)
+        for month, records in by_month.items():
+            with open(archive_path(archive_dir, month), 'ab') as raw:
+                with gzip.GzipFile(fileobj=raw, mode='wb') as gz:
+                    for record in records:
+                        gz.write((json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8'))
+                raw.flush()
+                os.fsync(raw.fileno())
+            months.add(month)
+
+        # 2. Suppression et agrégats dans une même transaction
+        ids = [log.id for log, _, _, _ in rows]
+        _add_rollups(counts)
+        ActivityLog.query.filter(ActivityLog.id.in_(ids)).delete(synchronize_session=False)
+        db.session.commit()
+        archived += len(ids)
+
+    return {'archived': archived, 'months': sorted(months)}
+
+
+def list_archive_months(archive_dir):
+    """
+    Liste les mois disponibles dans le dossier d'archives.
+
+    Returns:
+        list: Mois 'AAAA-MM', du plus récent au plus ancien
+    """
+    if not os.path.isdir(archive_dir):
+        return []
+    months = [m.group(1) for m in map(_ARCHIVE_RE.match, os.listdir(archive_dir)) if m]
+    return sorted(months, reverse=True)
+
+
+def read_archived_logs(archive_dir, month, action_type=None, user_id=None, event_id=None, limit=None):
+    """
+    Lit les logs archivés d'un mois, filtrés à la volée.
+
+    Args:
+        archive_dir: Dossier des archives
+        month: Mois 'AAAA-MM'
+        action_type, user_id, event_id: Filtres optionnels
+        limit: Nombre maximal de logs retournés
+
+    Returns:
+        list: Logs (dict, created_at en datetime), du plus récent au plus ancien
+    """
+    path = archive_path(archive_dir, month)
+    if not os.path.exists(path):
+        return []
+
+    records = {}
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            if action_type and record['action_type'] != action_type:
+                continue
+            if user_id and record['user_id'] != user_id:
+                continue
+            if event_id and record['event_id'] != event_id:
+                continue
+            records[(record['id'], record['created_at'])] = record
+            record['created_at'] = datetime.fromisoformat(record['created_at'])
+
+    logs = sorted(records.values(), key=lambda r: (r['created_at'], r['id']), reverse=True)
+    return logs[:limit] if limit else logs
+
+
+def get_monthly_rollups():
+    """
+    Totaux mensuels des logs archivés, par type d'action.
+
+    Returns:
+        dict: {'AAAA-MM': {action_type: total}}, du plus récent au plus ancien
+    """
+    totals = {}
+    for rollup in ActivityLogRollup.query.order_by(ActivityLogRollup.day.desc()).all():
+        month = totals.setdefault(rollup.day.strftime('%Y-%m'), Counter())
+        month[rollup.action_type] += rollup.count
+    return {month: dict(counts) for month, counts in totals.items()}
@@ -0,0 +1,174 @@
+"""
+Suppression d'un événement et de toutes ses données, par lots.
+
+Les tables dépendantes sont vidées dans l'ordre des clés étrangères par
+instructions ensemblistes bornées (DELETE ... WHERE id IN (SELECT id ...
+LIMIT n)). Chaque lot est une transaction courte : le verrou d'écriture
+SQLite est relâché entre deux lots et les autres requêtes continuent
+d'écrire pendant la suppression d'un gros événement.
+
+L'événement est d'abord marqué (Event.is_deleting) : il disparaît des
+listes et ses routes répondent 404, le webhook Google Forms 410. Une
+écriture commencée avant le marquage peut encore ajouter des lignes après
+le passage de leur étape : toutes les étapes sont rejouées, sans lots, dans
+la transaction qui supprime la ligne de l'événement. Son dossier d'uploads
+(static/uploads/events/<id>) est supprimé ensuite.
+
+Une suppression interrompue (redémarrage du worker) peut être relancée
+avec `manage_db.py delete-event` : les lots déjà supprimés ne sont plus
+trouvés.
+"""
+
+import logging
+import os
+import shutil
+import threading
+
+from flask import current_app
+from sqlalchemy import delete, select, update
+
+from constants import DefaultValues
+from models import (db, Event, EventLink, Role, Participant, EventParticipantCount, ActivityLog,
+                    CastingProposal, CastingAssignment, FormResponse, EventNotification,
+                    EventNotificationRead, GFormsCategory, GFormsFieldMapping, GFormsSubmission,
+                    GFormsAnswer)
+from utils.db_transaction import begin_write
+
+logger = logging.getLogger(__name__)
+
+
+def _deletion_steps(event_id):
+    """
+    Étapes de la suppression, dans l'ordre des dépendances.
+
+    Returns:
+        list: (libellé, modèle, condition, valeurs) ; valeurs None pour un
+              DELETE, sinon les colonnes remises à NULL par un UPDATE
+    """
+    submission_ids = select(GFormsSubmission.id).where(GFormsSubmission.event_id == event_id)
+    return [
+        ('gforms_answer', GFormsAnswer, GFormsAnswer.submission_id.in_(submission_ids), None),
+        ('gforms_submission', GFormsSubmission, GFormsSubmission.event_id == event_id, None),
+        ('gforms_field_mapping', GFormsFieldMapping, GFormsFieldMapping.event_id == event_id, None),
+        ('gforms_category', GFormsCategory, GFormsCategory.event_id == event_id, None),
+        ('form_response', FormResponse, FormResponse.event_id == event_id, None),
+        ('casting_assignment', CastingAssignment, CastingAssignment.event_id == event_id, None),
+        ('casting_proposal', CastingProposal, CastingProposal.event_id == event_id, None),
+        ('event_notification_read', EventNotificationRead, EventNotificationRead.event_id == event_id, None),
+        ('event_notification', EventNotification, EventNotification.event_id == event_id, None),
+        ('event_link', EventLink, EventLink.event_id == event_id, None),
+        # Références circulaires rôle <-> participant
+        ('role_unassign', Role, (Role.event_id == event_id) & Role.assigned_participant_id.isnot(None),
+         {'assigned_participant_id': None}),
+        ('participant_unassign', Participant, (Participant.event_id == event_id) & Participant.role_id.isnot(None),
+         {'role_id': None}),
+        ('participant', Participant, Participant.event_id == event_id, None),
+        ('role', Role, Role.event_id == event_id, None),
+        ('event_participant_count', EventParticipantCount, EventParticipantCount.event_id == event_id, None),
+        # L'historique est conservé, détaché de l'événement
+        ('activity_log_detach', ActivityLog, ActivityLog.event_id == event_id, {'event_id': None}),
+    ]
+
+
+def _run_batched(model, condition, values, batch_size, on_batch=None):
+    """
+    Exécute un DELETE (ou UPDATE) par lots d'au plus batch_size lignes, un commit par lot.
+
+    Returns:
+        int: Nombre total de lignes traitées
+    """
+    total = 0
+    while True:
+        batch = select(model.id).where(condition).limit(batch_size).scalar_subquery()
+        if values is None:
+            stmt = delete(model).where(model.id.in_(batch))
+        else:
+            stmt = update(model).where(model.id.in_(batch)).values(**values)
+        count = db.session.execute(stmt, execution_options={'synchronize_session': False}).rowcount
+        db.session.commit()
+        total += count
+        if count and on_batch:
+            on_batch(total)
+        if count < batch_size:
+            return total
+
+
+def event_upload_dir(event_id):
+    """Dossier des fichiers téléversés d'un événement (fond, photos des participants)."""
+    return os.path.join(current_app.root_path, 'static', 'uploads', 'events', str(int(event_id)))
+
+
+def delete_event_data(event_id, batch_size=DefaultValues.DELETE_BATCH_SIZE, progress=None):
+    """
+    Supprime un événement, ses données et ses fichiers, par lots.
+
+    Args:
+        event_id: ID de l'événement
+        batch_size: Nombre maximal de lignes par transaction
+        progress: Appelé avec (étape, lignes traitées) après chaque lot
+
+    Returns:
+        dict: Lignes traitées par étape, plus 'event' et 'files_removed'
+    """
+    # Déjà posé par la route ; pour la CLI et les reprises
+    db.session.execute(update(Event).where(Event.id == event_id).values(is_deleting=True),
+                       execution_options={'synchronize_session': False})
+    db.session.commit()
+
+    stats = {}
+    for label, model, condition, values in _deletion_steps(event_id):
+        on_batch = (lambda total, label=label: progress(label, total)) if progress else None
+        stats[label] = _run_batched(model, condition, values, batch_size, on_batch)
+        if stats[label]:
+            logger.info(f"Suppression de l'événement {event_id} : {label} ({stats[label]} lignes)")
+
+    # Dernier passage et suppression de l'événement dans une seule transaction :
+    # les lignes écrites pendant les lots ne bloquent pas la clé étrangère
+    begin_write(endpoint='event_deletion')
+    for label, model, condition, values in _deletion_steps(event_id):
+        stmt = delete(model) if values is None else update(model).values(**values)
+        late = db.session.execute(stmt.where(condition),
+                                  execution_options={'synchronize_session': False}).rowcount
+        if late:
+            stats[label] += late
+            logger.info(f"Suppression de l'événement {event_id} : {label} ({late} lignes tardives)")
+    stats['event'] = db.session.execute(
+        delete(Event).where(Event.id == event_id), execution_options={'synchronize_session': False}
+    ).rowcount
+    db.session.commit()
+
+    upload_dir = event_upload_dir(event_id)
+    stats['files_removed'] = os.path.isdir(upload_dir)
+    if stats['files_removed']:
+        shutil.rmtree(upload_dir, ignore_errors=True)
+
+    logger.info(f"✅ Événement {event_id} supprimé : {stats}")
+    return stats
+
+
+def start_event_deletion(event_id):
+    """
+    Lance la suppression d'un événement hors de la requête.
+
+    Dans un thread dédié (avec son propre contexte d'application et sa
+    propre session), sauf si EVENT_DELETION_IN_BACKGROUND est faux : la
+    suppression est alors faite immédiatement (tests, CLI).
+
+    Returns:
+        dict | None: Statistiques en mode synchrone, None sinon
+    """
+    app = current_app._get_current_object()
+    if not app.config.get('EVENT_DELETION_IN_BACKGROUND', True):
+        return delete_event_data(event_id)
+
+    def run():
+        with app.app_context():
+            try:
+                delete_event_data(event_id)
+            except Exception:
+                db.session.rollback()
+                logger.exception(f"Échec de la suppression de l'événement {event_id} "
+                                 f"(relancer : manage_db.py delete-event --id {event_id})")
+
+    threading.Thread(target=run, name=f'delete-event-{event_id}', daemon=True).start()
+    return None
@@ -0,0 +1,128 @@
+"""
+Vue d'ensemble des événements pour l'administration.
+
+L'onglet "Événements" de la page d'administration n'affiche, par
+événement, que des compteurs par type et statut et la liste des
+organisateurs validés. Au lieu de charger tous les participants (et leurs
+utilisateurs) de tous les événements, une page d'événements est lue, puis
+ses compteurs par un GROUP BY sur la table des compteurs matérialisés et
+ses organisateurs par une projection de colonnes : le coût suit la page
+affichée, pas l'historique.
+"""
+
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from sqlalchemy import false, func, select
+from sqlalchemy.orm import load_only
+
+from constants import ParticipantType, RegistrationStatus, DefaultValues
+from models import db, Event, Participant, User, EventParticipantCount
+
+# Colonnes d'Event affichées dans la vue d'ensemble
+_EVENT_COLUMNS = (Event.id, Event.name, Event.statut, Event.date_start, Event.date_end,
+                  Event.max_pjs, Event.max_pnjs, Event.max_organizers)
+
+
+@dataclass(slots=True, frozen=True)
+class OrganizerView:
+    """Organisateur validé d'un événement."""
+    nom: str
+    prenom: str
+    email: str
+
+
+@dataclass(slots=True)
+class EventOverview:
+    """Événement, compteurs {(type, statut): n} et organisateurs validés."""
+    event: Event
+    counts: dict = field(default_factory=dict)
+    organizers: list = field(default_factory=list)
+
+    def count(self, p_type=None, status=None):
+        """Nombre de participants, filtré par type et/ou statut."""
+        return sum(n for (t, s), n in self.counts.items()
+                   if (p_type is None or t == p_type) and (status is None or s == status))
+
+    @property
+    def total_max(self):
+        return (self.event.max_organizers or 0) + (self.event.max_pjs or 0) + (self.event.max_pnjs or 0)
+
+
+def _counts_by_event(event_ids):
+    """
+    Compteurs des événements donnés, en un GROUP BY.
+
+    Returns:
+        dict: {event_id: {(type, statut): n}}
+    """
+    rows = db.session.execute(
+        select(EventParticipantCount.event_id, EventParticipantCount.type,
+               EventParticipantCount.registration_status, func.sum(EventParticipantCount.count))
+        .where(EventParticipantCount.event_id.in_(event_ids))
+        .group_by(EventParticipantCount.event_id, EventParticipantCount.type,
+                  EventParticipantCount.registration_status)
+    )
+    counts = {}
+    for event_id, p_type, status, count in rows:
+        if count:
+            counts.setdefault(event_id, {})[(p_type, status)] = int(count)
+    return counts
+
+
+def _organizers_by_event(event_ids):
+    """
+    Organisateurs validés des événements donnés (nom, prénom, email).
+
+    Returns:
+        dict: {event_id: [OrganizerView]}
+    """
+    rows = db.session.execute(
+        select(Participant.event_id, User.nom, User.prenom, User.email)
+        .join(User, User.id == Participant.user_id)
+        .where(
+            Participant.event_id.in_(event_ids),
+            Participant.type == ParticipantType.ORGANISATEUR.value,
+            Participant.registration_status == RegistrationStatus.VALIDATED.value
+        )
+        .order_by(Participant.event_id, Participant.id)
+    )
+    organizers = {}
+    for event_id, *values in rows:
+        organizers.setdefault(event_id, []).append(OrganizerView(*values))
+    return organizers
+
+
+def events_overview(page=1, per_page=DefaultValues.EVENTS_PER_PAGE, date_from=None, date_to=None):
+    """
+    Page de la vue d'ensemble des événements, du plus récent au plus ancien.
+
+    Trois requêtes au plus, quel que soit le nombre de participants : la
+    page d'événements (et son total), les compteurs, les organisateurs.
+
+    Args:
+        page: Numéro de page (à partir de 1)
+        per_page: Événements par page
+        date_from: Date (incluse) : événements se terminant ce jour ou après
+        date_to: Date (incluse) : événements commençant ce jour ou avant
+
+    Returns:
+        tuple: (pagination Flask-SQLAlchemy, list[EventOverview])
+    """
+    query = Event.query.options(load_only(*_EVENT_COLUMNS)).filter(Event.is_deleting == false())
+    if date_from:
+        query = query.filter(Event.date_end >= date_from)
+    if date_to:
+        query = query.filter(Event.date_start < date_to + timedelta(days=1))
+    pagination = query.order_by(Event.date_start.desc(), Event.id.desc())\
+        .paginate(page=page, per_page=per_page, error_out=False)
+
+    event_ids = [event.id for event in pagination.items]
+    if not event_ids:
+        return pagination, []
+    counts = _counts_by_event(event_ids)
+    organizers = _organizers_by_event(event_ids)
+    return pagination, [
+        EventOverview(event, counts.get(event.id, {}), organizers.get(event.id, []))
+        for event in pagination.items
+    ]
@@ -0,0 +1,257 @@
+"""
+Service de maintenance des réponses Google Forms normalisées.
+
+La table gforms_answer est un miroir de GFormsSubmission.raw_data (une ligne
+par champ renseigné). Elle est synchronisée par le webhook et l'import CSV
+après la création des mappings de champs, et sert aux requêtes "quels champs
+existent" et "quelles soumissions ont la valeur X pour le champ Y".
+"""
+
+import json
+
+from sqlalchemy import and_, or_, asc, desc
+from sqlalchemy.orm import aliased
+
+from models import db, GFormsAnswer, GFormsFieldMapping, GFormsSubmission
+
+# Limite de variables par requête IN (SQLite)
+_CHUNK_SIZE = 500
+
+
+def encode_answer_value(value):
+    """
+    Convertit une réponse de formulaire en texte indexable.
+
+    Les listes (cases à cocher) sont jointes par ", ", les autres valeurs
+    non textuelles sont sérialisées en JSON.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return ', '.join('' if v is None else str(v) for v in value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def sync_submission_answers(submissions, mappings_by_name=None):
+    """
+    Aligne les réponses normalisées sur le raw_data des soumissions.
+
+    Les champs sans mapping sont ignorés : les appelants créent les mappings
+    manquants avant la synchronisation. Ne commit pas.
+
+    Args:
+        submissions: Soumissions d'un même événement
+        mappings_by_name: {field_name: GFormsFieldMapping} (chargé si None)
+
+    Returns:
+        int: Nombre de réponses créées ou modifiées
+    """
+    # Une soumission touchée par plusieurs lignes d'un import n'est synchronisée qu'une fois
+    submissions = list(dict.fromkeys(s for s in submissions if s is not None))
+    if not submissions:
+        return 0
+
+    db.session.flush()
+    if mappings_by_name is None:
+        event_id = submissions[0].event_id
+        mappings_by_name = {m.field_name: m for m in
+                            GFormsFieldMapping.query.filter_by(event_id=event_id).all()}
+
+    # Réponses existantes, en une requête par lot
+    submission_ids = [s.id for s in submissions]
+    existing = {}
+    for i in range(0, len(submission_ids), _CHUNK_SIZE):
+        for answer in GFormsAnswer.query.filter(
+                GFormsAnswer.submission_id.in_(submission_ids[i:i + _CHUNK_SIZE])).all():
+            existing.setdefault(answer.submission_id, {})[answer.field_mapping_id] = answer
+
+    written = 0
+    for submission in submissions:
+        current = existing.get(submission.id, {})
+        seen = set()
+        for field_name, raw_value in (submission.raw_data or {}).items():
+            mapping = mappings_by_name.get(field_name)
+            value = encode_answer_value(raw_value)
+            if mapping is None or value is None:
+                continue
+            seen.add(mapping.id)
+            answer = current.get(mapping.id)
+            if answer is None:
+                db.session.add(GFormsAnswer(submission_id=submission.id,
+                                            field_mapping_id=mapping.id, value=value))
+                written += 1
+            elif answer.value != value:
+                answer.value = value
+                written += 1
+
+        # Champs retirés du raw_data
+        for mapping_id, answer in current.items():
+            if mapping_id not in seen:
+                db.session.delete(answer)
+    return written
+
+
+def rebuild_gforms_answers(event_ids=None):
+    """
+    Reconstruit les réponses normalisées depuis raw_data (reprise de données).
+
+    Ne commit pas.
+
+    Args:
+        event_ids: Liste d'IDs d'événements (tous si None)
+
+    Returns:
+        int: Nombre de réponses écrites
+    """
+    query = GFormsSubmission.query
+    if event_ids is not None:
+        query = query.filter(GFormsSubmission.event_id.in_(list(event_ids)))
+
+    by_event = {}
+    for submission in query.order_by(GFormsSubmission.event_id).all():
+        by_event.setdefault(submission.event_id, []).append(submission)
+
+    written = 0
+    for submissions in by_event.values():
+        written += sync_submission_answers(submissions)
+    return written
+
+
+def get_answered_field_names(event_id):
+    """
+    Retourne les noms des champs ayant au moins une réponse pour un événement.
+
+    Returns:
+        list: Noms de champs
+    """
+    answered = db.session.query(GFormsAnswer.id).filter(
+        GFormsAnswer.field_mapping_id == GFormsFieldMapping.id
+    ).exists()
+    rows = db.session.query(GFormsFieldMapping.field_name).filter(
+        GFormsFieldMapping.event_id == event_id,
+        answered
+    ).all()
+    return [name for (name,) in rows]
+
+
+def get_event_answers(event_id):
+    """
+    Retourne toutes les réponses d'un événement, indexées par soumission.
+
+    Returns:
+        dict: {submission_id: {field_name: value}}
+    """
+    rows = db.session.query(
+        GFormsAnswer.submission_id,
+        GFormsFieldMapping.field_name,
+        GFormsAnswer.value
+    ).join(GFormsFieldMapping, GFormsAnswer.field_mapping_id == GFormsFieldMapping.id)\
+     .filter(GFormsFieldMapping.event_id == event_id).all()
+
+    answers = {}
+    for submission_id, field_name, value in rows:
+        answers.setdefault(submission_id, {})[field_name] = value
+    return answers
+
+
+def find_submission_ids(event_id, field_name, value):
+    """
+    Retourne les IDs des soumissions ayant la valeur donnée pour un champ.
+
+    Returns:
+        list: IDs de soumissions
+    """
+    rows = db.session.query(GFormsAnswer.submission_id)\
+        .join(GFormsFieldMapping, GFormsAnswer.field_mapping_id == GFormsFieldMapping.id)\
+        .filter(
+            GFormsFieldMapping.event_id == event_id,
+            GFormsFieldMapping.field_name == field_name,
+            GFormsAnswer.value == value
+        ).all()
+    return [sid for (sid,) in rows]
+
+
+# Colonnes de GFormsSubmission triables directement
+SUBMISSION_SORT_COLUMNS = {
+    'timestamp': GFormsSubmission.timestamp,
+    'email': GFormsSubmission.email,
+    'type_ajout': GFormsSubmission.type_ajout,
+}
+
+
+def _answer_exists(mapping_id, condition):
+    """EXISTS sur une réponse de la soumission courante (via idx_gforms_answer_field_value)."""
+    return db.session.query(GFormsAnswer.id).filter(
+        GFormsAnswer.submission_id == GFormsSubmission.id,
+        GFormsAnswer.field_mapping_id == mapping_id,
+        condition
+    ).exists()
+
+
+def query_event_submissions(event_id, search=None, equals=None, contains=None,
+                            sort='timestamp', order='desc'):
+    """
+    Construit la requête filtrée et triée des soumissions d'un événement.
+
+    Les filtres portent sur la table normalisée gforms_answer, le tri sur un
+    champ dynamique passe par une jointure externe sur la réponse de ce champ.
+
+    Args:
+        event_id: ID de l'événement
+        search: Texte libre recherché dans l'email et toutes les réponses
+        equals: {field_name: valeur} (égalité stricte)
+        contains: {field_name: texte} (sous-chaîne, insensible à la casse)
+        sort: Colonne système (timestamp, email, type_ajout) ou nom de champ
+        order: 'asc' ou 'desc'
+
+    Returns:
+        Query: Requête GFormsSubmission (non paginée)
+
+    Raises:
+        ValueError: Si un champ de filtre ou de tri est inconnu
+    """
+    query = GFormsSubmission.query.filter(GFormsSubmission.event_id == event_id)
+
+    requested = set(equals or {}) | set(contains or {})
+    if sort and sort not in SUBMISSION_SORT_COLUMNS:
+        requested.add(sort)
+    mapping_ids = {}
+    if requested:
+        mapping_ids = dict(db.session.query(GFormsFieldMapping.field_name, GFormsFieldMapping.id).filter(
+            GFormsFieldMapping.event_id == event_id,
+            GFormsFieldMapping.field_name.in_(requested)
+        ).all())
+
+    unknown = sorted(requested - set(mapping_ids))
+    if unknown:
+        raise ValueError(f"Champ inconnu : {', '.join(unknown)}")
+
+    for field_name, value in (equals or {}).items():
+        query = query.filter(_answer_exists(mapping_ids[field_name], GFormsAnswer.value == value))
+
+    for field_name, value in (contains or {}).items():
+        query = query.filter(_answer_exists(
+            mapping_ids[field_name], GFormsAnswer.value.icontains(value, autoescape=True)))
+
+    if search:
+        any_answer = db.session.query(GFormsAnswer.id).filter(
+            GFormsAnswer.submission_id == GFormsSubmission.id,
+            GFormsAnswer.value.icontains(search, autoescape=True)
+        ).exists()
+        query = query.filter(or_(GFormsSubmission.email.icontains(search, autoescape=True), any_answer))
+
+    direction = desc if order == 'desc' else asc
+    if not sort or sort in SUBMISSION_SORT_COLUMNS:
+        sort_column = SUBMISSION_SORT_COLUMNS[sort or 'timestamp']
+        return query.order_by(direction(sort_column), direction(GFormsSubmission.id))
+
+    sort_answer = aliased(GFormsAnswer)
+    query = query.outerjoin(sort_answer, and_(
+        sort_answer.submission_id == GFormsSubmission.id,
+        sort_answer.field_mapping_id == mapping_ids[sort]
+    ))
+    # Soumissions sans réponse pour ce champ toujours en fin de liste
+    return query.order_by(sort_answer.value.is_(None), direction(sort_answer.value),
+                          direction(GFormsSubmission.id))
@@ -3,14 +3,29 @@ Service pour la gestion des notifications d'événements.
 
 Ce module fournit des fonctions helper pour créer et gérer
 les notifications liées aux événements.
+
+La lecture est suivie par utilisateur (EventNotificationRead) : un curseur
+last_read_id, plus les IDs lus individuellement au-delà. Les non-lues d'un
+organisateur sont donc un simple intervalle d'IDs sur l'index (event_id, id).
 """
 
-from models import db, EventNotification
+from datetime import datetime
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import joinedload
+
+from constants import DefaultValues
+from models import db, EventNotification, EventNotificationRead
+from utils.db_dialect import dialect_insert
 
 
 def create_notification(event_id, user_id, action_type, description):
     """
     Crée une nouvelle notification d'événement.
+
+    Ne commit pas : la notification est ajoutée à la session et part avec
+    le commit unique de la requête appelante (modification, journal et
+    notification dans la même transaction).
     
     Args:
         event_id: ID de l'événement concerné
@@ -36,61 +51,203 @@ def create_notification(event_id, user_id, action_type, description):
         description=description
     )
     db.session.add(notification)
-    db.session.commit()
     return notification
 
 
-def mark_as_read(notification_id):
+def _upsert_read_state(event_id, user_id, last_read_id):
     """
-    Marque une notification comme lue.
-    
+    Crée ou avance le curseur de lecture (jamais en arrière). Ne commit pas.
+
+    Une seule instruction INSERT ... ON CONFLICT DO UPDATE.
+    """
+    table = EventNotificationRead.__table__
+    stmt = dialect_insert(table).values(
+        event_id=event_id, user_id=user_id, last_read_id=last_read_id,
+        read_ids='[]', updated_at=datetime.utcnow()
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.event_id, table.c.user_id],
+        set_={
+            'last_read_id': case(
+                (stmt.excluded.last_read_id > table.c.last_read_id, stmt.excluded.last_read_id),
+                else_=table.c.last_read_id
+            ),
+            'updated_at': stmt.excluded.updated_at,
+        }
+    )
+    db.session.execute(stmt)
+
+
+def get_read_state(event_id, user_id):
+    """
+    Retourne le curseur de lecture d'un utilisateur pour un événement.
+
+    Returns:
+        tuple: (last_read_id, IDs lus au-delà du curseur) ; (0, set()) si
+               l'utilisateur n'a encore rien lu
+    """
+    state = EventNotificationRead.query.filter_by(event_id=event_id, user_id=user_id).first()
+    if state is None:
+        return 0, set()
+    return state.last_read_id, {i for i in (state.read_ids or []) if i > state.last_read_id}
+
+
+def _unread_conditions(event_id, last_read_id, read_ids):
+    """Filtre des notifications non lues : intervalle d'IDs moins les lectures isolées."""
+    conditions = [EventNotification.event_id == event_id, EventNotification.id > last_read_id]
+    if read_ids:
+        conditions.append(EventNotification.id.notin_(sorted(read_ids)))
+    return conditions
+
+
+def mark_as_read(notification, user_id):
+    """
+    Marque une notification comme lue pour un utilisateur.
+
+    Si toutes les notifications précédentes sont lues, le curseur avance
+    et la liste des lectures isolées est compactée.
+
     Args:
-        notification_id: ID de la notification à marquer
-        
+        notification: Notification à marquer
+        user_id: ID du lecteur
+
     Returns:
-        bool: True si la mise à jour a réussi, False sinon
+        bool: True
     """
-    notification = EventNotification.query.get(notification_id)
-    if notification:
-        notification.is_read = True
-        db.session.commit()
-        return True
-    return False
+    event_id = notification.event_id
+    _upsert_read_state(event_id, user_id, 0)
+    state = EventNotificationRead.query.filter_by(event_id=event_id, user_id=user_id).one()
+    read_ids = {i for i in (state.read_ids or []) if i > state.last_read_id}
+    if notification.id > state.last_read_id:
+        read_ids.add(notification.id)
+
+    first_unread = db.session.query(func.min(EventNotification.id))\
+        .filter(*_unread_conditions(event_id, state.last_read_id, read_ids)).scalar()
+    if first_unread is None:
+        state.last_read_id = max(read_ids | {state.last_read_id})
+    else:
+        state.last_read_id = max(state.last_read_id, first_unread - 1)
+    state.read_ids = sorted(i for i in read_ids if i > state.last_read_id)
+    state.updated_at = datetime.utcnow()
+    db.session.commit()
+    return True
 
 
-def get_event_notifications(event_id, unread_only=False):
+def mark_all_as_read(event_id, user_id, up_to_id=None):
     """
-    Récupère les notifications d'un événement.
-    
+    Marque comme lues, pour un utilisateur, les notifications d'un événement.
+
     Args:
         event_id: ID de l'événement
-        unread_only: Si True, ne retourne que les notifications non lues
-        
+        user_id: ID du lecteur
+        up_to_id: Si fourni, ignore les notifications arrivées après cet ID
+            (borné à la dernière notification existante de l'événement : les
+            ID sont globaux et le curseur ne recule jamais)
+
     Returns:
-        List[EventNotification]: Liste des notifications triées par date (plus récentes en premier)
+        int: Nouveau curseur de lecture demandé
     """
-    query = EventNotification.query.filter_by(event_id=event_id)
-    
-    if unread_only:
-        query = query.filter_by(is_read=False)
-        
-    return query.order_by(EventNotification.created_at.desc()).all()
+    latest_id = db.session.query(func.max(EventNotification.id))\
+        .filter(EventNotification.event_id == event_id).scalar() or 0
+    up_to_id = latest_id if up_to_id is None else min(up_to_id, latest_id)
+    _upsert_read_state(event_id, user_id, up_to_id)
+    db.session.commit()
+    return up_to_id
+
 
+def get_notification_feed(event_id, user_id, before_id=None, since_id=None,
+                          limit=DefaultValues.NOTIFICATIONS_PER_PAGE):
+    """
+    Récupère une page du fil de notifications d'un événement.
+
+    Pagination par curseur sur l'ID (index (event_id, id)) : before_id
+    charge les notifications plus anciennes, since_id les plus récentes
+    (rafraîchissement). Le compteur de non-lues du lecteur est une
+    sous-requête scalaire de la même requête (intervalle sur le même index).
 
-def count_unread_notifications(event_id):
+    Args:
+        event_id: ID de l'événement
+        user_id: ID du lecteur (pour l'état lu / non lu)
+        before_id: Ne retourne que les notifications d'ID inférieur
+        since_id: Ne retourne que les notifications d'ID supérieur
+        limit: Taille de la page
+
+    Returns:
+        dict: {'items': notifications (plus récentes en premier),
+               'unread_ids': IDs non lus de la page,
+               'unread_count': int, 'has_more': bool,
+               'next_before_id': curseur de la page plus ancienne ou None}
     """
-    Compte le nombre de notifications non lues pour un événement.
+    last_read_id, read_ids = get_read_state(event_id, user_id)
+    unread = db.session.query(func.count(EventNotification.id))\
+        .filter(*_unread_conditions(event_id, last_read_id, read_ids))\
+        .scalar_subquery()
+
+    query = db.session.query(EventNotification, unread)\
+        .options(joinedload(EventNotification.user))\
+        .filter(EventNotification.event_id == event_id)
+    if before_id is not None:
+        query = query.filter(EventNotification.id < before_id)
+    if since_id is not None:
+        # Les plus anciennes d'abord pour ne pas sauter de notifications
+        # lorsqu'il y en a plus d'une page de nouvelles
+        query = query.filter(EventNotification.id > since_id)\
+            .order_by(EventNotification.id.asc())
+    else:
+        query = query.order_by(EventNotification.id.desc())
+
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    items = [notification for notification, _ in rows]
+    if since_id is not None:
+        items.reverse()
+
+    if rows:
+        unread_count = rows[0][1]
+    else:
+        # Page vide : le compteur ne peut pas voyager avec les lignes
+        unread_count = count_unread_notifications(event_id, user_id)
+
+    next_before_id = items[-1].id if has_more and since_id is None else None
+    return {
+        'items': items,
+        'unread_ids': {n.id for n in items if n.id > last_read_id and n.id not in read_ids},
+        'unread_count': unread_count,
+        'has_more': has_more,
+        'next_before_id': next_before_id,
+    }
+
+
+def serialize_notification(notification, is_read):
+    """
+    Sérialise une notification pour le fil JSON.
+
+    Returns:
+        dict: Champs affichés par l'onglet Notifications
+    """
+    user = notification.user
+    return {
+        'id': notification.id,
+        'action_type': notification.action_type,
+        'description': notification.description,
+        'created_at': notification.created_at.strftime('%d/%m/%Y à %H:%M'),
+        'is_read': is_read,
+        'user_name': f"{user.prenom} {user.nom}" if user else None,
+    }
+
+
+def count_unread_notifications(event_id, user_id):
+    """
+    Compte les notifications non lues d'un événement pour un utilisateur.
     
     Args:
         event_id: ID de l'événement
+        user_id: ID du lecteur
         
     Returns:
         int: Nombre de notifications non lues
     """
-    count = EventNotification.query.filter_by(
-        event_id=event_id,
-        is_read=False
-    ).count()
-    from flask import current_app
-    current_app.logger.debug(f"Unread notifications for event {event_id}: {count}")
-    return count
+    last_read_id, read_ids = get_read_state(event_id, user_id)
+    return db.session.query(func.count(EventNotification.id))\
+        .filter(*_unread_conditions(event_id, last_read_id, read_ids)).scalar()
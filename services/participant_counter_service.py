@@ -0,0 +1,226 @@
+"""
+Service de maintenance des compteurs de participants par événement.
+
+Les compteurs (table event_participant_count) sont tenus à jour par deux
+hooks de session SQLAlchemy, dans la même transaction que les écritures
+sur Participant :
+- before_flush : lecture des anciennes valeurs (type, statut, événement)
+  des participants modifiés ou supprimés
+- after_flush : lecture des nouvelles valeurs des participants créés ou
+  modifiés, puis application des deltas
+
+Les suppressions en masse (Query.delete) contournent ces hooks : les
+appelants doivent alors utiliser recount_event_counters(). Les insertions
+Core (INSERT ... ON CONFLICT) appliquent leur delta par
+count_inserted_participant().
+"""
+
+from collections import Counter
+
+from sqlalchemy import event as sa_event, inspect, select, func
+
+from models import db, Participant, EventParticipantCount
+from constants import ParticipantType, RegistrationStatus
+from utils.db_dialect import dialect_insert
+
+# Attributs de Participant qui déterminent la clé d'un compteur
+_COUNTED_ATTRS = ('event_id', 'type', 'registration_status')
+
+# Limite de variables par requête IN (SQLite)
+_CHUNK_SIZE = 500
+
+_PENDING_KEY = 'participant_counter_pending'
+
+
+def _canonical_type(value):
+    """Normalise un type de participant (Organisateur, PJ, PNJ)."""
+    if not value:
+        return ''
+    for member in ParticipantType:
+        if member.value.lower() == value.lower():
+            return member.value
+    return value
+
+
+def _fetch_keys(connection, participant_ids):
+    """
+    Lit en base la clé (event_id, type, statut) des participants donnés.
+
+    Returns:
+        dict: {participant_id: (event_id, type, registration_status)}
+    """
+    table = Participant.__table__
+    ids = list(participant_ids)
+    keys = {}
+    for i in range(0, len(ids), _CHUNK_SIZE):
+        rows = connection.execute(
+            select(table.c.id, table.c.event_id, table.c.type, table.c.registration_status)
+            .where(table.c.id.in_(ids[i:i + _CHUNK_SIZE]))
+        )
+        for pid, event_id, p_type, status in rows:
+            keys[pid] = (event_id, _canonical_type(p_type), status or '')
+    return keys
+
+
+def _apply_deltas(connection, deltas):
+    """
+    Applique les deltas {(event_id, type, statut): n} sur la table des compteurs.
+
+    INSERT ... ON CONFLICT DO UPDATE sur uq_event_participant_count : deux
+    premières inscriptions concurrentes sur la même clé ne se marchent pas
+    dessus (un UPDATE puis INSERT verrait 0 ligne des deux côtés).
+    """
+    table = EventParticipantCount.__table__
+    for (event_id, p_type, status), delta in deltas.items():
+        if not delta or event_id is None:
+            continue
+        stmt = dialect_insert(table, connection.dialect.name).values(
+            event_id=event_id,
+            type=p_type,
+            registration_status=status,
+            count=max(delta, 0)
+        )
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=[table.c.event_id, table.c.type, table.c.registration_status],
+            set_={'count': table.c.count + delta}
+        ))
+
+
+def _before_flush(session, flush_context, instances):
+    """Capture les anciennes clés des participants modifiés ou supprimés."""
+    # Un flush précédent interrompu ne doit pas laisser de deltas orphelins
+    session.info.pop(_PENDING_KEY, None)
+
+    changed_ids = set()
+    for obj in session.dirty:
+        if isinstance(obj, Participant) and obj.id is not None:
+            state = inspect(obj)
+            if any(state.attrs[attr].history.has_changes() for attr in _COUNTED_ATTRS):
+                changed_ids.add(obj.id)
+
+    deleted_ids = {obj.id for obj in session.deleted
+                   if isinstance(obj, Participant) and obj.id is not None}
+    new_objects = [obj for obj in session.new if isinstance(obj, Participant)]
+
+    if not (changed_ids or deleted_ids or new_objects):
+        return
+
+    old_keys = _fetch_keys(session.connection(), changed_ids | deleted_ids)
+    session.info[_PENDING_KEY] = {
+        'old_keys': old_keys,
+        'changed_ids': changed_ids,
+        'new_objects': new_objects,
+    }
+
+
+def _after_flush(session, flush_context):
+    """Calcule les nouvelles clés et applique les deltas aux compteurs."""
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+
+    new_ids = {obj.id for obj in pending['new_objects'] if obj.id is not None}
+    connection = session.connection()
+    new_keys = _fetch_keys(connection, pending['changed_ids'] | new_ids)
+
+    deltas = Counter()
+    for key in pending['old_keys'].values():
+        deltas[key] -= 1
+    for key in new_keys.values():
+        deltas[key] += 1
+
+    _apply_deltas(connection, deltas)
+
+
+def register_counter_listeners():
+    """
+    Enregistre les hooks de maintenance des compteurs sur la session.
+
+    Idempotent : peut être appelé à chaque création d'application.
+    """
+    if not sa_event.contains(db.session, 'before_flush', _before_flush):
+        sa_event.listen(db.session, 'before_flush', _before_flush)
+        sa_event.listen(db.session, 'after_flush', _after_flush)
+
+
+def count_inserted_participant(event_id, participant_type, registration_status):
+    """
+    Ajoute au compteur un participant inséré hors ORM (INSERT Core).
+
+    Ne commit pas.
+    """
+    _apply_deltas(db.session.connection(),
+                  {(event_id, _canonical_type(participant_type), registration_status or ''): 1})
+
+
+def recount_event_counters(event_ids=None):
+    """
+    Reconstruit les compteurs à partir de la table Participant.
+
+    Ne commit pas : l'appelant reste maître de la transaction.
+
+    Args:
+        event_ids: Liste d'IDs d'événements à recompter (tous si None)
+
+    Returns:
+        int: Nombre de lignes de compteurs écrites
+    """
+    counts_query = db.session.query(
+        Participant.event_id,
+        Participant.type,
+        Participant.registration_status,
+        func.count(Participant.id)
+    ).group_by(Participant.event_id, Participant.type, Participant.registration_status)
+
+    delete_query = EventParticipantCount.query
+    if event_ids is not None:
+        event_ids = list(event_ids)
+        if not event_ids:
+            return 0
+        counts_query = counts_query.filter(Participant.event_id.in_(event_ids))
+        delete_query = delete_query.filter(EventParticipantCount.event_id.in_(event_ids))
+
+    # Les types legacy en minuscules sont regroupés sous leur forme canonique
+    totals = Counter()
+    for event_id, p_type, status, count in counts_query.all():
+        totals[(event_id, _canonical_type(p_type), status or '')] += count
+
+    delete_query.delete(synchronize_session=False)
+    if totals:
+        db.session.execute(
+            EventParticipantCount.__table__.insert(),
+            [
+                {'event_id': event_id, 'type': p_type, 'registration_status': status, 'count': count}
+                for (event_id, p_type, status), count in totals.items()
+            ]
+        )
+    return len(totals)
+
+
+def get_event_counts(event_id):
+    """
+    Retourne les compteurs bruts d'un événement.
+
+    Returns:
+        dict: {(type, registration_status): count}
+    """
+    rows = db.session.query(
+        EventParticipantCount.type,
+        EventParticipantCount.registration_status,
+        EventParticipantCount.count
+    ).filter_by(event_id=event_id).all()
+    return {(p_type, status): count for p_type, status, count in rows}
+
+
+def count_active_by_type(event_id):
+    """
+    Compte les participants non rejetés d'un événement, par type.
+
+    Returns:
+        dict: {'PJ': n, 'PNJ': n, 'Organisateur': n}
+    """
+    totals = {member.value: 0 for member in ParticipantType}
+    for (p_type, status), count in get_event_counts(event_id).items():
+        if status != RegistrationStatus.REJECTED.value and p_type in totals:
+            totals[p_type] += count
+    return totals
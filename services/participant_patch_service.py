@@ -0,0 +1,272 @@
+"""
+Modifications groupées de participants (patch JSON).
+
+Un patch est une liste de changements {participant_id, field, value}
+accumulés par l'interface organisateur pendant une session d'édition.
+Il est validé en une fois contre l'événement (participants, types, tarifs
+PAF), appliqué par UPDATE groupés (executemany par clé primaire), puis les
+statuts PAF des participants concernés sont recalculés en une passe.
+Le journal d'activité reçoit une seule ligne agrégée.
+"""
+
+import math
+
+from sqlalchemy import update
+
+from constants import ParticipantType, PAFStatus, ActivityLogType, DefaultValues
+from models import db, Participant, ActivityLog
+from services.participant_counter_service import recount_event_counters
+
+# Statuts posés à la main, conservés tant qu'aucun montant positif n'est saisi
+_MANUAL_PAF_STATUSES = (PAFStatus.DISPENSED.value, PAFStatus.ERROR.value)
+
+# Champs qui déclenchent le recalcul du statut PAF
+_PAF_FIELDS = ('payment_amount', 'paf_type')
+
+# Limite de variables par requête IN (SQLite)
+_CHUNK_SIZE = 500
+
+
+class PatchValidationError(ValueError):
+    """Patch refusé ; errors liste les changements invalides ({'index', 'error'})."""
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} changement(s) invalide(s)")
+        self.errors = errors
+
+
+def paf_due_map(event):
+    """
+    Montants dus par type de PAF, à partir de la configuration de l'événement.
+
+    Returns:
+        dict: {nom du tarif: montant}
+    """
+    return {item['name']: float(item.get('amount') or 0)
+            for item in event.paf_config or [] if 'name' in item}
+
+
+def compute_paf_status(current_status, due, payment_amount, amount_changed=False):
+    """
+    Statut PAF d'un participant d'après le montant versé et le montant dû.
+
+    Les statuts 'dispensé(e)' et 'erreur' sont conservés, sauf si un
+    montant positif vient d'être saisi.
+
+    Args:
+        current_status: Statut actuel
+        due: Montant dû
+        payment_amount: Montant versé
+        amount_changed: Le montant versé fait partie de la modification
+
+    Returns:
+        str: Nouveau statut PAF
+    """
+    if current_status in _MANUAL_PAF_STATUSES and not (amount_changed and payment_amount):
+        return current_status
+    amount = payment_amount or 0
+    if amount >= due:
+        return PAFStatus.PAID.value
+    if amount > 0:
+        return PAFStatus.PARTIAL.value
+    return PAFStatus.NOT_PAID.value
+
+
+def _text(max_length=None):
+    def parse(value, paf_map):
+        if value is None:
+            return None
+        if not isinstance(value, str):
+            raise ValueError('texte attendu')
+        value = value.strip()
+        if max_length and len(value) > max_length:
+            raise ValueError(f'{max_length} caractères maximum')
+        return value
+    return parse
+
+
+def _choice(values):
+    def parse(value, paf_map):
+        if value not in values:
+            raise ValueError(f"valeur inconnue '{value}'")
+        return value
+    return parse
+
+
+def _amount(value, paf_map):
+    if isinstance(value, bool):
+        raise ValueError('montant invalide')
+    try:
+        value = float(value or 0)
+    except (TypeError, ValueError):
+        raise ValueError('montant invalide')
+    if math.isnan(value) or value < 0:
+        raise ValueError('montant invalide')
+    return value
+
+
+def _paf_type(value, paf_map):
+    if not value:
+        return None
+    if value not in paf_map:
+        raise ValueError(f"tarif PAF inconnu '{value}'")
+    return value
+
+
+# Champs modifiables et leur validation
+PATCHABLE_FIELDS = {
+    'type': _choice([member.value for member in ParticipantType]),
+    'group': _text(50),
+    'paf_type': _paf_type,
+    'paf_status': _choice([member.value for member in PAFStatus]),
+    'payment_amount': _amount,
+    'payment_method': _text(50),
+    'info_payement': _text(),
+    'global_comment': _text(),
+    'comment': _text(),
+}
+
+
+def _parse_changes(changes, paf_map):
+    """
+    Valide la structure et les valeurs du patch.
+
+    Returns:
+        tuple: ({participant_id: {champ: valeur}} (le dernier changement
+               d'un champ l'emporte), erreurs)
+    """
+    updates = {}
+    errors = []
+    for index, change in enumerate(changes):
+        if not isinstance(change, dict):
+            errors.append({'index': index, 'error': 'Changement invalide'})
+            continue
+        participant_id = change.get('participant_id')
+        field = change.get('field')
+        if isinstance(participant_id, bool) or not isinstance(participant_id, int):
+            errors.append({'index': index, 'error': 'participant_id invalide'})
+            continue
+        if field not in PATCHABLE_FIELDS:
+            errors.append({'index': index, 'error': f"Champ non modifiable '{field}'"})
+            continue
+        try:
+            value = PATCHABLE_FIELDS[field](change.get('value'), paf_map)
+        except ValueError as e:
+            errors.append({'index': index, 'error': f"{field} : {e}"})
+            continue
+        updates.setdefault(participant_id, {})[field] = value
+    return updates, errors
+
+
+def _load_current(event_id, participant_ids):
+    """Valeurs actuelles des champs modifiables, pour les participants de l'événement."""
+    columns = [getattr(Participant, field) for field in PATCHABLE_FIELDS]
+    current = {}
+    for start in range(0, len(participant_ids), _CHUNK_SIZE):
+        rows = db.session.query(Participant.id, *columns).filter(
+            Participant.event_id == event_id,
+            Participant.id.in_(participant_ids[start:start + _CHUNK_SIZE])
+        ).all()
+        for row in rows:
+            current[row[0]] = dict(zip(PATCHABLE_FIELDS, row[1:]))
+    return current
+
+
+def apply_participant_patch(event, changes, user_id):
+    """
+    Applique un patch de modifications aux participants d'un événement.
+
+    Tout ou rien : un seul changement invalide fait refuser le patch.
+    Ne commit pas : l'appelant reste maître de la transaction.
+
+    Args:
+        event: Événement
+        changes: Liste de {participant_id, field, value}
+        user_id: Auteur des modifications (journal d'activité)
+
+    Returns:
+        dict: {'updated': participants modifiés, 'changes': champs modifiés,
+               'fields': champs modifiés (triés),
+               'participants': {id: champs modifiés et état PAF}}
+
+    Raises:
+        PatchValidationError: Patch invalide
+    """
+    if not isinstance(changes, list) or not changes:
+        raise PatchValidationError([{'index': None, 'error': 'Aucun changement'}])
+    if len(changes) > DefaultValues.PATCH_MAX_CHANGES:
+        raise PatchValidationError([{'index': None, 'error':
+                                     f'{DefaultValues.PATCH_MAX_CHANGES} changements maximum par patch'}])
+
+    paf_map = paf_due_map(event)
+    updates, errors = _parse_changes(changes, paf_map)
+    current = _load_current(event.id, sorted(updates))
+    for index, change in enumerate(changes):
+        if isinstance(change, dict) and change.get('participant_id') in updates \
+                and change['participant_id'] not in current:
+            errors.append({'index': index, 'error': 'Participant inconnu pour cet événement'})
+    if errors:
+        raise PatchValidationError(sorted(errors, key=lambda e: e['index']))
+
+    # Seuls les champs réellement modifiés sont écrits
+    rows = {}
+    for participant_id, fields in updates.items():
+        before = current[participant_id]
+        diff = {field: value for field, value in fields.items() if value != before[field]}
+        if diff:
+            rows[participant_id] = diff
+
+    # Recalcul des statuts PAF en une passe (un statut explicite l'emporte)
+    for participant_id, diff in rows.items():
+        if 'paf_status' in diff or not any(field in diff for field in _PAF_FIELDS):
+            continue
+        state = {**current[participant_id], **diff}
+        due = paf_map.get(state['paf_type'], 0.0) if state['paf_type'] else 0.0
+        status = compute_paf_status(state['paf_status'], due, state['payment_amount'],
+                                    amount_changed='payment_amount' in diff)
+        if status != state['paf_status']:
+            diff['paf_status'] = status
+
+    if not rows:
+        return {'updated': 0, 'changes': 0, 'fields': [], 'participants': {}}
+
+    # executemany par clé primaire (regroupé par jeu de colonnes)
+    db.session.execute(update(Participant), [{'id': pid, **diff} for pid, diff in rows.items()])
+
+    fields = sorted({field for diff in rows.values() for field in diff})
+    change_count = sum(len(diff) for diff in rows.values())
+    if 'type' in fields:
+        # Les UPDATE groupés contournent les hooks des compteurs
+        recount_event_counters([event.id])
+
+    participant_ids = sorted(rows)
+    db.session.add(ActivityLog(
+        user_id=user_id,
+        action_type=ActivityLogType.PARTICIPANT_UPDATE.value,
+        event_id=event.id,
+        details={
+            'event_name': event.name,
+            'update_type': 'patch',
+            'participant_ids': participant_ids,
+            'updated_fields': fields,
+            'changes': change_count,
+        }
+    ))
+
+    participants = {}
+    for participant_id, diff in rows.items():
+        state = {**current[participant_id], **diff}
+        due = paf_map.get(state['paf_type'], 0.0) if state['paf_type'] else 0.0
+        participants[participant_id] = {
+            **diff,
+            'paf_status': state['paf_status'],
+            'due': due,
+            'remaining': due - (state['payment_amount'] or 0),
+        }
+
+    return {
+        'updated': len(rows),
+        'changes': change_count,
+        'fields': fields,
+        'participants': participants,
+    }
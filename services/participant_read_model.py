@@ -0,0 +1,176 @@
+"""
+Modèles de lecture des participants pour les listes et les exports.
+
+La page de gestion et les exports CSV / Google Sheets n'affichent que des
+colonnes scalaires : au lieu d'hydrater Participant, User et Role (objets
+ORM, identity map, suivi des modifications), ils lisent un select() Core
+des seules colonnes utiles, dans des dataclasses à __slots__ (page de
+gestion) ou directement en lignes (exports, lus par lots).
+"""
+
+from dataclasses import dataclass
+
+from sqlalchemy import select
+
+from constants import ParticipantType, DefaultValues
+from models import db, Participant, User, Role
+
+
+@dataclass(slots=True, frozen=True)
+class RoleView:
+    """Rôle affiché dans la liste des participants."""
+    id: int
+    name: str
+    type: str
+    group: str
+
+
+@dataclass(slots=True, frozen=True)
+class UserView:
+    """Colonnes de l'utilisateur affichées dans la liste des participants."""
+    id: int
+    email: str
+    nom: str
+    prenom: str
+    age: int
+    genre: str
+    phone: str
+    discord: str
+    facebook: str
+    profile_photo_url: str
+    is_profile_photo_public: bool
+
+
+@dataclass(slots=True)
+class ParticipantView:
+    """Participant de la page de gestion (mêmes noms d'attributs que le modèle)."""
+    id: int
+    type: str
+    group: str
+    registration_status: str
+    paf_status: str
+    paf_type: str
+    payment_amount: float
+    payment_method: str
+    comment: str
+    global_comment: str
+    info_payement: str
+    custom_image: str
+    is_photo_locked: bool
+    participant_phone: str
+    participant_discord: str
+    participant_facebook: str
+    share_phone: bool
+    share_discord: bool
+    share_facebook: bool
+    user: UserView
+    role: RoleView = None
+    assigned_role: RoleView = None
+
+    @property
+    def is_organizer(self):
+        return self.type == ParticipantType.ORGANISATEUR.value
+
+    @property
+    def is_pj(self):
+        return self.type == ParticipantType.PJ.value
+
+    @property
+    def is_pnj(self):
+        return self.type == ParticipantType.PNJ.value
+
+    @property
+    def photo_status(self):
+        """'ok' (photo d'événement), 'profil' (photo de profil publique) ou 'ko'."""
+        if self.custom_image:
+            return 'ok'
+        if self.user.profile_photo_url and self.user.is_profile_photo_public:
+            return 'profil'
+        return 'ko'
+
+    @property
+    def active_role(self):
+        """Rôle du participant, ou à défaut le rôle qui lui est assigné."""
+        return self.role or self.assigned_role
+
+
+_PARTICIPANT_COLUMNS = ('id', 'type', 'group', 'registration_status', 'paf_status', 'paf_type',
+                        'payment_amount', 'payment_method', 'comment', 'global_comment', 'info_payement',
+                        'custom_image', 'is_photo_locked', 'participant_phone', 'participant_discord',
+                        'participant_facebook', 'share_phone', 'share_discord', 'share_facebook')
+_USER_COLUMNS = UserView.__slots__
+_ROLE_COLUMNS = RoleView.__slots__
+
+# Colonne "rôle assigné" des exports (rôle lié par Participant.role_id)
+ROLE_NAME = Role.name.label('role_name')
+
+
+def _role_views(event_id):
+    """Rôles de l'événement, et rôle assigné par participant (le premier par ID)."""
+    rows = db.session.execute(
+        select(Role.assigned_participant_id, *(getattr(Role, c) for c in _ROLE_COLUMNS))
+        .where(Role.event_id == event_id)
+        .order_by(Role.id)
+    ).all()
+    roles = {}
+    assigned = {}
+    for assigned_participant_id, *values in rows:
+        role = RoleView(*values)
+        roles[role.id] = role
+        if assigned_participant_id is not None:
+            assigned.setdefault(assigned_participant_id, role)
+    return roles, assigned
+
+
+def list_participants(event_id):
+    """
+    Participants d'un événement pour la page de gestion.
+
+    Deux requêtes : participants + utilisateurs (une jointure), puis les
+    rôles de l'événement.
+
+    Returns:
+        list[ParticipantView]: Par ID croissant
+    """
+    stmt = select(
+        Participant.role_id,
+        *(getattr(Participant, c) for c in _PARTICIPANT_COLUMNS),
+        *(getattr(User, c) for c in _USER_COLUMNS),
+    ).join(User, User.id == Participant.user_id)\
+        .where(Participant.event_id == event_id)\
+        .order_by(Participant.id)
+
+    roles, assigned = _role_views(event_id)
+    n_participant = len(_PARTICIPANT_COLUMNS)
+    participants = []
+    for role_id, *values in db.session.execute(stmt):
+        participant = ParticipantView(*values[:n_participant], user=UserView(*values[n_participant:]))
+        participant.role = roles.get(role_id)
+        participant.assigned_role = assigned.get(participant.id)
+        participants.append(participant)
+    return participants
+
+
+def iter_participant_rows(event_id, columns, batch_size=DefaultValues.EXPORT_BATCH_SIZE):
+    """
+    Lignes d'export des participants d'un événement, lues par lots.
+
+    Participant est joint à User, et au rôle lié (ROLE_NAME) par une
+    jointure externe.
+
+    Args:
+        event_id: ID de l'événement
+        columns: Colonnes à lire (attributs de Participant / User, ROLE_NAME)
+        batch_size: Lignes par lot (curseur serveur sous PostgreSQL)
+
+    Returns:
+        Iterator[Row]: Lignes dans l'ordre des colonnes, par ID croissant
+    """
+    stmt = select(*columns)\
+        .select_from(Participant)\
+        .join(User, User.id == Participant.user_id)\
+        .outerjoin(Role, Role.id == Participant.role_id)\
+        .where(Participant.event_id == event_id)\
+        .order_by(Participant.id)\
+        .execution_options(yield_per=batch_size)
+    return iter(db.session.execute(stmt))
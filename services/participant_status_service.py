@@ -0,0 +1,168 @@
+"""
+Changements groupés du statut d'inscription des participants.
+
+Une transition (valider, rejeter, mettre en attente) est appliquée à un
+ensemble de participants par un UPDATE ... WHERE id IN (...), puis les
+compteurs de l'événement sont reconstruits dans la même transaction. Les
+limites max_pjs / max_pnjs / max_organizers sont vérifiées sur ces
+compteurs avant le commit : si une limite est dépassée, l'appelant annule
+la transaction et aucun participant n'est modifié.
+"""
+
+from sqlalchemy import update
+
+from constants import RegistrationStatus, ParticipantType, ActivityLogType, DefaultValues
+from models import db, Event, Participant, User, ActivityLog
+from services.notification_service import create_notification
+from services.participant_counter_service import recount_event_counters, get_event_counts
+
+# action -> (statut, libellé pour la notification)
+STATUS_ACTIONS = {
+    'validate': (RegistrationStatus.VALIDATED.value, 'validé(s)'),
+    'reject': (RegistrationStatus.REJECTED.value, 'rejeté(s)'),
+    'pending': (RegistrationStatus.PENDING.value, 'mis en attente'),
+}
+
+# Type de participant -> (colonne de limite, valeur par défaut affichée)
+_LIMIT_COLUMNS = {
+    ParticipantType.PJ.value: ('max_pjs', 50),
+    ParticipantType.PNJ.value: ('max_pnjs', 10),
+    ParticipantType.ORGANISATEUR.value: ('max_organizers', 5),
+}
+
+
+class StatusTransitionError(ValueError):
+    """Transition refusée (action ou liste de participants invalide)."""
+
+
+class CapacityExceededError(StatusTransitionError):
+    """Validation refusée ; over_limit détaille {type: {'limit', 'count'}}."""
+
+    def __init__(self, over_limit):
+        details = ', '.join(f"{p_type} {v['count']}/{v['limit']}" for p_type, v in over_limit.items())
+        super().__init__(f"Limite de participants dépassée ({details})")
+        self.over_limit = over_limit
+
+
+def event_limits(event):
+    """
+    Limites de participants validés par type.
+
+    Returns:
+        dict: {type: limite}
+    """
+    return {p_type: getattr(event, column) if getattr(event, column) is not None else default
+            for p_type, (column, default) in _LIMIT_COLUMNS.items()}
+
+
+def _validated_counts(event_id):
+    """Participants validés par type, lus depuis les compteurs matérialisés."""
+    totals = {p_type: 0 for p_type in _LIMIT_COLUMNS}
+    for (p_type, status), count in get_event_counts(event_id).items():
+        if status == RegistrationStatus.VALIDATED.value and p_type in totals:
+            totals[p_type] += count
+    return totals
+
+
+def change_registration_status(event, participant_ids, action, user_id):
+    """
+    Applique une transition de statut à un ensemble de participants.
+
+    L'organisateur qui fait la demande ne change pas son propre statut.
+    Ne commit pas : l'appelant commit, ou annule si une exception est levée.
+
+    Args:
+        event: Événement
+        participant_ids: IDs des participants
+        action: 'validate', 'reject' ou 'pending'
+        user_id: Organisateur à l'origine du changement
+
+    Returns:
+        dict: {'status', 'updated', 'unchanged', 'not_found' (IDs),
+               'validated': {type: nombre}, 'limits': {type: limite}}
+
+    Raises:
+        StatusTransitionError: Action ou liste invalide
+        CapacityExceededError: Une limite serait dépassée
+    """
+    if action not in STATUS_ACTIONS:
+        raise StatusTransitionError('Action invalide')
+    if not isinstance(participant_ids, list) or not participant_ids or \
+            not all(isinstance(i, int) and not isinstance(i, bool) for i in participant_ids):
+        raise StatusTransitionError('Liste de participants invalide')
+    status, status_text = STATUS_ACTIONS[action]
+    participant_ids = sorted(set(participant_ids))
+    batch_size = DefaultValues.DELETE_BATCH_SIZE
+
+    # Sérialise les transitions concurrentes sur l'événement (FOR UPDATE, ignoré par SQLite
+    # où le verrou d'écriture pris par l'UPDATE joue ce rôle)
+    db.session.query(Event.id).filter(Event.id == event.id).with_for_update().scalar()
+
+    rows = []
+    for start in range(0, len(participant_ids), batch_size):
+        rows += db.session.query(
+            Participant.id, Participant.user_id, Participant.type, Participant.registration_status,
+            User.prenom, User.nom
+        ).join(User, Participant.user_id == User.id).filter(
+            Participant.event_id == event.id,
+            Participant.id.in_(participant_ids[start:start + batch_size])
+        ).all()
+
+    found = {row.id for row in rows}
+    targets = [row for row in rows if row.registration_status != status and row.user_id != user_id]
+    target_ids = [row.id for row in targets]
+
+    for start in range(0, len(target_ids), batch_size):
+        db.session.execute(
+            update(Participant)
+            .where(Participant.id.in_(target_ids[start:start + batch_size]))
+            .values(registration_status=status),
+            execution_options={'synchronize_session': False}
+        )
+
+    limits = event_limits(event)
+    validated = None
+    if target_ids:
+        # Les UPDATE groupés contournent les hooks des compteurs
+        recount_event_counters([event.id])
+        validated = _validated_counts(event.id)
+        if status == RegistrationStatus.VALIDATED.value:
+            # Seuls les types concernés par la transition sont contrôlés
+            changed_types = {row.type for row in targets}
+            over_limit = {p_type: {'limit': limits[p_type], 'count': count}
+                          for p_type, count in validated.items()
+                          if p_type in changed_types and count > limits[p_type]}
+            if over_limit:
+                raise CapacityExceededError(over_limit)
+
+        db.session.add(ActivityLog(
+            user_id=user_id,
+            action_type=ActivityLogType.STATUS_CHANGE.value,
+            event_id=event.id,
+            details={
+                'event_name': event.name,
+                'update_type': 'bulk_status',
+                'new_status': status,
+                'participant_ids': target_ids,
+            }
+        ))
+
+        names = [f"{row.prenom or ''} {row.nom or ''}".strip() for row in targets]
+        description = f"{len(names)} participant(s) {status_text} : {', '.join(names[:5])}"
+        if len(names) > 5:
+            description += f" ... (+{len(names) - 5})"
+        create_notification(
+            event_id=event.id,
+            user_id=user_id,
+            action_type='status_change',
+            description=description
+        )
+
+    return {
+        'status': status,
+        'updated': len(target_ids),
+        'unchanged': len(rows) - len(target_ids),
+        'not_found': [i for i in participant_ids if i not in found],
+        'validated': validated if validated is not None else _validated_counts(event.id),
+        'limits': limits,
+    }
@@ -0,0 +1,127 @@
+"""
+Inscriptions idempotentes : participants et soumissions GForms.
+
+Le webhook GForms, l'import CSV et l'inscription à un événement créent
+une participation (et une soumission) si elle n'existe pas encore. Au lieu
+d'un SELECT suivi d'un INSERT, sujets à une course entre deux envois
+simultanés, les lignes sont insérées par INSERT ... ON CONFLICT DO NOTHING
+sur les index uniques :
+- participant (event_id, user_id)
+- gforms_submission (event_id, email), pour les emails non vides
+
+Une ligne insérée coûte une seule requête ; le conflit est résolu par la
+base, qui ne crée jamais de doublon. L'INSERT Core ne passe pas par les
+validateurs de Participant : le type et le statut sont rendus canoniques
+ici, une valeur inconnue est refusée.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.orm import make_transient_to_detached
+
+from constants import ParticipantType, RegistrationStatus
+from models import db, Participant, GFormsSubmission
+from services.participant_counter_service import count_inserted_participant
+from utils.db_dialect import dialect_insert
+
+# Prédicat de l'index unique partiel des soumissions (SQLite et PostgreSQL)
+SUBMISSION_EMAIL_PREDICATE = "email <> ''"
+
+
+class RegistrationValueError(ValueError):
+    """Type de participant ou statut d'inscription inconnu."""
+
+
+def canonical_value(enum_cls, value):
+    """
+    Valeur canonique d'un membre de enum_cls, sans tenir compte de la casse
+    (même règle que les validateurs de Participant).
+
+    Args:
+        enum_cls: ParticipantType ou RegistrationStatus
+        value: Valeur saisie (None est conservé)
+
+    Raises:
+        RegistrationValueError: Valeur qui n'est pas un membre de enum_cls
+    """
+    if value is None:
+        return None
+    for member in enum_cls:
+        if member.value.lower() == value.strip().lower():
+            return member.value
+    raise RegistrationValueError(f"Valeur inconnue : {value}")
+
+
+def upsert_participant(event_id, user_id, **values):
+    """
+    Inscrit un utilisateur à un événement s'il n'y est pas déjà.
+
+    Le compteur de l'événement est mis à jour pour une insertion (l'INSERT
+    Core contourne les hooks de session). Ne commit pas.
+
+    Args:
+        event_id: ID de l'événement
+        user_id: ID de l'utilisateur (déjà en base)
+        **values: Autres colonnes de Participant (type, registration_status...)
+
+    Returns:
+        int: ID du participant créé, None s'il existait déjà (rien n'est modifié)
+
+    Raises:
+        RegistrationValueError: Type ou statut qui n'est pas une valeur de
+            ParticipantType / RegistrationStatus
+    """
+    values['type'] = canonical_value(ParticipantType, values.get('type'))
+    values['registration_status'] = canonical_value(
+        RegistrationStatus, values.get('registration_status', RegistrationStatus.TO_VALIDATE.value))
+    stmt = dialect_insert(Participant)\
+        .values(event_id=event_id, user_id=user_id, **values)\
+        .on_conflict_do_nothing(index_elements=['event_id', 'user_id'])\
+        .returning(Participant.__table__.c.id)
+    participant_id = db.session.execute(stmt).scalar()
+    if participant_id is not None:
+        count_inserted_participant(event_id, values['type'], values['registration_status'])
+    return participant_id
+
+
+def upsert_submission(event_id, email, **values):
+    """
+    Crée la soumission GForms d'un email, ou retourne celle qui existe.
+
+    Une soumission créée est attachée à la session sans être relue. Une
+    soumission existante est chargée sans être modifiée : l'appelant
+    fusionne ses réponses. Un email vide (réponse anonyme) crée toujours
+    une nouvelle soumission. Ne commit pas.
+
+    Args:
+        event_id: ID de l'événement
+        email: Email du répondant
+        **values: Autres colonnes de GFormsSubmission
+
+    Returns:
+        tuple: (GFormsSubmission, créée)
+    """
+    row = dict(values, event_id=event_id, email=email)
+    if not email:
+        submission = GFormsSubmission(**row)
+        db.session.add(submission)
+        return submission, True
+
+    stmt = dialect_insert(GFormsSubmission)\
+        .values(**row)\
+        .on_conflict_do_nothing(index_elements=['event_id', 'email'],
+                                index_where=text(SUBMISSION_EMAIL_PREDICATE))\
+        .returning(GFormsSubmission.__table__.c.id)
+    submission_id = db.session.execute(stmt).scalar()
+    if submission_id is None:
+        submission = GFormsSubmission.query.filter(
+            GFormsSubmission.event_id == event_id,
+            GFormsSubmission.email == email
+        ).one()
+        return submission, False
+
+    # Ligne connue : l'objet devient persistant sans SELECT (colonnes non
+    # fournies chargées à la demande)
+    submission = GFormsSubmission(id=submission_id, **row)
+    make_transient_to_detached(submission)
+    db.session.add(submission)
+    return submission, True
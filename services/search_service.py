@@ -0,0 +1,324 @@
+"""
+Service de recherche plein texte (SQLite FTS5).
+
+La table virtuelle search_index regroupe trois sources, tenues à jour par
+des triggers SQLite (y compris pour les écritures en masse) :
+- user : prénom, nom et email
+- participant : commentaire général et infos de paiement
+- answer : valeur d'une réponse Google Forms (gforms_answer)
+
+Le rowid encode la source (ref_id * 4 + code du type) pour que les
+triggers mettent l'index à jour par clé primaire, sans parcours.
+
+Sur un moteur sans FTS5 (ou non SQLite), search_index_available() renvoie
+False et les appelants se rabattent sur leurs requêtes LIKE ; search()
+parcourt alors les mêmes sources par ILIKE (sans classement ni accents).
+"""
+
+import re
+
+import sqlalchemy as sa
+from sqlalchemy import event as sa_event, DDL
+
+from models import db, User, Participant, GFormsAnswer, GFormsFieldMapping, GFormsSubmission
+from constants import ParticipantType
+
+# Code de chaque type de document dans le rowid
+KIND_CODES = {'user': 1, 'participant': 2, 'answer': 3}
+
+# Nombre de résultats maximal par recherche
+MAX_SEARCH_RESULTS = 50
+
+_search_index = sa.table(
+    'search_index',
+    sa.column('rowid', sa.Integer),
+    sa.column('content', sa.Text),
+    sa.column('kind', sa.String),
+    sa.column('ref_id', sa.Integer),
+    sa.column('event_id', sa.Integer),
+)
+
+# Contenu indexé par type (expressions SQL sur la ligne "new" ou la table source)
+_USER_CONTENT = "trim(coalesce({t}.prenom, '') || ' ' || coalesce({t}.nom, '') || ' ' || {t}.email)"
+_PARTICIPANT_CONTENT = "trim(coalesce({t}.global_comment, '') || ' ' || coalesce({t}.info_payement, ''))"
+
+_INSERT_USER = (
+    "INSERT INTO search_index(rowid, content, kind, ref_id, event_id) "
+    "SELECT {t}.id * 4 + 1, " + _USER_CONTENT + ", 'user', {t}.id, NULL"
+)
+_INSERT_PARTICIPANT = (
+    "INSERT INTO search_index(rowid, content, kind, ref_id, event_id) "
+    "SELECT {t}.id * 4 + 2, " + _PARTICIPANT_CONTENT + ", 'participant', {t}.id, {t}.event_id"
+)
+_INSERT_ANSWER = (
+    "INSERT INTO search_index(rowid, content, kind, ref_id, event_id) "
+    "SELECT {t}.id * 4 + 3, {t}.value, 'answer', {t}.id, "
+    "(SELECT event_id FROM gforms_submission WHERE id = {t}.submission_id)"
+)
+
+SEARCH_INDEX_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+    "content, kind UNINDEXED, ref_id UNINDEXED, event_id UNINDEXED, "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+
+    # Utilisateurs
+    'CREATE TRIGGER IF NOT EXISTS search_user_ai AFTER INSERT ON "user" BEGIN '
+    + _INSERT_USER.format(t='new') + "; END",
+    'CREATE TRIGGER IF NOT EXISTS search_user_au AFTER UPDATE OF nom, prenom, email ON "user" BEGIN '
+    "DELETE FROM search_index WHERE rowid = old.id * 4 + 1; "
+    + _INSERT_USER.format(t='new') + "; END",
+    'CREATE TRIGGER IF NOT EXISTS search_user_ad AFTER DELETE ON "user" BEGIN '
+    "DELETE FROM search_index WHERE rowid = old.id * 4 + 1; END",
+
+    # Commentaires des participants (lignes vides non indexées)
+    "CREATE TRIGGER IF NOT EXISTS search_participant_ai AFTER INSERT ON participant BEGIN "
+    + _INSERT_PARTICIPANT.format(t='new') + " WHERE " + _PARTICIPANT_CONTENT.format(t='new') + " <> ''; END",
+    "CREATE TRIGGER IF NOT EXISTS search_participant_au "
+    "AFTER UPDATE OF global_comment, info_payement, event_id ON participant BEGIN "
+    "DELETE FROM search_index WHERE rowid = old.id * 4 + 2; "
+    + _INSERT_PARTICIPANT.format(t='new') + " WHERE " + _PARTICIPANT_CONTENT.format(t='new') + " <> ''; END",
+    "CREATE TRIGGER IF NOT EXISTS search_participant_ad AFTER DELETE ON participant BEGIN "
+    "DELETE FROM search_index WHERE rowid = old.id * 4 + 2; END",
+
+    # Réponses Google Forms
+    "CREATE TRIGGER IF NOT EXISTS search_answer_ai AFTER INSERT ON gforms_answer BEGIN "
+    + _INSERT_ANSWER.format(t='new') + "; END",
+    "CREATE TRIGGER IF NOT EXISTS search_answer_au AFTER UPDATE OF value ON gforms_answer BEGIN "
+    "DELETE FROM search_index WHERE rowid = old.id * 4 + 3; "
+    + _INSERT_ANSWER.format(t='new') + "; END",
+    "CREATE TRIGGER IF NOT EXISTS search_answer_ad AFTER DELETE ON gforms_answer BEGIN "
+    "DELETE FROM search_index WHERE rowid = old.id * 4 + 3; END",
+]
+
+
+def register_search_index():
+    """
+    Crée l'index FTS5 et ses triggers avec db.create_all() (SQLite uniquement).
+
+    Idempotent : peut être appelé à chaque création d'application.
+    """
+    if sa_event.contains(db.metadata, 'before_drop', _drop_search_index):
+        return
+    for statement in SEARCH_INDEX_DDL:
+        sa_event.listen(db.metadata, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+    sa_event.listen(db.metadata, 'before_drop', _drop_search_index)
+
+
+def _drop_search_index(target, connection, **kw):
+    """Supprime la table virtuelle avec db.drop_all() (les triggers suivent leurs tables)."""
+    if connection.dialect.name == 'sqlite':
+        connection.exec_driver_sql('DROP TABLE IF EXISTS search_index')
+
+
+def search_index_available():
+    """Indique si la table search_index existe sur la base courante."""
+    if db.engine.dialect.name != 'sqlite':
+        return False
+    return db.session.execute(sa.text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'"
+    )).first() is not None
+
+
+def rebuild_search_index():
+    """
+    Reconstruit intégralement l'index depuis les tables sources.
+
+    Ne commit pas.
+
+    Returns:
+        int: Nombre de documents indexés (0 si l'index est indisponible)
+    """
+    if not search_index_available():
+        return 0
+    db.session.execute(sa.text('DELETE FROM search_index'))
+    db.session.execute(sa.text(_INSERT_USER.format(t='u') + ' FROM "user" u'))
+    db.session.execute(sa.text(
+        _INSERT_PARTICIPANT.format(t='p') + ' FROM participant p WHERE '
+        + _PARTICIPANT_CONTENT.format(t='p') + " <> ''"))
+    db.session.execute(sa.text(_INSERT_ANSWER.format(t='a') + ' FROM gforms_answer a'))
+    return db.session.execute(sa.text('SELECT count(*) FROM search_index')).scalar()
+
+
+def build_match_query(text):
+    """
+    Convertit une saisie libre en requête FTS5 (tous les mots, en préfixe).
+
+    Les opérateurs FTS5 de la saisie sont neutralisés.
+
+    Returns:
+        str: Requête MATCH, ou None si la saisie ne contient aucun mot
+    """
+    tokens = re.findall(r'\w+', text or '')
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def _match(match_query):
+    return sa.literal_column('search_index').op('MATCH')(match_query)
+
+
+def search_user_ids_query(text):
+    """
+    Sous-requête des IDs d'utilisateurs correspondant à la saisie.
+
+    Returns:
+        Select: Sous-requête utilisable dans User.id.in_(...), ou None si la
+        saisie est vide ou l'index indisponible
+    """
+    match_query = build_match_query(text)
+    if match_query is None or not search_index_available():
+        return None
+    return sa.select(_search_index.c.ref_id).where(
+        _match(match_query), _search_index.c.kind == 'user')
+
+
+def get_searchable_event_ids(user):
+    """
+    Retourne les événements dont l'utilisateur peut consulter les données.
+
+    Returns:
+        set: IDs d'événements organisés, ou None pour un administrateur (tous)
+    """
+    if user.is_admin:
+        return None
+    rows = db.session.query(Participant.event_id).filter(
+        Participant.user_id == user.id,
+        Participant.type == ParticipantType.ORGANISATEUR.value
+    ).all()
+    return {event_id for (event_id,) in rows}
+
+
+def search(text, user, event_id=None, limit=20):
+    """
+    Recherche classée (bm25) dans l'index, limitée aux droits de l'utilisateur.
+
+    Un administrateur voit tout ; un organisateur voit les commentaires et
+    réponses de ses événements, et les utilisateurs qui y participent.
+
+    Args:
+        text: Saisie libre
+        user: Utilisateur effectuant la recherche
+        event_id: Restreint la recherche à un événement (optionnel)
+        limit: Nombre maximal de résultats (plafonné à MAX_SEARCH_RESULTS)
+
+    Returns:
+        list: [{'kind', 'id', 'event_id', 'label', 'snippet', ...}] triés par pertinence
+
+    Raises:
+        PermissionError: Si l'utilisateur ne peut pas consulter l'événement
+    """
+    allowed = get_searchable_event_ids(user)
+    if event_id is not None:
+        if allowed is not None and event_id not in allowed:
+            raise PermissionError(event_id)
+        allowed = {event_id}
+
+    match_query = build_match_query(text)
+    if match_query is None or (allowed is not None and not allowed):
+        return []
+    limit = max(1, min(int(limit), MAX_SEARCH_RESULTS))
+    if not search_index_available():
+        return _describe_hits(_search_like(text, allowed, limit))
+
+    idx = _search_index
+    query = sa.select(
+        idx.c.kind, idx.c.ref_id, idx.c.event_id,
+        sa.func.snippet(sa.literal_column('search_index'), 0, '', '', '…', 12).label('snippet'),
+        sa.func.bm25(sa.literal_column('search_index')).label('score')
+    ).where(_match(match_query))
+
+    if allowed is not None:
+        participants = sa.select(Participant.user_id).where(Participant.event_id.in_(allowed))
+        query = query.where(sa.or_(
+            idx.c.event_id.in_(allowed),
+            sa.and_(idx.c.kind == 'user', idx.c.ref_id.in_(participants))
+        ))
+
+    rows = db.session.execute(query.order_by(sa.text('score')).limit(limit)).all()
+    return _describe_hits(rows)
+
+
+def _search_like(text, allowed, limit):
+    """
+    Recherche de repli sans index (PostgreSQL, SQLite sans FTS5).
+
+    Chaque mot de la saisie doit apparaître (ILIKE) dans le contenu que
+    l'index aurait indexé ; résultats les plus récents d'abord.
+
+    Returns:
+        list: Lignes (kind, ref_id, event_id, snippet, score) comme search()
+    """
+    tokens = re.findall(r'\w+', text or '')
+
+    def matching(content):
+        return sa.and_(*(content.ilike(f'%{token}%') for token in tokens))
+
+    user_content = sa.func.trim(sa.func.coalesce(User.prenom, '') + ' ' + sa.func.coalesce(User.nom, '')
+                                + ' ' + User.email)
+    participant_content = sa.func.trim(sa.func.coalesce(Participant.global_comment, '') + ' '
+                                       + sa.func.coalesce(Participant.info_payement, ''))
+
+    def kind(name):
+        return sa.literal_column(f"'{name}'", sa.String)
+
+    users = sa.select(kind('user').label('kind'), User.id.label('ref_id'),
+                      sa.cast(sa.null(), sa.Integer).label('event_id'), user_content.label('content'))\
+        .where(matching(user_content))
+    participants = sa.select(kind('participant'), Participant.id, Participant.event_id, participant_content)\
+        .where(matching(participant_content))
+    answers = sa.select(kind('answer'), GFormsAnswer.id, GFormsSubmission.event_id, GFormsAnswer.value)\
+        .join(GFormsSubmission, GFormsAnswer.submission_id == GFormsSubmission.id)\
+        .where(matching(GFormsAnswer.value))
+
+    if allowed is not None:
+        members = sa.select(Participant.user_id).where(Participant.event_id.in_(allowed))
+        users = users.where(User.id.in_(members))
+        participants = participants.where(Participant.event_id.in_(allowed))
+        answers = answers.where(GFormsSubmission.event_id.in_(allowed))
+
+    hits = sa.union_all(users, participants, answers).subquery()
+    query = sa.select(hits.c.kind, hits.c.ref_id, hits.c.event_id,
+                      sa.func.substr(hits.c.content, 1, 120).label('snippet'),
+                      sa.literal(0).label('score'))\
+        .order_by(hits.c.ref_id.desc()).limit(limit)
+    return db.session.execute(query).all()
+
+
+def _describe_hits(rows):
+    """Complète les résultats bruts avec les libellés des entités (une requête par type)."""
+    ids = {kind: [r.ref_id for r in rows if r.kind == kind] for kind in KIND_CODES}
+
+    users = {u.id: u for u in User.query.filter(User.id.in_(ids['user'])).all()} if ids['user'] else {}
+    participants = {}
+    if ids['participant']:
+        for p, u in db.session.query(Participant, User).join(User, Participant.user_id == User.id)\
+                .filter(Participant.id.in_(ids['participant'])).all():
+            participants[p.id] = (p, u)
+    answers = {}
+    if ids['answer']:
+        for answer_id, field_name, email, submission_id in db.session.query(
+                GFormsAnswer.id, GFormsFieldMapping.field_name, GFormsSubmission.email, GFormsSubmission.id)\
+                .join(GFormsFieldMapping, GFormsAnswer.field_mapping_id == GFormsFieldMapping.id)\
+                .join(GFormsSubmission, GFormsAnswer.submission_id == GFormsSubmission.id)\
+                .filter(GFormsAnswer.id.in_(ids['answer'])).all():
+            answers[answer_id] = (field_name, email, submission_id)
+
+    hits = []
+    for row in rows:
+        hit = {'kind': row.kind, 'id': row.ref_id, 'event_id': row.event_id,
+               'snippet': row.snippet, 'score': row.score}
+        if row.kind == 'user' and row.ref_id in users:
+            u = users[row.ref_id]
+            hit.update(label=f"{u.prenom or ''} {u.nom or ''}".strip() or u.email, email=u.email)
+        elif row.kind == 'participant' and row.ref_id in participants:
+            p, u = participants[row.ref_id]
+            hit.update(label=f"{u.prenom or ''} {u.nom or ''}".strip() or u.email,
+                       email=u.email, user_id=u.id)
+        elif row.kind == 'answer' and row.ref_id in answers:
+            field_name, email, submission_id = answers[row.ref_id]
+            hit.update(label=field_name, email=email, submission_id=submission_id)
+        else:
+            continue
+        hits.append(hit)
+    return hits
@@ -0,0 +1,132 @@
+"""
+Annuaire des utilisateurs de l'administration.
+
+Une page de l'annuaire est lue en une requête : les colonnes affichées de
+User, le nombre de participations et la dernière activité (sous-requêtes
+corrélées, résolues par les index idx_participant_user et
+idx_activity_log_user_created pour les seuls utilisateurs de la page).
+Le filtre "actifs" (ni supprimés, ni bannis) et les tris correspondants
+descendent les index partiels idx_user_active et idx_user_active_name.
+"""
+
+from dataclasses import dataclass
+
+from sqlalchemy import false, func, or_, select
+from sqlalchemy.orm import load_only
+
+from constants import ParticipantType, DefaultValues
+from models import db, User, Event, Participant, Role, ActivityLog
+from services.search_service import search_user_ids_query
+
+# Colonnes de User lues pour l'annuaire (tableau et fenêtre d'édition)
+_DIRECTORY_COLUMNS = (User.id, User.email, User.nom, User.prenom, User.age, User.genre, User.role,
+                      User.is_banned, User.is_deleted, User.account_status)
+
+# Filtres de statut : nom -> conditions (les "actifs" correspondent aux index partiels)
+STATUS_FILTERS = {
+    'all': (),
+    'active': (User.is_deleted == false(), User.is_banned == false()),
+    'banned': (User.is_banned.is_(True),),
+    'deleted': (User.is_deleted.is_(True),),
+}
+
+SORT_ORDERS = {
+    'id': (User.id,),
+    'name': (User.nom, User.prenom, User.id),
+}
+
+PARTICIPATION_COUNT = select(func.count(Participant.id))\
+    .where(Participant.user_id == User.id)\
+    .correlate(User)\
+    .scalar_subquery()\
+    .label('participation_count')
+
+LAST_ACTIVITY = select(func.max(ActivityLog.created_at))\
+    .where(ActivityLog.user_id == User.id)\
+    .correlate(User)\
+    .scalar_subquery()\
+    .label('last_activity')
+
+
+def _filters(search_query, status):
+    conditions = list(STATUS_FILTERS.get(status, ()))
+    if search_query:
+        # Index plein texte si disponible, sinon LIKE (parcours complet)
+        matching_ids = search_user_ids_query(search_query)
+        if matching_ids is not None:
+            conditions.append(User.id.in_(matching_ids))
+        else:
+            term = f"%{search_query}%"
+            conditions.append(or_(User.email.ilike(term), User.nom.ilike(term), User.prenom.ilike(term)))
+    return conditions
+
+
+def user_directory(page=1, per_page=DefaultValues.USERS_PER_PAGE, search_query='', status='all', sort='id'):
+    """
+    Page de l'annuaire des utilisateurs.
+
+    Args:
+        page: Numéro de page (à partir de 1)
+        per_page: Utilisateurs par page
+        search_query: Saisie de recherche (email, nom, prénom)
+        status: Clé de STATUS_FILTERS ('all' si inconnue)
+        sort: Clé de SORT_ORDERS ('id' si inconnue)
+
+    Returns:
+        Pagination: items = lignes (User, participation_count, last_activity)
+    """
+    conditions = _filters(search_query, status)
+    query = db.session.query(User, PARTICIPATION_COUNT, LAST_ACTIVITY)\
+        .options(load_only(*_DIRECTORY_COLUMNS))\
+        .filter(*conditions)\
+        .order_by(*SORT_ORDERS.get(sort, SORT_ORDERS['id']))
+    # Le total est compté sur User seul : le comptage par défaut de paginate()
+    # envelopperait la requête et ses sous-requêtes corrélées
+    pagination = query.paginate(page=page, per_page=per_page, error_out=False, count=False)
+    pagination.total = db.session.scalar(select(func.count(User.id)).where(*conditions))
+    return pagination
+
+
+@dataclass(slots=True, frozen=True)
+class UserParticipationView:
+    """Participation d'un utilisateur à un événement."""
+    event_id: int
+    event_name: str
+    event_statut: str
+    date_start: object
+    date_end: object
+    type: str
+    registration_status: str
+    role_name: str
+
+    @property
+    def is_organizer(self):
+        return self.type == ParticipantType.ORGANISATEUR.value
+
+    @property
+    def is_pj(self):
+        return self.type == ParticipantType.PJ.value
+
+    @property
+    def is_pnj(self):
+        return self.type == ParticipantType.PNJ.value
+
+
+def user_participations(user_id):
+    """
+    Événements d'un utilisateur (une participation par événement, index
+    unique uq_participant_event_user), du plus récent au plus ancien.
+
+    Returns:
+        list[UserParticipationView]
+    """
+    rows = db.session.execute(
+        select(Event.id, Event.name, Event.statut, Event.date_start, Event.date_end,
+               Participant.type, Participant.registration_status, Role.name)
+        .select_from(Participant)
+        .join(Event, Event.id == Participant.event_id)
+        .outerjoin(Role, Role.id == Participant.role_id)
+        .where(Participant.user_id == user_id, Event.is_deleting == false())
+        .order_by(Participant.event_id.desc())
+    )
+    return [UserParticipationView(*row) for row in rows]
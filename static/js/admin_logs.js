@@ -1,7 +1,8 @@
 /**
  * Script pour la page admin_logs.html
  * 
- * Gère le bouton "Marquer tout comme vu" via data attributes.
+ * Gère le bouton "Marquer tout comme vu" via data attributes
+ * (filtres actifs et limite haute up_to_id transmis au serveur).
  */
 
 document.addEventListener('DOMContentLoaded', function () {
@@ -10,15 +11,20 @@ document.addEventListener('DOMContentLoaded', function () {
     if (markViewedBtn) {
         const url = markViewedBtn.getAttribute('data-url');
         const csrfToken = markViewedBtn.getAttribute('data-csrf');
+        // Filtres actifs et limite haute : seuls les logs affichés sont marqués
+        const body = new URLSearchParams(JSON.parse(markViewedBtn.getAttribute('data-filters') || '{}'));
+        const upToId = markViewedBtn.getAttribute('data-up-to-id');
+        if (upToId && upToId !== 'None') body.set('up_to_id', upToId);
 
         markViewedBtn.addEventListener('click', function () {
             if (confirm('Marquer tous les logs comme consultés ?')) {
                 fetch(url, {
                     method: 'POST',
                     headers: {
-                        'Content-Type': 'application/json',
+                        'Content-Type': 'application/x-www-form-urlencoded',
                         'X-CSRFToken': csrfToken
-                    }
+                    },
+                    body: body.toString()
                 })
                     .then(response => response.json())
                     .then(data => {
@@ -741,8 +741,12 @@ document.addEventListener('DOMContentLoaded', function () {
     }
 
     // --- Notification Mark as Read functionality ---
+    // Compteur serveur : les pages non chargées peuvent contenir des non-lues
+    const notificationsPane = document.getElementById('list-notifications');
+    let unreadNotifications = notificationsPane ? parseInt(notificationsPane.dataset.unreadCount || '0', 10) : 0;
+
     function updateNotificationBadge() {
-        const unreadCount = document.querySelectorAll('.notification-unread').length;
+        const unreadCount = unreadNotifications;
         const bellIcon = document.querySelector('#list-notifications-list i.bi-bell');
         if (bellIcon) {
             if (unreadCount > 0) {
@@ -755,30 +759,99 @@ document.addEventListener('DOMContentLoaded', function () {
         }
     }
 
-    document.querySelectorAll('.mark-read-btn').forEach(btn => {
-        btn.addEventListener('click', function () {
-            const notifId = this.dataset.notifId;
+    function markNotificationRead(btn) {
+        const notifId = btn.dataset.notifId;
 
-            fetch(`${baseUrl}/event/${eventId}/notification/${notifId}/mark_read`, {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                    'X-CSRFToken': csrfToken
+        fetch(`${baseUrl}/event/${eventId}/notification/${notifId}/mark_read`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': csrfToken
+            }
+        })
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    // Remove highlight and button
+                    const item = btn.closest('.list-group-item');
+                    item.classList.remove('notification-unread');
+                    btn.remove();
+                    unreadNotifications = Math.max(0, unreadNotifications - 1);
+                    updateNotificationBadge();
                 }
             })
+            .catch(error => console.error('Error marking notification as read:', error));
+    }
+
+    // Délégation : couvre aussi les notifications chargées à la demande
+    const notificationList = document.getElementById('notification-list');
+    if (notificationList) {
+        notificationList.addEventListener('click', function (e) {
+            const btn = e.target.closest('.mark-read-btn');
+            if (btn) markNotificationRead(btn);
+        });
+    }
+
+    function renderNotification(notif) {
+        const item = document.createElement('div');
+        item.className = 'list-group-item' + (notif.is_read ? '' : ' notification-unread');
+        item.dataset.notifId = notif.id;
+
+        const row = document.createElement('div');
+        row.className = 'd-flex w-100 justify-content-between align-items-start';
+        const body = document.createElement('div');
+        body.className = 'flex-grow-1';
+        const line = document.createElement('div');
+        line.className = 'mb-1';
+
+        const date = document.createElement('span');
+        date.className = 'text-muted small me-2';
+        date.textContent = notif.created_at;
+        const user = document.createElement('span');
+        user.className = 'fw-bold text-primary me-2';
+        user.textContent = notif.user_name || '';
+        const description = document.createElement('span');
+        description.textContent = notif.description;
+
+        line.append(date, user, description);
+        body.appendChild(line);
+        row.appendChild(body);
+
+        if (!notif.is_read) {
+            const btn = document.createElement('button');
+            btn.className = 'btn btn-sm btn-outline-primary ms-3 mark-read-btn';
+            btn.dataset.notifId = notif.id;
+            btn.innerHTML = '<i class="bi bi-check"></i> Marquer comme lu';
+            row.appendChild(btn);
+        }
+        item.appendChild(row);
+        return item;
+    }
+
+    // --- Chargement des notifications plus anciennes (curseur before_id) ---
+    const loadMoreNotificationsBtn = document.getElementById('load-more-notifications-btn');
+    if (loadMoreNotificationsBtn && notificationList) {
+        loadMoreNotificationsBtn.addEventListener('click', function () {
+            const beforeId = this.dataset.beforeId;
+            this.disabled = true;
+
+            fetch(`${baseUrl}/event/${eventId}/notifications/feed?before_id=${encodeURIComponent(beforeId)}`)
                 .then(response => response.json())
                 .then(data => {
-                    if (data.success) {
-                        // Remove highlight and button
-                        const item = this.closest('.list-group-item');
-                        item.classList.remove('notification-unread');
-                        this.remove();
-                        updateNotificationBadge();
+                    data.items.forEach(notif => notificationList.appendChild(renderNotification(notif)));
+                    if (data.has_more) {
+                        this.dataset.beforeId = data.next_before_id;
+                        this.disabled = false;
+                    } else {
+                        this.closest('div').remove();
                     }
                 })
-                .catch(error => console.error('Error marking notification as read:', error));
+                .catch(error => {
+                    console.error('Error loading notifications:', error);
+                    this.disabled = false;
+                });
         });
-    });
+    }
 
     const markAllReadBtn = document.getElementById('mark-all-read-btn');
     if (markAllReadBtn) {
@@ -790,7 +863,8 @@ document.addEventListener('DOMContentLoaded', function () {
                 headers: {
                     'Content-Type': 'application/json',
                     'X-CSRFToken': csrfToken
-                }
+                },
+                body: JSON.stringify({ up_to_id: markAllReadBtn.dataset.upToId })
             })
                 .then(response => response.json())
                 .then(data => {
@@ -801,6 +875,7 @@ document.addEventListener('DOMContentLoaded', function () {
                             if (btn) btn.remove();
                         });
                         markAllReadBtn.remove();
+                        unreadNotifications = 0;
                         updateNotificationBadge();
                     }
                 })
@@ -44,6 +44,10 @@ document.addEventListener('DOMContentLoaded', function () {
     let fieldMappings = [];
     let currentPage = 1;
     let totalPages = 1;
+    // Filtres et tri exécutés côté serveur
+    let currentSearch = '';
+    let currentSort = 'timestamp';
+    let currentOrder = 'desc';
 
     // --- Initialization ---
 
@@ -60,6 +64,36 @@ document.addEventListener('DOMContentLoaded', function () {
         btn.addEventListener('click', () => loadAllData(eventId));
     });
 
+    // Recherche serveur (debounce)
+    const searchInput = document.getElementById('gforms-search');
+    if (searchInput) {
+        let searchTimer = null;
+        searchInput.addEventListener('input', function () {
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(() => {
+                currentSearch = searchInput.value.trim();
+                loadSubmissions(eventId, 1);
+            }, 300);
+        });
+    }
+
+    // Tri serveur au clic sur un en-tête
+    const tableHead = document.getElementById('gforms-table-head');
+    if (tableHead) {
+        tableHead.addEventListener('click', function (e) {
+            const th = e.target.closest('.gforms-sortable');
+            if (!th) return;
+            const field = th.dataset.sort;
+            if (field === currentSort) {
+                currentOrder = currentOrder === 'asc' ? 'desc' : 'asc';
+            } else {
+                currentSort = field;
+                currentOrder = 'asc';
+            }
+            loadSubmissions(eventId, 1);
+        });
+    }
+
     // Export button
     const exportBtn = document.getElementById('export-gforms-btn');
     if (exportBtn) {
@@ -218,7 +252,10 @@ document.addEventListener('DOMContentLoaded', function () {
 
         tbody.innerHTML = '<tr><td colspan="5" class="text-center"><div class="spinner-border text-primary" role="status"></div></td></tr>';
 
-        fetch(`${baseUrl}/event/${eventId}/gforms/submissions?page=${page}&per_page=50`)
+        const params = new URLSearchParams({ page: page, per_page: 50, sort: currentSort, order: currentOrder });
+        if (currentSearch) params.set('q', currentSearch);
+
+        fetch(`${baseUrl}/event/${eventId}/gforms/submissions?${params.toString()}`)
             .then(response => {
                 if (!response.ok) {
                     return response.json().then(data => {
@@ -258,7 +295,8 @@ document.addEventListener('DOMContentLoaded', function () {
         tbody.innerHTML = '';
 
         if (submissions.length === 0) {
-            tbody.innerHTML = '<tr><td colspan="100%" class="text-center text-muted">Aucun formulaire reçu pour le moment</td></tr>';
+            const emptyMessage = currentSearch ? 'Aucun formulaire ne correspond à la recherche' : 'Aucun formulaire reçu pour le moment';
+            tbody.innerHTML = `<tr><td colspan="100%" class="text-center text-muted">${emptyMessage}</td></tr>`;
             return;
         }
 
@@ -274,12 +312,12 @@ document.addEventListener('DOMContentLoaded', function () {
             return lower !== 'email' && lower !== 'timestamp' && lower !== 'type_ajout' && lower !== 'type d\'ajout';
         });
 
-        // Update Header
+        // Update Header (colonnes triables côté serveur)
         let headerHTML = `
             <tr>
-                <th>Email</th>
-                <th>Timestamp</th>
-                <th>Type d'ajout</th>
+                <th class="gforms-sortable" data-sort="email" style="cursor:pointer;">Email${sortIndicator('email')}</th>
+                <th class="gforms-sortable" data-sort="timestamp" style="cursor:pointer;">Timestamp${sortIndicator('timestamp')}</th>
+                <th class="gforms-sortable" data-sort="type_ajout" style="cursor:pointer;">Type d'ajout${sortIndicator('type_ajout')}</th>
         `;
 
         dynamicFields.forEach(field => {
@@ -298,7 +336,7 @@ document.addEventListener('DOMContentLoaded', function () {
                 labelHTML = `${displayName} <i class="bi bi-info-circle small ms-1" style="cursor:help; opacity: 0.7;" title="${field.replace(/"/g, '&quot;')}"></i>`;
             }
 
-            headerHTML += `<th class="${colorClass}">${labelHTML}</th>`;
+            headerHTML += `<th class="${colorClass} gforms-sortable" data-sort="${field.replace(/"/g, '&quot;')}" style="cursor:pointer;">${labelHTML}${sortIndicator(field)}</th>`;
         });
 
         headerHTML += '</tr>';
@@ -340,6 +378,11 @@ document.addEventListener('DOMContentLoaded', function () {
         });
     }
 
+    function sortIndicator(field) {
+        if (field !== currentSort) return '';
+        return currentOrder === 'asc' ? ' <i class="bi bi-caret-up-fill small"></i>' : ' <i class="bi bi-caret-down-fill small"></i>';
+    }
+
     function renderPagination(pagination) {
         const container = document.getElementById('gforms-pagination');
         if (!container) return;
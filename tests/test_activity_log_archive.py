@@ -0,0 +1,101 @@
+"""Tests de l'archivage du journal d'activité (services/activity_log_archive_service.py)."""
+
+import gzip
+import json
+from datetime import datetime, date
+
+from models import ActivityLog, ActivityLogRollup
+from services.activity_log_archive_service import (
+    archive_activity_logs, archive_path, list_archive_months, read_archived_logs, get_monthly_rollups
+)
+from tests.conftest import login
+
+NOW = datetime(2026, 6, 15, 12, 0)
+
+
+def _log(db, user, created_at, action_type='user_registration', **details):
+    log = ActivityLog(user_id=user.id, action_type=action_type, created_at=created_at,
+                      details=details or {'email': user.email})
+    db.session.add(log)
+    db.session.commit()
+    return log
+
+
+def test_archive_moves_old_logs(db, tmp_path, user_regular):
+    """Les logs anciens partent dans les archives mensuelles, les récents restent."""
+    _log(db, user_regular, datetime(2026, 1, 10, 9, 0))
+    _log(db, user_regular, datetime(2026, 1, 10, 18, 0), action_type='Suppression utilisateur')
+    _log(db, user_regular, datetime(2026, 2, 3, 9, 0))
+    recent = _log(db, user_regular, datetime(2026, 6, 1, 9, 0))
+
+    result = archive_activity_logs(str(tmp_path), retention_days=90, now=NOW, batch_size=2)
+
+    assert result == {'archived': 3, 'months': ['2026-01', '2026-02']}
+    assert [l.id for l in ActivityLog.query.all()] == [recent.id]
+    assert list_archive_months(str(tmp_path)) == ['2026-02', '2026-01']
+
+    with gzip.open(archive_path(str(tmp_path), '2026-01'), 'rt', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 2
+    assert records[0]['user_email'] == 'user@test.com'
+    assert records[0]['details'] == {'email': 'user@test.com'}
+
+    rollups = {(r.day, r.action_type): r.count for r in ActivityLogRollup.query.all()}
+    assert rollups == {
+        (date(2026, 1, 10), 'user_registration'): 1,
+        (date(2026, 1, 10), 'Suppression utilisateur'): 1,
+        (date(2026, 2, 3), 'user_registration'): 1,
+    }
+    assert get_monthly_rollups() == {
+        '2026-02': {'user_registration': 1},
+        '2026-01': {'user_registration': 1, 'Suppression utilisateur': 1},
+    }
+
+
+def test_archive_appends_and_accumulates(db, tmp_path, user_regular):
+    """Un second passage complète l'archive du mois et les agrégats existants."""
+    _log(db, user_regular, datetime(2026, 1, 10, 9, 0))
+    archive_activity_logs(str(tmp_path), retention_days=90, now=NOW)
+    _log(db, user_regular, datetime(2026, 1, 10, 10, 0))
+    archive_activity_logs(str(tmp_path), retention_days=90, now=NOW)
+
+    assert len(read_archived_logs(str(tmp_path), '2026-01')) == 2
+    assert ActivityLogRollup.query.one().count == 2
+
+
+def test_read_archived_logs_filters_and_dedupes(tmp_path):
+    """La lecture filtre à la volée et ignore les doublons d'un lot réarchivé."""
+    record = {'id': 1, 'created_at': '2026-01-10T09:00:00', 'action_type': 'user_registration',
+              'user_id': 5, 'user_email': 'a@test.com', 'user_nom': None, 'user_prenom': None,
+              'event_id': None, 'details': {}, 'is_viewed': False}
+    other = dict(record, id=2, action_type='event_creation', event_id=3)
+    for _ in range(2):
+        with gzip.open(archive_path(str(tmp_path), '2026-01'), 'at', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+    with gzip.open(archive_path(str(tmp_path), '2026-01'), 'at', encoding='utf-8') as f:
+        f.write(json.dumps(other) + '\n')
+
+    assert [r['id'] for r in read_archived_logs(str(tmp_path), '2026-01')] == [2, 1]
+    assert [r['id'] for r in read_archived_logs(str(tmp_path), '2026-01', event_id=3)] == [2]
+    assert read_archived_logs(str(tmp_path), '2026-01', action_type='x') == []
+    assert read_archived_logs(str(tmp_path), '2025-12') == []
+
+
+def test_admin_archives_page(client, db, app, tmp_path, monkeypatch, user_admin, user_regular):
+    """La page d'archives affiche les totaux et le contenu d'un mois à la demande."""
+    monkeypatch.setitem(app.config, 'ACTIVITY_LOG_ARCHIVE_DIR', str(tmp_path))
+    _log(db, user_regular, datetime(2026, 1, 10, 9, 0), nom='Archivé', prenom='Jean',
+         email='jean@test.com')
+    archive_activity_logs(str(tmp_path), retention_days=90, now=NOW)
+
+    login(client, 'admin@test.com', 'admin123')
+    response = client.get('/admin/logs/archives')
+    assert response.status_code == 200
+    assert b'2026-01' in response.data
+
+    response = client.get('/admin/logs/archives?month=2026-01')
+    assert response.status_code == 200
+    assert 'Archivé'.encode() in response.data
+
+    response = client.get('/admin/logs/archives?month=2026-01&action_type=event_creation')
+    assert 'Archivé'.encode() not in response.data
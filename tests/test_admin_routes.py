@@ -200,6 +200,77 @@ class TestAdminLogs:
         # Vérifier que le log est marqué comme vu
         db.session.refresh(log)
         assert log.is_viewed == True
+    
+    def _create_logs(self, db, user, count, action_type='user_registration', start=None):
+        """Crée des logs espacés d'une minute, du plus ancien au plus récent."""
+        from datetime import datetime, timedelta
+        start = start or datetime(2026, 1, 1, 12, 0)
+        logs = [ActivityLog(user_id=user.id, action_type=action_type,
+                            details={'email': f'log{i}@test.com'},
+                            created_at=start + timedelta(minutes=i)) for i in range(count)]
+        db.session.add_all(logs)
+        db.session.commit()
+        return logs
+    
+    def test_logs_keyset_pagination(self, client, user_admin, db):
+        """Le journal est paginé par curseur, sans doublon ni trou."""
+        import re
+        from constants import DefaultValues
+        self._create_logs(db, user_admin, DefaultValues.LOGS_PER_PAGE + 5)
+        
+        login(client, 'admin@test.com', 'admin123')
+        first = client.get('/admin/logs').data.decode()
+        assert 'log54@test.com' in first
+        assert 'log4@test.com' not in first
+        
+        cursor = re.search(r'cursor=([^&"]+)', first).group(1)
+        second = client.get(f'/admin/logs?cursor={cursor}').data.decode()
+        assert 'log4@test.com' in second and 'log0@test.com' in second
+        assert 'log5@test.com' not in second
+        assert 'cursor=' not in second
+    
+    def test_log_created_at_required(self, user_admin, db):
+        """La date, clé des curseurs (created_at, id), ne peut pas être NULL."""
+        from sqlalchemy.exc import IntegrityError
+        with pytest.raises(IntegrityError):
+            db.session.execute(ActivityLog.__table__.insert().values(
+                user_id=user_admin.id, action_type='test', created_at=None))
+        db.session.rollback()
+    
+    def test_logs_filters(self, client, user_admin, db):
+        """Les filtres par type d'action s'appliquent en SQL."""
+        self._create_logs(db, user_admin, 2, action_type='user_registration')
+        self._create_logs(db, user_admin, 1, action_type='Suppression utilisateur')
+        
+        login(client, 'admin@test.com', 'admin123')
+        response = client.get('/admin/logs?action_type=Suppression+utilisateur')
+        assert response.data.count(b'<tr class="table-warning"') == 1
+    
+    def test_mark_viewed_respects_filters_and_limit(self, client, user_admin, db):
+        """Le marquage est limité aux filtres et aux logs déjà affichés."""
+        registrations = self._create_logs(db, user_admin, 2, action_type='user_registration')
+        deletion = self._create_logs(db, user_admin, 1, action_type='Suppression utilisateur')[0]
+        
+        login(client, 'admin@test.com', 'admin123')
+        response = client.post('/admin/logs/mark-viewed', data={
+            'action_type': 'user_registration', 'up_to_id': registrations[0].id
+        })
+        assert response.get_json()['updated'] == 1
+        
+        db.session.expire_all()
+        assert [l.is_viewed for l in registrations] == [True, False]
+        assert db.session.get(ActivityLog, deletion.id).is_viewed is False
+    
+    def test_delete_logs_with_filter(self, client, user_admin, db):
+        """La suppression groupée ne touche que les logs filtrés."""
+        self._create_logs(db, user_admin, 2, action_type='user_registration')
+        self._create_logs(db, user_admin, 1, action_type='Suppression utilisateur')
+        
+        login(client, 'admin@test.com', 'admin123')
+        response = client.post('/admin/logs/delete-all', data={'action_type': 'user_registration'})
+        assert response.status_code == 302
+        assert 'action_type=user_registration' in response.headers['Location']
+        assert ActivityLog.query.count() == 1
 
 
 class TestProfileUpdate:
@@ -0,0 +1,54 @@
+"""Tests des helpers SQL portables (utils/db_dialect.py)."""
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, ProgrammingError, SQLAlchemyError
+
+from models import FormResponse, GFormsFieldMapping, GFormsCategory
+from utils.db_dialect import upsert, insert_ignore, is_missing_table_error
+
+
+def test_upsert_inserts_then_updates(db, event_sample):
+    """Un même response_id met à jour la ligne existante."""
+    values = {'response_id': 'resp-1', 'event_id': event_sample.id, 'answers': '{"a": 1}'}
+    first_id = upsert(FormResponse, values, ['response_id'], ['answers'])
+    second_id = upsert(FormResponse, dict(values, answers='{"a": 2}'),
+                       ['response_id'], ['answers'])
+    db.session.commit()
+
+    assert first_id == second_id
+    assert FormResponse.query.count() == 1
+    assert db.session.get(FormResponse, first_id).answers == '{"a": 2}'
+
+
+def test_insert_ignore_skips_existing_rows(db, event_sample):
+    """Les lignes déjà présentes sont ignorées, sans IntegrityError."""
+    category = GFormsCategory(event_id=event_sample.id, name='Généralités', color='neutral')
+    db.session.add(category)
+    db.session.add(GFormsFieldMapping(event_id=event_sample.id, field_name='Prénom',
+                                      category_id=None))
+    db.session.commit()
+
+    insert_ignore(GFormsFieldMapping, [
+        {'event_id': event_sample.id, 'field_name': name, 'category_id': category.id}
+        for name in ('Prénom', 'Régime')
+    ], index_elements=['event_id', 'field_name'])
+    insert_ignore(GFormsFieldMapping, [], index_elements=['event_id', 'field_name'])
+    db.session.commit()
+
+    mappings = {m.field_name: m.category_id
+                for m in GFormsFieldMapping.query.filter_by(event_id=event_sample.id)}
+    assert mappings == {'Prénom': None, 'Régime': category.id}
+
+
+def test_is_missing_table_error(db):
+    """Table absente : OperationalError SQLite ou UndefinedTable PostgreSQL."""
+    try:
+        db.session.execute(text('SELECT * FROM table_absente'))
+    except SQLAlchemyError as e:
+        assert is_missing_table_error(e)
+    db.session.rollback()
+
+    undefined = ProgrammingError('SELECT', {}, Exception('relation "gforms_submission" does not exist'))
+    assert is_missing_table_error(undefined)
+    assert not is_missing_table_error(OperationalError('SELECT', {}, Exception('database is locked')))
+    assert not is_missing_table_error(ValueError('no such table'))
@@ -0,0 +1,78 @@
+"""Tests du routage des lectures vers le moteur read-only (utils/db_routing.py)."""
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from werkzeug.security import generate_password_hash
+
+from app import create_app
+from models import db, User
+from utils.db_routing import READ_ENGINE_KEY, read_only_session
+from tests.conftest import login
+
+
+@pytest.fixture
+def file_app(tmp_path):
+    """Application sur une base SQLite fichier (le routage est inactif en mémoire)."""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'routing.db'}",
+        'WTF_CSRF_ENABLED': False,
+        'SERVER_NAME': 'localhost.localdomain',
+        'SECRET_KEY': 'test-secret-key-for-testing-only',
+    })
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(email='reader@test.com', nom='Reader', prenom='Read', role='user',
+                            password_hash=generate_password_hash('reader123')))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+        app.extensions[READ_ENGINE_KEY].dispose()
+
+
+def test_memory_database_has_no_read_engine(app):
+    """Base en mémoire : une seconde connexion ouvrirait une autre base."""
+    assert app.extensions.get(READ_ENGINE_KEY) is None
+
+
+def test_reads_use_query_only_engine(file_app):
+    """Dans un bloc read-only, les lectures passent par le moteur query_only."""
+    read_engine = file_app.extensions[READ_ENGINE_KEY]
+    assert db.session.get_bind() is db.engine
+
+    with read_only_session(db.session):
+        assert db.session.get_bind(mapper=User) is read_engine
+        assert User.query.filter_by(email='reader@test.com').one().nom == 'Reader'
+        with read_engine.connect() as connection:
+            assert connection.execute(text('PRAGMA query_only')).scalar() == 1
+            with pytest.raises(OperationalError):
+                connection.execute(text("UPDATE user SET nom = 'X'"))
+
+    assert db.session.get_bind(mapper=User) is db.engine
+
+
+def test_write_switches_back_to_primary(file_app):
+    """Une écriture dans une vue read-only part sur le moteur principal et y reste."""
+    with read_only_session(db.session):
+        user = User.query.filter_by(email='reader@test.com').one()
+        user.nom = 'Writer'
+        db.session.commit()
+        assert db.session.get_bind(mapper=User) is db.engine
+        assert User.query.filter_by(nom='Writer').count() == 1
+
+
+def test_read_only_view(file_app):
+    """Le tableau de bord (@read_only_db) fonctionne sur le moteur read-only."""
+    statements = []
+    read_engine = file_app.extensions[READ_ENGINE_KEY]
+    event.listen(read_engine, 'before_cursor_execute',
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    client = file_app.test_client()
+    login(client, 'reader@test.com', 'reader123')
+    statements.clear()
+    response = client.get('/dashboard')
+    assert response.status_code == 200
+    assert any('FROM event' in s for s in statements)
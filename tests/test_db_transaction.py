@@ -0,0 +1,155 @@
+"""Tests de la prise du verrou d'écriture et des métriques de contention (utils/db_transaction.py)."""
+
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from app import create_app
+from exceptions import DatabaseBusyError
+from models import db, Event
+from utils.db_routing import READ_ENGINE_KEY
+from utils.db_transaction import Histogram, begin_write, lock_metrics
+from tests.conftest import login, create_user, create_participant
+
+pytestmark = pytest.mark.sqlite_only
+
+
+@pytest.fixture
+def file_app(tmp_path):
+    """Application sur une base SQLite fichier, pour ouvrir une connexion concurrente."""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'locks.db'}",
+        'WTF_CSRF_ENABLED': False,
+        'SERVER_NAME': 'localhost.localdomain',
+        'SECRET_KEY': 'test-secret-key-for-testing-only',
+        'DB_WRITE_RETRIES': 2,
+        'DB_WRITE_LOCK_TIMEOUT_MS': 20,
+        'DB_WRITE_BACKOFF_MS': 1,
+    })
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+        app.extensions[READ_ENGINE_KEY].dispose()
+
+
+def _hold_write_lock(app):
+    """Connexion concurrente qui garde le verrou d'écriture."""
+    other = sqlite3.connect(app.config['SQLALCHEMY_DATABASE_URI'].replace('sqlite:///', ''),
+                            isolation_level=None)
+    other.execute('BEGIN IMMEDIATE')
+    return other
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram(bounds=(10, 100))
+    for value in (1, 50, 70, 500):
+        histogram.observe(value)
+    data = histogram.to_dict()
+    assert data['count'] == 4 and data['max_ms'] == 500
+    assert data['buckets'] == {'10': 1, '100': 3, '+Inf': 4}
+
+
+def test_begin_write_takes_lock_and_records_hold(file_app):
+    """BEGIN IMMEDIATE : une autre connexion ne peut plus écrire avant le commit."""
+    begin_write(endpoint='test.write')
+    create_user(db, 'w@test.com', nom='W', prenom='W')
+
+    other = sqlite3.connect(file_app.config['SQLALCHEMY_DATABASE_URI'].replace('sqlite:///', ''), timeout=0)
+    with pytest.raises(sqlite3.OperationalError):
+        other.execute('BEGIN IMMEDIATE')
+    db.session.commit()
+    other.execute('BEGIN IMMEDIATE')
+    other.rollback()
+    other.close()
+
+    metrics = lock_metrics().snapshot()['test.write']
+    assert metrics['lock_wait_ms']['count'] == 1
+    assert metrics['hold_ms']['count'] == 1
+    assert metrics['busy_errors'] == 0
+
+
+def test_begin_write_retries_then_gives_up(file_app):
+    """Verrou tenu ailleurs : reprises puis DatabaseBusyError, comptée dans les métriques."""
+    other = _hold_write_lock(file_app)
+    try:
+        with pytest.raises(DatabaseBusyError):
+            begin_write(endpoint='test.busy')
+    finally:
+        other.rollback()
+        other.close()
+    db.session.rollback()
+
+    metrics = lock_metrics().snapshot()['test.busy']
+    assert metrics['busy_errors'] == 1
+    assert metrics['retries'] == 2
+
+    # Verrou libéré : la prise suivante réussit
+    begin_write(endpoint='test.busy')
+    db.session.commit()
+    assert lock_metrics().snapshot()['test.busy']['hold_ms']['count'] == 1
+
+
+def test_busy_write_route_returns_503(file_app):
+    """Une route d'écriture dont le verrou reste pris répond 503 avec Retry-After."""
+    creator = create_user(db, 'creator@test.com', password='creator123', nom='C', prenom='C', role='creator')
+    player = create_user(db, 'player@test.com', nom='P', prenom='P')
+    event = Event(name='Locks', statut='En préparation', date_start=datetime.now(), date_end=datetime.now())
+    db.session.add(event)
+    db.session.commit()
+    create_participant(db, event, creator, participant_type='Organisateur')
+    participant_id = create_participant(db, event, player, status='À valider').id
+    event_id = event.id
+    db.session.remove()
+
+    client = file_app.test_client()
+    login(client, 'creator@test.com', 'creator123')
+    other = _hold_write_lock(file_app)
+    try:
+        response = client.post(f'/event/{event_id}/participants/bulk-status',
+                               json={'participant_ids': [participant_id], 'action': 'validate'})
+    finally:
+        other.rollback()
+        other.close()
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert lock_metrics(file_app).snapshot()['participant.bulk_status']['busy_errors'] == 1
+
+    response = client.post(f'/event/{event_id}/participants/bulk-status',
+                           json={'participant_ids': [participant_id], 'action': 'validate'})
+    assert response.status_code == 200
+
+
+def test_metrics_endpoint_exposes_write_locks(client, db, event_sample, user_creator):
+    login(client, 'creator@test.com', 'creator123')
+    client.post(f'/event/{event_sample.id}/participants/bulk-status',
+                json={'participant_ids': [1], 'action': 'pending'})
+
+    data = client.get('/health/metrics').get_json()
+    write_locks = data['database']['write_locks']
+    assert write_locks['participant.bulk_status']['lock_wait_ms']['count'] >= 1
+    assert write_locks['participant.bulk_status']['hold_ms']['count'] >= 1
+
+
+def test_refused_requests_do_not_take_lock(client, app, db, event_sample, user_creator, user_regular):
+    """Les vues qui vérifient les droits dans leur corps ne prennent le verrou qu'ensuite."""
+    participant = create_participant(db, event_sample, user_regular)
+    login(client, 'user@test.com', 'password123')
+
+    response = client.post('/api/casting/assign', json={'event_id': event_sample.id,
+                                                         'participant_id': participant.id, 'role_id': 1})
+    assert response.status_code == 403
+    response = client.post('/api/casting/unassign', json={'event_id': event_sample.id, 'role_id': 1})
+    assert response.status_code == 403
+    client.get('/logout')
+    login(client, 'creator@test.com', 'creator123')
+    client.post(f'/event/{event_sample.id}/participant/{participant.id}/update_contact',
+                data={'field': 'phone', 'value': '0600000000'})
+
+    write_locks = lock_metrics(app).snapshot()
+    assert not {'participant.api_assign', 'participant.api_unassign',
+                'participant.update_contact'} & set(write_locks)
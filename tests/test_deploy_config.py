@@ -0,0 +1,109 @@
+"""Tests des profils de connexion SQLite et PostgreSQL (utils/deploy_config_loader.py)."""
+
+import pytest
+from flask import Flask
+from sqlalchemy import create_engine, event, text
+
+from utils.deploy_config_loader import (
+    load_database_config, resolve_database_profile, apply_sqlite_pragmas, read_sqlite_pragmas,
+    normalize_database_url
+)
+
+
+@pytest.fixture
+def bare_app(tmp_path, monkeypatch):
+    """Application minimale lisant son fichier de déploiement dans tmp_path."""
+    for name in ('DB_PROFILE', 'GN_ENVIRONMENT'):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv('DEPLOY_CONFIG_PATH', str(tmp_path / 'deploy_config.yaml'))
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'app.db'}"
+    return app
+
+
+@pytest.mark.parametrize('environment, profile', [
+    ('prod', 'production'), ('dev', 'dev'), ('test', 'test'), ('', 'production'),
+])
+def test_profile_follows_environment(bare_app, monkeypatch, environment, profile):
+    """GN_ENVIRONMENT (gnole, gnole_dev, gnole_test) choisit le profil."""
+    monkeypatch.setenv('GN_ENVIRONMENT', environment)
+    assert resolve_database_profile(bare_app)[0] == profile
+
+
+def test_deploy_yaml_overrides(bare_app, tmp_path, monkeypatch):
+    """La section 'database' du fichier de déploiement surcharge le profil."""
+    monkeypatch.setenv('GN_ENVIRONMENT', 'prod')
+    (tmp_path / 'deploy_config.yaml').write_text(
+        "database:\n"
+        "  profile: dev\n"
+        "  pool_size: 7\n"
+        "  pragmas:\n"
+        "    cache_size: -4096\n"
+        "    temp_store: file\n"
+        "    foreign_keys: 'on'\n"
+        "    page_size: 8192\n"
+        "    synchronous: 'NORMAL; DROP TABLE user'\n",
+        encoding='utf-8')
+
+    name, pragmas, pool = resolve_database_profile(bare_app)
+    assert name == 'dev'
+    assert pragmas['cache_size'] == -4096
+    assert pragmas['temp_store'] == 'FILE'
+    assert pragmas['foreign_keys'] is True
+    assert 'page_size' not in pragmas
+    assert pragmas['synchronous'] == 'NORMAL'
+    assert pool == {'pool_size': 7, 'pool_recycle': 3600}
+
+
+def test_engine_options_and_pragmas(bare_app, tmp_path):
+    """Le profil alimente les options du moteur et les PRAGMA de chaque connexion."""
+    load_database_config(bare_app)
+    options = bare_app.config['SQLALCHEMY_ENGINE_OPTIONS']
+    assert options['connect_args'] == {'timeout': 30.0}
+    assert (options['pool_size'], options['pool_recycle']) == (5, 3600)
+
+    engine = create_engine(bare_app.config['SQLALCHEMY_DATABASE_URI'], **options)
+    pragmas = bare_app.config['SQLITE_PRAGMAS']
+    event.listen(engine, 'connect', lambda dbapi_connection, _: apply_sqlite_pragmas(dbapi_connection, pragmas))
+    with engine.connect() as connection:
+        effective = read_sqlite_pragmas(connection)
+        assert connection.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+    engine.dispose()
+
+    assert effective['mmap_size'] == 256 * 1024 * 1024
+    assert effective['cache_size'] == -64 * 1024
+    assert effective['busy_timeout'] == 30000
+
+
+def test_memory_database_keeps_static_pool(bare_app):
+    """Base en mémoire : pas d'options de pool (pool statique)."""
+    bare_app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    load_database_config(bare_app)
+    assert 'pool_size' not in bare_app.config['SQLALCHEMY_ENGINE_OPTIONS']
+
+
+def test_postgres_profile(bare_app, tmp_path, monkeypatch):
+    """PostgreSQL : QueuePool du profil et timeouts de session dans connect_args."""
+    monkeypatch.setenv('GN_ENVIRONMENT', 'prod')
+    (tmp_path / 'deploy_config.yaml').write_text(
+        "database:\n"
+        "  max_overflow: 4\n"
+        "  postgres:\n"
+        "    statement_timeout: 5000\n"
+        "    search_path: evil\n",
+        encoding='utf-8')
+    bare_app.config['SQLALCHEMY_DATABASE_URI'] = 'postgresql://gnole@localhost/gnole'
+    load_database_config(bare_app)
+
+    options = bare_app.config['SQLALCHEMY_ENGINE_OPTIONS']
+    assert bare_app.config['DB_PROFILE'] == 'production'
+    assert (options['pool_size'], options['max_overflow'], options['pool_pre_ping']) == (10, 4, True)
+    assert options['connect_args']['options'] == (
+        '-c statement_timeout=5000 -c lock_timeout=10000 -c idle_in_transaction_session_timeout=60000')
+    assert 'SQLITE_PRAGMAS' not in bare_app.config
+
+
+def test_normalize_database_url():
+    """Les URL 'postgres://' des hébergeurs sont acceptées."""
+    assert normalize_database_url('postgres://u:p@h/db') == 'postgresql://u:p@h/db'
+    assert normalize_database_url('sqlite:///gnmanager.db') == 'sqlite:///gnmanager.db'
@@ -0,0 +1,132 @@
+"""Tests de la suppression d'événement par lots (services/event_deletion_service.py)."""
+
+from datetime import datetime
+
+import services.event_deletion_service as deletion
+from models import (Event, Role, Participant, ActivityLog, CastingProposal, CastingAssignment,
+                    EventNotification, EventNotificationRead, GFormsCategory, GFormsFieldMapping,
+                    GFormsSubmission, GFormsAnswer, EventParticipantCount)
+from tests.conftest import login, create_participants
+
+
+def _populate(db, event, count):
+    """Participants avec rôles assignés, casting, notifications et réponses GForms."""
+    proposal = CastingProposal(event_id=event.id, name='Principale', position=1)
+    category = GFormsCategory(event_id=event.id, name='Généralités', color='neutral')
+    db.session.add_all([proposal, category])
+    db.session.flush()
+    mapping = GFormsFieldMapping(event_id=event.id, field_name='Régime', category_id=category.id)
+    db.session.add(mapping)
+    db.session.flush()
+
+    for i, participant in enumerate(create_participants(db, event, count, prefix='del')):
+        user = participant.user
+        role = Role(event_id=event.id, name=f'Rôle {i}', assigned_participant_id=participant.id)
+        db.session.add(role)
+        db.session.flush()
+        participant.role_id = role.id
+        db.session.add(CastingAssignment(event_id=event.id, proposal_id=proposal.id, role_id=role.id,
+                                         participant_id=participant.id))
+        submission = GFormsSubmission(event_id=event.id, user_id=user.id, email=user.email,
+                                      timestamp=datetime.utcnow(), type_ajout='créé', raw_data={'Régime': 'Aucun'})
+        db.session.add(submission)
+        db.session.flush()
+        db.session.add(GFormsAnswer(submission_id=submission.id, field_mapping_id=mapping.id, value='Aucun'))
+        db.session.add(EventNotification(event_id=event.id, user_id=user.id,
+                                         action_type='participant_join_request', description='Demande'))
+        db.session.add(ActivityLog(action_type='event_participation', user_id=user.id, event_id=event.id))
+    db.session.commit()
+
+
+def test_delete_event_data_in_batches(db, event_sample, user_creator, tmp_path, monkeypatch):
+    """Toutes les tables dépendantes sont vidées par lots, l'historique est détaché."""
+    upload_dir = tmp_path / 'events' / str(event_sample.id)
+    (upload_dir / 'participants').mkdir(parents=True)
+    (upload_dir / 'participants' / 'photo.jpg').write_bytes(b'jpg')
+    monkeypatch.setattr(deletion, 'event_upload_dir', lambda event_id: str(upload_dir))
+
+    _populate(db, event_sample, 7)
+    event_id = event_sample.id
+    steps = []
+
+    stats = deletion.delete_event_data(event_id, batch_size=3,
+                                       progress=lambda step, total: steps.append((step, total)))
+
+    assert stats['participant'] == 8  # 7 + l'organisateur créateur
+    assert stats['event'] == 1
+    assert stats['files_removed'] is True
+    assert not upload_dir.exists()
+    assert ('participant', 3) in steps and ('participant', 6) in steps
+    db.session.expire_all()
+    assert db.session.get(Event, event_id) is None
+    for model in (Role, Participant, CastingProposal, CastingAssignment, EventNotification,
+                  EventNotificationRead, GFormsCategory, GFormsFieldMapping, GFormsSubmission,
+                  EventParticipantCount):
+        assert model.query.filter_by(event_id=event_id).count() == 0, model.__name__
+    assert GFormsAnswer.query.count() == 0
+    assert ActivityLog.query.filter_by(event_id=event_id).count() == 0
+    assert ActivityLog.query.filter_by(action_type='event_participation').count() == 7
+
+
+def test_delete_event_route(client, db, event_sample, user_creator, user_regular, tmp_path, monkeypatch):
+    """Seul un organisateur supprime l'événement ; la suppression est journalisée."""
+    monkeypatch.setattr(deletion, 'event_upload_dir', lambda event_id: str(tmp_path / 'absent'))
+    _populate(db, event_sample, 2)
+    event_id = event_sample.id
+
+    login(client, 'user@test.com', 'password123')
+    client.post(f'/event/{event_id}/delete')
+    assert db.session.get(Event, event_id) is not None
+
+    client.get('/logout')
+    login(client, 'creator@test.com', 'creator123')
+    response = client.post(f'/event/{event_id}/delete')
+    assert response.status_code == 302
+    db.session.expire_all()
+    assert db.session.get(Event, event_id) is None
+    assert ActivityLog.query.filter_by(action_type='Suppression événement').count() == 1
+
+
+def test_deleting_event_is_hidden_and_closed(client, db, event_sample, user_creator, user_regular):
+    """Pendant la suppression : routes en 404, webhook en 410, absent des listes."""
+    event_sample.is_deleting = True
+    event_sample.webhook_secret = 'secret-deleting'
+    db.session.commit()
+    event_id = event_sample.id
+
+    response = client.post('/api/webhook/gform', headers={'Authorization': 'Bearer secret-deleting'},
+                           json={'responseId': 'r1', 'email': 'user@test.com', 'answers': {}})
+    assert response.status_code == 410
+
+    login(client, 'user@test.com', 'password123')
+    assert client.post(f'/event/{event_id}/join', data={'type': 'PJ'}).status_code == 404
+    client.get('/logout')
+
+    login(client, 'creator@test.com', 'creator123')
+    assert client.get(f'/event/{event_id}').status_code == 404
+    assert client.get(f'/event/{event_id}/participants').status_code == 404
+    assert b'Test Event' not in client.get('/dashboard?filter=all').data
+    assert b'Test Event' not in client.get('/dashboard?filter=mine').data
+    assert Participant.query.filter_by(event_id=event_id).count() == 1
+
+
+def test_rows_written_during_deletion_are_swept(db, event_sample, user_creator, tmp_path, monkeypatch):
+    """Une ligne ajoutée après le passage de son étape est supprimée avec l'événement."""
+    monkeypatch.setattr(deletion, 'event_upload_dir', lambda event_id: str(tmp_path / 'absent'))
+    _populate(db, event_sample, 2)
+    event_id = event_sample.id
+    user_id = user_creator.id
+
+    def late_write(step, total):
+        if step == 'participant':
+            db.session.add(EventNotification(event_id=event_id, user_id=user_id,
+                                             action_type='participant_join_request', description='Tardive'))
+            db.session.commit()
+
+    stats = deletion.delete_event_data(event_id, progress=late_write)
+
+    assert stats['event'] == 1
+    assert stats['event_notification'] == 3
+    db.session.expire_all()
+    assert db.session.get(Event, event_id) is None
+    assert EventNotification.query.filter_by(event_id=event_id).count() == 0
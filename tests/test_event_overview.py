@@ -0,0 +1,81 @@
+"""Tests de la vue d'ensemble des événements de l'administration (services/event_overview_service.py)."""
+
+from datetime import datetime, timedelta
+
+from models import Event
+from services.event_overview_service import events_overview
+from utils.query_plan import capture_queries
+from tests.conftest import login, create_participants
+
+
+def _players(db, event, n, participant_type='PJ', status='Validé', prefix='p'):
+    create_participants(db, event, n, prefix=f'{prefix}{event.id}_', participant_type=participant_type,
+                        status=status)
+
+
+def _event(db, name, days):
+    start = datetime(2026, 6, 1) + timedelta(days=days)
+    event = Event(name=name, date_start=start, date_end=start + timedelta(days=2), statut='En préparation')
+    db.session.add(event)
+    db.session.commit()
+    return event
+
+
+def test_overview_counts_and_organizers(db, event_sample, user_creator):
+    _players(db, event_sample, 3)
+    _players(db, event_sample, 2, participant_type='PNJ', status='À valider', prefix='n')
+    _players(db, event_sample, 1, participant_type='Organisateur', status='En attente', prefix='o')
+
+    pagination, overviews = events_overview()
+
+    assert pagination.total == 1
+    overview = overviews[0]
+    assert overview.event.id == event_sample.id
+    assert overview.count('PJ') == 3 and overview.count('PJ', 'Validé') == 3
+    assert overview.count('PNJ', 'À valider') == 2
+    assert overview.count() == 7 and overview.count(status='Validé') == 4
+    # Seuls les organisateurs validés sont listés
+    assert [o.email for o in overview.organizers] == ['creator@test.com']
+    assert overview.total_max == 65
+
+
+def test_overview_query_count_does_not_grow_with_participants(db, event_sample, user_creator):
+    with capture_queries(db.engine) as small:
+        events_overview()
+    _players(db, event_sample, 30)
+    _players(db, _event(db, 'Autre', 0), 30, prefix='q')
+    with capture_queries(db.engine) as large:
+        events_overview()
+
+    assert len(large.queries) == len(small.queries) <= 4
+
+
+def test_overview_pagination_and_date_filters(db):
+    events = [_event(db, f'GN {i}', i * 10) for i in range(5)]
+
+    pagination, overviews = events_overview(page=1, per_page=2)
+    assert pagination.total == 5 and pagination.pages == 3
+    assert [o.event.name for o in overviews] == ['GN 4', 'GN 3']
+
+    _, overviews = events_overview(page=3, per_page=2)
+    assert [o.event.name for o in overviews] == ['GN 0']
+
+    # Du 11/06 au 21/06 : GN 1 (11-13/06) et GN 2 (21-23/06)
+    pagination, overviews = events_overview(date_from=datetime(2026, 6, 11), date_to=datetime(2026, 6, 21))
+    assert pagination.total == 2
+    assert {o.event.id for o in overviews} == {events[1].id, events[2].id}
+
+
+def test_admin_events_tab(client, db, event_sample, user_admin):
+    _players(db, event_sample, 2)
+    login(client, 'admin@test.com', 'admin123')
+
+    page = client.get('/admin?admin_view=events').get_data(as_text=True)
+    assert 'Test Event' in page and 'creator@test.com' in page
+    assert 'Événements (1)' in page
+
+    page = client.get('/admin?admin_view=events&date_from=2000-01-01&date_to=2000-12-31').get_data(as_text=True)
+    assert 'Aucun événement enregistré.' in page
+
+    response = client.get('/admin?admin_view=events&date_from=invalide')
+    assert response.status_code == 200
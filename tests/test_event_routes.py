@@ -135,7 +135,7 @@ class TestEventDetailAndUpdate:
         db.session.refresh(sample_event)
         # Vérifier que groups_config contient la nouvelle configuration
         import json
-        config = json.loads(sample_event.groups_config) if sample_event.groups_config else {}
+        config = sample_event.groups_config or {}
         # Au minimum, vérifier que la structure a été mise à jour
         assert 'PJ' in config or 'PNJ' in config or 'Organisateur' in config
 
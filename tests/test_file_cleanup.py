@@ -0,0 +1,23 @@
+"""Tests du nettoyage de fichiers après commit (utils/file_cleanup.py)."""
+
+from models import User
+from utils.file_cleanup import schedule_file_removal
+
+
+def test_schedule_file_removal_after_commit(db, tmp_path):
+    """Le fichier n'est supprimé qu'au commit, et conservé en cas de rollback."""
+    kept = tmp_path / 'kept.jpg'
+    removed = tmp_path / 'removed.jpg'
+    kept.write_bytes(b'jpg')
+    removed.write_bytes(b'jpg')
+
+    User.query.count()
+    schedule_file_removal([str(kept)])
+    db.session.rollback()
+    db.session.commit()
+    assert kept.exists()
+
+    schedule_file_removal([str(removed), str(tmp_path / 'absent.jpg')])
+    assert removed.exists()
+    db.session.commit()
+    assert not removed.exists()
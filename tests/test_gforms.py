@@ -90,7 +90,7 @@ def test_webhook_processing(client, db, event_sample):
     submission = GFormsSubmission.query.filter_by(event_id=event_sample.id, email="new.user@test.com").first()
     assert submission is not None
     assert submission.type_ajout == "créé"
-    raw = json.loads(submission.raw_data)
+    raw = submission.raw_data
     assert raw["Régime"] == "Végétarien"
     
     # Verify Auto-Mapping of fields
@@ -0,0 +1,161 @@
+"""Tests des réponses Google Forms normalisées (services/gforms_answer_service.py)."""
+
+import json
+from datetime import datetime
+
+from models import GFormsAnswer, GFormsFieldMapping, GFormsSubmission
+from services.gforms_answer_service import (
+    encode_answer_value, sync_submission_answers, rebuild_gforms_answers,
+    get_answered_field_names, get_event_answers, find_submission_ids
+)
+from tests.conftest import login
+
+
+def _post_webhook(client, event, email, answers):
+    payload = {
+        "responseId": f"RESP_{email}",
+        "formId": "FORM_ABC",
+        "email": email,
+        "timestamp": "2024-01-01T12:00:00.000Z",
+        "answers": answers
+    }
+    headers = {"Authorization": f"Bearer {event.webhook_secret}", "Content-Type": "application/json"}
+    return client.post('/api/webhook/gform', data=json.dumps(payload), headers=headers)
+
+
+def _add_submission(db, event, email, raw_data):
+    submission = GFormsSubmission(event_id=event.id, email=email, timestamp=datetime.now(),
+                                  type_ajout='créé', raw_data=raw_data)
+    db.session.add(submission)
+    for field_name in raw_data:
+        if not GFormsFieldMapping.query.filter_by(event_id=event.id, field_name=field_name).first():
+            db.session.add(GFormsFieldMapping(event_id=event.id, field_name=field_name))
+    db.session.flush()
+    return submission
+
+
+def test_encode_answer_value():
+    """Les listes sont jointes, les scalaires non textuels sérialisés en JSON."""
+    assert encode_answer_value('Végétarien') == 'Végétarien'
+    assert encode_answer_value(['a', 'b']) == 'a, b'
+    assert encode_answer_value(3) == '3'
+    assert encode_answer_value(None) is None
+
+
+def test_webhook_creates_answers(client, db, event_sample):
+    """Le webhook alimente la table normalisée."""
+    event_sample.webhook_secret = 'secret_answers'
+    db.session.commit()
+
+    response = _post_webhook(client, event_sample, 'jean@test.com',
+                             {"Régime": "Végétarien", "Options": ["Tente", "Repas"]})
+    assert response.status_code == 200
+
+    assert get_event_answers(event_sample.id) == {
+        GFormsSubmission.query.filter_by(email='jean@test.com').one().id:
+            {'Régime': 'Végétarien', 'Options': 'Tente, Repas'}
+    }
+    assert sorted(get_answered_field_names(event_sample.id)) == ['Options', 'Régime']
+
+
+def test_sync_updates_and_removes_answers(db, event_sample):
+    """La synchronisation met à jour les valeurs et supprime les champs retirés."""
+    submission = _add_submission(db, event_sample, 'a@test.com', {'Q1': 'oui', 'Q2': 'non'})
+    assert sync_submission_answers([submission]) == 2
+    db.session.commit()
+
+    submission.raw_data = {'Q1': 'non'}
+    assert sync_submission_answers([submission]) == 1
+    db.session.commit()
+
+    assert get_event_answers(event_sample.id) == {submission.id: {'Q1': 'non'}}
+    assert find_submission_ids(event_sample.id, 'Q1', 'non') == [submission.id]
+    assert find_submission_ids(event_sample.id, 'Q1', 'oui') == []
+
+
+def test_rebuild_gforms_answers(db, event_sample):
+    """La reconstruction recrée les réponses à partir de raw_data."""
+    _add_submission(db, event_sample, 'a@test.com', {'Q1': 'oui'})
+    _add_submission(db, event_sample, 'b@test.com', {'Q1': 'non', 'Q2': 'x'})
+    db.session.commit()
+    assert GFormsAnswer.query.count() == 0
+
+    assert rebuild_gforms_answers([event_sample.id]) == 3
+    db.session.commit()
+    assert GFormsAnswer.query.count() == 3
+    assert rebuild_gforms_answers() == 0
+
+
+def test_fields_export_and_purge_use_answers(client, db, event_sample, user_creator):
+    """Les routes organisateur lisent et purgent la table normalisée."""
+    submission = _add_submission(db, event_sample, 'creator@test.com', {'Allergies': 'Aucune'})
+    sync_submission_answers([submission])
+    db.session.commit()
+
+    login(client, 'creator@test.com', 'creator123')
+
+    response = client.get(f'/event/{event_sample.id}/gforms/fields')
+    assert response.status_code == 200
+    fields = [f['field_name'] for f in response.get_json()['fields']]
+    assert 'Allergies' in fields
+
+    response = client.get(f'/event/{event_sample.id}/gforms/export')
+    assert response.status_code == 200
+    assert 'Aucune' in response.get_data(as_text=True)
+
+    response = client.delete(f'/event/{event_sample.id}/gforms/purge')
+    assert response.status_code == 200
+    assert GFormsAnswer.query.count() == 0
+
+
+def _seed_submissions(db, event):
+    subs = [
+        _add_submission(db, event, 'alice@test.com', {'Régime': 'Végétarien', 'Ville': 'Lyon'}),
+        _add_submission(db, event, 'bob@test.com', {'Régime': 'Omnivore', 'Ville': 'Paris'}),
+        _add_submission(db, event, 'carol@test.com', {'Régime': 'Végétalien'}),
+    ]
+    sync_submission_answers(subs)
+    db.session.commit()
+    return subs
+
+
+def _emails(response):
+    assert response.status_code == 200
+    return [s['email'] for s in response.get_json()['submissions']]
+
+
+def test_submissions_api_filters(client, db, event_sample, user_creator):
+    """Filtres égalité / sous-chaîne et recherche libre exécutés côté serveur."""
+    _seed_submissions(db, event_sample)
+    login(client, 'creator@test.com', 'creator123')
+    url = f'/event/{event_sample.id}/gforms/submissions'
+
+    assert _emails(client.get(url, query_string={'eq[Régime]': 'Omnivore'})) == ['bob@test.com']
+    assert sorted(_emails(client.get(url, query_string={'contains[Régime]': 'végé'}))) == \
+        ['alice@test.com', 'carol@test.com']
+    assert _emails(client.get(url, query_string={'q': 'paris'})) == ['bob@test.com']
+    assert _emails(client.get(url, query_string={'q': 'carol'})) == ['carol@test.com']
+    assert client.get(url, query_string={'eq[Inconnu]': 'x'}).status_code == 400
+    # Les jokers LIKE sont échappés
+    assert _emails(client.get(url, query_string={'q': '%'})) == []
+
+    response = client.get(url, query_string={'contains[Régime]': 'végé', 'per_page': 1})
+    assert response.get_json()['pagination']['total'] == 2
+    assert len(response.get_json()['submissions']) == 1
+
+
+def test_submissions_api_sort(client, db, event_sample, user_creator):
+    """Tri par colonne système ou par champ dynamique (réponses absentes en dernier)."""
+    _seed_submissions(db, event_sample)
+    login(client, 'creator@test.com', 'creator123')
+    url = f'/event/{event_sample.id}/gforms/submissions'
+
+    assert _emails(client.get(url, query_string={'sort': 'email', 'order': 'desc'})) == \
+        ['carol@test.com', 'bob@test.com', 'alice@test.com']
+    assert _emails(client.get(url, query_string={'sort': 'Ville', 'order': 'asc'})) == \
+        ['alice@test.com', 'bob@test.com', 'carol@test.com']
+    assert _emails(client.get(url, query_string={'sort': 'Ville', 'order': 'desc'})) == \
+        ['bob@test.com', 'alice@test.com', 'carol@test.com']
+
+    response = client.get(url, query_string={'sort': 'Inconnu'})
+    assert response.status_code == 400
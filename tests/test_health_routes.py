@@ -136,6 +136,17 @@ class TestMetricsEndpoint:
         assert db_info['size_bytes'] >= 0
         assert db_info['size_mb'] >= 0
     
+    @pytest.mark.sqlite_only
+    def test_metrics_database_pragmas(self, client):
+        """Test que metrics expose le profil et les PRAGMA effectifs."""
+        response = client.get('/health/metrics')
+        db_info = response.get_json()['database']
+        
+        assert db_info['profile'] == 'test'
+        assert db_info['pragmas']['busy_timeout'] == 5000
+        assert db_info['pragmas']['temp_store'] == 2  # MEMORY
+        assert db_info['pragmas']['foreign_keys'] == 0
+    
     def test_metrics_logs_info(self, client):
         """Test les informations de logs."""
         response = client.get('/health/metrics')
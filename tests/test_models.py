@@ -206,18 +206,36 @@ class TestParticipantModel:
             
             statuses = ['En attente', 'Validé', 'Rejeté']
             
+            # Une seule participation par utilisateur et par événement : le statut évolue
+            p = Participant(user_id=sample_user.id, event_id=sample_event.id, type='PNJ')
+            db.session.add(p)
             for status in statuses:
-                p = Participant(
-                    user_id=sample_user.id,
-                    event_id=sample_event.id,
-                    type='PNJ',
-                    registration_status=status
-                )
-                db.session.add(p)
+                p.registration_status = status
                 db.session.commit()
                 
                 assert p.registration_status == status
 
+    def test_participant_values_are_canonicalized(self, app, sample_user, sample_event):
+        """Test que le type et le statut sont normalisés à l'écriture."""
+        with app.app_context():
+            from models import db, Participant
+
+            p = Participant(
+                user_id=sample_user.id,
+                event_id=sample_event.id,
+                type='organisateur',
+                registration_status='VALIDÉ'
+            )
+            db.session.add(p)
+            db.session.commit()
+
+            assert p.type == 'Organisateur'
+            assert p.registration_status == 'Validé'
+            assert p.is_organizer
+            assert Participant.query.filter_by(
+                event_id=sample_event.id, type='Organisateur', registration_status='Validé'
+            ).count() == 2
+
 
 class TestRoleModel:
     """Tests du modèle Role."""
@@ -293,3 +311,67 @@ class TestActivityLogModel:
             
             assert log.created_at is not None
             assert isinstance(log.created_at, datetime)
+
+
+class TestJSONColumns:
+    """Tests des colonnes JSON décodées (models.JSONText)."""
+    
+    def test_json_columns_are_decoded(self, app, sample_event):
+        """Test que les colonnes JSON sont exposées en dict/list."""
+        with app.app_context():
+            from models import db
+            
+            event = db.session.get(Event, sample_event.id)
+            assert event.groups_config['PJ'] == ['Groupe A', 'Groupe B']
+            assert event.payment_methods == ['Helloasso']
+            assert event.paf_config == []
+    
+    def test_in_place_mutation_is_persisted(self, app, sample_event):
+        """Test que les modifications en place sont écrites en base."""
+        with app.app_context():
+            from models import db
+            
+            event = db.session.get(Event, sample_event.id)
+            event.groups_config['PNJ'].append('Groupe D')
+            event.paf_config.append({'name': 'PJ Standard', 'amount': 50})
+            db.session.commit()
+            db.session.expire_all()
+            
+            event = db.session.get(Event, sample_event.id)
+            assert event.groups_config['PNJ'] == ['Groupe C', 'Groupe D']
+            assert event.paf_config == [{'name': 'PJ Standard', 'amount': 50}]
+    
+    def test_legacy_string_assignment(self, app, sample_user):
+        """Test qu'une chaîne JSON ou du texte libre reste accepté."""
+        with app.app_context():
+            from models import db
+            import json
+            
+            log = ActivityLog(user_id=sample_user.id, action_type='test',
+                              details=json.dumps({'email': 'a@b.c'}))
+            text_log = ActivityLog(user_id=sample_user.id, action_type='test',
+                                   details='Texte libre')
+            db.session.add_all([log, text_log])
+            db.session.commit()
+            db.session.expire_all()
+            
+            assert db.session.get(ActivityLog, log.id).details == {'email': 'a@b.c'}
+            assert db.session.get(ActivityLog, text_log.id).details == {'message': 'Texte libre'}
+
+    def test_non_object_json_is_wrapped(self, app, sample_user):
+        """Test qu'un JSON valide non objet (liste, scalaire) se charge sans erreur."""
+        with app.app_context():
+            from models import db
+            from sqlalchemy import text
+            
+            log = ActivityLog(user_id=sample_user.id, action_type='test')
+            db.session.add(log)
+            db.session.commit()
+            db.session.execute(text("UPDATE activity_log SET details = '[1, 2]' WHERE id = :id"), {'id': log.id})
+            scalar_log = ActivityLog(user_id=sample_user.id, action_type='test', details=42)
+            db.session.add(scalar_log)
+            db.session.commit()
+            db.session.expire_all()
+            
+            assert db.session.get(ActivityLog, log.id).details == {'value': [1, 2]}
+            assert db.session.get(ActivityLog, scalar_log.id).details == {'value': 42}
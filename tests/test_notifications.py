@@ -0,0 +1,201 @@
+"""Tests du fil de notifications organisateur (services/notification_service.py)."""
+
+from contextlib import contextmanager
+
+from sqlalchemy import event as sa_event
+
+from models import EventNotification, EventNotificationRead
+from services.notification_service import (
+    get_notification_feed, mark_all_as_read, mark_as_read, count_unread_notifications
+)
+from tests.conftest import login, create_participant
+
+
+@contextmanager
+def _count_commits(db):
+    """Compte les COMMIT de la session pendant le bloc."""
+    commits = []
+    listener = lambda session: commits.append(session)
+    sa_event.listen(db.session, 'after_commit', listener)
+    try:
+        yield commits
+    finally:
+        sa_event.remove(db.session, 'after_commit', listener)
+
+
+def _notify(db, event, user, count):
+    notifications = [EventNotification(event_id=event.id, user_id=user.id,
+                                       action_type='participant_join_request',
+                                       description=f'Demande {i}')
+                     for i in range(count)]
+    db.session.add_all(notifications)
+    db.session.commit()
+    return notifications
+
+
+def test_feed_pages_with_before_id(db, event_sample, user_creator, user_regular):
+    """Le fil descend par ID et fournit le curseur de la page suivante."""
+    notifications = _notify(db, event_sample, user_regular, 5)
+    ids = sorted((n.id for n in notifications), reverse=True)
+
+    feed = get_notification_feed(event_sample.id, user_creator.id, limit=2)
+    assert [n.id for n in feed['items']] == ids[:2]
+    assert feed['unread_ids'] == set(ids[:2])
+    assert feed['has_more'] is True
+    assert feed['next_before_id'] == ids[1]
+    assert feed['unread_count'] == 5
+
+    feed = get_notification_feed(event_sample.id, user_creator.id, before_id=ids[3], limit=2)
+    assert [n.id for n in feed['items']] == ids[4:]
+    assert feed['has_more'] is False
+    assert feed['next_before_id'] is None
+
+
+def test_feed_since_id_returns_oldest_new_items_first_page(db, event_sample, user_creator, user_regular):
+    """since_id ne saute aucune notification quand plusieurs pages sont arrivées."""
+    first = _notify(db, event_sample, user_regular, 1)[0]
+    newer = _notify(db, event_sample, user_regular, 3)
+
+    feed = get_notification_feed(event_sample.id, user_creator.id, since_id=first.id, limit=2)
+    assert [n.id for n in feed['items']] == [newer[1].id, newer[0].id]
+    assert feed['has_more'] is True
+
+
+def test_feed_unread_count_on_empty_page(db, event_sample, user_creator, user_regular):
+    """Le compteur de non-lues reste exact lorsque la page est vide."""
+    notifications = _notify(db, event_sample, user_regular, 3)
+    mark_as_read(notifications[2], user_creator.id)
+
+    feed = get_notification_feed(event_sample.id, user_creator.id, before_id=notifications[0].id)
+    assert feed['items'] == []
+    assert feed['unread_count'] == 2
+
+
+def test_read_state_is_per_user(db, event_sample, user_creator, user_regular, user_admin):
+    """Une lecture par un organisateur ne change rien pour les autres."""
+    notifications = _notify(db, event_sample, user_regular, 2)
+
+    mark_all_as_read(event_sample.id, user_creator.id)
+    assert count_unread_notifications(event_sample.id, user_creator.id) == 0
+    assert count_unread_notifications(event_sample.id, user_admin.id) == 2
+
+    mark_as_read(notifications[1], user_admin.id)
+    assert count_unread_notifications(event_sample.id, user_admin.id) == 1
+    assert get_notification_feed(event_sample.id, user_admin.id)['unread_ids'] == {notifications[0].id}
+
+
+def test_mark_as_read_compacts_watermark(db, event_sample, user_creator, user_regular):
+    """Les lectures isolées contiguës au curseur le font avancer."""
+    notifications = _notify(db, event_sample, user_regular, 3)
+
+    mark_as_read(notifications[1], user_creator.id)
+    state = EventNotificationRead.query.filter_by(event_id=event_sample.id, user_id=user_creator.id).one()
+    assert (state.last_read_id, list(state.read_ids)) == (notifications[0].id - 1, [notifications[1].id])
+
+    mark_as_read(notifications[0], user_creator.id)
+    db.session.refresh(state)
+    assert (state.last_read_id, list(state.read_ids)) == (notifications[1].id, [])
+
+
+def test_mark_all_as_read_up_to_id_never_moves_back(db, event_sample, user_creator, user_regular):
+    """Le curseur ignore les notifications arrivées après la page et ne recule jamais."""
+    shown = _notify(db, event_sample, user_regular, 2)
+    _notify(db, event_sample, user_regular, 1)
+
+    mark_all_as_read(event_sample.id, user_creator.id, up_to_id=shown[-1].id)
+    assert count_unread_notifications(event_sample.id, user_creator.id) == 1
+
+    mark_all_as_read(event_sample.id, user_creator.id, up_to_id=shown[0].id)
+    assert count_unread_notifications(event_sample.id, user_creator.id) == 1
+    assert EventNotificationRead.query.count() == 1
+
+
+def test_mark_all_as_read_clamps_up_to_id(db, event_sample, user_creator, user_regular):
+    """Un up_to_id au-delà de la dernière notification ne marque pas les futures comme lues."""
+    _notify(db, event_sample, user_regular, 2)
+
+    last_read_id = mark_all_as_read(event_sample.id, user_creator.id, up_to_id=10 ** 9)
+    assert last_read_id == EventNotification.query.order_by(EventNotification.id.desc()).first().id
+
+    _notify(db, event_sample, user_regular, 1)
+    assert count_unread_notifications(event_sample.id, user_creator.id) == 1
+
+
+def test_deleted_latest_notification_id_is_not_reused(db, event_sample, user_creator, user_regular):
+    """Après suppression de la dernière notification lue, la suivante reste non lue."""
+    latest = _notify(db, event_sample, user_regular, 2)[-1]
+    mark_all_as_read(event_sample.id, user_creator.id)
+    deleted_id = latest.id
+    db.session.delete(latest)
+    db.session.commit()
+
+    new = _notify(db, event_sample, user_regular, 1)[0]
+    assert new.id > deleted_id
+    assert count_unread_notifications(event_sample.id, user_creator.id) == 1
+
+
+def test_detail_renders_latest_page_only(client, db, event_sample, user_creator, user_regular):
+    """La page événement n'affiche que la dernière page et propose la suite."""
+    _notify(db, event_sample, user_regular, 25)
+    login(client, 'creator@test.com', 'creator123')
+
+    response = client.get(f'/event/{event_sample.id}')
+    html = response.data.decode()
+    assert html.count('data-notif-id=') == 2 * 20
+    assert 'load-more-notifications-btn' in html
+
+
+def test_feed_route(client, db, event_sample, user_creator, user_regular):
+    """Le fil JSON est réservé aux organisateurs et refuse les curseurs combinés."""
+    notifications = _notify(db, event_sample, user_regular, 3)
+
+    login(client, 'user@test.com', 'password123')
+    response = client.get(f'/event/{event_sample.id}/notifications/feed')
+    assert response.status_code in (302, 403)
+
+    client.get('/logout')
+    login(client, 'creator@test.com', 'creator123')
+    response = client.get(f'/event/{event_sample.id}/notifications/feed?before_id={notifications[-1].id}&limit=1')
+    data = response.get_json()
+    assert [n['id'] for n in data['items']] == [notifications[1].id]
+    assert data['items'][0]['user_name'] == 'User Test'
+    assert data['items'][0]['is_read'] is False
+    assert data['has_more'] is True
+    assert data['unread_count'] == 3
+
+    response = client.get(f'/event/{event_sample.id}/notifications/feed?before_id=1&since_id=1')
+    assert response.status_code == 400
+
+
+def test_mark_read_routes(client, db, event_sample, user_creator, user_regular):
+    """Les routes de lecture n'affectent que l'organisateur connecté."""
+    organizer = create_participant(db, event_sample, user_regular, participant_type='Organisateur')
+    notifications = _notify(db, event_sample, user_regular, 2)
+    login(client, 'creator@test.com', 'creator123')
+
+    response = client.post(f'/event/{event_sample.id}/notification/{notifications[0].id}/mark_read')
+    assert response.get_json()['success'] is True
+    assert count_unread_notifications(event_sample.id, user_creator.id) == 1
+
+    response = client.post(f'/event/{event_sample.id}/notifications/mark_all_read', json={})
+    assert response.get_json() == {'success': True, 'last_read_id': notifications[1].id}
+    assert count_unread_notifications(event_sample.id, user_creator.id) == 0
+    assert count_unread_notifications(event_sample.id, organizer.user_id) == 2
+
+
+def test_create_notification_joins_request_commit(client, db, event_sample, user_creator, user_regular):
+    """Statut, journal et notification partent dans un seul commit."""
+    participant = create_participant(db, event_sample, user_regular, status='En attente')
+    login(client, 'creator@test.com', 'creator123')
+
+    with _count_commits(db) as commits:
+        client.post(f'/event/{event_sample.id}/participant/{participant.id}/change-status',
+                    data={'action': 'validate'})
+    assert len(commits) == 1
+    assert EventNotification.query.filter_by(action_type='status_change').count() == 1
+
+    with _count_commits(db) as commits:
+        client.post(f'/event/{event_sample.id}/add_role', data={'name': 'Le Roi'})
+    assert len(commits) == 1
+    assert EventNotification.query.filter_by(action_type='role_created').count() == 1
+
@@ -0,0 +1,58 @@
+"""Tests de la suppression groupée de participants (ensembliste)."""
+
+import os
+
+from models import Role, Participant, CastingProposal, CastingAssignment, EventParticipantCount
+from tests.conftest import login, create_user, create_participant
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _participant_with_role(db, event, index, photo=None):
+    user = create_user(db, f'bulk{index}@test.com', nom=f'Nom{index}')
+    participant = create_participant(db, event, user, status='Refusé')
+    participant.custom_image = photo
+    role = Role(event_id=event.id, name=f'Rôle {index}', assigned_participant_id=participant.id)
+    db.session.add(role)
+    db.session.flush()
+    participant.role_id = role.id
+    return participant, role
+
+
+def test_bulk_delete_set_based(client, db, event_sample, user_creator, app, tmp_path, monkeypatch):
+    """Rôles libérés, casting supprimé, organisateurs conservés, compteurs et photos à jour."""
+    # Les chemins des photos sont relatifs à root_path : on le redirige sans toucher aux templates
+    monkeypatch.setattr(app, 'root_path', str(tmp_path))
+    monkeypatch.setattr(app.jinja_loader, 'searchpath', [os.path.join(ROOT, 'templates')])
+    photo_dir = tmp_path / 'static' / 'uploads' / 'events' / str(event_sample.id) / 'participants'
+    photo_dir.mkdir(parents=True)
+    (photo_dir / 'p0.jpg').write_bytes(b'jpg')
+
+    proposal = CastingProposal(event_id=event_sample.id, name='Principale', position=1)
+    db.session.add(proposal)
+    db.session.flush()
+    pairs = [_participant_with_role(db, event_sample, i,
+                                    photo=f'/static/uploads/events/{event_sample.id}/participants/p{i}.jpg')
+             for i in range(3)]
+    for participant, role in pairs:
+        db.session.add(CastingAssignment(event_id=event_sample.id, proposal_id=proposal.id,
+                                         role_id=role.id, participant_id=participant.id))
+    db.session.commit()
+    organizer = Participant.query.filter_by(event_id=event_sample.id, type='Organisateur').one()
+    ids = [p.id for p, _ in pairs] + [organizer.id]
+    role_ids = [r.id for _, r in pairs]
+
+    login(client, 'creator@test.com', 'creator123')
+    response = client.post(f'/event/{event_sample.id}/participants/bulk-delete', json={'participant_ids': ids})
+
+    data = response.get_json()
+    assert data['success'] is True
+    assert data['deleted'] == 3
+    assert data['skipped_orga'] == 1
+    db.session.expire_all()
+    assert Participant.query.filter_by(event_id=event_sample.id).count() == 1
+    assert all(r.assigned_participant_id is None for r in Role.query.filter(Role.id.in_(role_ids)))
+    assert CastingAssignment.query.filter_by(event_id=event_sample.id).count() == 0
+    assert not (photo_dir / 'p0.jpg').exists()
+    counts = [c.count for c in EventParticipantCount.query.filter_by(event_id=event_sample.id)]
+    assert sum(counts) == 1
@@ -6,6 +6,7 @@ import json
 from models import Participant, ActivityLog
 from constants import ActivityLogType
 from flask import url_for
+from tests.conftest import login, create_participant
 
 class TestParticipantBulkUpdate:
     """Tests pour la route bulk_update des participants."""
@@ -92,7 +93,7 @@ class TestParticipantBulkUpdate:
         ).order_by(ActivityLog.created_at.desc()).first()
         
         assert log is not None
-        details = json.loads(log.details)
+        details = log.details
         assert details['update_type'] == 'bulk_update'
 
     def test_bulk_update_unauthorized(self, client, sample_event, user_regular, db):
@@ -136,3 +137,15 @@ class TestParticipantBulkUpdate:
         
         db.session.refresh(p1)
         assert p1.type == 'PNJ' # La mise à jour valide a fonctionné
+
+    def test_bulk_update_writes_one_log_row(self, client, db, event_sample, user_creator, user_regular, user_admin):
+        """La mise à jour groupée agrège son journal en une seule ligne."""
+        first = create_participant(db, event_sample, user_regular)
+        second = create_participant(db, event_sample, user_admin)
+        login(client, 'creator@test.com', 'creator123')
+
+        client.post(f'/event/{event_sample.id}/participants/bulk_update',
+                    data={'participant_ids': [first.id, second.id]})
+        logs = ActivityLog.query.filter_by(event_id=event_sample.id).all()
+        assert len(logs) == 1
+        assert logs[0].details['participant_ids'] == [first.id, second.id]
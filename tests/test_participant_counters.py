@@ -0,0 +1,177 @@
+"""
+Tests des compteurs matérialisés de participants (participant_counter_service.py).
+
+Couvre :
+- Maintenance automatique (création, changement de statut/type, suppression)
+- Recomptage complet et ciblé
+- Suppressions en masse (utilisateur, événement)
+"""
+
+import re
+
+import pytest
+from models import Participant, EventParticipantCount
+from services.participant_counter_service import (
+    get_event_counts, count_active_by_type, recount_event_counters
+)
+
+
+def _make_user(db, email):
+    from models import User
+    from werkzeug.security import generate_password_hash
+    user = User(email=email, password_hash=generate_password_hash('password123'),
+                nom='Test', prenom='Counter', role='user')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def _rendered_count(response, limit_field):
+    """Compteur affiché devant le champ de limite (onglet organisateur)."""
+    match = re.search(r'(\d+) /\s*</span>\s*<input[^>]*name="%s"' % limit_field, response.get_data(as_text=True))
+    return int(match.group(1)) if match else None
+
+
+class TestCounterMaintenance:
+    """Tests de la maintenance transactionnelle des compteurs."""
+
+    def test_fixture_organizer_counted(self, db, event_sample):
+        """L'organisateur créé par la fixture est compté."""
+        assert get_event_counts(event_sample.id) == {('Organisateur', 'Validé'): 1}
+
+    def test_create_participant_increments(self, db, event_sample, user_regular):
+        """Une création incrémente le compteur (type, statut)."""
+        from tests.conftest import create_participant
+        create_participant(db, event_sample, user_regular, 'PJ', 'À valider')
+
+        counts = get_event_counts(event_sample.id)
+        assert counts[('PJ', 'À valider')] == 1
+
+    def test_legacy_lowercase_type_is_canonicalized(self, db, event_sample, user_regular):
+        """Un type legacy en minuscules est compté sous sa forme canonique."""
+        from tests.conftest import create_participant
+        create_participant(db, event_sample, user_regular, 'pnj', 'Validé')
+
+        assert count_active_by_type(event_sample.id)['PNJ'] == 1
+
+    def test_status_change_moves_count(self, db, event_sample, user_regular):
+        """Un changement de statut déplace le compteur."""
+        from tests.conftest import create_participant
+        participant = create_participant(db, event_sample, user_regular, 'PJ', 'À valider')
+
+        participant.registration_status = 'Validé'
+        db.session.commit()
+
+        counts = get_event_counts(event_sample.id)
+        assert counts[('PJ', 'À valider')] == 0
+        assert counts[('PJ', 'Validé')] == 1
+
+    def test_rejected_excluded_from_active(self, db, event_sample, user_regular):
+        """Les participants rejetés ne sont pas comptés comme actifs."""
+        from tests.conftest import create_participant
+        participant = create_participant(db, event_sample, user_regular, 'PJ', 'Validé')
+        assert count_active_by_type(event_sample.id)['PJ'] == 1
+
+        participant.registration_status = 'Rejeté'
+        db.session.commit()
+        assert count_active_by_type(event_sample.id)['PJ'] == 0
+
+    def test_delete_decrements(self, db, event_sample, user_regular):
+        """Une suppression ORM décrémente le compteur."""
+        from tests.conftest import create_participant
+        participant = create_participant(db, event_sample, user_regular, 'PNJ', 'Validé')
+
+        db.session.delete(participant)
+        db.session.commit()
+
+        assert get_event_counts(event_sample.id)[('PNJ', 'Validé')] == 0
+
+    def test_rollback_discards_deltas(self, db, event_sample, user_regular):
+        """Un rollback annule aussi la mise à jour des compteurs."""
+        db.session.add(Participant(event_id=event_sample.id, user_id=user_regular.id,
+                                   type='PJ', registration_status='Validé'))
+        db.session.flush()
+        db.session.rollback()
+
+        assert ('PJ', 'Validé') not in get_event_counts(event_sample.id)
+
+
+class TestRecount:
+    """Tests du recomptage depuis la table Participant."""
+
+    def test_recount_repairs_drift(self, db, event_sample, user_regular):
+        """Le recomptage corrige un compteur désynchronisé."""
+        from tests.conftest import create_participant
+        create_participant(db, event_sample, user_regular, 'PJ', 'Validé')
+
+        EventParticipantCount.query.filter_by(event_id=event_sample.id).update({'count': 42})
+        db.session.commit()
+
+        recount_event_counters([event_sample.id])
+        db.session.commit()
+
+        assert get_event_counts(event_sample.id) == {
+            ('Organisateur', 'Validé'): 1,
+            ('PJ', 'Validé'): 1,
+        }
+
+    def test_delta_on_existing_row_is_added(self, db, event_sample):
+        """Une clé créée entre-temps (écrivain concurrent) est incrémentée, sans conflit."""
+        from services.participant_counter_service import _apply_deltas
+        db.session.add(EventParticipantCount(event_id=event_sample.id, type='PNJ',
+                                             registration_status='Validé', count=2))
+        db.session.flush()
+        _apply_deltas(db.session.connection(), {(event_sample.id, 'PNJ', 'Validé'): 1})
+        db.session.commit()
+        assert get_event_counts(event_sample.id)[('PNJ', 'Validé')] == 3
+
+    def test_recount_empty_scope_is_noop(self, db, event_sample):
+        """Un recomptage sur une liste vide ne touche à rien."""
+        assert recount_event_counters([]) == 0
+        assert get_event_counts(event_sample.id) == {('Organisateur', 'Validé'): 1}
+
+
+class TestBulkPaths:
+    """Tests des chemins de suppression en masse."""
+
+    def test_detail_page_uses_counters(self, client, db, event_sample, user_creator):
+        """La page de détail affiche les compteurs matérialisés."""
+        from tests.conftest import login, create_participant
+        for i in range(3):
+            create_participant(db, event_sample, _make_user(db, f'pj{i}@test.com'), 'PJ', 'Validé')
+
+        login(client, 'creator@test.com', 'creator123')
+        response = client.get(f'/event/{event_sample.id}')
+        assert response.status_code == 200
+        assert _rendered_count(response, 'max_pjs') == 3
+        assert _rendered_count(response, 'max_organizers') == 1
+
+        # La page lit le compteur, pas les lignes de participants
+        db.session.query(EventParticipantCount).filter_by(
+            event_id=event_sample.id, type='PJ', registration_status='Validé'
+        ).update({'count': 42})
+        db.session.commit()
+        assert _rendered_count(client.get(f'/event/{event_sample.id}'), 'max_pjs') == 42
+
+    def test_admin_delete_user_recounts(self, client, db, event_sample, user_admin):
+        """La suppression d'un utilisateur recalcule les compteurs de ses événements."""
+        from tests.conftest import login, create_participant
+        user = _make_user(db, 'leaving@test.com')
+        create_participant(db, event_sample, user, 'PJ', 'Validé')
+        assert count_active_by_type(event_sample.id)['PJ'] == 1
+
+        login(client, 'admin@test.com', 'admin123')
+        client.post(f'/admin/user/{user.id}/delete')
+
+        assert count_active_by_type(event_sample.id)['PJ'] == 0
+
+    def test_delete_event_removes_counters(self, client, db, event_sample, user_creator):
+        """La suppression d'un événement supprime ses compteurs."""
+        from tests.conftest import login
+        event_id = event_sample.id
+        login(client, 'creator@test.com', 'creator123')
+        client.post(f'/event/{event_id}/delete')
+
+        from models import Event
+        assert db.session.get(Event, event_id) is None
+        assert EventParticipantCount.query.filter_by(event_id=event_id).count() == 0
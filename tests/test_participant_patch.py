@@ -0,0 +1,84 @@
+"""Tests du patch JSON de participants (services/participant_patch_service.py)."""
+
+from models import Participant, ActivityLog, EventNotification
+from services.participant_counter_service import get_event_counts
+from services.participant_patch_service import compute_paf_status
+from tests.conftest import login, create_participants
+
+
+def _participants(db, event, count):
+    event.paf_config = [{'name': 'Standard', 'amount': 40}, {'name': 'Réduit', 'amount': 20}]
+    return create_participants(db, event, count, prefix='patch')
+
+
+def _patch(client, event, changes):
+    return client.patch(f'/event/{event.id}/participants/patch', json={'changes': changes})
+
+
+def test_compute_paf_status():
+    assert compute_paf_status('non versée', 40, 40) == 'versée'
+    assert compute_paf_status('non versée', 40, 10) == 'partielle'
+    assert compute_paf_status('versée', 40, 0) == 'non versée'
+    assert compute_paf_status('dispensé(e)', 40, 0, amount_changed=True) == 'dispensé(e)'
+    assert compute_paf_status('erreur', 40, 40) == 'erreur'
+    assert compute_paf_status('erreur', 40, 40, amount_changed=True) == 'versée'
+
+
+def test_patch_applies_changes_in_one_request(client, db, event_sample, user_creator):
+    """Montants, tarifs et types appliqués ; statuts PAF recalculés ; une ligne de journal."""
+    p1, p2, p3 = _participants(db, event_sample, 3)
+    login(client, 'creator@test.com', 'creator123')
+
+    response = _patch(client, event_sample, [
+        {'participant_id': p1.id, 'field': 'paf_type', 'value': 'Standard'},
+        {'participant_id': p1.id, 'field': 'payment_amount', 'value': '40'},
+        {'participant_id': p2.id, 'field': 'paf_type', 'value': 'Réduit'},
+        {'participant_id': p2.id, 'field': 'payment_amount', 'value': 5},
+        {'participant_id': p3.id, 'field': 'type', 'value': 'PNJ'},
+        {'participant_id': p3.id, 'field': 'group', 'value': 'Groupe C'},
+        {'participant_id': p3.id, 'field': 'group', 'value': ' Groupe C '},
+    ])
+
+    data = response.get_json()
+    assert response.status_code == 200 and data['success'] is True
+    assert data['updated'] == 3
+    assert data['participants'][str(p1.id)]['paf_status'] == 'versée'
+    assert data['participants'][str(p2.id)]['remaining'] == 15
+    db.session.expire_all()
+    assert db.session.get(Participant, p2.id).paf_status == 'partielle'
+    assert db.session.get(Participant, p3.id).group == 'Groupe C'
+    assert get_event_counts(event_sample.id).get(('PNJ', 'Validé')) == 1
+
+    logs = ActivityLog.query.filter_by(event_id=event_sample.id).all()
+    assert len(logs) == 1
+    assert logs[0].details['update_type'] == 'patch'
+    assert logs[0].details['participant_ids'] == sorted([p1.id, p2.id, p3.id])
+    assert EventNotification.query.filter_by(event_id=event_sample.id).count() == 1
+
+
+def test_patch_is_all_or_nothing(client, db, event_sample, user_creator):
+    """Un changement invalide (champ, valeur, participant d'un autre événement) refuse tout le patch."""
+    (p1,) = _participants(db, event_sample, 1)
+    login(client, 'creator@test.com', 'creator123')
+
+    response = _patch(client, event_sample, [
+        {'participant_id': p1.id, 'field': 'group', 'value': 'Groupe A'},
+        {'participant_id': p1.id, 'field': 'registration_status', 'value': 'Validé'},
+        {'participant_id': p1.id, 'field': 'paf_type', 'value': 'Inconnu'},
+        {'participant_id': p1.id, 'field': 'payment_amount', 'value': -3},
+        {'participant_id': 999999, 'field': 'group', 'value': 'Groupe A'},
+    ])
+
+    assert response.status_code == 400
+    assert [e['index'] for e in response.get_json()['errors']] == [1, 2, 3, 4]
+    db.session.expire_all()
+    assert db.session.get(Participant, p1.id).group == 'Test Group'
+    assert ActivityLog.query.filter_by(event_id=event_sample.id).count() == 0
+
+
+def test_patch_requires_organizer(client, db, event_sample, user_regular):
+    (p1,) = _participants(db, event_sample, 1)
+    login(client, 'user@test.com', 'password123')
+    _patch(client, event_sample, [{'participant_id': p1.id, 'field': 'group', 'value': 'X'}])
+    db.session.expire_all()
+    assert db.session.get(Participant, p1.id).group == 'Test Group'
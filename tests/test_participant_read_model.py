@@ -0,0 +1,68 @@
+"""Tests des modèles de lecture des participants (services/participant_read_model.py)."""
+
+import csv
+import io
+
+from models import User, Role, Participant
+from services.participant_read_model import list_participants, iter_participant_rows, ROLE_NAME
+from tests.conftest import login, create_user, create_participant
+
+
+def _cast(db, event):
+    """Un participant avec rôle lié, un autre avec seulement un rôle assigné."""
+    users = [create_user(db, f'read{i}@test.com', nom=f'Nom{i}', prenom=f'Prenom{i}', genre=genre,
+                         profile_photo_url='/static/p.jpg' if i else None)
+             for i, genre in enumerate(('Homme', 'Femme'))]
+    linked = create_participant(db, event, users[0])
+    assigned = create_participant(db, event, users[1], participant_type='PNJ')
+    role_linked = Role(event_id=event.id, name='Le Baron', type='PJ', group='Nobles')
+    role_assigned = Role(event_id=event.id, name='La Garde', type='PNJ', assigned_participant_id=assigned.id)
+    db.session.add_all([role_linked, role_assigned])
+    db.session.flush()
+    linked.role_id = role_linked.id
+    linked.comment = 'Arrive samedi'
+    db.session.commit()
+    return linked, assigned
+
+
+def test_list_participants_views(db, event_sample, user_creator):
+    linked, assigned = _cast(db, event_sample)
+
+    views = {p.id: p for p in list_participants(event_sample.id)}
+
+    assert len(views) == 3  # + l'organisateur créateur
+    assert views[linked.id].user.email == 'read0@test.com'
+    assert views[linked.id].active_role.name == 'Le Baron'
+    assert views[linked.id].photo_status == 'ko'
+    assert views[assigned.id].role is None
+    assert views[assigned.id].active_role.name == 'La Garde'
+    assert views[assigned.id].is_pnj and views[assigned.id].photo_status == 'profil'
+    assert not hasattr(views[linked.id], '__dict__')
+
+
+def test_iter_participant_rows_projects_columns(db, event_sample, user_creator):
+    linked, _ = _cast(db, event_sample)
+
+    rows = list(iter_participant_rows(event_sample.id, [Participant.id, User.email, ROLE_NAME], batch_size=1))
+
+    assert [tuple(row) for row in rows if row.id == linked.id] == [(linked.id, 'read0@test.com', 'Le Baron')]
+    assert len(rows) == 3
+
+
+def test_manage_page_and_exports(client, db, event_sample, user_creator):
+    _cast(db, event_sample)
+    login(client, 'creator@test.com', 'creator123')
+
+    page = client.get(f'/event/{event_sample.id}/participants').get_data(as_text=True)
+    assert 'Le Baron' in page and 'La Garde' in page
+
+    response = client.get(f'/event/{event_sample.id}/participants/export')
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    baron = next(row for row in rows if row[2] == 'read0@test.com')
+    assert baron[11] == 'Le Baron'
+
+    response = client.post(f'/event/{event_sample.id}/export/csv')
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True).lstrip('\ufeff')), delimiter=';'))
+    assert rows[0][0] == 'Email'
+    baron = next(row for row in rows if row[0] == 'read0@test.com')
+    assert baron[11] == 'Le Baron' and baron[12] == 'Arrive samedi'
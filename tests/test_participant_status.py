@@ -0,0 +1,66 @@
+"""Tests des changements groupés de statut d'inscription (services/participant_status_service.py)."""
+
+from models import Participant, ActivityLog, EventNotification
+from services.participant_counter_service import get_event_counts
+from tests.conftest import login, create_participants
+
+
+def _pending(db, event, count, participant_type='PJ'):
+    return create_participants(db, event, count, prefix=participant_type.lower(),
+                               participant_type=participant_type, status='À valider')
+
+
+def _bulk_status(client, event, ids, action):
+    return client.post(f'/event/{event.id}/participants/bulk-status',
+                       json={'participant_ids': ids, 'action': action})
+
+
+def test_bulk_validate(client, db, event_sample, user_creator):
+    """Une transition groupée : statuts, compteurs, une ligne de journal et une notification."""
+    participants = _pending(db, event_sample, 4)
+    organizer = Participant.query.filter_by(event_id=event_sample.id, user_id=user_creator.id).one()
+    ids = [p.id for p in participants]
+    login(client, 'creator@test.com', 'creator123')
+
+    response = _bulk_status(client, event_sample, ids + [organizer.id, 999999], 'validate')
+
+    data = response.get_json()
+    assert response.status_code == 200 and data['success'] is True
+    assert data['updated'] == 4
+    assert data['unchanged'] == 1  # l'organisateur demandeur
+    assert data['not_found'] == [999999]
+    assert data['validated']['PJ'] == 4
+    db.session.expire_all()
+    assert {p.registration_status for p in Participant.query.filter(Participant.id.in_(ids))} == {'Validé'}
+    assert get_event_counts(event_sample.id)[('PJ', 'Validé')] == 4
+    assert ActivityLog.query.filter_by(event_id=event_sample.id, action_type='Modification statut').count() == 1
+    assert EventNotification.query.filter_by(event_id=event_sample.id, action_type='status_change').count() == 1
+
+
+def test_bulk_validate_enforces_limits(client, db, event_sample, user_creator):
+    """Une limite dépassée annule toute la transition."""
+    event_sample.max_pnjs = 2
+    db.session.commit()
+    participants = _pending(db, event_sample, 3, participant_type='PNJ')
+    ids = [p.id for p in participants]
+    login(client, 'creator@test.com', 'creator123')
+
+    response = _bulk_status(client, event_sample, ids, 'validate')
+
+    assert response.status_code == 409
+    assert response.get_json()['over_limit'] == {'PNJ': {'limit': 2, 'count': 3}}
+    db.session.expire_all()
+    assert {p.registration_status for p in Participant.query.filter(Participant.id.in_(ids))} == {'À valider'}
+    assert get_event_counts(event_sample.id).get(('PNJ', 'Validé'), 0) == 0
+    assert EventNotification.query.filter_by(event_id=event_sample.id).count() == 0
+
+    # Rejeter n'est pas soumis aux limites
+    assert _bulk_status(client, event_sample, ids[:1], 'reject').status_code == 200
+    assert _bulk_status(client, event_sample, ids[1:], 'validate').status_code == 200
+
+
+def test_bulk_status_invalid_request(client, db, event_sample, user_creator):
+    login(client, 'creator@test.com', 'creator123')
+    assert _bulk_status(client, event_sample, [1], 'promote').status_code == 400
+    assert _bulk_status(client, event_sample, [], 'validate').status_code == 400
+    assert _bulk_status(client, event_sample, ['1'], 'validate').status_code == 400
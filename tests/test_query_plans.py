@@ -0,0 +1,138 @@
+"""
+Tests de non-régression des plans de requêtes (utils/query_plan.py).
+
+Exécute les routes GET de chaque blueprint contre une base SQLite peuplée,
+capture le SQL émis, le rejoue avec EXPLAIN QUERY PLAN et échoue si une
+table volumineuse est parcourue intégralement hors de la liste des
+parcours connus (KNOWN_SCANS).
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from werkzeug.security import generate_password_hash
+
+from models import (User, Event, Participant, Role, ActivityLog, EventNotification,
+                    CastingProposal, FormResponse, GFormsSubmission)
+from utils.query_plan import capture_queries, find_full_scans, format_report
+
+# EXPLAIN QUERY PLAN : SQLite uniquement
+pytestmark = pytest.mark.sqlite_only
+
+
+# Routes exclues : authentification externe ou déconnexion, liens signés par jeton
+EXCLUDED_ENDPOINTS = {'static', 'auth.logout', 'auth.login_google', 'auth.authorize_google',
+                      'auth.reset_password', 'auth.validate_account'}
+
+# Routes qui redirigent sans requête (page d'accueil vers le dashboard)
+REDIRECT_ENDPOINTS = {'auth.index'}
+
+# Variantes de chaînes de requête exercées en plus de l'URL nue
+EXTRA_QUERY_STRINGS = {
+    'admin.admin_page': ['admin_view=users', 'admin_view=events', 'admin_view=users&search=user1',
+                         'admin_view=users&status=active', 'admin_view=users&status=active&sort=name'],
+    'admin.dashboard': ['filter=future', 'filter=past', 'filter=mine'],
+    'admin.admin_logs': ['action_type=event_participation', 'event_id=1', 'user_id=2'],
+    'gforms.get_submissions': ['q=user1', 'sort=email&order=asc'],
+    'event.notification_feed': ['before_id=100', 'since_id=10'],
+}
+
+# Parcours complets assumés : (endpoint, table)
+KNOWN_SCANS = {
+    # Annuaire des utilisateurs paginé sans filtre de statut (LIMIT/OFFSET)
+    ('admin.admin_page', 'user'),
+}
+
+
+def _seed(db, n_users=60, n_events=3):
+    """Peuple la base avec un volume représentatif de chaque table surveillée."""
+    password = generate_password_hash('creator123')
+    creator = User(email='creator@test.com', nom='Creator', prenom='Supreme',
+                   role='createur', password_hash=password)
+    db.session.add(creator)
+    users = [User(email=f'user{i}@test.com', nom=f'Nom{i}', prenom=f'Prenom{i}',
+                  role='user', password_hash=password) for i in range(n_users)]
+    db.session.add_all(users)
+    db.session.flush()
+
+    now = datetime.now()
+    events = []
+    for e in range(n_events):
+        event = Event(name=f'Event {e}', date_start=now + timedelta(days=e * 30 - 30),
+                      date_end=now + timedelta(days=e * 30 - 28), location='Lieu',
+                      statut='Inscriptions ouvertes')
+        db.session.add(event)
+        db.session.flush()
+        events.append(event)
+        db.session.add(Participant(event_id=event.id, user_id=creator.id,
+                                   type='Organisateur', registration_status='Validé'))
+        for i, user in enumerate(users):
+            db.session.add(Participant(
+                event_id=event.id, user_id=user.id,
+                type='PJ' if i % 3 else 'PNJ',
+                registration_status=['À valider', 'Validé', 'Rejeté'][i % 3],
+                group='Groupe A'
+            ))
+            db.session.add(Role(event_id=event.id, name=f'Rôle {i}', type='PJ', group=f'G{i % 4}'))
+            db.session.add(EventNotification(event_id=event.id, user_id=user.id,
+                                             action_type='participant_join_request',
+                                             description='Demande', is_read=bool(i % 2)))
+            db.session.add(ActivityLog(action_type='event_participation', user_id=user.id,
+                                       event_id=event.id, details='{}'))
+            response = FormResponse(event_id=event.id, response_id=f'r-{e}-{i}',
+                                    respondent_email=user.email, answers='{}')
+            db.session.add(response)
+            db.session.flush()
+            db.session.add(GFormsSubmission(event_id=event.id, user_id=user.id, email=user.email,
+                                            timestamp=now, type_ajout='créé',
+                                            form_response_id=response.id, raw_data='{}'))
+        db.session.add(CastingProposal(event_id=event.id, name='Proposition', position=0))
+    db.session.commit()
+    return creator, users, events
+
+
+def _route_urls(app, ids):
+    """Construit les URLs GET à exercer, avec les IDs du jeu de données."""
+    urls = []
+    unknown = []
+    for rule in app.url_map.iter_rules():
+        if 'GET' not in rule.methods or rule.endpoint in EXCLUDED_ENDPOINTS:
+            continue
+        if not set(rule.arguments) <= set(ids):
+            unknown.append(f"{rule.endpoint} {sorted(set(rule.arguments) - set(ids))}")
+            continue
+        path = rule.rule
+        for arg in rule.arguments:
+            path = path.replace(f'<int:{arg}>', str(ids[arg]))
+        urls.append((rule.endpoint, path))
+        for qs in EXTRA_QUERY_STRINGS.get(rule.endpoint, []):
+            urls.append((rule.endpoint, f'{path}?{qs}'))
+    # Une route non exercée doit être exclue explicitement
+    assert not unknown, f"Arguments d'URL sans ID de test : {unknown}"
+    return sorted(urls)
+
+
+@pytest.mark.slow
+def test_routes_do_not_scan_large_tables(client, db, app):
+    """Aucune route GET ne parcourt intégralement une table volumineuse."""
+    from tests.conftest import login
+    creator, users, events = _seed(db)
+    event = events[-1]
+    role = Role.query.filter_by(event_id=event.id).first()
+    ids = {'event_id': event.id, 'user_id': users[0].id, 'role_id': role.id}
+
+    login(client, 'creator@test.com', 'creator123')
+    unexpected_status = []
+    with capture_queries(db.engine) as capture:
+        for endpoint, url in _route_urls(app, ids):
+            capture.label = endpoint
+            status = client.get(url).status_code
+            # Une redirection ou une erreur n'exécute pas les requêtes de la page
+            if status != (302 if endpoint in REDIRECT_ENDPOINTS else 200):
+                unexpected_status.append((url, status))
+    assert not unexpected_status, unexpected_status
+
+    with db.engine.connect() as connection:
+        findings = find_full_scans(connection, capture.queries)
+
+    unexpected = [f for f in findings if (f[0], f[1]) not in KNOWN_SCANS]
+    assert not unexpected, format_report(unexpected)
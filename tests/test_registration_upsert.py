@@ -0,0 +1,144 @@
+"""Tests des inscriptions idempotentes (services/registration_service.py)."""
+
+import io
+from datetime import datetime
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from models import Participant, GFormsSubmission, GFormsFieldMapping, GFormsAnswer
+from services.participant_counter_service import get_event_counts
+from services.registration_service import upsert_participant, upsert_submission, RegistrationValueError
+from utils.query_plan import capture_queries
+from tests.conftest import login
+
+
+def test_upsert_participant_inserts_once(db, event_sample, user_regular):
+    participant_id = upsert_participant(event_sample.id, user_regular.id, type='PJ')
+    assert participant_id is not None
+    assert upsert_participant(event_sample.id, user_regular.id, type='PNJ') is None
+    db.session.commit()
+
+    participants = Participant.query.filter_by(event_id=event_sample.id, user_id=user_regular.id).all()
+    assert [(p.id, p.type, p.registration_status) for p in participants] == [(participant_id, 'PJ', 'À valider')]
+    # INSERT Core : le compteur est tenu à jour hors des hooks de session
+    assert get_event_counts(event_sample.id)[('PJ', 'À valider')] == 1
+
+
+def test_upsert_participant_canonical_values(db, event_sample, user_regular):
+    with pytest.raises(RegistrationValueError):
+        upsert_participant(event_sample.id, user_regular.id, type='PJ', registration_status='Peut-être')
+    participant_id = upsert_participant(event_sample.id, user_regular.id, type='pnj',
+                                        registration_status='validé')
+    db.session.commit()
+
+    participant = db.session.get(Participant, participant_id)
+    assert (participant.type, participant.registration_status) == ('PNJ', 'Validé')
+    assert get_event_counts(event_sample.id)[('PNJ', 'Validé')] == 1
+
+
+def test_unique_index_rejects_orm_duplicate(db, event_sample, user_creator):
+    db.session.add(Participant(event_id=event_sample.id, user_id=user_creator.id, type='PJ'))
+    with pytest.raises(IntegrityError):
+        db.session.commit()
+    db.session.rollback()
+
+
+def test_upsert_submission(db, event_sample, user_regular):
+    event_id, user_id = event_sample.id, user_regular.id
+    with capture_queries(db.engine) as capture:
+        submission, created = upsert_submission(event_id, 'user@test.com', user_id=user_id,
+                                                timestamp=datetime(2026, 1, 1), type_ajout='créé',
+                                                raw_data={'Q1': 'a'})
+    assert created and submission in db.session
+    assert not capture.queries  # INSERT ... RETURNING, sans SELECT de relecture
+    submission.type_ajout = 'mis à jour'
+    db.session.commit()
+
+    again, created = upsert_submission(event_sample.id, 'user@test.com', timestamp=datetime(2026, 1, 2),
+                                       raw_data={'Q1': 'b'})
+    assert not created and again.id == submission.id
+    assert again.raw_data == {'Q1': 'a'} and again.type_ajout == 'mis à jour'
+
+    # Réponses anonymes : toujours distinctes
+    first, _ = upsert_submission(event_sample.id, '', timestamp=datetime(2026, 1, 1), raw_data={})
+    second, created = upsert_submission(event_sample.id, '', timestamp=datetime(2026, 1, 1), raw_data={})
+    db.session.commit()
+    assert created and first.id != second.id
+
+
+def test_webhook_retries_do_not_duplicate(client, db, event_sample):
+    event_sample.webhook_secret = 'secret-upsert'
+    db.session.commit()
+
+    for response_id, answer in (('resp-1', 'Oui'), ('resp-2', 'Non')):
+        response = client.post('/api/webhook/gform', headers={'Authorization': 'Bearer secret-upsert'},
+                               json={'responseId': response_id, 'email': 'retry@test.com',
+                                     'answers': {'Prénom': 'Rita', 'Vient ?': answer}})
+        assert response.status_code == 200
+
+    participants = Participant.query.filter_by(event_id=event_sample.id).all()
+    assert len([p for p in participants if p.user.email == 'retry@test.com']) == 1
+    submissions = GFormsSubmission.query.filter_by(event_id=event_sample.id, email='retry@test.com').all()
+    assert len(submissions) == 1
+    assert submissions[0].raw_data['Vient ?'] == 'Non' and submissions[0].type_ajout == 'mis à jour'
+    assert get_event_counts(event_sample.id)[('PJ', 'À valider')] == 1
+
+
+def test_gforms_import_upserts_rows(client, db, event_sample, user_creator):
+    login(client, 'creator@test.com', 'creator123')
+    csv_data = ('Horodateur,Email,Q1\n'
+                '2024/01/30 14:30:15,dup@test.com,premier\n'
+                '2024/01/30 14:31:15,dup@test.com,second\n')
+
+    response = client.post(f'/event/{event_sample.id}/gforms/import',
+                           data={'file': (io.BytesIO(csv_data.encode()), 'import.csv')},
+                           content_type='multipart/form-data')
+
+    data = response.get_json()
+    assert data['success'] and data['imported'] == 1 and data['updated'] == 1
+    submission = GFormsSubmission.query.filter_by(event_id=event_sample.id, email='dup@test.com').one()
+    assert submission.raw_data == {'Q1': 'second'}
+    assert GFormsAnswer.query.filter_by(submission_id=submission.id).one().value == 'second'
+    assert Participant.query.filter_by(event_id=event_sample.id).count() == 2
+
+
+def test_join_twice_keeps_first_registration(auth_client, db, event_sample, user_regular):
+    auth_client.post(f'/event/{event_sample.id}/join', data={'type': 'PNJ'})
+    response = auth_client.post(f'/event/{event_sample.id}/join', data={'type': 'PJ'}, follow_redirects=True)
+
+    assert 'Vous participez déjà à cet événement.' in response.get_data(as_text=True)
+    participant = Participant.query.filter_by(event_id=event_sample.id, user_id=user_regular.id).one()
+    assert participant.type == 'PNJ'
+
+
+def test_save_field_mappings_upserts(client, db, event_sample, user_creator):
+    login(client, 'creator@test.com', 'creator123')
+    db.session.add(GFormsFieldMapping(event_id=event_sample.id, field_name='Q1'))
+    db.session.commit()
+
+    response = client.post(f'/event/{event_sample.id}/gforms/field-mappings', json={'mappings': [
+        {'field_name': 'Q1', 'field_alias': 'Question 1'},
+        {'field_name': 'Q2', 'field_alias': None},
+        {'field_name': ''},
+    ]})
+
+    assert response.get_json()['success']
+    mappings = {m.field_name: m.field_alias for m in GFormsFieldMapping.query.filter_by(event_id=event_sample.id)}
+    assert mappings == {'Q1': 'Question 1', 'Q2': None}
+
+
+def test_join_with_lowercase_type(auth_client, db, event_sample, user_regular):
+    auth_client.post(f'/event/{event_sample.id}/join', data={'type': 'pj'})
+
+    participant = Participant.query.filter_by(event_id=event_sample.id, user_id=user_regular.id).one()
+    assert participant.type == 'PJ'
+    assert Participant.query.filter_by(event_id=event_sample.id, type='PJ').count() == 1
+    assert get_event_counts(event_sample.id)[('PJ', 'À valider')] == 1
+
+
+def test_join_rejects_unknown_type(auth_client, db, event_sample, user_regular):
+    response = auth_client.post(f'/event/{event_sample.id}/join', data={'type': 'Dragon'}, follow_redirects=True)
+
+    assert 'Type d&#39;inscription invalide.' in response.get_data(as_text=True)
+    assert Participant.query.filter_by(event_id=event_sample.id, user_id=user_regular.id).count() == 0
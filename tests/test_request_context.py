@@ -0,0 +1,53 @@
+"""Tests du contexte d'événement de la requête (utils/request_context.py)."""
+
+import re
+
+from flask import g
+
+from utils.query_plan import capture_queries
+from tests.conftest import login
+
+EVENT_LOAD = re.compile(r'FROM event\s+(LEFT OUTER JOIN participant|WHERE event\.id = \?)')
+MEMBERSHIP_LOAD = re.compile(r'WHERE participant\.event_id = \? AND participant\.user_id = \?')
+
+
+def _count(capture, pattern):
+    return sum(1 for query in capture.queries if pattern.search(query.statement))
+
+
+def test_organizer_view_reuses_decorator_context(client, db, event_sample, user_creator):
+    login(client, 'creator@test.com', 'creator123')
+    event_id = event_sample.id
+    db.session.expunge_all()
+
+    with capture_queries(db.engine) as capture:
+        response = client.get(f'/event/{event_id}/participants')
+
+    assert response.status_code == 200
+    assert _count(capture, EVENT_LOAD) == 1
+    assert _count(capture, MEMBERSHIP_LOAD) == 1
+
+
+def test_detail_takes_membership_from_loaded_participants(client, db, event_sample, user_creator):
+    login(client, 'creator@test.com', 'creator123')
+    event_id = event_sample.id
+    db.session.expunge_all()
+
+    with capture_queries(db.engine) as capture:
+        response = client.get(f'/event/{event_id}')
+
+    assert response.status_code == 200
+    assert _count(capture, EVENT_LOAD) == 1
+    assert _count(capture, MEMBERSHIP_LOAD) == 0
+
+
+def test_context_cleared_after_request(client, db, event_sample, user_creator, user_regular):
+    event_id = event_sample.id
+    login(client, 'creator@test.com', 'creator123')
+    assert client.get(f'/event/{event_id}/participants').status_code == 200
+    assert 'current_event' not in g and 'current_membership' not in g
+
+    client.get('/logout')
+    login(client, 'user@test.com', 'password123')
+    response = client.get(f'/event/{event_id}/participants')
+    assert response.status_code == 302
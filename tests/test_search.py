@@ -0,0 +1,130 @@
+"""Tests de la recherche plein texte (services/search_service.py)."""
+
+import pytest
+from datetime import datetime, timedelta
+
+from werkzeug.security import generate_password_hash
+
+from models import User, Event, Participant, GFormsSubmission, GFormsFieldMapping
+from services.gforms_answer_service import sync_submission_answers
+from services.search_service import build_match_query, rebuild_search_index, search
+from tests.conftest import login
+
+# Index FTS5 : SQLite uniquement
+pytestmark = pytest.mark.sqlite_only
+
+
+def _kinds(results):
+    return sorted((r['kind'], r['id']) for r in results)
+
+
+def _other_event(db, user_creator):
+    event = Event(name='Autre GN', date_start=datetime.now() + timedelta(days=10),
+                  date_end=datetime.now() + timedelta(days=11), location='Ailleurs')
+    db.session.add(event)
+    db.session.flush()
+    return event
+
+
+def test_build_match_query():
+    """La saisie est découpée en mots préfixés, sans opérateurs FTS5."""
+    assert build_match_query('jean dup') == '"jean"* "dup"*'
+    assert build_match_query('a OR "b" NEAR(c)') == '"a"* "OR"* "b"* "NEAR"* "c"*'
+    assert build_match_query('  ') is None
+
+
+def test_index_follows_writes(db, user_creator, event_sample, user_regular):
+    """Les triggers maintiennent l'index à l'insertion, la modification et la suppression."""
+    assert _kinds(search('user@test.com', user_creator)) == [('user', user_regular.id)]
+
+    participant = Participant(event_id=event_sample.id, user_id=user_regular.id, type='PJ',
+                              global_comment='Allergie aux arachides')
+    db.session.add(participant)
+    db.session.commit()
+    assert _kinds(search('arachide', user_creator)) == [('participant', participant.id)]
+
+    participant.global_comment = 'Végétarien'
+    db.session.commit()
+    assert search('arachide', user_creator) == []
+    # Insensible aux accents
+    assert _kinds(search('vegetarien', user_creator)) == [('participant', participant.id)]
+
+    # Suppression en masse (hors ORM)
+    Participant.query.filter_by(id=participant.id).delete()
+    db.session.commit()
+    assert search('vegetarien', user_creator) == []
+
+
+def test_answers_are_indexed(db, user_creator, event_sample):
+    """Les réponses GForms normalisées sont indexées avec leur événement."""
+    submission = GFormsSubmission(event_id=event_sample.id, email='jean@test.com',
+                                  timestamp=datetime.now(), type_ajout='créé',
+                                  raw_data={'Costume': 'Chevalier noir'})
+    db.session.add(submission)
+    db.session.add(GFormsFieldMapping(event_id=event_sample.id, field_name='Costume'))
+    sync_submission_answers([submission])
+    db.session.commit()
+
+    results = search('chevalier', user_creator)
+    assert len(results) == 1
+    assert results[0]['kind'] == 'answer'
+    assert results[0]['event_id'] == event_sample.id
+    assert results[0]['label'] == 'Costume'
+    assert results[0]['email'] == 'jean@test.com'
+
+
+def test_search_is_scoped_by_permission(db, event_sample, user_regular, user_creator):
+    """Un organisateur ne voit que ses événements et leurs participants."""
+    other = _other_event(db, user_creator)
+    organizer = User(email='orga@test.com', nom='Orga', prenom='Nisateur', role='user',
+                     password_hash=generate_password_hash('orga123'))
+    outsider = User(email='outsider@test.com', nom='Externe', prenom='Paul', role='user')
+    db.session.add_all([organizer, outsider])
+    db.session.flush()
+    db.session.add_all([
+        Participant(event_id=event_sample.id, user_id=organizer.id, type='Organisateur'),
+        Participant(event_id=event_sample.id, user_id=user_regular.id, type='PJ',
+                    global_comment='Secret visible'),
+        Participant(event_id=other.id, user_id=outsider.id, type='PJ', global_comment='Secret caché'),
+    ])
+    db.session.commit()
+
+    assert len(search('secret', organizer)) == 1
+    assert len(search('secret', user_creator)) == 2
+    assert search('Externe', organizer) == []
+    assert [r['email'] for r in search('user@test.com', organizer)] == ['user@test.com']
+    assert search('secret', user_regular) == []
+
+
+def test_search_api(client, db, event_sample, user_regular, user_creator):
+    """L'API refuse un événement non organisé et renvoie les résultats classés."""
+    other = _other_event(db, user_creator)
+    db.session.add(Participant(event_id=event_sample.id, user_id=user_regular.id, type='PJ',
+                               info_payement='Chèque reçu'))
+    db.session.commit()
+
+    login(client, 'user@test.com', 'password123')
+    assert client.get('/api/search', query_string={'q': 'cheque', 'event_id': other.id}).status_code == 403
+    client.get('/logout')
+
+    login(client, 'creator@test.com', 'creator123')
+    response = client.get('/api/search', query_string={'q': 'cheque', 'event_id': event_sample.id})
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert [r['kind'] for r in results] == ['participant']
+    assert results[0]['user_id'] == user_regular.id
+
+
+def test_admin_user_search_uses_index(admin_client, db, user_regular):
+    """La recherche d'utilisateurs de l'administration passe par l'index."""
+    response = admin_client.get('/admin', query_string={'admin_view': 'users', 'q': 'User Test'})
+    assert response.status_code == 200
+    assert b'user@test.com' in response.data
+    assert b'admin@test.com' not in response.data.split(b'<tbody')[-1]
+
+
+def test_rebuild_search_index(db, user_creator, user_regular):
+    """La reconstruction réindexe toutes les sources."""
+    assert rebuild_search_index() == 2
+    db.session.commit()
+    assert _kinds(search('user@test.com', user_creator)) == [('user', user_regular.id)]
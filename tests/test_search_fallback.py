@@ -0,0 +1,66 @@
+"""Tests de la recherche sans index FTS5 (repli ILIKE de services/search_service.py)."""
+
+from datetime import datetime
+
+import pytest
+
+from models import User, Participant, GFormsSubmission, GFormsFieldMapping
+from services import search_service
+from services.gforms_answer_service import sync_submission_answers
+from services.search_service import search
+from tests.conftest import login
+
+
+@pytest.fixture(autouse=True)
+def no_search_index(monkeypatch):
+    """Comme sous PostgreSQL : l'index plein texte est indisponible."""
+    monkeypatch.setattr(search_service, 'search_index_available', lambda: False)
+
+
+def _kinds(results):
+    return sorted((r['kind'], r['id']) for r in results)
+
+
+def test_fallback_searches_all_sources(db, event_sample, user_creator, user_regular):
+    participant = Participant(event_id=event_sample.id, user_id=user_regular.id, type='PJ',
+                              global_comment='Allergie aux arachides')
+    submission = GFormsSubmission(event_id=event_sample.id, email='jean@test.com',
+                                  timestamp=datetime.now(), type_ajout='créé',
+                                  raw_data={'Costume': 'Chevalier noir'})
+    db.session.add_all([participant, submission,
+                        GFormsFieldMapping(event_id=event_sample.id, field_name='Costume')])
+    sync_submission_answers([submission])
+    db.session.commit()
+
+    assert _kinds(search('user@test', user_creator)) == [('user', user_regular.id)]
+    assert _kinds(search('ARACHIDES allergie', user_creator)) == [('participant', participant.id)]
+    results = search('chevalier', user_creator)
+    assert [(r['kind'], r['label'], r['event_id']) for r in results] == [('answer', 'Costume', event_sample.id)]
+
+
+def test_fallback_is_scoped_by_permission(db, event_sample, user_creator, user_regular):
+    organizer = User(email='orga@test.com', nom='Orga', prenom='Nisateur', role='user')
+    outsider = User(email='outsider@test.com', nom='Externe', prenom='Paul', role='user')
+    db.session.add_all([organizer, outsider])
+    db.session.flush()
+    db.session.add_all([
+        Participant(event_id=event_sample.id, user_id=organizer.id, type='Organisateur'),
+        Participant(event_id=event_sample.id, user_id=user_regular.id, type='PJ'),
+    ])
+    db.session.commit()
+
+    assert sorted(r['email'] for r in search('test.com', organizer) if r['kind'] == 'user') == \
+        ['creator@test.com', 'orga@test.com', 'user@test.com']
+    assert search('Externe', organizer) == []
+    assert search('user@test', user_regular) == []
+
+
+def test_search_api_without_index(client, db, event_sample, user_creator, user_regular):
+    db.session.add(Participant(event_id=event_sample.id, user_id=user_regular.id, type='PJ',
+                               info_payement='Chèque reçu'))
+    db.session.commit()
+
+    login(client, 'creator@test.com', 'creator123')
+    response = client.get('/api/search', query_string={'q': 'chèque', 'event_id': event_sample.id})
+    assert response.status_code == 200
+    assert [r['kind'] for r in response.get_json()['results']] == ['participant']
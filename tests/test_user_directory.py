@@ -0,0 +1,91 @@
+"""Tests de l'annuaire des utilisateurs de l'administration (services/user_directory_service.py)."""
+
+from datetime import datetime
+
+from models import Event, Role, ActivityLog
+from services.user_directory_service import user_directory, user_participations
+from utils.query_plan import capture_queries
+from tests.conftest import login, create_user, create_participant
+
+
+def _user(db, email, nom, **kwargs):
+    user = create_user(db, email, nom=nom, **kwargs)
+    db.session.commit()
+    return user
+
+
+def test_directory_counts_and_last_activity(db, event_sample, user_regular):
+    create_participant(db, event_sample, user_regular)
+    db.session.add(ActivityLog(user_id=user_regular.id, action_type='registration',
+                               created_at=datetime(2026, 5, 1, 10, 30)))
+    db.session.add(ActivityLog(user_id=user_regular.id, action_type='registration',
+                               created_at=datetime(2026, 3, 1)))
+    db.session.commit()
+
+    pagination = user_directory()
+
+    rows = {u.email: (count, last) for u, count, last in pagination.items}
+    assert pagination.total == 2
+    assert rows['user@test.com'] == (1, datetime(2026, 5, 1, 10, 30))
+    assert rows['creator@test.com'] == (1, None)
+
+
+def test_directory_status_filters_and_sort(db):
+    _user(db, 'b@test.com', 'Bravo')
+    _user(db, 'a@test.com', 'Alpha')
+    _user(db, 'banned@test.com', 'Charlie', is_banned=True)
+    _user(db, 'gone@test.com', 'Delta', is_deleted=True, account_status='deregistered')
+
+    assert [u.email for u, _, _ in user_directory().items] == \
+        ['b@test.com', 'a@test.com', 'banned@test.com', 'gone@test.com']
+    active = user_directory(status='active', sort='name')
+    assert active.total == 2
+    assert [u.email for u, _, _ in active.items] == ['a@test.com', 'b@test.com']
+    assert [u.email for u, _, _ in user_directory(status='banned').items] == ['banned@test.com']
+    assert [u.email for u, _, _ in user_directory(status='deleted').items] == ['gone@test.com']
+
+    page = user_directory(page=2, per_page=3)
+    assert page.pages == 2 and page.has_prev and not page.has_next
+    assert [u.email for u, _, _ in page.items] == ['gone@test.com']
+
+
+def test_user_participations(db, event_sample, user_regular):
+    other = Event(name='Autre GN', date_start=datetime(2026, 1, 1), date_end=datetime(2026, 1, 2))
+    db.session.add(other)
+    db.session.commit()
+    first = create_participant(db, event_sample, user_regular)
+    create_participant(db, other, user_regular, status='En attente')
+    role = Role(event_id=event_sample.id, name='Le Baron', type='PJ')
+    db.session.add(role)
+    db.session.flush()
+    first.role_id = role.id
+    db.session.commit()
+
+    views = user_participations(user_regular.id)
+
+    assert [v.event_name for v in views] == ['Autre GN', 'Test Event']
+    assert views[1].is_pj and views[1].role_name == 'Le Baron'
+    assert views[0].registration_status == 'En attente' and views[0].role_name is None
+
+
+def test_dashboard_skips_directory_unless_requested(client, db, user_admin):
+    login(client, 'admin@test.com', 'admin123')
+
+    with capture_queries(db.engine) as capture:
+        client.get('/dashboard')
+    assert not any('participation_count' in query.statement for query in capture.queries)
+
+    with capture_queries(db.engine) as capture:
+        client.get('/dashboard?admin_view=users')
+    assert any('participation_count' in query.statement for query in capture.queries)
+
+
+def test_admin_users_tab_and_user_events(client, db, event_sample, user_admin, user_regular):
+    create_participant(db, event_sample, user_regular)
+    login(client, 'admin@test.com', 'admin123')
+
+    page = client.get('/admin?admin_view=users&status=active&sort=name').get_data(as_text=True)
+    assert 'user@test.com' in page and 'Participations' in page
+
+    page = client.get(f'/admin/user/{user_regular.id}/events').get_data(as_text=True)
+    assert 'Test Event' in page
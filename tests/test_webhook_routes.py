@@ -335,7 +335,7 @@ class TestUserParticipantCreation:
         from models import GFormsSubmission
         submission = GFormsSubmission.query.filter_by(event_id=event_sample.id, user_id=user.id).first()
         assert submission is not None
-        raw = json.loads(submission.raw_data)
+        raw = submission.raw_data
         assert raw.get('Question 1') == 'Réponse 1'
         assert raw.get('Question 2') == 'Réponse 2'
 
@@ -380,6 +380,6 @@ class TestUserParticipantCreation:
         # Vérifier que les réponses sont stockées dans GFormsSubmission
         submission = GFormsSubmission.query.filter_by(event_id=event_sample.id, user_id=user_regular.id).first()
         assert submission is not None
-        raw = json.loads(submission.raw_data)
+        raw = submission.raw_data
         assert raw.get('Nouvelle Info') == 'Super Important'
 
@@ -0,0 +1,128 @@
+"""
+Helpers SQL portables entre SQLite et PostgreSQL.
+
+- INSERT ... ON CONFLICT (upsert / insertion idempotente) avec le dialecte
+  de la session courante ;
+- reconnaissance des erreurs "table absente" et "verrou" des deux moteurs.
+"""
+
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from models import db
+
+
+def dialect_name():
+    """Nom du dialecte du moteur de la session ('sqlite', 'postgresql'...)."""
+    return db.session.get_bind().dialect.name
+
+
+def dialect_insert(table, dialect=None):
+    """
+    Construit un INSERT du dialecte courant (supporte on_conflict_do_*).
+
+    Args:
+        table: Modèle ou Table cible
+        dialect: Nom du dialecte (celui de la session par défaut)
+    """
+    if (dialect or dialect_name()) == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(getattr(table, '__table__', table))
+
+
+def insert_ignore(model, rows, index_elements):
+    """
+    Insère des lignes en ignorant celles qui violent la contrainte unique.
+
+    INSERT ... ON CONFLICT DO NOTHING : deux requêtes concurrentes
+    (webhooks simultanés) ne lèvent plus d'IntegrityError. Ne commit pas.
+
+    Args:
+        model: Modèle cible
+        rows: Liste de dict de valeurs (mêmes clés)
+        index_elements: Colonnes de la contrainte unique
+    """
+    if not rows:
+        return
+    stmt = dialect_insert(model).on_conflict_do_nothing(index_elements=index_elements)
+    db.session.execute(stmt, rows)
+
+
+def upsert(model, values, index_elements, update_columns):
+    """
+    Insère une ligne ou met à jour update_columns si elle existe déjà.
+
+    Ne commit pas.
+
+    Args:
+        model: Modèle cible
+        values: dict de valeurs de la ligne
+        index_elements: Colonnes de la contrainte unique
+        update_columns: Colonnes réécrites en cas de conflit
+
+    Returns:
+        int: ID de la ligne insérée ou mise à jour
+    """
+    stmt = dialect_insert(model).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={column: stmt.excluded[column] for column in update_columns}
+    ).returning(model.__table__.c.id)
+    return db.session.execute(stmt).scalar_one()
+
+
+def upsert_rows(model, rows, index_elements, update_columns):
+    """
+    Variante de upsert() pour plusieurs lignes, en une instruction (executemany).
+
+    Ne commit pas.
+
+    Args:
+        model: Modèle cible
+        rows: Liste de dict de valeurs (mêmes clés)
+        index_elements: Colonnes de la contrainte unique
+        update_columns: Colonnes réécrites en cas de conflit
+    """
+    if not rows:
+        return
+    stmt = dialect_insert(model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={column: stmt.excluded[column] for column in update_columns}
+    )
+    db.session.execute(stmt, rows)
+
+
+def is_missing_table_error(error):
+    """
+    Indique si une erreur SQLAlchemy signale une table absente.
+
+    SQLite lève OperationalError ("no such table"), PostgreSQL
+    ProgrammingError (UndefinedTable, "relation ... does not exist").
+    """
+    if not isinstance(error, (OperationalError, ProgrammingError)):
+        return False
+    message = str(getattr(error, 'orig', error)).lower()
+    return 'no such table' in message or ('relation' in message and 'does not exist' in message)
+
+
+# Codes PostgreSQL : serialization_failure, deadlock_detected, lock_not_available
+_PG_LOCK_CODES = {'40001', '40P01', '55P03'}
+
+
+def is_lock_error(error):
+    """
+    Indique si une erreur SQLAlchemy signale un conflit de verrou.
+
+    SQLite lève OperationalError ("database is locked" / "is busy"),
+    PostgreSQL un code SQLSTATE de sérialisation, d'interblocage ou de
+    lock_timeout.
+    """
+    if not isinstance(error, OperationalError):
+        return False
+    orig = getattr(error, 'orig', error)
+    if getattr(orig, 'pgcode', None) in _PG_LOCK_CODES:
+        return True
+    message = str(orig).lower()
+    return 'database is locked' in message or 'database is busy' in message
@@ -0,0 +1,111 @@
+"""
+Routage des lectures vers une connexion en lecture seule.
+
+Un second moteur est ouvert sur la même base avec PRAGMA query_only=1
+(SQLite) ou sur un réplica / une session read-only (PostgreSQL). Les vues
+marquées @read_only_db (decorators.py) lisent par ce moteur : en WAL, ces
+lecteurs ne prennent jamais la connexion qui écrit.
+
+La session bascule sur le moteur principal dès la première écriture
+(flush ou UPDATE/DELETE en masse) et y reste jusqu'à la fin de la
+requête, pour relire ses propres écritures.
+"""
+
+import logging
+from contextlib import contextmanager
+
+from flask import current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+
+logger = logging.getLogger(__name__)
+
+READ_ENGINE_KEY = 'db_read_engine'
+_READ_ONLY = 'read_only'
+_WROTE = 'wrote'
+
+
+class RoutingSession(Session):
+    """Session Flask-SQLAlchemy qui route les lectures des vues read-only."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.info.get(_READ_ONLY):
+            if self._flushing or getattr(clause, 'is_dml', False):
+                self.info[_WROTE] = True
+            elif not self.info.get(_WROTE):
+                engine = current_app.extensions.get(READ_ENGINE_KEY)
+                if engine is not None:
+                    return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@contextmanager
+def read_only_session(session):
+    """
+    Route les lectures de la session vers le moteur read-only le temps du bloc.
+
+    Sans moteur read-only (base en mémoire, routage désactivé), le bloc
+    s'exécute sur le moteur principal.
+    """
+    previous = session.info.get(_READ_ONLY)
+    session.info[_READ_ONLY] = True
+    try:
+        yield session
+    finally:
+        if previous:
+            session.info[_READ_ONLY] = previous
+        else:
+            session.info.pop(_READ_ONLY, None)
+            session.info.pop(_WROTE, None)
+
+
+def _read_engine_url(app, engine):
+    """URL du moteur read-only, ou None si le routage est impossible."""
+    replica = app.config.get('SQLALCHEMY_READONLY_DATABASE_URI')
+    if replica:
+        return replica
+    url = engine.url
+    if url.get_backend_name() == 'sqlite' and (
+            url.database in (None, '', ':memory:') or 'mode=memory' in str(url)):
+        # Une seconde connexion ouvrirait une autre base en mémoire
+        return None
+    return url
+
+
+def init_read_routing(app, db):
+    """
+    Crée le moteur read-only de l'application (app.extensions['db_read_engine']).
+
+    Désactivé par DB_READ_ROUTING = False. Doit être appelé après db.init_app().
+    """
+    if not app.config.get('DB_READ_ROUTING', True):
+        return None
+
+    with app.app_context():
+        engine = db.engine
+        url = _read_engine_url(app, engine)
+        if url is None:
+            return None
+
+        options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+        if engine.dialect.name == 'postgresql' and not app.config.get('SQLALCHEMY_READONLY_DATABASE_URI'):
+            connect_args = dict(options.get('connect_args', {}))
+            connect_args['options'] = (connect_args.get('options', '') +
+                                       ' -c default_transaction_read_only=on').strip()
+            options['connect_args'] = connect_args
+        read_engine = create_engine(url, **options)
+
+        if read_engine.dialect.name == 'sqlite':
+            from utils.deploy_config_loader import apply_sqlite_pragmas
+            pragmas = app.config.get('SQLITE_PRAGMAS', {})
+
+            @event.listens_for(read_engine, 'connect')
+            def set_read_only_pragmas(dbapi_connection, connection_record):
+                apply_sqlite_pragmas(dbapi_connection, pragmas)
+                cursor = dbapi_connection.cursor()
+                cursor.execute('PRAGMA query_only=1')
+                cursor.close()
+
+    app.extensions[READ_ENGINE_KEY] = read_engine
+    logger.info("✅ Moteur en lecture seule initialisé")
+    return read_engine
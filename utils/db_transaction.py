@@ -0,0 +1,233 @@
+"""
+Transactions d'écriture : prise anticipée du verrou et métriques de contention.
+
+Sous SQLite, une seule connexion écrit à la fois. Par défaut, pysqlite
+ouvre la transaction au premier INSERT/UPDATE : une requête qui a déjà lu
+attend alors le verrou jusqu'à busy_timeout (30 s), sans trace. begin_write()
+prend le verrou dès le début de l'unité d'écriture (BEGIN IMMEDIATE), avec
+une attente courte par tentative et des reprises espacées aléatoirement ;
+une fois le verrou obtenu, les écritures de la requête ne peuvent plus
+échouer sur "database is locked".
+
+Sous PostgreSQL les verrous sont pris par ligne : begin_write() ne fait
+que démarrer la mesure (lock_timeout borne déjà les attentes).
+
+Pour chaque endpoint sont relevés l'attente du verrou et sa durée de
+détention (jusqu'au commit ou rollback), exposés par /health/metrics.
+Les métriques sont propres à chaque processus (worker).
+"""
+
+import logging
+import random
+import threading
+import time
+from bisect import bisect_left
+
+from flask import current_app, has_app_context, has_request_context, request
+from sqlalchemy import event as sa_event
+from sqlalchemy.exc import OperationalError
+
+from exceptions import DatabaseBusyError
+from models import db
+from utils.db_dialect import is_lock_error
+
+logger = logging.getLogger(__name__)
+
+METRICS_KEY = 'db_lock_metrics'
+_WRITE_KEY = 'write_transaction'
+
+# Bornes supérieures des classes des histogrammes (ms)
+HISTOGRAM_BOUNDS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """Histogramme cumulatif de durées en millisecondes."""
+
+    def __init__(self, bounds=HISTOGRAM_BOUNDS_MS):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value_ms):
+        self.buckets[bisect_left(self.bounds, value_ms)] += 1
+        self.count += 1
+        self.sum += value_ms
+        self.max = max(self.max, value_ms)
+
+    def to_dict(self):
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(list(self.bounds) + ['+Inf'], self.buckets):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            'count': self.count,
+            'sum_ms': round(self.sum, 2),
+            'max_ms': round(self.max, 2),
+            'buckets': buckets,
+        }
+
+
+class LockMetrics:
+    """Métriques de verrou d'écriture par endpoint (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def _entry(self, endpoint):
+        return self._endpoints.setdefault(endpoint, {
+            'lock_wait_ms': Histogram(),
+            'hold_ms': Histogram(),
+            'retries': 0,
+            'busy_errors': 0,
+        })
+
+    def observe_wait(self, endpoint, wait_ms, retries):
+        with self._lock:
+            entry = self._entry(endpoint)
+            entry['lock_wait_ms'].observe(wait_ms)
+            entry['retries'] += retries
+
+    def observe_hold(self, endpoint, hold_ms):
+        with self._lock:
+            self._entry(endpoint)['hold_ms'].observe(hold_ms)
+
+    def observe_busy(self, endpoint, retries):
+        with self._lock:
+            entry = self._entry(endpoint)
+            entry['busy_errors'] += 1
+            entry['retries'] += retries
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: {endpoint: {'lock_wait_ms', 'hold_ms', 'retries', 'busy_errors'}}
+        """
+        with self._lock:
+            return {
+                endpoint: {
+                    'lock_wait_ms': entry['lock_wait_ms'].to_dict(),
+                    'hold_ms': entry['hold_ms'].to_dict(),
+                    'retries': entry['retries'],
+                    'busy_errors': entry['busy_errors'],
+                }
+                for endpoint, entry in sorted(self._endpoints.items())
+            }
+
+
+def lock_metrics(app=None):
+    """Métriques de verrou de l'application (créées au premier appel)."""
+    app = app or current_app
+    return app.extensions.setdefault(METRICS_KEY, LockMetrics())
+
+
+def _endpoint_name(endpoint):
+    if endpoint:
+        return endpoint
+    if has_request_context():
+        return request.endpoint or request.path
+    return 'cli'
+
+
+def _begin_immediate(connection, busy_timeout_ms, restore_timeout_ms):
+    """
+    BEGIN IMMEDIATE sur la connexion pysqlite, avec une attente bornée.
+
+    Returns:
+        bool: False si la connexion était déjà dans une transaction
+              (verrou déjà pris par une écriture antérieure)
+    """
+    dbapi_connection = connection.connection.dbapi_connection
+    if dbapi_connection.in_transaction:
+        return False
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+        finally:
+            cursor.execute(f"PRAGMA busy_timeout={int(restore_timeout_ms)}")
+    finally:
+        cursor.close()
+    return True
+
+
+def begin_write(endpoint=None, session=None):
+    """
+    Ouvre l'unité d'écriture de la session et prend le verrou d'écriture.
+
+    À appeler avant les premières écritures d'une requête (voir le
+    décorateur @write_transaction). Sans effet si la session a déjà une
+    unité d'écriture ouverte.
+
+    Configuration (app.config) :
+        DB_WRITE_RETRIES: Tentatives supplémentaires après un échec
+        DB_WRITE_LOCK_TIMEOUT_MS: Attente du verrou par tentative
+        DB_WRITE_BACKOFF_MS: Base du délai (doublé à chaque reprise, tiré au hasard)
+
+    Args:
+        endpoint: Nom pour les métriques (endpoint de la requête par défaut)
+        session: Session (db.session par défaut)
+
+    Raises:
+        DatabaseBusyError: Verrou non obtenu après toutes les tentatives
+    """
+    session = session or db.session()
+    if _WRITE_KEY in session.info:
+        return
+    endpoint = _endpoint_name(endpoint)
+    config = current_app.config
+    metrics = lock_metrics()
+    connection = session.connection()
+    start = time.monotonic()
+
+    if connection.dialect.name == 'sqlite':
+        retries = config.get('DB_WRITE_RETRIES', 5)
+        timeout_ms = config.get('DB_WRITE_LOCK_TIMEOUT_MS', 2000)
+        backoff_ms = config.get('DB_WRITE_BACKOFF_MS', 50)
+        restore_ms = config.get('SQLITE_PRAGMAS', {}).get('busy_timeout', 5000)
+        dbapi_error = connection.dialect.loaded_dbapi.OperationalError
+        attempt = 0
+        while True:
+            try:
+                _begin_immediate(connection, timeout_ms, restore_ms)
+                break
+            except dbapi_error as e:
+                error = OperationalError("BEGIN IMMEDIATE", None, e)
+            if not is_lock_error(error):
+                raise error
+            if attempt >= retries:
+                metrics.observe_busy(endpoint, attempt)
+                logger.warning(f"⚠️  Verrou d'écriture non obtenu ({endpoint}, {attempt + 1} tentatives)")
+                raise DatabaseBusyError("Base de données occupée, réessayez") from error
+            attempt += 1
+            time.sleep(random.uniform(0, backoff_ms * 2 ** attempt) / 1000)
+    else:
+        attempt = 0
+
+    acquired = time.monotonic()
+    metrics.observe_wait(endpoint, (acquired - start) * 1000, attempt)
+    session.info[_WRITE_KEY] = (endpoint, acquired)
+
+
+def _end_write(session, transaction):
+    # Fin de la transaction racine : commit, rollback ou fermeture
+    if transaction.parent is not None or transaction.nested:
+        return
+    started = session.info.pop(_WRITE_KEY, None)
+    if started is not None and has_app_context():
+        endpoint, acquired = started
+        lock_metrics().observe_hold(endpoint, (time.monotonic() - acquired) * 1000)
+
+
+def register_write_transaction_listeners():
+    """
+    Enregistre le hook after_transaction_end (durée de détention du verrou).
+
+    Idempotent : peut être appelé à chaque création d'application.
+    """
+    if not sa_event.contains(db.session, 'after_transaction_end', _end_write):
+        sa_event.listen(db.session, 'after_transaction_end', _end_write)
@@ -1,5 +1,5 @@
 """
-Utilitaire de chargement de la configuration des services externes.
+Utilitaire de chargement de la configuration de déploiement.
 
 Charge les paramètres depuis les variables d'environnement pour rendre
 accessibles les URLs et tokens des services pdf2txt et character
@@ -10,6 +10,12 @@ Variables d'environnement attendues :
 - WEBHOOK_PDF2TXT_API_TOKEN
 - WEBHOOK_CHARACTER_API_URL
 - WEBHOOK_CHARACTER_API_TOKEN
+
+Charge aussi le profil de connexion à la base, choisi selon l'environnement
+(GN_ENVIRONMENT : prod, dev, test, c'est-à-dire les services gnole,
+gnole_dev, gnole_test) et ajustable dans la section 'database' de
+config/deploy_config.yaml : PRAGMA et pool pour SQLite, QueuePool et
+timeouts de session pour PostgreSQL.
 """
 
 import os
@@ -18,6 +24,281 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+# Profils de connexion SQLite : PRAGMA appliqués à chaque nouvelle connexion
+SQLITE_PROFILES = {
+    'production': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 256 * 1024 * 1024,   # 256 Mo lus via mmap, sans copie
+        'cache_size': -64 * 1024,         # 64 Mo de cache de pages (négatif = Kio)
+        'temp_store': 'MEMORY',
+        'busy_timeout': 30000,            # ms
+        'wal_autocheckpoint': 1000,       # pages
+        'foreign_keys': False,            # Non activé : données historiques non vérifiées
+    },
+    'dev': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 64 * 1024 * 1024,
+        'cache_size': -16 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 30000,
+        'wal_autocheckpoint': 1000,
+        'foreign_keys': False,
+    },
+    'test': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 0,
+        'cache_size': -2000,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+        'wal_autocheckpoint': 1000,
+        'foreign_keys': False,
+    },
+}
+
+# Pool SQLAlchemy par profil (un worker gunicorn synchrone = une connexion active)
+POOL_PROFILES = {
+    'production': {'pool_size': 5, 'pool_recycle': 3600},
+    'dev': {'pool_size': 2, 'pool_recycle': 3600},
+    'test': {'pool_size': 2, 'pool_recycle': 3600},
+}
+
+# Profils PostgreSQL : QueuePool et paramètres de session (ms) envoyés à la connexion
+POSTGRES_PROFILES = {
+    'production': {
+        'pool': {'pool_size': 10, 'max_overflow': 10, 'pool_timeout': 30,
+                 'pool_recycle': 1800, 'pool_pre_ping': True},
+        'settings': {'statement_timeout': 30000, 'lock_timeout': 10000,
+                     'idle_in_transaction_session_timeout': 60000},
+    },
+    'dev': {
+        'pool': {'pool_size': 5, 'max_overflow': 5, 'pool_timeout': 30,
+                 'pool_recycle': 1800, 'pool_pre_ping': True},
+        'settings': {'statement_timeout': 60000, 'lock_timeout': 10000,
+                     'idle_in_transaction_session_timeout': 300000},
+    },
+    'test': {
+        'pool': {'pool_size': 5, 'max_overflow': 0, 'pool_timeout': 10,
+                 'pool_recycle': 1800, 'pool_pre_ping': False},
+        'settings': {'statement_timeout': 15000, 'lock_timeout': 5000,
+                     'idle_in_transaction_session_timeout': 60000},
+    },
+}
+
+# GN_ENVIRONMENT -> profil
+ENVIRONMENT_PROFILES = {
+    'prod': 'production',
+    'production': 'production',
+    'dev': 'dev',
+    'test': 'test',
+}
+
+# Valeurs admises pour les PRAGMA à mots-clés (les autres sont des entiers)
+_PRAGMA_KEYWORDS = {
+    'journal_mode': {'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'},
+    'synchronous': {'OFF', 'NORMAL', 'FULL', 'EXTRA'},
+    'temp_store': {'DEFAULT', 'FILE', 'MEMORY'},
+}
+_PRAGMA_BOOLEANS = {'foreign_keys'}
+
+DEFAULT_DEPLOY_CONFIG_PATH = os.path.join('config', 'deploy_config.yaml')
+
+
+def _read_deploy_yaml(app):
+    """Lit config/deploy_config.yaml (ou DEPLOY_CONFIG_PATH) ; {} s'il est absent."""
+    path = os.environ.get('DEPLOY_CONFIG_PATH') or os.path.join(app.root_path, DEFAULT_DEPLOY_CONFIG_PATH)
+    if not os.path.exists(path):
+        return {}
+    import yaml
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
+    except (OSError, yaml.YAMLError) as e:
+        logger.warning(f"⚠️  Lecture de {path} impossible : {e}")
+        return {}
+
+
+def _normalize_pragma(name, value):
+    """
+    Valide une valeur de PRAGMA avant interpolation dans le SQL.
+
+    Raises:
+        ValueError: PRAGMA inconnu ou valeur invalide
+    """
+    if name not in SQLITE_PROFILES['production']:
+        raise ValueError(f"PRAGMA non pris en charge : {name}")
+    if name in _PRAGMA_BOOLEANS:
+        if isinstance(value, str):
+            value = value.strip().lower() in ('1', 'on', 'true', 'yes')
+        return bool(value)
+    if name in _PRAGMA_KEYWORDS:
+        value = str(value).upper()
+        if value not in _PRAGMA_KEYWORDS[name]:
+            raise ValueError(f"Valeur invalide pour {name} : {value}")
+        return value
+    return int(value)
+
+
+def _profile_name(app, database):
+    """Nom du profil : DB_PROFILE, 'database.profile', GN_ENVIRONMENT, TESTING."""
+    name = os.environ.get('DB_PROFILE') or database.get('profile')
+    if not name:
+        name = ENVIRONMENT_PROFILES.get(os.environ.get('GN_ENVIRONMENT', '').lower())
+    if not name:
+        name = 'test' if app.config.get('TESTING') else 'production'
+    if name not in SQLITE_PROFILES:
+        logger.warning(f"⚠️  Profil de base inconnu '{name}', profil 'production' utilisé")
+        name = 'production'
+    return name
+
+
+def _pool_overrides(pool, database, keys):
+    """Applique les surcharges de pool du fichier de déploiement."""
+    for key in keys:
+        if database.get(key) is not None:
+            pool[key] = int(database[key])
+    return pool
+
+
+def resolve_database_profile(app):
+    """
+    Détermine le profil de connexion SQLite effectif.
+
+    Priorité : variable DB_PROFILE, puis 'database.profile' du fichier de
+    déploiement, puis GN_ENVIRONMENT ; 'test' en mode TESTING, sinon
+    'production'. Les surcharges 'database.pragmas', 'database.pool_size'
+    et 'database.pool_recycle' du fichier s'appliquent ensuite.
+
+    Returns:
+        tuple: (nom du profil, PRAGMA, options de pool)
+    """
+    database = _read_deploy_yaml(app).get('database') or {}
+    name = _profile_name(app, database)
+
+    pragmas = dict(SQLITE_PROFILES[name])
+    for key, value in (database.get('pragmas') or {}).items():
+        try:
+            pragmas[key] = _normalize_pragma(key, value)
+        except ValueError as e:
+            logger.warning(f"⚠️  {e} (ignoré)")
+
+    pool = _pool_overrides(dict(POOL_PROFILES[name]), database, ('pool_size', 'pool_recycle'))
+    return name, pragmas, pool
+
+
+def resolve_postgres_profile(app):
+    """
+    Détermine le profil de connexion PostgreSQL effectif.
+
+    Même choix de profil que resolve_database_profile(). Surcharges :
+    'database.pool_size', 'max_overflow', 'pool_timeout', 'pool_recycle'
+    et les paramètres de session de 'database.postgres'.
+
+    Returns:
+        tuple: (nom du profil, options de QueuePool, paramètres de session)
+    """
+    database = _read_deploy_yaml(app).get('database') or {}
+    name = _profile_name(app, database)
+    profile = POSTGRES_PROFILES[name]
+
+    pool = _pool_overrides(dict(profile['pool']), database,
+                           ('pool_size', 'max_overflow', 'pool_timeout', 'pool_recycle'))
+    settings = dict(profile['settings'])
+    for key, value in (database.get('postgres') or {}).items():
+        if key not in settings:
+            logger.warning(f"⚠️  Paramètre PostgreSQL non pris en charge : {key} (ignoré)")
+            continue
+        try:
+            settings[key] = int(value)
+        except (TypeError, ValueError):
+            logger.warning(f"⚠️  Valeur invalide pour {key} : {value} (ignoré)")
+    return name, pool, settings
+
+
+def postgres_connect_options(settings):
+    """Chaîne libpq 'options' appliquant les paramètres de session à la connexion."""
+    return ' '.join(f"-c {key}={int(value)}" for key, value in settings.items())
+
+
+def normalize_database_url(url):
+    """
+    Normalise une URL de base de données fournie par l'environnement.
+
+    Les hébergeurs exportent souvent 'postgres://', refusé par SQLAlchemy 2.
+    """
+    if url.startswith('postgres://'):
+        return 'postgresql://' + url[len('postgres://'):]
+    return url
+
+
+def load_database_config(app):
+    """
+    Prépare la configuration SQLAlchemy du profil de connexion.
+
+    Doit être appelé avant db.init_app(). Renseigne DB_PROFILE, puis
+    SQLITE_PRAGMAS ou POSTGRES_SETTINGS dans app.config, et complète
+    SQLALCHEMY_ENGINE_OPTIONS (timeouts et pool) sans écraser les options
+    déjà fournies.
+    """
+    uri = app.config.get('SQLALCHEMY_DATABASE_URI', '')
+    options = app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+
+    if uri.startswith('postgresql'):
+        name, pool, settings = resolve_postgres_profile(app)
+        app.config['DB_PROFILE'] = name
+        app.config['POSTGRES_SETTINGS'] = settings
+        connect_args = options.setdefault('connect_args', {})
+        connect_args['options'] = (connect_args.get('options', '') + ' ' +
+                                   postgres_connect_options(settings)).strip()
+        for key, value in pool.items():
+            options.setdefault(key, value)
+        logger.info(f"✅ Profil de connexion PostgreSQL '{name}' chargé")
+        return
+
+    name, pragmas, pool = resolve_database_profile(app)
+    app.config['DB_PROFILE'] = name
+    if 'sqlite' not in uri:
+        return
+
+    app.config['SQLITE_PRAGMAS'] = pragmas
+    options.setdefault('connect_args', {}).setdefault('timeout', pragmas['busy_timeout'] / 1000)
+    # Base en mémoire : pool statique imposé par Flask-SQLAlchemy
+    if ':memory:' not in uri and 'mode=memory' not in uri:
+        for key, value in pool.items():
+            options.setdefault(key, value)
+    logger.info(f"✅ Profil de connexion SQLite '{name}' chargé")
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas):
+    """
+    Applique les PRAGMA d'un profil à une connexion DBAPI SQLite.
+
+    Les noms et valeurs proviennent de resolve_database_profile() (validés).
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            if isinstance(value, bool):
+                value = 'ON' if value else 'OFF'
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def read_sqlite_pragmas(connection, names=None):
+    """
+    Lit les valeurs effectives des PRAGMA sur une connexion SQLAlchemy.
+
+    Returns:
+        dict: {nom: valeur retournée par SQLite}
+    """
+    from sqlalchemy import text
+    names = names or SQLITE_PROFILES['production'].keys()
+    return {name: connection.execute(text(f"PRAGMA {name}")).scalar() for name in names}
+
+
 def load_deploy_config(app):
     """
     Charge la configuration des services externes dans app.config
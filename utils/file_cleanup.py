@@ -0,0 +1,58 @@
+"""
+File de suppression de fichiers différée après commit.
+
+Les routes qui suppriment des lignes référençant des fichiers (photos de
+participants...) planifient la suppression des fichiers au lieu d'appeler
+os.remove dans la transaction : les fichiers ne sont effacés qu'une fois
+le commit réussi, et sont conservés si la transaction est annulée.
+"""
+
+import logging
+import os
+
+from sqlalchemy import event as sa_event
+
+from models import db
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = 'pending_file_removals'
+
+
+def schedule_file_removal(paths, session=None):
+    """
+    Planifie la suppression de fichiers au prochain commit de la session.
+
+    Args:
+        paths: Chemins absolus des fichiers
+        session: Session (db.session par défaut)
+    """
+    session = session or db.session()
+    session.info.setdefault(_PENDING_KEY, []).extend(p for p in paths if p)
+
+
+def _remove_pending_files(session):
+    paths = session.info.pop(_PENDING_KEY, None)
+    for path in paths or []:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"⚠️  Suppression de {path} impossible : {e}")
+
+
+def _discard_pending_files(session, previous_transaction):
+    # after_soft_rollback : appelé même si aucune connexion n'était ouverte
+    session.info.pop(_PENDING_KEY, None)
+
+
+def register_file_cleanup_listeners():
+    """
+    Enregistre les hooks after_commit / after_soft_rollback sur la session.
+
+    Idempotent : peut être appelé à chaque création d'application.
+    """
+    if not sa_event.contains(db.session, 'after_commit', _remove_pending_files):
+        sa_event.listen(db.session, 'after_commit', _remove_pending_files)
+        sa_event.listen(db.session, 'after_soft_rollback', _discard_pending_files)
@@ -0,0 +1,64 @@
+"""
+Pagination par curseur (keyset) sur (created_at, id).
+
+Contrairement à LIMIT/OFFSET, le coût d'une page ne dépend pas de sa
+position : la requête reprend juste après la dernière ligne affichée en
+descendant un index dont les dernières colonnes sont (created_at, id).
+"""
+
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+
+def encode_cursor(created_at, row_id):
+    """
+    Encode la position d'une ligne en curseur opaque pour l'URL.
+
+    Returns:
+        str: Curseur de la forme "<created_at ISO>_<id>"
+    """
+    return f"{created_at.isoformat()}_{row_id}"
+
+
+def decode_cursor(token):
+    """
+    Décode un curseur produit par encode_cursor().
+
+    Returns:
+        tuple: (created_at, id), ou None si le curseur est absent ou invalide
+    """
+    if not token:
+        return None
+    created_at, _, row_id = token.rpartition('_')
+    try:
+        return datetime.fromisoformat(created_at), int(row_id)
+    except ValueError:
+        return None
+
+
+def keyset_page(query, created_column, id_column, cursor=None, limit=50):
+    """
+    Retourne une page de résultats, du plus récent au plus ancien.
+
+    Args:
+        query: Requête ORM déjà filtrée
+        created_column: Colonne de date (ex: ActivityLog.created_at)
+        id_column: Clé primaire départageant les dates égales
+        cursor: Position (created_at, id) décodée, None pour la première page
+        limit: Taille de la page
+
+    Returns:
+        tuple: (éléments, curseur de la page suivante ou None)
+    """
+    if cursor is not None:
+        query = query.filter(tuple_(created_column, id_column) < tuple_(*cursor))
+
+    items = query.order_by(created_column.desc(), id_column.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, created_column.key), getattr(last, id_column.key))
+    return items, next_cursor
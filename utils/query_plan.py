@@ -0,0 +1,128 @@
+"""
+Utilitaire d'analyse des plans de requêtes SQLite.
+
+Capture le SQL émis par SQLAlchemy pendant un bloc de code, puis rejoue
+chaque SELECT avec EXPLAIN QUERY PLAN pour détecter les parcours complets
+(SCAN sans index) sur les tables volumineuses. Utilisé par
+tests/test_query_plans.py pour rendre visibles les régressions d'index.
+"""
+
+import re
+from contextlib import contextmanager
+
+from sqlalchemy import event as sa_event
+
+# Tables dont le volume croît avec l'activité (participants, logs, formulaires...)
+LARGE_TABLES = frozenset({
+    'user',
+    'participant',
+    'role',
+    'activity_log',
+    'event_notification',
+    'casting_proposal',
+    'casting_assignment',
+    'form_response',
+    'gforms_submission',
+})
+
+# "SCAN participant" ou "SCAN participant AS participant_1" (sans index)
+_FULL_SCAN_RE = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$')
+
+
+class CapturedQuery:
+    """Requête SQL capturée avec ses paramètres et son contexte d'émission."""
+
+    def __init__(self, statement, parameters, label=None):
+        self.statement = statement
+        self.parameters = parameters
+        self.label = label
+
+    def __repr__(self):
+        return f'<CapturedQuery {self.label}: {self.statement[:60]}>'
+
+
+class QueryCapture:
+    """
+    Collecteur de requêtes branché sur before_cursor_execute.
+
+    L'attribut `label` peut être modifié entre deux appels pour rattacher
+    les requêtes à la route qui les a émises.
+    """
+
+    def __init__(self):
+        self.queries = []
+        self.label = None
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith('SELECT'):
+            self.queries.append(CapturedQuery(statement, parameters, self.label))
+
+
+@contextmanager
+def capture_queries(engine):
+    """
+    Capture les SELECT émis sur un engine pendant le bloc.
+
+    Usage:
+        with capture_queries(db.engine) as capture:
+            client.get('/event/1')
+        capture.queries
+    """
+    capture = QueryCapture()
+    sa_event.listen(engine, 'before_cursor_execute', capture._on_execute)
+    try:
+        yield capture
+    finally:
+        sa_event.remove(engine, 'before_cursor_execute', capture._on_execute)
+
+
+def explain(connection, query):
+    """
+    Exécute EXPLAIN QUERY PLAN pour une requête capturée.
+
+    Returns:
+        list: Lignes "detail" du plan SQLite
+    """
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute(f'EXPLAIN QUERY PLAN {query.statement}', query.parameters or ())
+        return [row[-1] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def find_full_scans(connection, queries, large_tables=LARGE_TABLES):
+    """
+    Liste les parcours complets de tables volumineuses.
+
+    Args:
+        connection: Connexion SQLAlchemy (SQLite)
+        queries: Requêtes capturées
+        large_tables: Tables à surveiller
+
+    Returns:
+        list: Tuples (label, table, statement) dédupliqués
+    """
+    findings = []
+    seen = set()
+    for query in queries:
+        for detail in explain(connection, query):
+            match = _FULL_SCAN_RE.match(detail)
+            if not match or match.group(1) not in large_tables:
+                continue
+            key = (query.label, match.group(1), query.statement)
+            if key not in seen:
+                seen.add(key)
+                findings.append(key)
+    return findings
+
+
+def format_report(findings):
+    """Formate les parcours complets détectés en rapport lisible."""
+    if not findings:
+        return 'Aucun parcours complet sur les tables volumineuses.'
+    lines = [f'{len(findings)} parcours complet(s) détecté(s) :']
+    for label, table, statement in findings:
+        compact = ' '.join(statement.split())
+        lines.append(f'- [{label}] SCAN {table} : {compact[:200]}')
+    return '\n'.join(lines)
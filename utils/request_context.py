@@ -0,0 +1,81 @@
+"""
+Contexte d'événement de la requête (flask.g).
+
+Les décorateurs @organizer_required et @participant_required chargent
+l'événement et la participation de l'utilisateur connecté ; les vues les
+relisent depuis le contexte au lieu de refaire les mêmes requêtes :
+- g.current_event : l'événement de la route
+- g.current_membership : le Participant de current_user (None s'il n'en a pas)
+
+Une participation par (event_id, user_id) (index unique
+uq_participant_event_user) : une seule ligne sert à la fois aux contrôles
+"participant" et "organisateur". Le contexte est vidé en fin de requête.
+
+Un événement en cours de suppression (Event.is_deleting) répond 404 : ni
+lecture ni écriture pendant le traitement par lots.
+"""
+
+from flask import abort, g
+from flask_login import current_user
+from sqlalchemy import inspect
+
+from models import Event, Participant
+
+_CONTEXT_KEYS = ('current_event', 'current_membership', '_membership_event_id')
+
+
+def get_current_event(event_id, *options):
+    """
+    Événement de la requête, chargé au premier appel (404 s'il n'existe pas
+    ou est en cours de suppression).
+
+    Args:
+        event_id: ID de l'événement
+        *options: Options de chargement (joinedload...) du premier chargement
+
+    Returns:
+        Event
+    """
+    event = g.get('current_event')
+    if event is None or inspect(event).identity != (event_id,):
+        event = Event.query.options(*options).get_or_404(event_id)
+        if event.is_deleting:
+            abort(404)
+        g.current_event = event
+    return event
+
+
+def get_current_membership(event_id):
+    """
+    Participation de l'utilisateur connecté à un événement, lue une fois par requête.
+
+    N'a pas besoin de l'événement : si celui de la requête est déjà chargé
+    avec ses participants (joinedload), la participation y est prise sans
+    requête.
+
+    Returns:
+        Participant ou None
+    """
+    if g.get('_membership_event_id') != event_id:
+        event = g.get('current_event')
+        if not current_user.is_authenticated:
+            membership = None
+        elif event is not None and inspect(event).identity == (event_id,) \
+                and 'participants' not in inspect(event).unloaded:
+            membership = next((p for p in event.participants if p.user_id == current_user.id), None)
+        else:
+            membership = Participant.query.filter_by(event_id=event_id, user_id=current_user.id).first()
+        g.current_membership = membership
+        g._membership_event_id = event_id
+    return g.current_membership
+
+
+def clear_request_context(exc=None):
+    """Vide le contexte d'événement (teardown_request)."""
+    for key in _CONTEXT_KEYS:
+        g.pop(key, None)
+
+
+def init_request_context(app):
+    """Enregistre le nettoyage du contexte en fin de requête."""
+    app.teardown_request(clear_request_context)